@@ -0,0 +1,8 @@
+# benchmarks/__init__.py
+
+"""
+Benchmark suite for kopen-data-builder: synthetic Korean public-data inputs, per-stage
+timings and peak memory, stored baselines and a comparison report.
+
+Run from the repository root with ``python -m benchmarks --help``.
+"""
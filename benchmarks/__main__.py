@@ -0,0 +1,122 @@
+# benchmarks/__main__.py
+
+"""
+Benchmark CLI: Generate inputs, run the suite, and compare with stored baselines.
+
+Example:
+$ python -m benchmarks run --preset small              # compare with benchmarks/baselines/small.json
+$ python -m benchmarks run --preset medium --case read --case build
+$ python -m benchmarks run --preset small --save-baseline
+$ python -m benchmarks compare .benchmarks/results/small.json benchmarks/baselines/small.json
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+
+from benchmarks.suite import (
+    DEFAULT_DATA_DIR,
+    DEFAULT_RESULTS_DIR,
+    MEMORY_TOLERANCE,
+    PRESETS,
+    TIME_TOLERANCE,
+    baseline_path,
+    compare_reports,
+    format_comparison,
+    format_report,
+    load_report,
+    prepare_inputs,
+    run_suite,
+    save_report,
+)
+
+app = typer.Typer(help="Benchmark pipeline stages on synthetic Korean public data.")
+logger = logging.getLogger(__name__)
+
+
+@app.callback()
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+
+@app.command("generate")
+def generate(
+    preset: str = typer.Option("small", help=f"Input sizes: {', '.join(PRESETS)}."),
+    data_dir: str = typer.Option(str(DEFAULT_DATA_DIR), help="Directory for generated inputs."),
+    seed: int = typer.Option(0, help="Seed of the data generator."),
+) -> None:
+    """Generate (or reuse) the input files of a preset."""
+    try:
+        paths = prepare_inputs(preset, data_dir, seed)
+    except ValueError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        raise typer.Exit(code=1) from e
+    for name, path in paths.items():
+        typer.echo(f"{name}: {path} ({path.stat().st_size / 1024**2:.1f} MB)")
+
+
+@app.command("run")
+def run(
+    preset: str = typer.Option("small", help=f"Input sizes: {', '.join(PRESETS)}."),
+    case: List[str] = typer.Option(None, help="Case name prefix (e.g. read, build/csv), repeatable."),  # noqa: B008
+    data_dir: str = typer.Option(str(DEFAULT_DATA_DIR), help="Directory for generated inputs."),
+    seed: int = typer.Option(0, help="Seed of the data generator."),
+    repeats: Optional[int] = typer.Option(None, help="Timed runs per case (default depends on the preset)."),
+    memory: bool = typer.Option(True, "--memory/--no-memory", help="Measure peak traced memory with tracemalloc."),
+    output: Optional[str] = typer.Option(None, help="Results JSON (default .benchmarks/results/<preset>.json)."),
+    save_baseline: bool = typer.Option(False, help="Store the results as the baseline of the preset."),
+    compare: bool = typer.Option(True, "--compare/--no-compare", help="Compare with the stored baseline."),
+    time_tolerance: float = typer.Option(TIME_TOLERANCE, help="Allowed relative slowdown before failing."),
+    memory_tolerance: float = typer.Option(MEMORY_TOLERANCE, help="Allowed relative memory growth before failing."),
+) -> None:
+    """
+    Run the benchmark suite; exits with 1 if a case regressed against the baseline.
+    """
+    try:
+        report = run_suite(preset, case, data_dir, seed, repeats, memory)
+    except ValueError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        raise typer.Exit(code=1) from e
+
+    path = save_report(report, output or DEFAULT_RESULTS_DIR / f"{preset}.json")
+    typer.echo(format_report(report))
+    typer.echo(f"\n📄 Results written to {path}")
+
+    if save_baseline:
+        typer.echo(f"📌 Baseline stored at {save_report(report, baseline_path(preset))}")
+    elif compare:
+        _compare(report, baseline_path(preset), time_tolerance, memory_tolerance)
+
+
+@app.command("compare")
+def compare_cmd(
+    current: str = typer.Argument(..., help="Results JSON of the run to check."),
+    baseline: Optional[str] = typer.Argument(None, help="Baseline JSON (default: the stored baseline of the preset)."),
+    time_tolerance: float = typer.Option(TIME_TOLERANCE, help="Allowed relative slowdown before failing."),
+    memory_tolerance: float = typer.Option(MEMORY_TOLERANCE, help="Allowed relative memory growth before failing."),
+) -> None:
+    """Compare a results file with a baseline; exits with 1 on a regression."""
+    report = load_report(current)
+    _compare(report, Path(baseline) if baseline else baseline_path(report["preset"]), time_tolerance, memory_tolerance)
+
+
+def _compare(report: Dict[str, Any], baseline: Path, time_tolerance: float, memory_tolerance: float) -> None:
+    if not baseline.exists():
+        typer.echo(f"⚠️ No baseline at {baseline}; store one with --save-baseline")
+        return
+    stored = load_report(baseline)
+    if stored["environment"] != report["environment"]:
+        typer.echo("⚠️ Baseline was recorded in a different environment; differences may not be regressions")
+    comparisons = compare_reports(stored, report, time_tolerance, memory_tolerance)
+    typer.echo(f"\nCompared with {baseline}:\n{format_comparison(comparisons)}")
+    regressions = [c.case for c in comparisons if c.regressed]
+    if regressions:
+        typer.echo(f"❌ Regressions: {', '.join(regressions)}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo("✅ No regressions")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,472 @@
+# benchmarks/suite.py
+
+"""
+Benchmark suite: Times each pipeline stage on synthetic inputs and compares against baselines.
+Every case runs in a fresh spawned process, so imports and caches of one case do not
+leak into the next. A case is timed ``repeats`` times, recording the peak RSS of the
+process during those runs (on Linux the peak is reset after the setup, so it covers
+the stage and the input it holds), and then run once more under tracemalloc for the
+peak of Python and NumPy allocations, which excludes Arrow buffers. Results are JSON
+files that can be saved as the baseline of a preset and compared with a later run.
+"""
+
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from benchmarks.datagen import WIDE_COLUMNS, generate_table, write_csv, write_workbook
+from kopen_data_builder import __version__
+from kopen_data_builder.core.metrics import peak_rss_mb
+
+logger = logging.getLogger(__name__)
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_DATA_DIR = Path(".benchmarks") / "data"
+DEFAULT_RESULTS_DIR = Path(".benchmarks") / "results"
+SPLIT_RULES = {"train": 0.8, "test": 0.2}
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+MIN_SECONDS_DELTA = 0.02  # smaller slowdowns are timer noise
+
+PathLike = Union[str, Path]
+Work = Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class Preset:
+    """Input sizes of one benchmark run."""
+
+    rows: int
+    wide_rows: int
+    excel_rows: int
+    excel_sheets: int
+    repeats: int
+
+
+PRESETS: Dict[str, Preset] = {
+    "smoke": Preset(rows=1_000, wide_rows=200, excel_rows=600, excel_sheets=3, repeats=1),
+    "small": Preset(rows=10_000, wide_rows=2_000, excel_rows=10_000, excel_sheets=5, repeats=3),
+    "medium": Preset(rows=1_000_000, wide_rows=100_000, excel_rows=200_000, excel_sheets=10, repeats=3),
+    "large": Preset(rows=10_000_000, wide_rows=1_000_000, excel_rows=500_000, excel_sheets=20, repeats=1),
+}
+
+
+@dataclass
+class CaseResult:
+    """Timing and memory of one benchmark case."""
+
+    case: str
+    rows: int
+    seconds: float
+    min_seconds: float
+    peak_traced_mb: Optional[float]
+    peak_rss_mb: Optional[float]
+    runs: List[float] = field(default_factory=list)
+
+    @property
+    def memory_mb(self) -> Optional[float]:
+        """Traced peak when available, else the process peak RSS."""
+        return self.peak_traced_mb if self.peak_traced_mb is not None else self.peak_rss_mb
+
+
+def prepare_inputs(preset: str, data_dir: PathLike = DEFAULT_DATA_DIR, seed: int = 0) -> Dict[str, Path]:
+    """
+    Generate the input files of ``preset`` under ``data_dir/<preset>-<seed>``, reusing existing ones.
+
+    Returns:
+        dict: Input name (``tall-utf8``, ``tall-cp949``, ``wide-utf8``, ``workbook``) to path.
+    """
+    sizes = _preset(preset)
+    root = Path(data_dir) / f"{preset}-{seed}"
+    paths = {
+        "tall-utf8": root / "tall-utf8.csv",
+        "tall-cp949": root / "tall-cp949.csv",
+        "wide-utf8": root / "wide-utf8.csv",
+        "workbook": root / "workbook.xlsx",
+    }
+    if all(path.exists() for path in paths.values()):
+        return paths
+
+    logger.info("Generating %s inputs in %s", preset, root)
+    tall = generate_table(sizes.rows, seed=seed)
+    write_csv(tall, paths["tall-utf8"], encoding="utf-8")
+    write_csv(tall, paths["tall-cp949"], encoding="cp949")
+    write_workbook(tall.head(sizes.excel_rows), paths["workbook"], sizes.excel_sheets)
+    del tall
+    write_csv(generate_table(sizes.wide_rows, columns=WIDE_COLUMNS, seed=seed), paths["wide-utf8"])
+    return paths
+
+
+def _preset(name: str) -> Preset:
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset '{name}'; expected one of {', '.join(PRESETS)}")
+    return PRESETS[name]
+
+
+# Case setups run in the worker process: they prepare the stage's input outside the
+# measured region and return the work to measure.
+
+
+@dataclass
+class Prepared:
+    """The measured work of a case and the number of rows it processes."""
+
+    work: Work
+    rows: int
+    # Peak RSS of work done in a child process, read after the runs.
+    child_peak_rss_mb: Optional[Callable[[], Optional[float]]] = None
+
+
+Setup = Callable[[Dict[str, Path], Path], Prepared]
+
+
+def _read(name: str, **kwargs: Any) -> Setup:
+    def setup(inputs: Dict[str, Path], workdir: Path) -> Prepared:
+        from kopen_data_builder.core.io import read_table
+
+        rows = len(read_table(str(inputs[name]), **kwargs))
+        return Prepared(lambda: read_table(str(inputs[name]), **kwargs), rows)
+
+    return setup
+
+
+def _preprocess(name: str) -> Setup:
+    def setup(inputs: Dict[str, Path], workdir: Path) -> Prepared:
+        from kopen_data_builder.core.io import read_table
+        from kopen_data_builder.core.preprocessing import preprocess_data
+
+        df = read_table(str(inputs[name]))
+        return Prepared(lambda: preprocess_data(df), len(df))
+
+    return setup
+
+
+def _split(inputs: Dict[str, Path], workdir: Path) -> Prepared:
+    from kopen_data_builder.core.io import read_table
+    from kopen_data_builder.core.preprocessing import preprocess_data
+    from kopen_data_builder.core.splitter import split_dataset
+
+    df = preprocess_data(read_table(str(inputs["tall-utf8"])))
+    split_dataset(df.head(100), SPLIT_RULES)  # loads scikit-learn outside the measured runs
+    return Prepared(lambda: split_dataset(df, SPLIT_RULES), len(df))
+
+
+def _build(output_format: str) -> Setup:
+    def setup(inputs: Dict[str, Path], workdir: Path) -> Prepared:
+        from kopen_data_builder.core.builder import prepare_hf_repository
+        from kopen_data_builder.core.io import read_table
+        from kopen_data_builder.core.preprocessing import preprocess_data
+        from kopen_data_builder.core.splitter import split_dataset
+
+        splits = split_dataset(preprocess_data(read_table(str(inputs["tall-utf8"]))), SPLIT_RULES)
+        output_dir = str(workdir / f"repo-{output_format}")
+        rows = sum(len(df) for df in splits.values())
+        return Prepared(lambda: prepare_hf_repository("bench", splits, output_dir, output_format=output_format), rows)
+
+    return setup
+
+
+def _cli(*args: str, input_name: Optional[str] = None) -> Setup:
+    """Run the CLI in a subprocess; its peak RSS comes from the ``--metrics jsonl`` summary."""
+
+    def setup(inputs: Dict[str, Path], workdir: Path) -> Prepared:
+        rules = workdir / "rules.json"
+        rules.write_text(json.dumps(SPLIT_RULES), encoding="utf-8")
+        metrics_file = workdir / "metrics.jsonl"
+        values = {"rules": str(rules), "workdir": str(workdir), **{k: str(v) for k, v in inputs.items()}}
+        command = [sys.executable, "-m", "kopen_data_builder.cli.main"]
+        if "--help" not in args:
+            command += ["--metrics", "jsonl", "--metrics-file", str(metrics_file)]
+        command += [arg.format(**values) for arg in args]
+        rows = _count_lines(inputs[input_name]) - 1 if input_name else 0
+        return Prepared(
+            lambda: subprocess.run(command, check=True, capture_output=True), rows, partial(_cli_peak, metrics_file)
+        )
+
+    return setup
+
+
+def _cli_peak(metrics_file: Path) -> Optional[float]:
+    if not metrics_file.exists():
+        return None
+    events = [json.loads(line) for line in metrics_file.read_text(encoding="utf-8").splitlines()]
+    peaks = [e["peak_rss_mb"] for e in events if e["type"] == "summary" and e["peak_rss_mb"] is not None]
+    return max(peaks) if peaks else None
+
+
+def _count_lines(path: Path) -> int:
+    with open(path, "rb") as f:
+        return sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+
+
+CASES: Dict[str, Setup] = {
+    "read/csv-utf8": _read("tall-utf8"),
+    "read/csv-cp949": _read("tall-cp949"),
+    "read/csv-wide": _read("wide-utf8"),
+    "read/xlsx-sheet": _read("workbook", sheet_name="sheet_1"),
+    "preprocess/tall": _preprocess("tall-utf8"),
+    "preprocess/wide": _preprocess("wide-utf8"),
+    "split/tall": _split,
+    "build/csv": _build("csv"),
+    "build/parquet": _build("parquet"),
+    "cli/help": _cli("--help"),
+    "cli/split": _cli(
+        "split",
+        "split",
+        "--input-csv",
+        "{tall-utf8}",
+        "--split-json",
+        "{rules}",
+        "--output-dir",
+        "{workdir}/splits",
+        input_name="tall-utf8",
+    ),
+}
+
+
+def _reset_peak_rss() -> None:
+    """Reset the kernel's peak RSS of this process to its current RSS (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        logger.debug("Cannot reset the peak RSS; it includes the case setup")
+
+
+def _measure(case: str, inputs: Dict[str, Path], workdir: Path, repeats: int, trace_memory: bool) -> CaseResult:
+    """Run one case in the current (fresh) process."""
+    # e.g. pandas falling back to dateutil while probing date columns, once per call
+    warnings.simplefilter("ignore")
+    workdir.mkdir(parents=True, exist_ok=True)
+    prepared = CASES[case](inputs, workdir)
+    gc.collect()
+    _reset_peak_rss()
+    runs = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        prepared.work()
+        runs.append(time.perf_counter() - started)
+    peak_rss = prepared.child_peak_rss_mb() if prepared.child_peak_rss_mb is not None else peak_rss_mb()
+
+    peak_traced = None
+    if trace_memory and prepared.child_peak_rss_mb is None:
+        gc.collect()
+        tracemalloc.start()
+        prepared.work()
+        peak_traced = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+    return CaseResult(case, prepared.rows, statistics.median(runs), min(runs), peak_traced, peak_rss, runs)
+
+
+def select_cases(patterns: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Case names starting with any of ``patterns`` (e.g. ``read`` or ``build/parquet``), or all cases.
+
+    Raises:
+        ValueError: If a pattern matches no case.
+    """
+    if not patterns:
+        return list(CASES)
+    selected: List[str] = []
+    for pattern in patterns:
+        matches = [case for case in CASES if case.startswith(pattern)]
+        if not matches:
+            raise ValueError(f"No benchmark case matches '{pattern}'; cases: {', '.join(CASES)}")
+        selected.extend(case for case in matches if case not in selected)
+    return selected
+
+
+def run_suite(
+    preset: str,
+    cases: Optional[Sequence[str]] = None,
+    data_dir: PathLike = DEFAULT_DATA_DIR,
+    seed: int = 0,
+    repeats: Optional[int] = None,
+    trace_memory: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark cases of ``preset``, each in a fresh process.
+
+    Args:
+        preset (str): Name in ``PRESETS``.
+        cases (Sequence[str], optional): Case name prefixes to run; all cases by default.
+        data_dir (str | Path): Where generated inputs are kept between runs.
+        seed (int): Seed of the data generator.
+        repeats (int, optional): Timed runs per case; the preset's default when omitted.
+        trace_memory (bool): Run each case once more under tracemalloc.
+
+    Returns:
+        dict: JSON-serializable report with the environment and one entry per case.
+    """
+    sizes = _preset(preset)
+    names = select_cases(cases)
+    inputs = prepare_inputs(preset, data_dir, seed)
+    workdir = Path(data_dir) / f"{preset}-{seed}" / "work"
+    results = []
+    for name in names:
+        logger.info("Running %s", name)
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(
+                _measure, name, inputs, workdir / name.replace("/", "-"), repeats or sizes.repeats, trace_memory
+            ).result()
+        results.append(asdict(result))
+    return {"preset": preset, "seed": seed, "version": __version__, "environment": environment(), "results": results}
+
+
+def environment() -> Dict[str, Any]:
+    """Interpreter, platform and library versions that results depend on."""
+    import numpy
+    import pandas
+    import pyarrow
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+    }
+
+
+def save_report(report: Dict[str, Any], path: PathLike) -> Path:
+    """Write ``report`` as JSON to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load_report(path: PathLike) -> Dict[str, Any]:
+    """Read a report written by ``save_report``."""
+    report: Dict[str, Any] = json.loads(Path(path).read_text(encoding="utf-8"))
+    return report
+
+
+def baseline_path(preset: str) -> Path:
+    """Location of the stored baseline of ``preset``."""
+    return BASELINE_DIR / f"{preset}.json"
+
+
+@dataclass
+class Comparison:
+    """One case of a baseline comparison."""
+
+    case: str
+    baseline_seconds: Optional[float]
+    seconds: float
+    baseline_mb: Optional[float]
+    memory_mb: Optional[float]
+    status: str
+    regressed: bool = False
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> List[Comparison]:
+    """
+    Compare the cases of ``current`` with the same cases of ``baseline``.
+
+    Times are compared by their fastest run, which is the least disturbed by other load
+    on the machine. A case regresses when that time grows by more than ``time_tolerance``
+    (and by at least ``MIN_SECONDS_DELTA``) or its peak memory by more than ``memory_tolerance``.
+    """
+    before = {r["case"]: CaseResult(**r) for r in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        new = CaseResult(**result)
+        old = before.get(new.case)
+        if old is None:
+            comparisons.append(Comparison(new.case, None, new.min_seconds, None, new.memory_mb, "new"))
+            continue
+        problems = []
+        if (
+            new.min_seconds > old.min_seconds * (1 + time_tolerance)
+            and new.min_seconds - old.min_seconds >= MIN_SECONDS_DELTA
+        ):
+            problems.append(f"slower {_change(old.min_seconds, new.min_seconds)}")
+        if old.memory_mb and new.memory_mb and new.memory_mb > old.memory_mb * (1 + memory_tolerance):
+            problems.append(f"more memory {_change(old.memory_mb, new.memory_mb)}")
+        comparisons.append(
+            Comparison(
+                new.case,
+                old.min_seconds,
+                new.min_seconds,
+                old.memory_mb,
+                new.memory_mb,
+                ", ".join(problems) or "ok",
+                regressed=bool(problems),
+            )
+        )
+    return comparisons
+
+
+def _change(old: float, new: float) -> str:
+    return f"{(new - old) / old:+.0%}" if old else "n/a"
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Fixed-width table of one run."""
+    rows = [["case", "rows", "median s", "min s", "rows/s", "traced MB", "RSS MB"]]
+    for r in report["results"]:
+        rows.append(
+            [
+                r["case"],
+                str(r["rows"]) if r["rows"] else "-",
+                f"{r['seconds']:.3f}",
+                f"{r['min_seconds']:.3f}",
+                f"{r['rows'] / r['seconds']:,.0f}" if r["rows"] and r["seconds"] else "-",
+                _mb(r["peak_traced_mb"]),
+                _mb(r["peak_rss_mb"]),
+            ]
+        )
+    return _table(rows)
+
+
+def format_comparison(comparisons: Sequence[Comparison]) -> str:
+    """Fixed-width table of a baseline comparison."""
+    rows = [["case", "baseline min s", "min s", "time", "baseline MB", "current MB", "memory", "status"]]
+    for c in comparisons:
+        rows.append(
+            [
+                c.case,
+                _seconds(c.baseline_seconds),
+                _seconds(c.seconds),
+                _change(c.baseline_seconds, c.seconds) if c.baseline_seconds and c.seconds else "-",
+                _mb(c.baseline_mb),
+                _mb(c.memory_mb),
+                _change(c.baseline_mb, c.memory_mb) if c.baseline_mb and c.memory_mb else "-",
+                c.status,
+            ]
+        )
+    return _table(rows)
+
+
+def _seconds(value: Optional[float]) -> str:
+    return f"{value:.3f}" if value is not None else "-"
+
+
+def _mb(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def _table(rows: List[List[str]]) -> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
@@ -1,2 +1,13 @@
 # Init for project package
 __version__ = "0.1.0"
+
+__all__ = ["LazyFrame", "scan"]
+
+
+def __getattr__(name: str) -> object:
+    # The SDK pulls in pandas; import it on first use so the CLI starts fast.
+    if name in __all__:
+        from kopen_data_builder.core import frame
+
+        return getattr(frame, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
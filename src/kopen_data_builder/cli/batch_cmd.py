@@ -0,0 +1,76 @@
+# src/kopen_data_builder/cli/batch_cmd.py
+
+"""
+Batch CLI: Run many dataset pipelines, each described by its own YAML file.
+
+Downloads and uploads overlap with preprocessing and building, which run in a pool of
+worker processes bounded by a global memory budget. One failing dataset does not stop
+the others; a table of stage timings is printed at the end.
+"""
+
+import glob
+import logging
+from typing import List
+
+import typer
+
+from kopen_data_builder.core.batch import DEFAULT_IO_WORKERS, format_summary, load_pipeline, run_batch
+from kopen_data_builder.core.downloader import DownloadCache
+
+app = typer.Typer(help="Run many dataset pipelines defined in YAML files.")
+logger = logging.getLogger(__name__)
+
+
+@app.command("run")
+def run(
+    pipelines: List[str] = typer.Argument(..., help="Pipeline YAML files or glob patterns."),  # noqa: B008
+    workers: int = typer.Option(None, help="Worker processes for preprocess/build (default: CPU count)."),
+    memory_budget_mb: int = typer.Option(None, help="Memory shared by running preprocess/build stages, in MB."),
+    io_workers: int = typer.Option(DEFAULT_IO_WORKERS, help="Threads for download and upload stages."),
+    token: str = typer.Option(None, help="Hugging Face token for uploads (optional)."),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Revalidate downloads against the cache (default)."),
+    cache_dir: str = typer.Option(None, help="Download cache directory (default: ~/.cache/kopen-data-builder)."),
+    force: bool = typer.Option(False, "--force", help="Rebuild datasets even if their inputs are unchanged."),
+) -> None:
+    """
+    Run every pipeline and print a summary of stage timings.
+
+    Example:
+    $ kopen batch run datasets/*.yaml --workers 4 --memory-budget-mb 8000
+    $ kopen batch run 'datasets/seoul-*.yaml' --io-workers 8
+    """
+    paths = []
+    for pattern in pipelines:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            typer.echo(f"⚠️ No pipeline matches {pattern}", err=True)
+        paths.extend(matches)
+
+    try:
+        specs = [load_pipeline(path) for path in paths]
+    except (OSError, ValueError) as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        raise typer.Exit(code=1) from e
+    if not specs:
+        typer.echo("❌ Error: no pipelines to run", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        results = run_batch(
+            specs,
+            workers=workers,
+            memory_budget_mb=memory_budget_mb,
+            io_workers=io_workers,
+            token=token,
+            cache=DownloadCache(cache_dir) if cache else None,
+            force=force,
+        )
+    except ValueError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        raise typer.Exit(code=1) from e
+
+    typer.echo(format_summary(results))
+    failed = [r for r in results if not r.ok]
+    typer.echo(f"{'❌' if failed else '✅'} {len(results) - len(failed)}/{len(results)} datasets completed.")
+    if failed:
+        raise typer.Exit(code=1)
@@ -12,7 +12,12 @@ import logging
 import typer
 
 from kopen_data_builder.core.builder import build_repository
-from kopen_data_builder.core.metadata import load_metadata
+from kopen_data_builder.core.diff import load_diff_report
+from kopen_data_builder.core.memory import MEMORY_BUDGET
+from kopen_data_builder.core.partitioning import DEFAULT_MAX_OPEN_FILES, parse_partition_by
+from kopen_data_builder.core.sampling import DEFAULT_SEED, check_sample_options
+from kopen_data_builder.core.stage_cache import StageCache
+from kopen_data_builder.registry import DatasetRegistry
 
 app = typer.Typer(help="Build Hugging Face-compatible dataset structure.")
 logger = logging.getLogger(__name__)
@@ -39,27 +44,126 @@ def run(
         None,
         help="Path to metadata.yaml (optional).",
     ),
+    output_format: str = typer.Option(
+        "csv",
+        "--format",
+        help="Output format: 'csv' or 'parquet' (one file per split), or 'arrow' (memory-mappable DatasetDict).",
+    ),
+    partition_by: str = typer.Option(
+        None,
+        help="Comma-separated partition columns; use 'col:year', 'col:month' or 'col:day' to derive date parts.",
+    ),
+    max_open_files: int = typer.Option(DEFAULT_MAX_OPEN_FILES, help="Maximum files held open by partition writers."),
+    incremental: bool = typer.Option(
+        False,
+        help="Keep the existing output and only replace partitions present in the input (requires --partition-by).",
+    ),
+    csv_engine: str = typer.Option("pandas", help="CSV writer engine: 'pandas', 'chunked' or 'arrow' (fastest)."),
+    force: bool = typer.Option(False, "--force", help="Rebuild even if splits, metadata and options are unchanged."),
+    sample: int = typer.Option(None, help="Preview on N random rows per split; the repository is marked as a sample."),
+    sample_frac: float = typer.Option(None, help="Preview on this fraction of rows per split (fastest)."),
+    sample_seed: int = typer.Option(DEFAULT_SEED, help="Seed for --sample / --sample-frac."),
+    changelog: str = typer.Option(
+        None,
+        help="diff.json (or its directory) from 'kopen diff run'; adds this release to the README changelog "
+        "and, with --incremental, deletes the partitions it emptied.",
+    ),
 ) -> None:
     """
     Build a Hugging Face-compatible dataset from split CSVs.
 
     This command reads split definitions from a JSON file and generates
     the necessary dataset files and structure to upload to Hugging Face Hub.
+    The build is skipped when the split files, metadata, options and tool version
+    match the last run and the repository is untouched (see ``kopen stages explain``).
+    Under ``kopen --max-memory`` splits are streamed into the repository in chunks.
+    With ``--sample`` or ``--sample-frac`` each split is sampled while it is read; the
+    repository then gets a ``sample.json`` marker and a README banner, as it does when
+    the split files themselves come from a sampled ``kopen split``.
+    ``--changelog`` records a ``kopen diff`` report in the README's changelog, which is
+    kept across rebuilds of the same output directory. With ``--incremental`` the
+    partitions the report found emptied are deleted, so a delta upload with
+    ``--delete-remote`` removes them from the Hub too.
 
     Example:
     $ kopen build run --dataset-name my-dataset --csv-json-path ./splits.json --output-dir ./my_dataset_repo
+    $ kopen build run --dataset-name my-dataset --csv-json-path ./splits.json --output-dir ./repo --format arrow
+    $ kopen build run ... --format parquet --partition-by reg_date:year,reg_date:month
+    $ kopen build run ... --sample 5000
+    $ kopen build run ... --partition-by reg_date:year --incremental --changelog ./diff
 
     Args:
         dataset_name (str): Name of the dataset to create.
         csv_json_path (str): Path to a JSON file mapping split names to CSV file paths.
         output_dir (str): Directory where the dataset repository will be created.
+        output_format (str): Split file format, ``csv``, ``parquet`` or ``arrow``.
+        partition_by (str): Comma-separated partition specs.
+        max_open_files (int): Bound on files held open by partition writers.
+        incremental (bool): Only rewrite partitions present in the input.
+        csv_engine (str): CSV writer engine used for ``csv`` output.
+        force (bool): Rebuild even if nothing changed.
+        sample (int): Rows kept per split for a preview build.
+        sample_frac (float): Fraction of rows kept per split for a preview build.
+        sample_seed (int): Seed of the sampler.
+        changelog (str): Diff report describing this release.
     """
+    try:
+        check_sample_options(sample, sample_frac)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--sample/--sample-frac") from e
+
+    report = load_diff_report(changelog) if changelog else None
+    entry = report.changelog_entry() if report else None
+    emptied = report.emptied_partitions if report and incremental else []
+
     logger.info(f"Reading split definition from: {csv_json_path}")
     with open(csv_json_path, "r", encoding="utf-8") as f:
         csv_paths = json.load(f)
 
-    metadata = load_metadata(metadata_path) if metadata_path else None
+    cache = StageCache()
+    decision = cache.check(
+        "build",
+        output_dir,
+        inputs=[*csv_paths.values(), *([metadata_path] if metadata_path else [])],
+        options={
+            "dataset_name": dataset_name,
+            "splits": csv_paths,
+            "format": output_format,
+            "partition_by": partition_by,
+            "incremental": incremental,
+            "csv_engine": csv_engine,
+            **({"sample": [sample, sample_frac, sample_seed]} if sample or sample_frac else {}),
+            **({"changelog": entry} if entry else {}),
+            **({"removed_partitions": emptied} if emptied else {}),
+        },
+        force=force,
+    )
+    if decision.fresh:
+        typer.echo(f"⏭️ Repository {output_dir} is up to date; skipping (use --force to rebuild).")
+        return
+
+    registry = DatasetRegistry()
+    metadata = registry.load(metadata_path) if metadata_path else None
     logger.info(f"Building dataset repository for: {dataset_name}")
-    build_repository(csv_paths=csv_paths, dataset_name=dataset_name, output_dir=output_dir, metadata=metadata)
+    build_repository(
+        csv_paths=csv_paths,
+        dataset_name=dataset_name,
+        output_dir=output_dir,
+        metadata=metadata,
+        output_format=output_format,
+        partition_by=parse_partition_by(partition_by),
+        max_open_files=max_open_files,
+        incremental=incremental,
+        csv_engine=csv_engine,
+        max_memory=MEMORY_BUDGET.limit_bytes,
+        sample_size=sample,
+        sample_fraction=sample_frac,
+        sample_seed=sample_seed,
+        changelog=entry,
+        removed_partitions=emptied,
+    )
+    cache.record(decision, [output_dir])
+    if metadata_path:
+        registry.record_build(metadata_path, output_dir, decision.key)
 
     typer.echo("✅ Dataset repository prepared.")
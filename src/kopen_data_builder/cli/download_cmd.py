@@ -4,7 +4,15 @@ from pathlib import Path
 
 import typer
 
-from kopen_data_builder.core.downloader import download_data
+from kopen_data_builder.core.downloader import (
+    DEFAULT_DOWNLOAD_WORKERS,
+    DEFAULT_RETRIES,
+    DownloadCache,
+    cached_download,
+    download_data,
+    download_many,
+    load_download_manifest,
+)
 
 app = typer.Typer(help="Download data from a given URL to a local file path.")
 
@@ -14,9 +22,15 @@ def run(
     url: str = typer.Argument(..., help="The URL to download from"),
     output: str = typer.Argument(..., help="Where to save the downloaded file"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
+    resume: bool = typer.Option(True, "--resume/--no-resume", help="Continue an interrupted download (default)."),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Revalidate against the download cache (default)."),
+    cache_dir: str = typer.Option(None, help="Download cache directory (default: ~/.cache/kopen-data-builder)."),
 ) -> None:
     """
     Download data from the given URL and save it to the specified local path.
+
+    The file is streamed to disk; rerun the same command to resume an interrupted download.
+    With the cache enabled, an unchanged file (HTTP 304) is restored from the cache.
     """
     try:
         output_path = Path(output)
@@ -25,9 +39,62 @@ def run(
             typer.echo(f"🌐 Downloading from: {url}")
             typer.echo(f"💾 Saving to: {output_path}")
 
-        download_data(url, output_path)
+        if cache:
+            cached = cached_download(url, output_path, DownloadCache(cache_dir), resume=resume)
+            if not cached.changed:
+                typer.echo(f"✅ Unchanged since the last download ({cached.sha256[:12]}).")
+                return
+            stats = cached.stats
+        else:
+            stats = download_data(url, output_path, resume=resume)
 
-        typer.echo("✅ Download completed successfully.")
+        resumed = f", resumed at {stats.resumed_from / 1024**2:.1f} MB" if stats.resumed_from else ""
+        typer.echo(
+            f"✅ Download completed successfully "
+            f"({stats.bytes / 1024**2:.1f} MB in {stats.seconds:.1f}s, {stats.mb_per_second:.1f} MB/s{resumed})."
+        )
     except Exception as e:
         typer.echo(f"❌ Error: {e}", err=True)
         raise typer.Exit(code=1) from e
+
+
+@app.command("batch")
+def batch(
+    manifest: str = typer.Argument(..., help="YAML manifest listing the files to download"),
+    output_dir: str = typer.Option(None, help="Directory for the downloads (default: manifest 'output_dir')."),
+    workers: int = typer.Option(DEFAULT_DOWNLOAD_WORKERS, help="Total concurrent downloads."),
+    retries: int = typer.Option(DEFAULT_RETRIES, help="Retries per file with exponential backoff."),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Revalidate against the download cache (default)."),
+    cache_dir: str = typer.Option(None, help="Download cache directory (default: ~/.cache/kopen-data-builder)."),
+) -> None:
+    """
+    Download every file listed in a manifest concurrently, with per-host limits.
+
+    Example:
+    $ kopen download batch manifest.yaml --workers 16
+    """
+    try:
+        jobs, hosts, defaults = load_download_manifest(manifest, output_dir=output_dir)
+    except (OSError, ValueError) as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        raise typer.Exit(code=1) from e
+
+    results = download_many(
+        jobs,
+        max_workers=workers,
+        host_limits=hosts,
+        default_limits=defaults,
+        retries=retries,
+        cache=DownloadCache(cache_dir) if cache else None,
+    )
+    failed = [r for r in results if not r.ok]
+    for result in failed:
+        typer.echo(f"❌ {result.url}: {result.error}", err=True)
+    received = sum(r.stats.bytes for r in results if r.stats is not None)
+    unchanged = sum(r.ok and not r.changed for r in results)
+    typer.echo(
+        f"✅ Downloaded {len(results) - len(failed)}/{len(results)} files "
+        f"({received / 1024**2:.1f} MB, {unchanged} unchanged)."
+    )
+    if failed:
+        raise typer.Exit(code=1)
@@ -0,0 +1,59 @@
+# src/kopen_data_builder/cli/inspect_cmd.py
+
+"""
+Inspect CLI: Report row counts, sizes and CSV dialect without parsing the table.
+
+Useful for choosing `size_categories` in metadata.yaml, picking chunk sizes,
+or sanity-checking inputs before a build.
+"""
+
+import json
+import logging
+from dataclasses import asdict
+from typing import List
+
+import typer
+
+from kopen_data_builder.core.io import inspect_table
+
+app = typer.Typer(help="Inspect CSV files (row count, size, encoding, delimiter, header) without loading them.")
+logger = logging.getLogger(__name__)
+
+
+@app.command("run")
+def run(
+    paths: List[str] = typer.Argument(..., help="CSV files to inspect"),  # noqa: B008
+    sample_bytes: int = typer.Option(
+        None,
+        help="Estimate row counts from this many sampled bytes instead of scanning whole files.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print one JSON object per file."),
+) -> None:
+    """
+    Inspect one or more CSV files.
+
+    Example:
+    $ kopen inspect run data.csv
+    $ kopen inspect run big.csv --sample-bytes 10000000 --json
+    """
+    for path in paths:
+        try:
+            stats = inspect_table(path, sample_bytes=sample_bytes)
+        except (OSError, ValueError) as e:
+            typer.echo(f"❌ {path}: {e}", err=True)
+            raise typer.Exit(code=1) from e
+
+        if as_json:
+            record = asdict(stats)
+            record["size_category"] = stats.size_category.value
+            typer.echo(json.dumps(record, ensure_ascii=False))
+            continue
+
+        approx = "" if stats.exact else "~"
+        typer.echo(f"📄 {stats.path}")
+        typer.echo(f"  rows:           {approx}{stats.rows:,}")
+        typer.echo(f"  size:           {stats.size_bytes:,} bytes")
+        typer.echo(f"  size_category:  {stats.size_category.value}")
+        typer.echo(f"  encoding:       {stats.encoding}")
+        typer.echo(f"  delimiter:      {stats.delimiter!r}")
+        typer.echo(f"  header:         {', '.join(stats.header)}")
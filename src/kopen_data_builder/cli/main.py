@@ -1,19 +1,76 @@
 # src/kopen_data_builder/cli/main.py
 
+import importlib
 import logging
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 
 import typer
+import typer.main
+from typer.core import TyperCommand, TyperGroup
 
-from kopen_data_builder.cli import (
-    build_cmd,
-    download_cmd,
-    metadata_cmd,
-    preprocess_cmd,
-    split_cmd,
-    upload_cmd,
-)
+from kopen_data_builder.core.memory import MEMORY_BUDGET, parse_memory_size
+from kopen_data_builder.core.metrics import METRICS, Profiler
 
-app = typer.Typer(help="Korean Public Data Builder CLI")
+# Subcommand name -> (module defining its ``app``, help shown in the root listing).
+# Modules are imported only when their command runs, so startup and ``--help`` do
+# not pay for pandas, huggingface_hub, scikit-learn and friends.
+SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "metadata": ("kopen_data_builder.cli.metadata_cmd", "Manage dataset metadata files."),
+    "preprocess": (
+        "kopen_data_builder.cli.preprocess_cmd",
+        "Preprocess and clean raw CSV data before transformation.",
+    ),
+    "split": ("kopen_data_builder.cli.split_cmd", "Split and merge datasets using defined rules or input files."),
+    "upload": ("kopen_data_builder.cli.upload_cmd", "Upload prepared dataset to Hugging Face and verify upload."),
+    "download": ("kopen_data_builder.cli.download_cmd", "Download data from a given URL to a local file path."),
+    "build": ("kopen_data_builder.cli.build_cmd", "Build Hugging Face-compatible dataset structure."),
+    "inspect": (
+        "kopen_data_builder.cli.inspect_cmd",
+        "Inspect CSV files (row count, size, encoding, delimiter, header) without loading them.",
+    ),
+    "fetch": (
+        "kopen_data_builder.cli.fetch_cmd",
+        "Fetch paginated open-data APIs (data.go.kr, Seoul Open Data) into CSV.",
+    ),
+    "batch": ("kopen_data_builder.cli.batch_cmd", "Run many dataset pipelines defined in YAML files."),
+    "stages": ("kopen_data_builder.cli.stages_cmd", "Explain or reset cached pipeline stages."),
+    "diff": ("kopen_data_builder.cli.diff_cmd", "Compare two releases of a dataset row by row."),
+    "convert": ("kopen_data_builder.cli.convert_cmd", "Convert raw files between formats and encodings."),
+    "registry": ("kopen_data_builder.cli.registry_cmd", "Index and query dataset metadata files."),
+}
+
+
+class LazyCommand(TyperCommand):
+    """Placeholder listed under the root group; imports the real command group when it is run."""
+
+    def __init__(self, name: str, module: str, help: str):
+        super().__init__(name=name, help=help)
+        self.module = module
+        self._loaded: Optional[Any] = None
+
+    def load(self) -> Any:
+        """Import the subcommand module and build its command group."""
+        if self._loaded is None:
+            group = typer.main.get_group(importlib.import_module(self.module).app)
+            group.name = self.name
+            self._loaded = group
+        return self._loaded
+
+    def make_context(self, info_name: Optional[str], args: List[str], parent: Any = None, **extra: Any) -> Any:
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+
+class LazyGroup(TyperGroup):
+    """Root command group whose subcommands are registered by name and loaded on first use."""
+
+    def __init__(self, **attrs: Any):
+        super().__init__(**attrs)
+        for name, (module, help_text) in SUBCOMMANDS.items():
+            self.add_command(LazyCommand(name, module, help_text))
+
+
+app = typer.Typer(cls=LazyGroup, help="Korean Public Data Builder CLI")
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -30,23 +87,56 @@ def setup_logging(verbose: bool = False) -> None:
     logging.debug("🔍 Verbose logging enabled.")
 
 
+def _report_metrics(output_format: Optional[str]) -> None:
+    METRICS.finish()
+    if METRICS.sink is not None and METRICS.sink is not sys.stderr:
+        METRICS.sink.close()
+    METRICS.sink = None
+    if output_format == "table":
+        typer.echo(METRICS.format_table(), err=True)
+
+
 @app.callback()
-def main(verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose (debug) logging")) -> None:
+def main(
+    ctx: typer.Context,
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose (debug) logging"),
+    metrics: str = typer.Option(None, help="Report stage timings, rows, bytes and peak RSS: 'table' or 'jsonl'."),
+    metrics_file: str = typer.Option(None, help="Append stage metrics as JSON lines to this file."),
+    profile: bool = typer.Option(False, "--profile", help="Profile the command with cProfile and tracemalloc."),
+    profile_output: str = typer.Option("kopen-profile", help="Path prefix for --profile output files."),
+    max_memory: str = typer.Option(
+        None, help="Memory budget, e.g. 4GB: size chunks to it and spill dedup/split state to disk."
+    ),
+) -> None:
     """
     Korean Public Data Builder CLI
 
     Use this CLI to validate, preprocess, split, and upload datasets to Hugging Face.
+
+    Example:
+    $ kopen --metrics table split split --input-csv data.csv --split-json rules.json --output-dir ./splits
+    $ kopen --profile --profile-output ./build-profile build run ...
+    $ kopen --max-memory 4GB split split --input-csv big.csv --split-json rules.json --output-dir ./splits
     """
     setup_logging(verbose)
+    try:
+        MEMORY_BUDGET.limit_bytes = parse_memory_size(max_memory) if max_memory else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--max-memory") from e
+    if metrics not in (None, "table", "jsonl"):
+        raise typer.BadParameter("Expected 'table' or 'jsonl'", param_hint="--metrics")
+    if metrics or metrics_file:
+        # JSON lines stream to the file, or to stderr for --metrics jsonl, as each stage finishes.
+        METRICS.sink = open(metrics_file, "a", encoding="utf-8") if metrics_file else None
+        if metrics == "jsonl" and METRICS.sink is None:
+            METRICS.sink = sys.stderr
+        ctx.call_on_close(lambda: _report_metrics(metrics))
+    if profile:
+        profiler = Profiler(profile_output)
+        profiler.start()
+        # Close callbacks run last-in first-out: profiling stops before metrics are reported.
+        ctx.call_on_close(lambda: typer.echo(profiler.stop(), err=True))
 
 
-# Register subcommands
-app.add_typer(metadata_cmd.app, name="metadata")
-app.add_typer(preprocess_cmd.app, name="preprocess")
-app.add_typer(split_cmd.app, name="split")
-app.add_typer(upload_cmd.app, name="upload")
-app.add_typer(download_cmd.app, name="download")
-app.add_typer(build_cmd.app, name="build")
-
 if __name__ == "__main__":
     app()
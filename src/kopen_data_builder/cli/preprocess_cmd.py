@@ -8,12 +8,19 @@ using built-in cleaning utilities before further transformation or upload.
 """
 
 import logging
+from pathlib import Path
 
 import typer
 from typer import Option
 
-from kopen_data_builder.core.io import read_table, write_csv
-from kopen_data_builder.core.preprocessing import preprocess_data
+from kopen_data_builder.core.frame import scan
+from kopen_data_builder.core.memory import MEMORY_BUDGET
+from kopen_data_builder.core.sampling import (
+    DEFAULT_SEED,
+    check_sample_options,
+    clear_sample_marker,
+    write_sample_marker,
+)
 
 # Create a Typer app for the "preprocess" command group
 app = typer.Typer(help="Preprocess and clean raw CSV data before transformation.")
@@ -27,7 +34,7 @@ def run(
     input_csv: str = Option(
         None,
         prompt="📥 Enter the path to the input CSV file",
-        help="Path to the raw input CSV file",
+        help="Path or http(s) URL of the raw input: CSV, Excel, XML, JSON or JSON Lines (may be gzip/zip compressed)",
     ),
     output_csv: str = Option(
         None,
@@ -42,31 +49,59 @@ def run(
         None,
         help="CSV encoding override (optional).",
     ),
+    output_encoding: str = Option("utf-8", help="Encoding of the cleaned CSV (e.g. utf-8, utf-8-sig, cp949)."),
+    csv_engine: str = Option("pandas", help="CSV writer engine: 'pandas', 'chunked' or 'arrow' (fastest)."),
+    cache: bool = Option(False, "--cache/--no-cache", help="Keep a copy of URL inputs in the download cache."),
+    sample: int = Option(None, help="Preview on N random rows (reservoir sampling); the output is marked as a sample."),
+    sample_frac: float = Option(None, help="Preview on this fraction of rows (Bernoulli sampling, fastest)."),
+    sample_seed: int = Option(DEFAULT_SEED, help="Seed for --sample / --sample-frac."),
 ) -> None:
     """
     Preprocess a CSV file and save the cleaned version.
 
-    This function loads a CSV file, applies standard cleaning rules using
+    This function scans a CSV file, applies standard cleaning rules using
     `preprocess_data`, and writes the result to the specified output path.
 
+    A URL input is streamed: chunks are cleaned and written while the rest of the
+    file is still downloading. Under ``kopen --max-memory`` local inputs are streamed
+    too, in chunks sized to the budget; date columns are then detected on the first chunk.
+    With ``--sample`` or ``--sample-frac`` the input is streamed once and only a random
+    sample is cleaned; ``<output>.sample.json`` marks the output as a sample.
+
     Example:
         $ kopen preprocess run --input-csv raw.csv --output-csv clean.csv
+        $ kopen preprocess run --input-csv https://example.org/raw.csv.gz --output-csv clean.csv
+        $ kopen preprocess run --input-csv huge.csv --output-csv preview.csv --sample 10000
 
     Args:
         input_csv (str): Path to the raw input CSV file.
         output_csv (str): Path where the cleaned CSV will be saved.
     """
-    # 1. Load the input CSV file into a DataFrame
-    logger.info("Loading data from: %s", input_csv)
-    df = read_table(input_csv, encoding=encoding, sheet_name=sheet_name)
-
-    # 2. Apply preprocessing (clean column names, strip strings, convert dates)
-    logger.info("Preprocessing data...")
-    cleaned = preprocess_data(df)
+    sampling = sample is not None or sample_frac is not None
+    try:
+        check_sample_options(sample, sample_frac)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--sample/--sample-frac") from e
 
-    # 3. Save the cleaned DataFrame to the output CSV path
-    logger.info("Saving cleaned data to: %s", output_csv)
-    write_csv(cleaned, output_csv)
+    max_memory = MEMORY_BUDGET.limit_bytes
+    if input_csv.startswith(("http://", "https://")) or max_memory is not None or sampling:
+        logger.info("Streaming and preprocessing: %s", input_csv)
+        frame = scan(input_csv, encoding=encoding, sheet_name=sheet_name, cache=cache, max_memory=max_memory)
+        if sampling:
+            frame = frame.sample(sample, sample_frac, sample_seed)
+        rows = frame.preprocess().to_csv(output_csv, encoding=output_encoding)
+        report = frame.sample_report
+        if report is not None:
+            write_sample_marker(Path(output_csv), report.as_dict(), input_csv)
+            typer.echo(f"⚠️ SAMPLE: {report.describe()}")
+        else:
+            clear_sample_marker(Path(output_csv))
+        typer.echo(f"✅ Preprocessed {rows} rows saved to: {output_csv}")
+        return
 
-    # 4. Provide confirmation to the user
+    # Local files are cleaned as one table so date columns are detected on every row.
+    logger.info("Preprocessing data from: %s", input_csv)
+    frame = scan(input_csv, encoding=encoding, sheet_name=sheet_name, chunk_rows=None).preprocess()
+    frame.to_csv(output_csv, encoding=output_encoding, engine=csv_engine)
+    clear_sample_marker(Path(output_csv))
     typer.echo(f"✅ Preprocessed data saved to: {output_csv}")
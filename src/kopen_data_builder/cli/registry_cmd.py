@@ -0,0 +1,98 @@
+# src/kopen_data_builder/cli/registry_cmd.py
+
+"""
+Registry CLI: Index many metadata.yaml files and query them without re-reading the YAML.
+
+Builds and uploads of datasets with metadata are recorded automatically, so the
+registry also knows which datasets are due for a refresh or still await an upload.
+"""
+
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Optional
+
+import typer
+
+from kopen_data_builder.registry import DatasetRegistry
+
+app = typer.Typer(help="Index and query dataset metadata files.")
+logger = logging.getLogger(__name__)
+
+
+def _when(timestamp: Optional[float]) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M") if timestamp else "never"
+
+
+@app.command("scan")
+def scan(
+    paths: List[str] = typer.Argument(  # noqa: B008
+        ..., help="Metadata files or directories to search for metadata.yaml."
+    ),
+    prune: bool = typer.Option(False, "--prune", help="Forget entries whose metadata file was deleted."),
+    state_db: str = typer.Option(None, help="State database (default: $KOPEN_STATE_DB or the cache dir)."),
+) -> None:
+    """
+    Index metadata files; only new or changed files are parsed and validated.
+
+    Example:
+    $ kopen registry scan ./datasets --prune
+    """
+    try:
+        stats = DatasetRegistry(state_db).index(paths, prune=prune)
+    except OSError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        raise typer.Exit(code=1) from e
+    for path in stats.invalid:
+        typer.echo(f"⚠️ Invalid metadata: {path}", err=True)
+    typer.echo(
+        f"✅ Indexed {stats.unchanged + stats.revalidated} metadata file(s): {stats.revalidated} revalidated, "
+        f"{stats.unchanged} unchanged, {len(stats.invalid)} invalid, {stats.removed} removed."
+    )
+
+
+@app.command("list")
+def list_datasets(
+    frequency: str = typer.Option(None, help="Update frequency, e.g. Monthly or 월간."),
+    agency: str = typer.Option(None, help="Source agency, in English or Korean."),
+    tag: List[str] = typer.Option(None, help="Required tag; repeat for several."),  # noqa: B008
+    license: str = typer.Option(None, help="License identifier, e.g. cc-by-4.0."),
+    due: bool = typer.Option(False, "--due", help="Only datasets due for refresh (or never built)."),
+    invalid: bool = typer.Option(False, "--invalid", help="Include metadata files that failed validation."),
+    as_json: bool = typer.Option(False, "--json", help="Print the entries as JSON."),
+    state_db: str = typer.Option(None, help="State database (default: $KOPEN_STATE_DB or the cache dir)."),
+) -> None:
+    """
+    List indexed datasets matching all given filters.
+
+    Example:
+    $ kopen registry list --frequency Monthly --agency 서울열림데이터광장 --due
+    $ kopen registry list --tag transportation --json
+    """
+    try:
+        entries = DatasetRegistry(state_db).find(
+            frequency=frequency, agency=agency, tags=tag or (), license=license, due=due, include_invalid=invalid
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--frequency") from e
+
+    if as_json:
+        payload = [
+            {**asdict(entry), "due": entry.is_due(), "upload_pending": entry.upload_pending} for entry in entries
+        ]
+        typer.echo(json.dumps(payload, ensure_ascii=False, indent=2))
+        return
+    if not entries:
+        typer.echo("No matching datasets.")
+        return
+    for entry in entries:
+        if not entry.valid:
+            typer.echo(f"❌ {entry.path}: {entry.error}")
+            continue
+        flags = [flag for flag, on in (("due", entry.is_due()), ("upload pending", entry.upload_pending)) if on]
+        typer.echo(f"{'🔄' if flags else '✅'} {entry.pretty_name} [{entry.update_frequency}] {entry.agency_ko}")
+        typer.echo(f"  {entry.path}")
+        typer.echo(
+            f"  built {_when(entry.built_at)}, uploaded {_when(entry.uploaded_at)}{''.join(f'; {f}' for f in flags)}"
+        )
@@ -14,7 +14,18 @@ from pathlib import Path
 import pandas as pd
 import typer
 
-from kopen_data_builder.core.splitter import merge_datasets, split_dataset
+from kopen_data_builder.core.frame import scan
+from kopen_data_builder.core.io import CSV_CHUNK_ROWS, write_csv
+from kopen_data_builder.core.memory import MEMORY_BUDGET
+from kopen_data_builder.core.partitioning import DEFAULT_MAX_OPEN_FILES, parse_partition_by
+from kopen_data_builder.core.sampling import (
+    DEFAULT_SEED,
+    check_sample_options,
+    clear_sample_marker,
+    write_sample_marker,
+)
+from kopen_data_builder.core.splitter import merge_datasets
+from kopen_data_builder.core.stage_cache import StageCache
 
 app = typer.Typer(help="Split and merge datasets using defined rules or input files.")
 logger = logging.getLogger(__name__)
@@ -37,29 +48,95 @@ def split(
         prompt="📁 Enter directory to save split files",
         help="Directory where the split CSV files will be saved",
     ),
+    output_format: str = typer.Option("csv", "--format", help="Split file format: 'csv' or 'parquet'."),
+    partition_by: str = typer.Option(
+        None,
+        help="Comma-separated partition columns; use 'col:year', 'col:month' or 'col:day' to derive date parts.",
+    ),
+    max_open_files: int = typer.Option(DEFAULT_MAX_OPEN_FILES, help="Maximum files held open by partition writers."),
+    output_encoding: str = typer.Option("utf-8", help="Encoding of CSV outputs (e.g. utf-8, utf-8-sig, cp949)."),
+    csv_engine: str = typer.Option("pandas", help="CSV writer engine: 'pandas', 'chunked' or 'arrow' (fastest)."),
+    force: bool = typer.Option(False, "--force", help="Re-split even if inputs and options are unchanged."),
+    sample: int = typer.Option(
+        None, help="Preview on N random rows (reservoir sampling); the output is marked as a sample."
+    ),
+    sample_frac: float = typer.Option(None, help="Preview on this fraction of rows (Bernoulli sampling, fastest)."),
+    sample_seed: int = typer.Option(DEFAULT_SEED, help="Seed for --sample / --sample-frac."),
 ) -> None:
     """
     Split a CSV dataset using rules from a JSON file.
 
+    The split is skipped when the input CSV, the rules, the options and the tool
+    version match the last run and its outputs are untouched (see ``kopen stages explain``).
+    Under ``kopen --max-memory`` the input is streamed and shuffled through temporary
+    files, so the split sizes match but rows may land in a different split.
+    With ``--sample`` or ``--sample-frac`` only a random sample of the input is split,
+    and ``<output-dir>/sample.json`` marks the splits as a sample.
+
     Example:
     $ kopen split split --input-csv data.csv --split-json rules.json --output-dir ./splits
+    $ kopen split split ... --format parquet --partition-by reg_date:year,reg_date:month
+    $ kopen split split ... --sample-frac 0.01
     """
-    logger.info(f"Loading dataset from {input_csv}")
-    df = pd.read_csv(input_csv)
+    if output_format not in ("csv", "parquet"):
+        raise typer.BadParameter(f"Unsupported format '{output_format}'", param_hint="--format")
+    sampling = sample is not None or sample_frac is not None
+    try:
+        check_sample_options(sample, sample_frac)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--sample/--sample-frac") from e
+
+    cache = StageCache()
+    decision = cache.check(
+        "split",
+        output_dir,
+        inputs=[input_csv, split_json],
+        options={
+            "format": output_format,
+            "partition_by": partition_by,
+            "output_encoding": output_encoding,
+            "csv_engine": csv_engine,
+            # Streamed splits assign rows differently; only key on the budget when it is set.
+            **({"max_memory": MEMORY_BUDGET.limit_bytes} if MEMORY_BUDGET.enabled else {}),
+            **({"sample": [sample, sample_frac, sample_seed]} if sampling else {}),
+        },
+        force=force,
+    )
+    if decision.fresh:
+        typer.echo(f"⏭️ Splits in {output_dir} are up to date; skipping (use --force to rerun).")
+        return
 
     logger.info(f"Loading split rules from {split_json}")
     with open(split_json, encoding="utf-8") as f:
         rules = json.load(f)
 
-    logger.info("Splitting dataset...")
-    result = split_dataset(df, rules)
-
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    for name, part in result.items():
-        output_path = Path(output_dir) / f"{name}.csv"
-        part.to_csv(output_path, index=False)
-        logger.info(f"Saved {name} split to {output_path}")
-        typer.echo(f"✅ {name} split saved to {output_path}")
+    logger.info(f"Splitting dataset from {input_csv}")
+    partitions = parse_partition_by(partition_by)
+    # A sample is drawn while streaming; otherwise the input is read as one table.
+    frame = scan(input_csv, chunk_rows=None if not sampling else CSV_CHUNK_ROWS, max_memory=MEMORY_BUDGET.limit_bytes)
+    if sampling:
+        frame = frame.sample(sample, sample_frac, sample_seed)
+    outputs = frame.split(rules).to_dir(
+        output_dir,
+        output_format=output_format,
+        partition_by=partitions,
+        encoding=output_encoding,
+        csv_engine=csv_engine,
+        max_open_files=max_open_files,
+    )
+    written = list(outputs.values())
+    report = frame.sample_report
+    if report is not None:
+        written.append(write_sample_marker(Path(output_dir), report.as_dict(), input_csv))
+        typer.echo(f"⚠️ SAMPLE: {report.describe()}")
+    else:
+        clear_sample_marker(Path(output_dir))
+    cache.record(decision, written)
+
+    # A 'col:part' spec partitions by the derived 'part' column.
+    suffix = f" (partitioned by {', '.join(spec.split(':')[-1] for spec in partitions)})" if partitions else ""
+    for name, path in outputs.items():
+        typer.echo(f"✅ {name} split saved to {path}{suffix}")
 
 
 @app.command()
@@ -74,6 +151,8 @@ def merge(
         prompt="📤 Enter path to save merged CSV",
         help="Path to output CSV file for merged result",
     ),
+    output_encoding: str = typer.Option("utf-8", help="Encoding of the merged CSV (e.g. utf-8, utf-8-sig, cp949)."),
+    csv_engine: str = typer.Option("pandas", help="CSV writer engine: 'pandas', 'chunked' or 'arrow' (fastest)."),
 ) -> None:
     """
     Merge multiple CSV files into a single dataset.
@@ -86,7 +165,7 @@ def merge(
     dfs = [pd.read_csv(p) for p in paths]
 
     merged = merge_datasets(dfs)
-    merged.to_csv(output_csv, index=False)
+    write_csv(merged, output_csv, encoding=output_encoding, engine=csv_engine)
 
     logger.info(f"Merged dataset saved to: {output_csv}")
     typer.echo(f"✅ Merged dataset saved to: {output_csv}")
@@ -0,0 +1,61 @@
+# src/kopen_data_builder/cli/stages_cmd.py
+
+"""
+Stages CLI: Inspect the stage cache that lets split, build and batch runs skip unchanged work.
+"""
+
+import logging
+from datetime import datetime
+
+import typer
+
+from kopen_data_builder.core.stage_cache import StageCache
+
+app = typer.Typer(help="Explain or reset cached pipeline stages.")
+logger = logging.getLogger(__name__)
+
+
+def _when(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@app.command("explain")
+def explain(
+    target: str = typer.Argument(None, help="Output directory of the stage (optional)."),
+    stage: str = typer.Option(None, help="Only show this stage: 'split', 'build' or 'pipeline'."),
+    state_db: str = typer.Option(None, help="State database (default: $KOPEN_STATE_DB or the cache dir)."),
+) -> None:
+    """
+    Show when each stage last ran, why it ran, and whether it was skipped since.
+
+    Example:
+    $ kopen stages explain ./hf_repo
+    $ kopen stages explain --stage split
+    """
+    records = StageCache(state_db).explain(stage=stage, target=target)
+    if not records:
+        typer.echo("No stage runs recorded.")
+        return
+    for record in records:
+        typer.echo(f"{record.stage} → {record.target}")
+        typer.echo(f"  ran {_when(record.ran_at)} (version {record.version}) because:")
+        for reason in record.reasons:
+            typer.echo(f"    - {reason}")
+        if record.last_action == "skipped":
+            typer.echo(f"  skipped {_when(record.checked_at)}: inputs, options and outputs unchanged")
+
+
+@app.command("clear")
+def clear(
+    target: str = typer.Argument(None, help="Output directory of the stage (optional)."),
+    stage: str = typer.Option(None, help="Only forget this stage."),
+    state_db: str = typer.Option(None, help="State database (default: $KOPEN_STATE_DB or the cache dir)."),
+) -> None:
+    """
+    Forget recorded stage runs so they run again.
+
+    Example:
+    $ kopen stages clear --stage build
+    """
+    removed = StageCache(state_db).forget(stage=stage, target=target)
+    typer.echo(f"✅ Forgot {removed} stage run(s).")
@@ -7,10 +7,21 @@ It requires the dataset to be in a Hugging Face-compatible format.
 """
 
 import logging
+from pathlib import Path
 
 import typer
+import yaml
 
-from kopen_data_builder.core.uploader import upload_to_hf, verify_upload
+from kopen_data_builder.core.uploader import (
+    DEFAULT_BATCH_BYTES,
+    DEFAULT_BATCH_FILES,
+    HubSession,
+    publish_many,
+    upload_in_batches,
+    upload_to_hf,
+    verify_upload,
+)
+from kopen_data_builder.registry import DatasetRegistry
 
 app = typer.Typer(help="Upload prepared dataset to Hugging Face and verify upload.")
 logger = logging.getLogger(__name__)
@@ -30,18 +41,145 @@ def run(
     ),
     token: str | None = typer.Option(None, help="Hugging Face access token (optional)."),
     private: bool | None = typer.Option(None, help="Create repository as private (optional)."),
+    delta: bool = typer.Option(
+        True, "--delta/--full", help="Upload only files that differ from the remote repository (default)."
+    ),
+    workers: int = typer.Option(None, help="Threads used to hash local files (optional)."),
+    delete_remote: bool = typer.Option(
+        False, "--delete-remote", help="Also delete remote files that are absent locally (kept by default)."
+    ),
 ) -> None:
     """
     Upload the dataset directory to Hugging Face Hub and verify the result.
 
+    Remote files that are not in the local directory (e.g. added on the Hub by hand) are
+    kept and listed in the log unless ``--delete-remote`` is given.
+
     Example:
     $ kopen upload run --repo-dir ./my_dataset_repo --repo-id username/dataset-name
+    $ kopen upload run --repo-dir ./my_dataset_repo --repo-id username/dataset-name --delete-remote
 
     Args:
         repo_dir (str): Path to the Hugging Face dataset directory to upload.
         repo_id (str): The repository ID on Hugging Face where the dataset will be uploaded.
     """
     logger.info(f"Uploading dataset from: {repo_dir} to repo: {repo_id}")
-    upload_to_hf(repo_dir, repo_id, token=token, private=private)
-    verify_upload(repo_id, token=token)
+    session = HubSession(token=token)
+    upload_to_hf(
+        repo_dir,
+        repo_id,
+        private=private,
+        delta=delta,
+        max_workers=workers,
+        session=session,
+        delete_remote=delete_remote,
+    )
+    if not verify_upload(repo_id, repo_dir=repo_dir, session=session):
+        typer.echo("❌ Verification failed: remote files are missing or differ from the local repository.", err=True)
+        raise typer.Exit(code=1)
+    DatasetRegistry().record_upload(repo_dir, repo_id)
+    typer.echo("✅ Dataset successfully uploaded and verified.")
+
+
+@app.command("large")
+def large(
+    repo_dir: str = typer.Option(
+        None,
+        prompt="📁 Enter the path to the Hugging Face dataset directory",
+        help="Path to the prepared Hugging Face dataset directory.",
+    ),
+    repo_id: str = typer.Option(
+        None,
+        prompt="📦 Enter the Hugging Face repository ID (e.g., username/dataset-name)",
+        help="Target repository ID on Hugging Face (e.g., username/dataset-name).",
+    ),
+    token: str | None = typer.Option(None, help="Hugging Face access token (optional)."),
+    private: bool | None = typer.Option(None, help="Create repository as private (optional)."),
+    workers: int = typer.Option(4, help="Concurrent LFS uploads and hashing threads."),
+    max_batch_mb: int = typer.Option(DEFAULT_BATCH_BYTES // 1024**2, help="Maximum megabytes per commit."),
+    max_batch_files: int = typer.Option(DEFAULT_BATCH_FILES, help="Maximum files per commit."),
+    delete_remote: bool = typer.Option(
+        False, "--delete-remote", help="Also delete remote files that are absent locally (kept by default)."
+    ),
+) -> None:
+    """
+    Upload a large dataset directory in resumable, size-bounded commit batches.
+
+    Progress is saved after every commit; rerun the same command to resume after a failure.
+
+    Example:
+    $ kopen upload large --repo-dir ./big_repo --repo-id username/big-dataset --workers 8
+    """
+    logger.info(f"Uploading dataset from: {repo_dir} to repo: {repo_id} in batches")
+    session = HubSession(token=token)
+    stats = upload_in_batches(
+        repo_dir,
+        repo_id,
+        private=private,
+        num_workers=workers,
+        max_batch_bytes=max_batch_mb * 1024**2,
+        max_batch_files=max_batch_files,
+        session=session,
+        delete_remote=delete_remote,
+    )
+    typer.echo(
+        f"📦 Uploaded {stats.files} files in {stats.commits} commits "
+        f"({stats.mb_per_second:.1f} MB/s, {stats.files_per_second:.1f} files/s, {stats.skipped} skipped)"
+    )
+    if not verify_upload(repo_id, repo_dir=repo_dir, session=session):
+        typer.echo("❌ Verification failed: remote files are missing or differ from the local repository.", err=True)
+        raise typer.Exit(code=1)
+    DatasetRegistry().record_upload(repo_dir, repo_id)
     typer.echo("✅ Dataset successfully uploaded and verified.")
+
+
+@app.command("batch")
+def batch(
+    jobs_file: str = typer.Argument(..., help="YAML/JSON file mapping repo IDs to local directories."),
+    token: str | None = typer.Option(None, help="Hugging Face access token (optional)."),
+    private: bool | None = typer.Option(None, help="Create missing repositories as private (optional)."),
+    delta: bool = typer.Option(
+        True, "--delta/--full", help="Upload only files that differ from the remote repository (default)."
+    ),
+    verify: bool = typer.Option(True, "--verify/--no-verify", help="Verify every repository after uploading it."),
+    workers: int = typer.Option(None, help="Threads used to hash local files (optional)."),
+    delete_remote: bool = typer.Option(
+        False, "--delete-remote", help="Also delete remote files that are absent locally (kept by default)."
+    ),
+) -> None:
+    """
+    Publish many dataset repositories over one shared Hub session.
+
+    The jobs file maps each repository ID to its local directory, e.g.
+    ``username/seoul-parking: ./repos/seoul-parking``. Failures are reported per
+    repository and do not stop the remaining uploads.
+
+    Example:
+    $ kopen upload batch jobs.yaml --token $HF_TOKEN
+    """
+    jobs = yaml.safe_load(Path(jobs_file).read_text(encoding="utf-8")) or {}
+    if not isinstance(jobs, dict):
+        typer.echo("❌ The jobs file must map repository IDs to directories.", err=True)
+        raise typer.Exit(code=1)
+
+    results = publish_many(
+        {str(k): str(v) for k, v in jobs.items()},
+        token=token,
+        private=private,
+        delta=delta,
+        verify=verify,
+        max_workers=workers,
+        delete_remote=delete_remote,
+    )
+    registry = DatasetRegistry()
+    for result in results:
+        if result.ok:
+            registry.record_upload(result.repo_dir, result.repo_id)
+            typer.echo(f"✅ {result.repo_id}: {result.url}")
+        else:
+            typer.echo(f"❌ {result.repo_id}: {result.error}", err=True)
+
+    failed = sum(not r.ok for r in results)
+    typer.echo(f"📦 Published {len(results) - failed}/{len(results)} repositories.")
+    if failed:
+        raise typer.Exit(code=1)
@@ -0,0 +1,445 @@
+# src/kopen_data_builder/core/batch.py
+
+"""
+Batch module: Runs many dataset pipelines described by per-dataset YAML files.
+Each pipeline downloads its sources, reads, preprocesses and splits the table, builds
+the Hugging Face repository and optionally publishes it. Downloads and uploads run on
+threads in the parent process while preprocess/build work runs in worker processes,
+so the network transfers of one dataset overlap with the CPU work of another. Worker
+processes are admitted against a global memory budget, and a failing dataset only
+stops its own pipeline.
+"""
+
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import yaml
+
+from kopen_data_builder.core.downloader import DownloadCache, DownloadJob, download_many, parse_download_entries
+from kopen_data_builder.core.stage_cache import StageCache
+
+if TYPE_CHECKING:
+    from kopen_data_builder.core.uploader import HubSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPLIT = {"train": 0.8, "test": 0.2}
+DEFAULT_IO_WORKERS = 4
+# Peak memory of read + preprocess + split + build, relative to the input file size.
+MEMORY_PER_INPUT_BYTE = 6
+MIN_DATASET_MEMORY_MB = 64
+# Times a dataset's process stage is resubmitted after its worker pool broke.
+PROCESS_RETRIES = 1
+SUMMARY_STAGES = ("download", "process", "upload", "total")
+PIPELINE_KEYS = {
+    "name",
+    "workdir",
+    "download",
+    "input",
+    "encoding",
+    "sheet_name",
+    "preprocess",
+    "split",
+    "build",
+    "upload",
+    "memory_mb",
+}
+
+
+@dataclass
+class PipelineSpec:
+    """
+    One dataset pipeline, usually loaded from YAML with ``load_pipeline``.
+
+    The repository is built in ``<workdir>/repo``; ``input`` and download outputs are
+    paths inside ``workdir``.
+    """
+
+    name: str
+    workdir: Path
+    input: Path
+    downloads: List[DownloadJob] = field(default_factory=list)
+    encoding: Optional[str] = None
+    sheet_name: Optional[str] = None
+    preprocess: bool = True
+    split: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_SPLIT))
+    output_format: str = "csv"
+    partition_by: List[str] = field(default_factory=list)
+    csv_engine: str = "pandas"
+    metadata_path: Optional[Path] = None
+    repo_id: Optional[str] = None
+    private: Optional[bool] = None
+    memory_mb: Optional[int] = None
+
+    @property
+    def repo_dir(self) -> Path:
+        return self.workdir / "repo"
+
+
+@dataclass
+class ProcessReport:
+    """What the process stage of one dataset produced, returned from the worker process."""
+
+    rows: Optional[int]
+    timings: Dict[str, float]
+    cached: bool = False
+
+
+@dataclass
+class DatasetResult:
+    """Outcome and stage timings (seconds) of one pipeline in ``run_batch``."""
+
+    name: str
+    status: str = "pending"
+    timings: Dict[str, float] = field(default_factory=dict)
+    rows: Optional[int] = None
+    url: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def load_pipeline(path: Union[str, Path]) -> PipelineSpec:
+    """
+    Read a pipeline definition.
+
+    Example::
+
+        name: seoul-bike-rental
+        workdir: ./build/seoul-bike-rental   # default: ./<name> next to this file
+        download:
+          - https://example.org/bike_2024.csv
+        input: bike_2024.csv                 # default: the first download
+        encoding: cp949
+        split: {train: 0.8, test: 0.2}
+        build:
+          format: parquet
+          partition_by: rent_date:year
+          metadata: seoul-bike.metadata.yaml
+        upload:
+          repo_id: my-org/seoul-bike-rental
+          private: false
+        memory_mb: 2048                      # default: estimated from the input size
+
+    Relative ``workdir`` and ``build.metadata`` paths are resolved against the file's
+    directory.
+
+    Raises:
+        ValueError: If the definition is malformed.
+    """
+    path = Path(path)
+    raw: Dict[str, Any] = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"Pipeline {path} must be a mapping")
+    unknown = set(raw) - PIPELINE_KEYS
+    if unknown:
+        raise ValueError(f"Unknown keys in pipeline {path}: {', '.join(sorted(unknown))}")
+
+    name = str(raw.get("name") or path.stem)
+    workdir = path.parent / (raw.get("workdir") or name)
+    downloads = parse_download_entries(raw.get("download") or [], workdir)
+    if raw.get("input"):
+        input_path = workdir / raw["input"]
+    elif downloads:
+        input_path = downloads[0].output_path
+    else:
+        raise ValueError(f"Pipeline {path} needs an 'input' or at least one 'download'")
+
+    build = raw.get("build") or {}
+    upload = raw.get("upload") or {}
+    if not isinstance(build, dict) or not isinstance(upload, dict):
+        raise ValueError(f"'build' and 'upload' in pipeline {path} must be mappings")
+    if upload and not upload.get("repo_id"):
+        raise ValueError(f"'upload' in pipeline {path} needs a 'repo_id'")
+    partition_by = build.get("partition_by") or []
+    if isinstance(partition_by, str):
+        partition_by = [spec.strip() for spec in partition_by.split(",") if spec.strip()]
+
+    return PipelineSpec(
+        name=name,
+        workdir=workdir,
+        input=input_path,
+        downloads=downloads,
+        encoding=raw.get("encoding"),
+        sheet_name=raw.get("sheet_name"),
+        preprocess=bool(raw.get("preprocess", True)),
+        split=dict(raw.get("split") or DEFAULT_SPLIT),
+        output_format=build.get("format", "csv"),
+        partition_by=list(partition_by),
+        csv_engine=build.get("csv_engine", "pandas"),
+        metadata_path=path.parent / build["metadata"] if build.get("metadata") else None,
+        repo_id=upload.get("repo_id"),
+        private=upload.get("private"),
+        memory_mb=raw.get("memory_mb"),
+    )
+
+
+def estimate_memory_mb(spec: PipelineSpec) -> int:
+    """Memory reserved for the process stage: ``memory_mb`` if set, otherwise a multiple of the input size."""
+    if spec.memory_mb:
+        return int(spec.memory_mb)
+    size = spec.input.stat().st_size if spec.input.is_file() else 0
+    return max(MIN_DATASET_MEMORY_MB, size * MEMORY_PER_INPUT_BYTE // 1024**2)
+
+
+def process_dataset(spec: PipelineSpec, force: bool = False) -> ProcessReport:
+    """
+    Read, preprocess, split and build one dataset. Runs in a worker process.
+
+    Skipped when the input, metadata, pipeline options and tool version match the
+    last run recorded in the stage cache and the repository is untouched.
+
+    Returns:
+        ProcessReport: Row count and per-step timings; ``cached`` if the build was reused.
+    """
+    # Imported here so the parent process stays light; workers pay for pandas once.
+    from kopen_data_builder.core.builder import prepare_hf_repository
+    from kopen_data_builder.core.io import read_table
+    from kopen_data_builder.core.preprocessing import preprocess_data
+    from kopen_data_builder.core.splitter import split_dataset
+    from kopen_data_builder.registry import DatasetRegistry
+
+    stage_cache = StageCache()
+    decision = stage_cache.check(
+        "pipeline",
+        spec.repo_dir,
+        inputs=[spec.input, *([spec.metadata_path] if spec.metadata_path else [])],
+        options={
+            "name": spec.name,
+            "encoding": spec.encoding,
+            "sheet_name": spec.sheet_name,
+            "preprocess": spec.preprocess,
+            "split": spec.split,
+            "format": spec.output_format,
+            "partition_by": spec.partition_by,
+            "csv_engine": spec.csv_engine,
+        },
+        force=force,
+    )
+    if decision.fresh:
+        return ProcessReport(rows=None, timings={}, cached=True)
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    df = read_table(str(spec.input), encoding=spec.encoding, sheet_name=spec.sheet_name)
+    timings["read"] = time.perf_counter() - started
+
+    if spec.preprocess:
+        started = time.perf_counter()
+        df = preprocess_data(df)
+        timings["preprocess"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    splits = split_dataset(df, spec.split)
+    timings["split"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    registry = DatasetRegistry()
+    metadata = registry.load(spec.metadata_path) if spec.metadata_path else None
+    prepare_hf_repository(
+        spec.name,
+        splits,
+        str(spec.repo_dir),
+        metadata=metadata,
+        output_format=spec.output_format,
+        partition_by=spec.partition_by,
+        csv_engine=spec.csv_engine,
+    )
+    timings["build"] = time.perf_counter() - started
+    stage_cache.record(decision, [spec.repo_dir])
+    if spec.metadata_path:
+        registry.record_build(spec.metadata_path, spec.repo_dir, decision.key)
+    return ProcessReport(rows=len(df), timings=timings)
+
+
+def _download_stage(spec: PipelineSpec, cache: Optional[DownloadCache]) -> None:
+    results = download_many(spec.downloads, cache=cache)
+    failed = [r for r in results if not r.ok]
+    if failed:
+        raise IOError("; ".join(f"{r.url}: {r.error}" for r in failed))
+
+
+def _upload_stage(spec: PipelineSpec, token: Optional[str], session: "HubSession") -> str:
+    from kopen_data_builder.core.uploader import upload_to_hf, verify_upload
+    from kopen_data_builder.registry import DatasetRegistry
+
+    assert spec.repo_id is not None
+    url: str = upload_to_hf(str(spec.repo_dir), spec.repo_id, token=token, private=spec.private, session=session)
+    if not verify_upload(spec.repo_id, token=token, repo_dir=str(spec.repo_dir), session=session):
+        raise IOError(f"Verification of {spec.repo_id} failed")
+    DatasetRegistry().record_upload(spec.repo_dir, spec.repo_id)
+    return url
+
+
+def run_batch(
+    specs: Sequence[PipelineSpec],
+    workers: Optional[int] = None,
+    memory_budget_mb: Optional[int] = None,
+    io_workers: int = DEFAULT_IO_WORKERS,
+    token: Optional[str] = None,
+    cache: Optional[DownloadCache] = None,
+    session: Optional["HubSession"] = None,
+    force: bool = False,
+) -> List[DatasetResult]:
+    """
+    Run every pipeline through download → process → upload.
+
+    Downloads and uploads share ``io_workers`` threads; process stages run in up to
+    ``workers`` spawned processes. A process stage only starts while the memory
+    reserved by running ones plus its own estimate (see ``estimate_memory_mb``) fits
+    ``memory_budget_mb``; a dataset larger than the whole budget runs alone. Datasets
+    are admitted in input order, so a large one holds back those after it rather than
+    being starved. Any exception fails only the dataset it belongs to. A worker process
+    dying breaks the whole pool, so every process stage in flight is resubmitted to a
+    fresh pool, up to ``PROCESS_RETRIES`` times per dataset; retried datasets run alone
+    so the one that killed its worker cannot take the others down again. Process stages
+    whose inputs and options are unchanged since their last run reuse the existing
+    repository unless ``force`` is set.
+
+    Args:
+        specs (Sequence[PipelineSpec]): Pipelines to run.
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+        memory_budget_mb (int, optional): Memory shared by running process stages. Unlimited if omitted.
+        io_workers (int): Threads for download and upload stages.
+        token (str, optional): Hugging Face token for uploads.
+        cache (DownloadCache, optional): Download cache shared by all pipelines.
+        session (HubSession, optional): Hub session shared by all uploads. Created on first use.
+        force (bool): Rebuild every dataset even if the stage cache says it is up to date.
+
+    Returns:
+        List[DatasetResult]: One result per pipeline, in input order.
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Pipeline names must be unique")
+    workers = max(1, workers or multiprocessing.cpu_count())
+    results = {spec.name: DatasetResult(spec.name) for spec in specs}
+    started_at: Dict[str, float] = {}
+    retries = {spec.name: 0 for spec in specs}
+    waiting: Deque[PipelineSpec] = deque()
+    running: Dict[Future[Any], Tuple[PipelineSpec, str, float, int, Executor]] = {}
+    reserved_mb = 0
+    # Spawned workers do not inherit the parent's download and upload threads.
+    context = multiprocessing.get_context("spawn")
+    io_pool = ThreadPoolExecutor(max_workers=max(1, io_workers), thread_name_prefix="kopen-batch-io")
+    cpu_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    def submit(spec: PipelineSpec, stage: str, executor: Executor, *args: Any, memory_mb: int = 0) -> None:
+        now = time.monotonic()
+        started_at.setdefault(spec.name, now)
+        results[spec.name].status = stage
+        running[executor.submit(*args)] = (spec, stage, now, memory_mb, executor)
+
+    def submit_upload(spec: PipelineSpec) -> None:
+        nonlocal session
+        if session is None:
+            from kopen_data_builder.core.uploader import HubSession
+
+            session = HubSession(token=token)
+        submit(spec, "upload", io_pool, _upload_stage, spec, token, session)
+
+    def admit() -> None:
+        nonlocal reserved_mb
+        in_process_specs = [spec for spec, stage, _, _, _ in running.values() if stage == "process"]
+        in_process = len(in_process_specs)
+        alone = any(retries[spec.name] for spec in in_process_specs)
+        while waiting and in_process < workers:
+            spec = waiting[0]
+            if in_process and (alone or retries[spec.name]):
+                logger.debug("%s waits for a retried dataset to run alone", spec.name)
+                return
+            need = estimate_memory_mb(spec)
+            if memory_budget_mb is not None and in_process and reserved_mb + need > memory_budget_mb:
+                logger.debug("%s waits for memory: %d MB reserved, needs %d MB", spec.name, reserved_mb, need)
+                return
+            if memory_budget_mb is not None and need > memory_budget_mb:
+                logger.warning("%s needs ~%d MB, more than the %d MB budget", spec.name, need, memory_budget_mb)
+            waiting.popleft()
+            reserved_mb += need
+            in_process += 1
+            alone = bool(retries[spec.name])
+            submit(spec, "process", cpu_pool, process_dataset, spec, force, memory_mb=need)
+
+    try:
+        for spec in specs:
+            if spec.downloads:
+                submit(spec, "download", io_pool, _download_stage, spec, cache)
+            else:
+                waiting.append(spec)
+        admit()
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec, stage, started, memory_mb, executor = running.pop(future)
+                result = results[spec.name]
+                result.timings[stage] = time.monotonic() - started
+                reserved_mb -= memory_mb
+                try:
+                    value = future.result()
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        # A worker died (e.g. killed for memory) and took every stage in flight with it.
+                        if executor is cpu_pool:
+                            cpu_pool.shutdown(wait=False)
+                            cpu_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                        if retries[spec.name] < PROCESS_RETRIES:
+                            retries[spec.name] += 1
+                            logger.warning("⚠️ %s lost its worker process; retrying alone: %s", spec.name, e)
+                            waiting.appendleft(spec)
+                            continue
+                    result.status, result.error = "failed", f"{stage}: {e}"
+                    result.timings["total"] = time.monotonic() - started_at[spec.name]
+                    logger.error("❌ %s failed during %s: %s", spec.name, stage, e)
+                    continue
+
+                if stage == "download":
+                    waiting.append(spec)
+                    continue
+                if stage == "process":
+                    result.rows, result.cached = value.rows, value.cached
+                    result.timings.update(value.timings)
+                    if spec.repo_id:
+                        submit_upload(spec)
+                        continue
+                else:
+                    result.url = value
+                result.status = "ok"
+                result.timings["total"] = time.monotonic() - started_at[spec.name]
+                logger.info("✅ %s finished in %.1fs", spec.name, result.timings["total"])
+            admit()
+    finally:
+        io_pool.shutdown(wait=True, cancel_futures=True)
+        cpu_pool.shutdown(wait=True, cancel_futures=True)
+
+    return [results[spec.name] for spec in specs]
+
+
+def format_summary(results: Sequence[DatasetResult]) -> str:
+    """Render results as a fixed-width table of stage timings, one row per dataset."""
+    header = ["dataset", "status", "rows", *SUMMARY_STAGES, "error"]
+    rows = [header]
+    for result in results:
+        timings = [f"{result.timings[stage]:.1f}s" if stage in result.timings else "-" for stage in SUMMARY_STAGES]
+        rows.append(
+            [
+                result.name,
+                "cached" if result.ok and result.cached else result.status,
+                str(result.rows) if result.rows is not None else "-",
+                *timings,
+                result.error or "",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header) - 1)]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1] for row in rows]
+    return "\n".join(line.rstrip() for line in lines)
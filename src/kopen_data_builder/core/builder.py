@@ -4,26 +4,75 @@
 Builder module: Prepares a Hugging Face dataset repository from CSV files.
 This module provides functionality to create a local directory structure
 for a dataset, including saving splits, writing metadata, and preparing for upload.
+Splits can be written as CSV or Parquet files, as an Arrow ``DatasetDict`` (``save_to_disk`` format)
+that consumers memory-map without parsing, or as a partitioned tree under ``data/``.
+Under a memory budget the split files are streamed into the repository chunk by chunk.
+Repositories built from sampled splits are marked as samples in ``sample.json`` and the README.
+A changelog of releases (from ``kopen diff`` reports) is kept across builds and rendered into the README.
 """
 
+import json
 import logging
 import shutil
+import tempfile
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
 
 import pandas as pd
 
+from kopen_data_builder.core.io import is_arrow_dataset, read_arrow_dataset, write_csv
+from kopen_data_builder.core.manifest import STATE_DIR
+from kopen_data_builder.core.memory import SAMPLE_ROWS, MemoryBudget
+from kopen_data_builder.core.metrics import timed
 from kopen_data_builder.core.models import DatasetMeta
-from kopen_data_builder.core.renderer import render_dataset_card
+from kopen_data_builder.core.partitioning import (
+    DEFAULT_MAX_OPEN_FILES,
+    PartitionLayout,
+    remove_partitions,
+    write_partitioned_splits,
+)
+from kopen_data_builder.core.renderer import (
+    render_changelog_section,
+    render_dataset_card,
+    render_partition_front_matter,
+    render_partition_section,
+)
+from kopen_data_builder.core.sampling import (
+    DEFAULT_SEED,
+    clear_sample_marker,
+    read_sample_marker,
+    write_sample_marker,
+)
+from kopen_data_builder.core.spill import ChunkWriter
+
+if TYPE_CHECKING:
+    from datasets import Dataset, Features
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_FORMATS = ("csv", "parquet", "arrow")
+ARROW_CHUNK_SIZE = 50_000
+# Rows read to size the chunks of a CSV streamed into Arrow.
+FEATURE_SAMPLE_ROWS = 10_000
+# Arrow types of the unified column kinds found by ``_csv_column_kinds``.
+ARROW_KINDS = {"bool": "bool", "int64": "int64", "float64": "float64", "string": "string"}
+CHANGELOG_FILENAME = f"{STATE_DIR}/changelog.json"
+SAMPLE_BANNER = (
+    "> ⚠️ **Sample preview.** This repository was built from a random sample of the source data, "
+    "not the full dataset; see `sample.json`."
+)
+
 
 def prepare_hf_repository(
     dataset_name: str,
     splits: Dict[str, pd.DataFrame],
     output_dir: str,
     metadata: DatasetMeta | None = None,
+    output_format: str = "csv",
+    partition_by: Optional[Sequence[str]] = None,
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    incremental: bool = False,
+    csv_engine: str = "pandas",
 ) -> None:
     """
     Prepare a local directory in Hugging Face dataset format.
@@ -32,32 +81,205 @@ def prepare_hf_repository(
         dataset_name (str): Name of the dataset.
         splits (dict): Dictionary of split name to pandas DataFrame.
         output_dir (str): Target directory to prepare.
+        output_format (str): ``csv`` or ``parquet`` for one file per split, ``arrow`` for a
+            ``DatasetDict`` on disk.
+        partition_by (Sequence[str], optional): Partition specs (e.g. ``["reg_date:year", "gu"]``).
+            Splits are then written to ``data/<split>/<value>/.../part-<n>.<format>``.
+        max_open_files (int): Bound on files held open by the partition writers.
+        incremental (bool): Keep the existing repository and only replace the partitions
+            present in ``splits``. Requires ``partition_by``.
+        csv_engine (str): CSV writer engine for ``csv`` output, see ``core.io.write_csv``.
     """
+    with timed("build", dataset=dataset_name) as sample:
+        _validate_output_format(output_format, partition_by, incremental)
+        repo_dir = _reset_repo_dir(output_dir, keep_existing=incremental)
+
+        partitioning = None
+        if partition_by:
+            partitioning = write_partitioned_splits(
+                splits,
+                str(repo_dir / "data"),
+                partition_by,
+                file_format=output_format,
+                max_open_files=max_open_files,
+                incremental=incremental,
+            )
+        elif output_format == "parquet":
+            _save_parquet_splits(repo_dir, splits)
+        elif output_format == "arrow":
+            from datasets import Dataset
+
+            _save_arrow_splits(
+                repo_dir,
+                {
+                    name: Dataset.from_pandas(df, features=_infer_features(df), preserve_index=False)
+                    for name, df in splits.items()
+                },
+            )
+        else:
+            _save_splits(repo_dir, splits, csv_engine)
+        _write_readme(repo_dir, dataset_name, metadata, partitioning)
+        _write_placeholder_metadata(repo_dir)
+
+        sample.rows = sum(len(df) for df in splits.values())
+        logger.info("✅ Hugging Face repository prepared at %s", repo_dir)
+
+
+def _validate_output_format(
+    output_format: str, partition_by: Optional[Sequence[str]] = None, incremental: bool = False
+) -> None:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}'. Choose one of: {', '.join(OUTPUT_FORMATS)}")
+    if partition_by and output_format == "arrow":
+        raise ValueError("Partitioned output supports 'csv' and 'parquet' formats only.")
+    if incremental and not partition_by:
+        raise ValueError("Incremental builds require partition columns.")
+
+
+def _reset_repo_dir(output_dir: str, keep_existing: bool = False) -> Path:
     repo_dir = Path(output_dir).resolve()
-    if repo_dir.exists():
+    if repo_dir.exists() and not keep_existing:
         shutil.rmtree(repo_dir)
     repo_dir.mkdir(parents=True, exist_ok=True)
+    return repo_dir
 
-    _save_splits(repo_dir, splits)
-    _write_readme(repo_dir, dataset_name, metadata)
-    _write_placeholder_metadata(repo_dir)
 
-    logger.info("✅ Hugging Face repository prepared at %s", repo_dir)
+def _save_splits(repo_dir: Path, splits: Dict[str, pd.DataFrame], csv_engine: str = "pandas") -> None:
+    for split_name, df in splits.items():
+        split_path = repo_dir / f"{split_name}.csv"
+        # UTF-8 with BOM for Excel compatibility
+        write_csv(df, str(split_path), encoding="utf-8-sig", engine=csv_engine)
+        logger.debug("Saved split %s to %s", split_name, split_path)
 
 
-def _save_splits(repo_dir: Path, splits: Dict[str, pd.DataFrame]) -> None:
+def _save_parquet_splits(repo_dir: Path, splits: Dict[str, pd.DataFrame]) -> None:
     for split_name, df in splits.items():
-        split_path = repo_dir / f"{split_name}.csv"
-        df.to_csv(split_path, index=False, encoding="utf-8-sig")  # UTF-8 with BOM for Excel compatibility
+        split_path = repo_dir / f"{split_name}.parquet"
+        df.to_parquet(split_path, index=False)
         logger.debug("Saved split %s to %s", split_name, split_path)
 
 
-def _write_readme(repo_dir: Path, dataset_name: str, metadata: DatasetMeta | None = None) -> None:
+def _save_arrow_splits(repo_dir: Path, splits: Dict[str, "Dataset"]) -> None:
+    from datasets import DatasetDict
+
+    DatasetDict(splits).save_to_disk(str(repo_dir))
+    for split_name, dataset in splits.items():
+        logger.debug("Saved Arrow split %s (%d rows) to %s", split_name, dataset.num_rows, repo_dir / split_name)
+
+
+def _infer_features(sample: pd.DataFrame) -> "Features":
+    import pyarrow as pa
+    from datasets import Features
+
+    schema = pa.Schema.from_pandas(sample, preserve_index=False)
+    # Columns that are entirely empty in the sample have no usable type; keep them as strings.
+    fields = [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in schema]
+    return Features.from_arrow_schema(pa.schema(fields))
+
+
+def _column_kind(values: pd.Series) -> Optional[str]:
+    if values.isna().all():
+        return None
+    if pd.api.types.is_bool_dtype(values):
+        return "bool"
+    if pd.api.types.is_integer_dtype(values):
+        return "int64"
+    if pd.api.types.is_float_dtype(values):
+        return "float64"
+    return "string"
+
+
+def _widen(current: Optional[str], kind: Optional[str]) -> Optional[str]:
+    if current is None or current == kind:
+        return kind or current
+    if kind is None:
+        return current
+    if {current, kind} == {"int64", "float64"}:
+        return "float64"
+    return "string"
+
+
+def _csv_column_kinds(path: str, chunksize: int) -> Dict[str, str]:
+    """
+    Unify the column types pandas infers for every chunk of a CSV.
+
+    Chunks are typed independently, so a column can be empty in the first chunk and hold
+    text later, or turn from int to float. int and float widen to float; any other
+    conflict widens to string. Columns that are empty throughout are strings.
+    """
+    kinds: Dict[str, Optional[str]] = {}
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        for column in chunk.columns:
+            kinds[column] = _widen(kinds.get(column), _column_kind(chunk[column]))
+    return {column: kind or "string" for column, kind in kinds.items()}
+
+
+def _features_from_kinds(kinds: Dict[str, str]) -> "Features":
+    import pyarrow as pa
+    from datasets import Features
+
+    fields = [pa.field(column, pa.type_for_alias(ARROW_KINDS[kind])) for column, kind in kinds.items()]
+    return Features.from_arrow_schema(pa.schema(fields))
+
+
+def _iter_split_chunks(split_name: str, path: str, max_memory: int) -> Iterator[pd.DataFrame]:
+    if is_arrow_dataset(path):
+        dataset = read_arrow_dataset(path, split=split_name)
+        sample = dataset.select(range(min(SAMPLE_ROWS, dataset.num_rows))).to_pandas()
+        row_bytes = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+        yield from dataset.to_pandas(batch_size=MemoryBudget(max_memory).chunk_rows(row_bytes), batched=True)
+        return
+    from kopen_data_builder.core.frame import scan
+
+    yield from scan(path, max_memory=max_memory).iter_chunks()
+
+
+def _iter_csv_records(path: str, chunksize: int, dtype: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=dtype):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.to_dict(orient="records")
+
+
+def _stream_csv_to_arrow(path: str, cache_dir: str, max_memory: Optional[int] = None) -> "Dataset":
+    from datasets import Dataset
+
+    sample = pd.read_csv(path, nrows=FEATURE_SAMPLE_ROWS)
+    chunksize = ARROW_CHUNK_SIZE
+    if max_memory is not None:
+        row_bytes = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+        chunksize = MemoryBudget(max_memory).chunk_rows(row_bytes) or ARROW_CHUNK_SIZE
+    # Features must hold for every chunk, so the types come from a first pass over all of them;
+    # widened columns are then read with a pinned dtype (strings keep their original text).
+    kinds = _csv_column_kinds(path, chunksize)
+    dtype = {column: ("str" if kind == "string" else kind) for column, kind in kinds.items() if kind != "int64"}
+    return Dataset.from_generator(
+        _iter_csv_records,
+        features=_features_from_kinds(kinds),
+        cache_dir=cache_dir,
+        gen_kwargs={"path": path, "chunksize": chunksize, "dtype": dtype},
+    )
+
+
+def _load_split(split_name: str, path: str) -> pd.DataFrame:
+    if is_arrow_dataset(path):
+        return read_arrow_dataset(path, split=split_name).to_pandas()
+    return pd.read_csv(path)
+
+
+def _write_readme(
+    repo_dir: Path,
+    dataset_name: str,
+    metadata: DatasetMeta | None = None,
+    partitioning: PartitionLayout | None = None,
+) -> None:
     readme_path = repo_dir / "README.md"
     if metadata is None:
         content = f"# Dataset: {dataset_name}\n\nThis dataset was prepared for upload to Hugging Face Datasets.\n"
+        if partitioning is not None:
+            front_matter = ["---", *render_partition_front_matter(partitioning), "---", ""]
+            content = "\n".join([*front_matter, content, *render_partition_section(partitioning)]) + "\n"
     else:
-        content = render_dataset_card(metadata, dataset_name=dataset_name)
+        content = render_dataset_card(metadata, dataset_name=dataset_name, partitioning=partitioning)
     readme_path.write_text(content, encoding="utf-8")
     logger.debug("README.md created at %s", readme_path)
 
@@ -73,20 +295,212 @@ def build_repository(
     dataset_name: str,
     output_dir: str,
     metadata: DatasetMeta | None = None,
+    output_format: str = "csv",
+    partition_by: Optional[Sequence[str]] = None,
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    incremental: bool = False,
+    csv_engine: str = "pandas",
+    max_memory: Optional[int] = None,
+    sample_size: Optional[int] = None,
+    sample_fraction: Optional[float] = None,
+    sample_seed: int = DEFAULT_SEED,
+    changelog: Optional[Dict[str, Any]] = None,
+    removed_partitions: Optional[Sequence[Dict[str, Optional[str]]]] = None,
 ) -> None:
     """
     Build the Hugging Face dataset directory structure from CSVs.
 
+    Each input may also be an Arrow dataset directory written by ``save_to_disk``,
+    which is memory-mapped instead of re-parsed. With ``max_memory`` splits are not
+    loaded whole but streamed into the repository in chunks sized to the budget.
+    With ``sample_size`` or ``sample_fraction`` each split is sampled while it is
+    streamed (see ``core.sampling``) and only the sample is built. The repository is
+    marked as a sample then, and also when any input split carries a sample marker.
+    Changelog entries survive rebuilds of the same output directory; each build
+    re-renders them as the last section of the README. An incremental build keeps
+    partitions absent from its inputs, so partitions a release emptied are passed
+    as ``removed_partitions`` and deleted from every built split.
+
     Args:
         csv_paths (dict): Dictionary mapping split name (e.g., 'train') to CSV path.
         dataset_name (str): Name of the dataset.
         output_dir (str): Path to the output directory.
+        output_format (str): ``csv``, ``parquet`` or ``arrow``. In ``arrow`` mode CSV inputs are
+            streamed into Arrow files chunk by chunk rather than loaded into pandas.
+        partition_by (Sequence[str], optional): Partition specs, see ``prepare_hf_repository``.
+        max_open_files (int): Bound on files held open by the partition writers.
+        incremental (bool): Only replace the partitions present in the inputs.
+        csv_engine (str): CSV writer engine for ``csv`` output, see ``core.io.write_csv``.
+            Streamed builds always append with pandas.
+        max_memory (int, optional): Memory budget in bytes.
+        sample_size (int, optional): Rows kept per split.
+        sample_fraction (float, optional): Fraction of rows kept per split.
+        sample_seed (int): Seed of the sampler.
+        changelog (dict, optional): Entry for this release, see ``DiffReport.changelog_entry``.
+        removed_partitions (Sequence[dict], optional): Partitions to delete after the build,
+            see ``DiffReport.emptied_partitions``.
     """
-    splits = {}
+    _validate_output_format(output_format, partition_by, incremental)
+    history = _load_changelog(Path(output_dir))
+    samples = {}
     for name, path in csv_paths.items():
-        df = pd.read_csv(path)
-        splits[name] = df
-        logger.debug("Loaded CSV: %s → %s rows", path, len(df))
+        marker = read_sample_marker(Path(path))
+        if marker is not None:
+            samples[name] = marker
+
+    if sample_size is not None or sample_fraction is not None:
+        from kopen_data_builder.core.frame import scan
+
+        splits = {}
+        for name, path in csv_paths.items():
+            frame = scan(path, max_memory=max_memory).sample(sample_size, sample_fraction, sample_seed)
+            splits[name] = frame.collect()
+            report = frame.sample_report
+            samples[name] = report.as_dict() if report is not None else {}
+            logger.info("Split %s: %s", name, report.describe() if report is not None else "sampled")
+        prepare_hf_repository(
+            dataset_name,
+            splits,
+            output_dir,
+            metadata=metadata,
+            output_format=output_format,
+            partition_by=partition_by,
+            max_open_files=max_open_files,
+            incremental=incremental,
+            csv_engine=csv_engine,
+        )
+    elif output_format == "arrow":
+        _build_arrow_repository(csv_paths, dataset_name, output_dir, metadata, max_memory)
+    elif max_memory is not None:
+        _stream_repository(
+            csv_paths,
+            dataset_name,
+            output_dir,
+            max_memory,
+            metadata,
+            output_format,
+            partition_by,
+            max_open_files,
+            incremental,
+        )
+    else:
+        splits = {}
+        for name, path in csv_paths.items():
+            df = _load_split(name, path)
+            splits[name] = df
+            logger.debug("Loaded CSV: %s → %s rows", path, len(df))
+
+        prepare_hf_repository(
+            dataset_name,
+            splits,
+            output_dir,
+            metadata=metadata,
+            output_format=output_format,
+            partition_by=partition_by,
+            max_open_files=max_open_files,
+            incremental=incremental,
+            csv_engine=csv_engine,
+        )
 
-    prepare_hf_repository(dataset_name, splits, output_dir, metadata=metadata)
+    if removed_partitions and partition_by:
+        for name in csv_paths:
+            remove_partitions(str(Path(output_dir) / "data" / name), removed_partitions)
+    if changelog is not None and (not history or history[-1] != changelog):
+        history.append(changelog)
+    if history:
+        _write_changelog(Path(output_dir), history)
+    if samples:
+        _mark_as_sample(Path(output_dir), samples, ", ".join(csv_paths.values()))
+    else:
+        clear_sample_marker(Path(output_dir))
     logger.info("✅ Dataset build process completed.")
+
+
+def _load_changelog(repo_dir: Path) -> List[Dict[str, Any]]:
+    path = repo_dir / CHANGELOG_FILENAME
+    if not path.is_file():
+        return []
+    entries: List[Dict[str, Any]] = json.loads(path.read_text(encoding="utf-8"))
+    return entries
+
+
+def _write_changelog(repo_dir: Path, entries: List[Dict[str, Any]]) -> None:
+    path = repo_dir / CHANGELOG_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entries, ensure_ascii=False, indent=2), encoding="utf-8")
+    readme = repo_dir / "README.md"
+    content = readme.read_text(encoding="utf-8").rstrip("\n")
+    readme.write_text(content + "\n\n" + "\n".join(render_changelog_section(entries)) + "\n", encoding="utf-8")
+
+
+def _mark_as_sample(repo_dir: Path, samples: Dict[str, Any], source: str) -> None:
+    write_sample_marker(repo_dir, {"splits": samples}, source)
+    readme = repo_dir / "README.md"
+    content = readme.read_text(encoding="utf-8")
+    # The banner goes after the YAML front matter, which must stay first.
+    head, body = "", content
+    if content.startswith("---\n"):
+        end = content.find("\n---\n", 4)
+        if end != -1:
+            head, body = content[: end + 5], content[end + 5 :]
+    readme.write_text(f"{head}{SAMPLE_BANNER}\n\n{body}", encoding="utf-8")
+
+
+def _stream_repository(
+    csv_paths: Dict[str, str],
+    dataset_name: str,
+    output_dir: str,
+    max_memory: int,
+    metadata: DatasetMeta | None,
+    output_format: str,
+    partition_by: Optional[Sequence[str]],
+    max_open_files: int,
+    incremental: bool,
+) -> None:
+    with timed("build", dataset=dataset_name) as sample:
+        repo_dir = _reset_repo_dir(output_dir, keep_existing=incremental)
+        partitioning = None
+        if partition_by:
+            partitioning = PartitionLayout(columns=[], file_format=output_format, splits=list(csv_paths))
+        for name, path in csv_paths.items():
+            target = repo_dir / "data" / name if partition_by else repo_dir / f"{name}.{output_format}"
+            # UTF-8 with BOM for Excel compatibility, as in the in-memory build
+            with ChunkWriter(
+                str(target), output_format, "utf-8-sig", partition_by, max_open_files, incremental
+            ) as writer:
+                for chunk in _iter_split_chunks(name, path, max_memory):
+                    writer.write(chunk)
+            if partitioning is not None:
+                partitioning.columns = writer.partition_columns
+            logger.debug("Streamed %s → %s rows into %s", path, writer.rows, target)
+            sample.rows = (sample.rows or 0) + writer.rows
+        _write_readme(repo_dir, dataset_name, metadata, partitioning)
+        _write_placeholder_metadata(repo_dir)
+        logger.info("✅ Hugging Face repository prepared at %s", repo_dir)
+
+
+def _build_arrow_repository(
+    csv_paths: Dict[str, str],
+    dataset_name: str,
+    output_dir: str,
+    metadata: DatasetMeta | None,
+    max_memory: Optional[int] = None,
+) -> None:
+    with timed("build", dataset=dataset_name) as sample:
+        # The generator cache must outlive save_to_disk, and must not live inside output_dir (it is reset).
+        with tempfile.TemporaryDirectory(prefix="kopen-arrow-") as cache_dir:
+            splits = {}
+            for name, path in csv_paths.items():
+                if is_arrow_dataset(path):
+                    splits[name] = read_arrow_dataset(path, split=name)
+                else:
+                    splits[name] = _stream_csv_to_arrow(path, cache_dir, max_memory)
+                logger.debug("Loaded %s → %s rows", path, splits[name].num_rows)
+
+            repo_dir = _reset_repo_dir(output_dir)
+            _save_arrow_splits(repo_dir, splits)
+            sample.rows = sum(split.num_rows for split in splits.values())
+
+        _write_readme(repo_dir, dataset_name, metadata)
+        _write_placeholder_metadata(repo_dir)
+        logger.info("✅ Hugging Face repository prepared at %s", repo_dir)
@@ -0,0 +1,406 @@
+# src/kopen_data_builder/core/diff.py
+
+"""
+Diff module: Row-level comparison of two releases of a dataset, keyed by one or more columns.
+Both releases are streamed in chunks and reduced to 64-bit (key hash, row hash) pairs,
+hash-partitioned by key into temporary files when a memory budget is set, then compared
+one partition at a time. A second pass writes the added, removed and modified rows and
+collects samples; with partition columns, a third pass writes the new rows of every
+changed partition so an incremental build rewrites (and uploads) only those partitions.
+"""
+
+import json
+import logging
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from kopen_data_builder.core.frame import LazyFrame, scan
+from kopen_data_builder.core.metrics import timed
+from kopen_data_builder.core.partitioning import add_partition_columns
+from kopen_data_builder.core.spill import SPILL_PREFIX, ChunkWriter
+
+logger = logging.getLogger(__name__)
+
+DIFF_PARTITIONS = 64
+DEFAULT_SAMPLE_ROWS = 5
+REPORT_NAME = "diff.json"
+DELTA_NAME = "delta.csv"
+CHANGE_KINDS = ("added", "removed", "modified")
+
+PartitionKey = Tuple[str, ...]
+
+
+@dataclass
+class DiffReport:
+    """
+    Result of ``diff_tables``; saved as ``diff.json`` next to the change files.
+
+    Counts of added, removed and modified rows are counts of keys; a key that occurs
+    several times in a release is compared as the multiset of its rows.
+    """
+
+    old: str
+    new: str
+    key: List[str]
+    old_rows: int = 0
+    new_rows: int = 0
+    added: int = 0
+    removed: int = 0
+    modified: int = 0
+    unchanged: int = 0
+    columns_added: List[str] = field(default_factory=list)
+    columns_removed: List[str] = field(default_factory=list)
+    duplicate_keys: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    partition_by: List[str] = field(default_factory=list)
+    changed_partitions: List[Dict[str, Optional[str]]] = field(default_factory=list)
+    emptied_partitions: List[Dict[str, Optional[str]]] = field(default_factory=list)
+    files: Dict[str, str] = field(default_factory=dict)
+    generated_at: str = ""
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.modified or self.columns_added or self.columns_removed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def changelog_entry(self) -> Dict[str, Any]:
+        """The summary kept in a dataset card's changelog (see ``build_repository``)."""
+        fields = ("old", "new", "old_rows", "new_rows", "added", "removed", "modified")
+        entry = {"date": self.generated_at[:10], **{name: getattr(self, name) for name in fields}}
+        return {**entry, "columns_added": self.columns_added, "columns_removed": self.columns_removed}
+
+    def describe(self) -> str:
+        return (
+            f"{self.old_rows:,} → {self.new_rows:,} rows: {self.added:,} added, {self.removed:,} removed, "
+            f"{self.modified:,} modified, {self.unchanged:,} unchanged"
+        )
+
+
+def load_diff_report(path: Union[str, Path]) -> DiffReport:
+    """Load a ``diff.json`` written by ``diff_tables`` (or the directory holding it)."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / REPORT_NAME
+    report = DiffReport(**json.loads(path.read_text(encoding="utf-8")))
+    return report
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Values as strings, with integral floats written as integers.
+
+    Chunked readers infer types per chunk (an integer column turns float in a chunk
+    with a missing value), so values are normalized one by one, never per column.
+    """
+    columns = {}
+    for name in frame.columns:
+        values = frame[name]
+        text = values.astype("string")
+        if pd.api.types.is_float_dtype(values):
+            integral = (values.abs() < 2**63) & (values == values.round())
+            text[integral] = values[integral].astype("int64").astype("string")
+        columns[name] = text
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def _hash(frame: pd.DataFrame) -> "np.ndarray":
+    hashed: np.ndarray = pd.util.hash_pandas_object(_normalize(frame), index=False).to_numpy(dtype=np.uint64)
+    return hashed
+
+
+class _HashPartitions:
+    """(key hash, row hash) pairs of one release, partitioned by key hash in memory or in spill files."""
+
+    def __init__(self, partitions: int, spill_dir: Optional[Path], name: str):
+        self.partitions = partitions
+        self.rows = 0
+        self._memory: List[List["np.ndarray"]] = [[] for _ in range(partitions)]
+        self._paths = [spill_dir / f"{name}-{i}.bin" for i in range(partitions)] if spill_dir else None
+
+    def add(self, keys: "np.ndarray", rows: "np.ndarray") -> None:
+        pairs = np.stack([keys, rows], axis=1)
+        self.rows += len(pairs)
+        assignment = keys % np.uint64(self.partitions)
+        for i in np.unique(assignment):
+            piece = pairs[assignment == i]
+            if self._paths is None:
+                self._memory[int(i)].append(piece)
+            else:
+                with open(self._paths[int(i)], "ab") as f:
+                    piece.tofile(f)
+
+    def load(self, i: int) -> "np.ndarray":
+        if self._paths is None:
+            pieces = self._memory[i]
+            self._memory[i] = []
+            return np.concatenate(pieces) if pieces else np.empty((0, 2), dtype=np.uint64)
+        if not self._paths[i].exists():
+            return np.empty((0, 2), dtype=np.uint64)
+        return np.fromfile(self._paths[i], dtype=np.uint64).reshape(-1, 2)
+
+
+def _by_key(pairs: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", int]:
+    """Unique key hashes, the wrapping sum of each key's row hashes, and the number of duplicate rows."""
+    order = np.argsort(pairs[:, 0], kind="stable")
+    keys, rows = pairs[order, 0], pairs[order, 1]
+    if not len(keys):
+        return keys, rows, 0
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(rows, starts), len(keys) - len(starts)
+
+
+def _frame(source: str, max_memory: Optional[int]) -> LazyFrame:
+    return scan(source, max_memory=max_memory)
+
+
+def _columns(source: str, max_memory: Optional[int]) -> List[str]:
+    chunks = _frame(source, max_memory).iter_chunks()
+    try:
+        return [str(column) for column in next(chunks, pd.DataFrame()).columns]
+    finally:
+        chunks.close()
+
+
+def _partition_keys(chunk: pd.DataFrame, partition_by: Sequence[str]) -> pd.MultiIndex:
+    derived, columns = add_partition_columns(chunk, partition_by)
+    keys: pd.MultiIndex = pd.MultiIndex.from_frame(derived[columns].astype("string").fillna(""))
+    return keys
+
+
+def _records(chunk: pd.DataFrame) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = json.loads(chunk.to_json(orient="records", date_format="iso", force_ascii=False))
+    return records
+
+
+def diff_tables(
+    old: str,
+    new: str,
+    key: Sequence[str],
+    output_dir: Optional[str] = None,
+    partition_by: Optional[Sequence[str]] = None,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    max_memory: Optional[int] = None,
+) -> DiffReport:
+    """
+    Compare two releases of a table row by row.
+
+    Rows are matched on ``key``; a row is modified when any column present in both
+    releases differs (columns only present in one release are reported, not compared).
+    Inputs are anything ``scan`` reads: CSV, Excel, XML, JSON(L), Parquet or URLs.
+
+    Args:
+        old (str): Previous release.
+        new (str): New release.
+        key (Sequence[str]): Key columns identifying a row.
+        output_dir (str, optional): Directory for ``diff.json``, ``added.csv``,
+            ``removed.csv`` and ``modified.csv`` (new values of modified rows), and with
+            ``partition_by`` also ``delta.csv``. Nothing is written when omitted.
+        partition_by (Sequence[str], optional): Partition specs of the built dataset, see
+            ``parse_partition_by``. The partitions touched by any change are reported and
+            ``delta.csv`` holds every new row of those partitions, ready for
+            ``build run --incremental``.
+        sample_rows (int): Rows sampled per kind of change for the report.
+        max_memory (int, optional): Memory budget in bytes; when set, key hashes are
+            partitioned into temporary files and compared one partition at a time.
+
+    Returns:
+        DiffReport: Counts, samples and written files.
+
+    Raises:
+        ValueError: If a key column is missing from either release.
+    """
+    key = list(key)
+    partition_by = list(partition_by or [])
+    report = DiffReport(
+        old=old,
+        new=new,
+        key=key,
+        partition_by=partition_by,
+        generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+    old_columns, new_columns = _columns(old, max_memory), _columns(new, max_memory)
+    for name, columns in (("old", old_columns), ("new", new_columns)):
+        missing = [column for column in key if column not in columns]
+        if missing:
+            raise ValueError(f"Key columns {missing} not found in the {name} release")
+    report.columns_added = [c for c in new_columns if c not in old_columns]
+    report.columns_removed = [c for c in old_columns if c not in new_columns]
+    compared = sorted(c for c in old_columns if c in new_columns)
+
+    spill_dir = Path(tempfile.mkdtemp(prefix=SPILL_PREFIX)) if max_memory is not None else None
+    partitions = DIFF_PARTITIONS if spill_dir is not None else 1
+    try:
+        with timed("diff", key=",".join(key)) as metric:
+            hashes = {}
+            for name, source in (("old", old), ("new", new)):
+                hashes[name] = _HashPartitions(partitions, spill_dir, name)
+                for chunk in _frame(source, max_memory).iter_chunks():
+                    hashes[name].add(_hash(chunk[key]), _hash(chunk[compared]))
+            report.old_rows, report.new_rows = hashes["old"].rows, hashes["new"].rows
+            changes = _compare(hashes["old"], hashes["new"], report)
+            metric.rows = report.old_rows + report.new_rows
+        _collect_changes(report, changes, compared, output_dir, sample_rows, max_memory)
+    finally:
+        if spill_dir is not None:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        target = Path(output_dir) / REPORT_NAME
+        report.files["report"] = str(target)
+        target.write_text(json.dumps(report.as_dict(), ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    logger.info("Diff %s → %s: %s", old, new, report.describe())
+    return report
+
+
+def _compare(old: _HashPartitions, new: _HashPartitions, report: DiffReport) -> Dict[str, "np.ndarray"]:
+    """Sorted key hashes of the added, removed and modified rows, comparing one partition at a time."""
+    found: Dict[str, List["np.ndarray"]] = {kind: [] for kind in CHANGE_KINDS}
+    duplicates = {"old": 0, "new": 0}
+    for i in range(old.partitions):
+        old_keys, old_rows, old_duplicates = _by_key(old.load(i))
+        new_keys, new_rows, new_duplicates = _by_key(new.load(i))
+        duplicates["old"] += old_duplicates
+        duplicates["new"] += new_duplicates
+        common, old_at, new_at = np.intersect1d(old_keys, new_keys, assume_unique=True, return_indices=True)
+        modified = common[old_rows[old_at] != new_rows[new_at]]
+        found["added"].append(np.setdiff1d(new_keys, old_keys, assume_unique=True))
+        found["removed"].append(np.setdiff1d(old_keys, new_keys, assume_unique=True))
+        found["modified"].append(modified)
+        report.unchanged += len(common) - len(modified)
+
+    changes = {kind: np.sort(np.concatenate(arrays)) for kind, arrays in found.items()}
+    report.added, report.removed, report.modified = (len(changes[kind]) for kind in CHANGE_KINDS)
+    report.duplicate_keys = {name: count for name, count in duplicates.items() if count}
+    if report.duplicate_keys:
+        logger.warning("Key %s is not unique: %s duplicate rows", report.key, report.duplicate_keys)
+    return changes
+
+
+def _collect_changes(
+    report: DiffReport,
+    changes: Dict[str, "np.ndarray"],
+    compared: List[str],
+    output_dir: Optional[str],
+    sample_rows: int,
+    max_memory: Optional[int],
+) -> None:
+    """Second pass: write the changed rows, sample them and find the partitions they touch."""
+    writers: Dict[str, ChunkWriter] = {}
+    if output_dir is not None:
+        for kind in CHANGE_KINDS:
+            writers[kind] = ChunkWriter(str(Path(output_dir) / f"{kind}.csv"), encoding="utf-8-sig")
+            report.files[kind] = writers[kind].path.as_posix()
+    report.samples = {kind: [] for kind in CHANGE_KINDS}
+    before: Dict[int, Tuple[Dict[str, Any], "pd.Series[Any]"]] = {}
+    touched: Set[PartitionKey] = set()
+
+    try:
+        # Old values of modified rows are only sampled; the change files hold new values.
+        for side, source, written in (("old", report.old, ("removed",)), ("new", report.new, ("added", "modified"))):
+            for chunk in _frame(source, max_memory).iter_chunks():
+                keys = _hash(chunk[report.key])
+                masks = {kind: np.isin(keys, changes[kind]) for kind in (*written, "modified")}
+                modified = masks["modified"]
+                _sample_modified(chunk[modified], keys[modified], side, compared, report, before, sample_rows)
+                for kind in written:
+                    rows = chunk[masks[kind]]
+                    if kind in writers:
+                        writers[kind].write(rows)
+                    room = sample_rows - len(report.samples[kind])
+                    if kind != "modified" and room > 0 and len(rows):
+                        report.samples[kind].extend(_records(rows.head(room)))
+                changed = np.logical_or.reduce(list(masks.values()))
+                if report.partition_by and changed.any():
+                    touched.update(_partition_keys(chunk[changed], report.partition_by))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    if report.partition_by:
+        _write_delta(report, touched, output_dir, max_memory)
+
+
+def _sample_modified(
+    rows: pd.DataFrame,
+    keys: "np.ndarray",
+    side: str,
+    compared: List[str],
+    report: DiffReport,
+    before: Dict[int, Tuple[Dict[str, Any], "pd.Series[Any]"]],
+    sample_rows: int,
+) -> None:
+    """Remember old values of the first modified keys, then pair them with their new values."""
+    if rows.empty:
+        return
+    normalized = _normalize(rows[compared])
+    values = _records(rows)
+    for position, key_hash in enumerate(keys.tolist()):
+        if side == "old":
+            if len(before) >= sample_rows:
+                return
+            before.setdefault(key_hash, (values[position], normalized.iloc[position]))
+            continue
+        if key_hash not in before:
+            continue
+        old_values, old_normalized = before.pop(key_hash)
+        new_normalized = normalized.iloc[position]
+        report.samples["modified"].append(
+            {
+                "key": {column: values[position][column] for column in report.key},
+                "changes": {
+                    column: [old_values[column], values[position][column]]
+                    for column in compared
+                    if _differs(old_normalized[column], new_normalized[column])
+                },
+            }
+        )
+
+
+def _differs(old: Any, new: Any) -> bool:
+    if pd.isna(old) or pd.isna(new):
+        return bool(pd.isna(old) != pd.isna(new))
+    return bool(old != new)
+
+
+def _write_delta(
+    report: DiffReport, touched: Set[PartitionKey], output_dir: Optional[str], max_memory: Optional[int]
+) -> None:
+    """Third pass: the new rows of every partition touched by a change."""
+    report.changed_partitions = [_partition_dict(report, values) for values in sorted(touched)]
+    if not touched:
+        return
+    seen: Set[PartitionKey] = set()
+    writer = ChunkWriter(str(Path(output_dir) / DELTA_NAME), encoding="utf-8-sig") if output_dir else None
+    try:
+        for chunk in _frame(report.new, max_memory).iter_chunks():
+            keys = _partition_keys(chunk, report.partition_by)
+            mask = keys.isin(list(touched))
+            seen.update(keys[mask])
+            if writer is not None:
+                writer.write(chunk[mask])
+    finally:
+        if writer is not None:
+            writer.close()
+            report.files["delta"] = writer.path.as_posix()
+    report.emptied_partitions = [_partition_dict(report, values) for values in sorted(touched - seen)]
+    if report.emptied_partitions:
+        logger.warning(
+            "%d partitions have no rows left in %s; pass the report to an incremental build to delete them",
+            len(report.emptied_partitions),
+            report.new,
+        )
+
+
+def _partition_dict(report: DiffReport, values: PartitionKey) -> Dict[str, Optional[str]]:
+    names = [spec.split(":")[-1] for spec in report.partition_by]
+    return {name: (value or None) for name, value in zip(names, values)}
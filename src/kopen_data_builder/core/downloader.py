@@ -3,40 +3,713 @@
 """
 Downloader module: Handles downloading files from a given URL to a local file path.
 This module ensures directory creation, proper error handling, and logging.
+Responses are streamed in chunks to a ``.part`` file so memory stays flat for
+multi-GB files; interrupted downloads resume with HTTP Range requests and the
+finished file is moved into place atomically. ``download_many`` fetches many
+files concurrently with pooled keep-alive connections, per-host concurrency and
+request-rate limits, and retries with exponential backoff. ``DownloadCache``
+keeps downloaded content keyed by URL and revalidates it with conditional
+requests, so unchanged sources are not transferred again.
 """
 
+import hashlib
+import json
 import logging
+import os
+import shutil
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlparse
 
 import requests
+import yaml  # type: ignore
+from requests.adapters import HTTPAdapter
+
+from kopen_data_builder.core.manifest import HASH_BLOCK_BYTES
+from kopen_data_builder.core.metrics import count, timed
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 1024 * 1024
+# (connect, read) timeouts: the read timeout applies per chunk, not to the whole download.
+DEFAULT_TIMEOUT = (10.0, 60.0)
+PROGRESS_INTERVAL = 5.0  # seconds between progress log lines
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+# Client errors worth retrying; other 4xx responses fail immediately.
+RETRYABLE_STATUS = {408, 425, 429}
+DEFAULT_CACHE_DIR = Path(os.environ.get("KOPEN_CACHE_DIR", Path.home() / ".cache" / "kopen-data-builder")) / "downloads"
+DEFAULT_CACHE_BYTES = 20 * 1024**3
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class IncompleteDownloadError(requests.RequestException):
+    """The connection ended before the announced number of bytes arrived; retrying can succeed."""
+
+
+@dataclass
+class DownloadStats:
+    """Outcome of a download: bytes received in this run, where it resumed from and how fast it was."""
+
+    path: Path
+    bytes: int = 0
+    total: Optional[int] = None
+    resumed_from: int = 0
+    seconds: float = 0.0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1024**2 / self.seconds if self.seconds else 0.0
+
+
+def _part_paths(path: Path) -> Tuple[Path, Path]:
+    """The partial download file and the sidecar holding the validators it was started with."""
+    return path.with_name(path.name + ".part"), path.with_name(path.name + ".part.json")
+
+
+def _load_validator(meta_path: Path, url: str) -> Optional[str]:
+    if not meta_path.exists():
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    return meta.get("validator") if meta.get("url") == url else None
+
+
+def _save_validator(meta_path: Path, url: str, response: requests.Response) -> None:
+    # A strong ETag (or Last-Modified) lets the server refuse to resume if the file changed meanwhile.
+    etag = response.headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    meta_path.write_text(json.dumps({"url": url, "validator": validator}), encoding="utf-8")
 
-def download_data(url: str, output_path: Union[str, Path]) -> None:
+
+def _content_range_start(response: requests.Response) -> Optional[int]:
+    value = response.headers.get("Content-Range", "")
+    if not value.startswith("bytes ") or "-" not in value:
+        return None
+    try:
+        return int(value[len("bytes ") :].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def download_data(
+    url: str,
+    output_path: Union[str, Path],
+    resume: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    session: Optional[requests.Session] = None,
+    headers: Optional[Dict[str, str]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> DownloadStats:
     """
     Download data from a URL and save it to the specified output path.
 
+    The body is streamed to ``<output>.part`` and renamed to ``output_path`` once
+    complete. If a ``.part`` file from an earlier attempt exists, only the missing
+    bytes are requested with a ``Range`` header (guarded by ``If-Range``); servers
+    that ignore ranges or report a changed file trigger a clean restart.
+
     Args:
         url (str): The URL of the file to download.
         output_path (str | Path): The local file path to save the downloaded file.
+        resume (bool): Continue from an existing ``.part`` file instead of starting over.
+        chunk_size (int): Bytes read from the socket and written per iteration.
+        timeout (tuple): ``(connect, read)`` timeouts in seconds; the read timeout is per chunk.
+        session (requests.Session, optional): Session to reuse pooled connections from.
+        headers (dict, optional): Extra request headers.
+        progress (callable, optional): Called as ``progress(done_bytes, total_bytes)`` after each chunk.
+
+    Returns:
+        DownloadStats: Bytes received, total size, resume offset, throughput and the
+        response validators. ``not_modified`` is set (and nothing is written) when a
+        conditional request in ``headers`` was answered with 304.
 
     Raises:
         HTTPError: If the HTTP request returns an unsuccessful status code.
         RequestException: For general network-related errors during the download.
+        IncompleteDownloadError: If the connection closed before the announced size was received.
     """
+    with timed("download", url=url) as sample:
+        stats = _download_data(url, output_path, resume, chunk_size, timeout, session, headers, progress)
+        sample.bytes = stats.bytes
+    return stats
+
+
+def _download_data(
+    url: str,
+    output_path: Union[str, Path],
+    resume: bool,
+    chunk_size: int,
+    timeout: Tuple[float, float],
+    session: Optional[requests.Session],
+    headers: Optional[Dict[str, str]],
+    progress: Optional[ProgressCallback],
+) -> DownloadStats:
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    part_path, meta_path = _part_paths(path)
 
-    logger.info("Starting download: %s", url)
+    offset = part_path.stat().st_size if resume and part_path.exists() else 0
+    # Byte counts and Range offsets must refer to the bytes on disk, which gzip/deflate
+    # Content-Encoding would make differ from Content-Length.
+    request_headers = {"Accept-Encoding": "identity", **(headers or {})}
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+        validator = _load_validator(meta_path, url)
+        if validator:
+            request_headers["If-Range"] = validator
+        logger.info("Resuming download at %d bytes: %s", offset, url)
+    else:
+        logger.info("Starting download: %s", url)
 
+    http = session or requests.Session()
+    stats = DownloadStats(path=path)
+    started = time.monotonic()
+    encoded = False
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        with open(path, "wb") as f:
-            f.write(response.content)
-        logger.info("Download complete: %s → %s", url, path)
-    except requests.RequestException as e:
+        with http.get(url, headers=request_headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 416 and offset:
+                # The range starts at or past the end: the partial file is stale or already complete.
+                part_path.unlink(missing_ok=True)
+                return download_data(url, path, False, chunk_size, timeout, http, headers, progress)
+            response.raise_for_status()
+            stats.etag = response.headers.get("ETag")
+            stats.last_modified = response.headers.get("Last-Modified")
+            if response.status_code == 304:
+                # Conditional request (see DownloadCache): the caller's copy is current.
+                stats.not_modified = True
+                stats.seconds = time.monotonic() - started
+                logger.info("Not modified: %s", url)
+                return stats
+
+            # Some servers compress regardless of Accept-Encoding. The body is then stored
+            # decoded, as before, but cannot be resumed: its ranges count encoded bytes.
+            encoded = response.headers.get("Content-Encoding", "identity").lower() not in ("", "identity")
+            if encoded and response.status_code == 206:
+                part_path.unlink(missing_ok=True)
+                return download_data(url, path, False, chunk_size, timeout, http, headers, progress)
+            if response.status_code == 206 and _content_range_start(response) == offset:
+                mode = "ab"
+                stats.resumed_from = offset
+            else:
+                if offset:
+                    logger.info("Server did not resume the download; starting over: %s", url)
+                mode, offset = "wb", 0
+                if not encoded:
+                    _save_validator(meta_path, url, response)
+
+            length = response.headers.get("Content-Length")
+            stats.total = offset + int(length) if length is not None and not encoded else None
+
+            last_report = started
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    stats.bytes += len(chunk)
+                    done = offset + stats.bytes
+                    if progress is not None:
+                        progress(done, stats.total)
+                    now = time.monotonic()
+                    if now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        stats.seconds = now - started
+                        logger.info(
+                            "Downloaded %.1f MB%s (%.1f MB/s): %s",
+                            done / 1024**2,
+                            f" of {stats.total / 1024**2:.1f} MB" if stats.total else "",
+                            stats.mb_per_second,
+                            url,
+                        )
+            if encoded and length is not None and response.raw.tell() != int(length):
+                raise IncompleteDownloadError(
+                    f"Incomplete download of {url}: got {response.raw.tell()} of {length} encoded bytes; rerun to retry"
+                )
+    except (requests.RequestException, IOError) as e:
+        if encoded:
+            part_path.unlink(missing_ok=True)
         logger.error("Download failed: %s (%s)", url, str(e))
         raise
+    finally:
+        if session is None:
+            http.close()
+
+    received = offset + stats.bytes
+    if stats.total is not None and received != stats.total:
+        raise IncompleteDownloadError(
+            f"Incomplete download of {url}: got {received} of {stats.total} bytes; rerun to resume"
+        )
+
+    os.replace(part_path, path)
+    meta_path.unlink(missing_ok=True)
+    stats.seconds = time.monotonic() - started
+    logger.info("Download complete: %s → %s (%.1f MB, %.1f MB/s)", url, path, received / 1024**2, stats.mb_per_second)
+    return stats
+
+
+@dataclass
+class CacheEntry:
+    """What the cache knows about one URL: its validators and the content it last returned."""
+
+    url: str
+    sha256: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_used: float = 0.0
+
+
+@dataclass
+class CachedDownload:
+    """Result of ``cached_download``; ``changed`` is False when the content equals the previous run's."""
+
+    path: Path
+    sha256: str
+    changed: bool
+    from_cache: bool
+    stats: DownloadStats
+
+
+class DownloadCache:
+    """
+    Content-addressed store of downloaded files with HTTP validators per URL.
+
+    Blobs live under ``objects/<sha256>`` and are read-only. They are copies of the
+    downloaded files unless a caller opts in to hard links. ``index.json`` maps each URL to its blob,
+    ETag and Last-Modified. When the total blob size exceeds ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Args:
+            cache_dir (str | Path, optional): Cache root. Defaults to ``$KOPEN_CACHE_DIR/downloads``
+                or ``~/.cache/kopen-data-builder/downloads``.
+            max_bytes (int): Size cap for cached content.
+        """
+        self.root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CacheEntry] = self._load()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256
+
+    def _load(self) -> Dict[str, CacheEntry]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+            return {url: CacheEntry(**entry) for url, entry in raw.get("entries", {}).items()}
+        except (ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable download cache index %s: %s", self.index_path, e)
+            return {}
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = {"version": 1, "entries": {url: entry.__dict__ for url, entry in self._entries.items()}}
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """The entry for ``url`` if its content is still present in the cache."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None or not self.blob_path(entry.sha256).exists():
+            return None
+        return entry
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        """``If-None-Match`` / ``If-Modified-Since`` headers that revalidate ``entry``."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def touch(self, url: str) -> None:
+        """Mark ``url`` as used now, for LRU eviction."""
+        with self._lock:
+            if url in self._entries:
+                self._entries[url].last_used = time.time()
+                self._save()
+
+    def store(self, url: str, path: Path, sha256: str, stats: DownloadStats, link: bool = False) -> CacheEntry:
+        """
+        Add the freshly downloaded ``path`` under ``url`` and evict old entries beyond the size cap.
+
+        The blob is a copy of ``path`` unless ``link`` is set; a hard link shares the inode,
+        so ``path`` then becomes read-only too.
+        """
+        blob = self.blob_path(sha256)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(blob.name + ".tmp")
+            tmp.unlink(missing_ok=True)
+            if link:
+                _link_or_copy(path, tmp)
+            else:
+                shutil.copyfile(path, tmp)
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, blob)
+        entry = CacheEntry(
+            url=url,
+            sha256=sha256,
+            size=path.stat().st_size,
+            etag=stats.etag,
+            last_modified=stats.last_modified,
+            last_used=time.time(),
+        )
+        with self._lock:
+            self._entries[url] = entry
+            self._evict()
+            self._save()
+        return entry
+
+    def _evict(self) -> None:
+        blobs: Dict[str, int] = {}
+        for entry in self._entries.values():
+            blobs[entry.sha256] = entry.size
+        total = sum(blobs.values())
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            del self._entries[entry.url]
+            if all(other.sha256 != entry.sha256 for other in self._entries.values()):
+                self.blob_path(entry.sha256).unlink(missing_ok=True)
+                total -= entry.size
+            logger.debug("Evicted %s from the download cache", entry.url)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link ``source`` to ``target``, copying when linking is not possible (e.g. across devices)."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _materialize(blob: Path, path: Path, link: bool) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and os.path.samefile(blob, path):
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    if link:
+        _link_or_copy(blob, tmp)
+    else:
+        shutil.copyfile(blob, tmp)
+    os.replace(tmp, path)
+
+
+def cached_download(
+    url: str,
+    output_path: Union[str, Path],
+    cache: DownloadCache,
+    link: bool = False,
+    **kwargs: Any,
+) -> CachedDownload:
+    """
+    Download ``url`` through ``cache``, revalidating a cached copy with a conditional request.
+
+    On ``304 Not Modified`` the cached content is placed at ``output_path`` without
+    transferring it again (copied, or hard-linked when ``link`` is True); if
+    conditional ``headers`` from the caller match but nothing is cached, the file is
+    fetched again without them. On a fresh download the content is hashed and added
+    to the cache. ``changed`` tells downstream stages whether the content differs from
+    what this URL returned before.
+
+    Args:
+        url (str): The URL of the file to download.
+        output_path (str | Path): The local file path to save the file at.
+        cache (DownloadCache): Cache to revalidate against and store into.
+        link (bool): Hard-link the output and the cached content instead of copying them.
+            This saves disk space, but linked outputs are read-only and share the cache's inode.
+        **kwargs: Passed through to ``download_data`` (e.g. ``session``, ``timeout``).
+
+    Returns:
+        CachedDownload: Output path, content hash and whether it changed or came from the cache.
+    """
+    path = Path(output_path)
+    entry = cache.lookup(url)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        headers.update(cache.conditional_headers(entry))
+
+    stats = download_data(url, path, headers=headers, **kwargs)
+    if stats.not_modified and entry is not None:
+        _materialize(cache.blob_path(entry.sha256), path, link)
+        cache.touch(url)
+        count("download_cache_hits")
+        return CachedDownload(path=path, sha256=entry.sha256, changed=False, from_cache=True, stats=stats)
+    if stats.not_modified:
+        # The caller's own conditional headers matched, but there is no cached copy to restore.
+        logger.info("Not modified but not cached; downloading unconditionally: %s", url)
+        headers = {k: v for k, v in headers.items() if k.lower() not in ("if-none-match", "if-modified-since")}
+        stats = download_data(url, path, headers=headers, **kwargs)
+
+    sha256 = _sha256(path)
+    cache.store(url, path, sha256, stats, link=link)
+    changed = entry is None or entry.sha256 != sha256
+    return CachedDownload(path=path, sha256=sha256, changed=changed, from_cache=False, stats=stats)
+
+
+@dataclass
+class HostLimits:
+    """Politeness limits applied to every request sent to one host."""
+
+    max_connections: int = 4
+    requests_per_second: Optional[float] = None
+
+
+@dataclass
+class DownloadJob:
+    """One URL to fetch and the local path to store it at."""
+
+    url: str
+    output_path: Path
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one job in ``download_many``."""
+
+    url: str
+    output_path: Path
+    stats: Optional[DownloadStats] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    changed: bool = True
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class HostPool:
+    """Keep-alive session, concurrency slots and request pacing shared by all requests to one host."""
+
+    limits: HostLimits
+    session: requests.Session = field(default_factory=requests.Session)
+    slots: threading.BoundedSemaphore = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _next_request: float = 0.0
+
+    def __post_init__(self) -> None:
+        size = max(1, self.limits.max_connections)
+        self.slots = threading.BoundedSemaphore(size)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def throttle(self) -> None:
+        """Block until the next request to this host is allowed by ``requests_per_second``."""
+        if not self.limits.requests_per_second:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request)
+            self._next_request = start + 1.0 / self.limits.requests_per_second
+        if start > now:
+            time.sleep(start - now)
+
+
+def retry_delay(error: Exception, attempt: int, backoff: float) -> Optional[float]:
+    """Seconds to wait before retrying after ``error``, or None if it is not retryable."""
+    response = getattr(error, "response", None)
+    if isinstance(error, requests.HTTPError) and response is not None:
+        status = response.status_code
+        if status < 500 and status not in RETRYABLE_STATUS:
+            return None
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return float(backoff * 2 ** (attempt - 1))
+
+
+def download_many(
+    jobs: Sequence[DownloadJob],
+    max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    host_limits: Optional[Dict[str, HostLimits]] = None,
+    default_limits: Optional[HostLimits] = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    resume: bool = True,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    cache: Optional[DownloadCache] = None,
+) -> List[DownloadResult]:
+    """
+    Download many files concurrently with per-host politeness limits.
+
+    Each host gets one ``requests.Session`` whose connection pool is sized to its
+    connection limit, so consecutive files reuse keep-alive connections. Requests to a
+    host are additionally paced to ``requests_per_second``. Network and HTTP errors are
+    retried with exponential backoff (honouring ``Retry-After``) and resume from the partial
+    file; the host slot is released while waiting. Local I/O errors (disk full, permissions)
+    fail the job at once.
+
+    Args:
+        jobs (Sequence[DownloadJob]): URLs and their target paths.
+        max_workers (int): Total concurrent downloads across all hosts.
+        host_limits (dict, optional): Limits per host name, e.g. ``{"apis.data.go.kr": HostLimits(2, 1.0)}``.
+        default_limits (HostLimits, optional): Limits for hosts without an explicit entry.
+        retries (int): Extra attempts per file after the first failure.
+        backoff (float): Base delay in seconds, doubled after every failed attempt.
+        resume (bool): Resume partial files left by earlier attempts or runs.
+        timeout (tuple): ``(connect, read)`` timeouts in seconds.
+        cache (DownloadCache, optional): Revalidate and store files through this cache
+            (see ``cached_download``); ``DownloadResult.changed`` then reports unchanged inputs.
+
+    Returns:
+        List[DownloadResult]: One result per job, in input order. Failures are reported, not raised.
+    """
+    host_limits = host_limits or {}
+    default_limits = default_limits or HostLimits()
+    pools: Dict[str, HostPool] = {}
+    for job in jobs:
+        host = urlparse(job.url).netloc
+        if host not in pools:
+            pools[host] = HostPool(host_limits.get(host, default_limits))
+
+    def fetch(job: DownloadJob) -> DownloadResult:
+        pool = pools[urlparse(job.url).netloc]
+        result = DownloadResult(url=job.url, output_path=job.output_path)
+        while True:
+            result.attempts += 1
+            with pool.slots:
+                pool.throttle()
+                try:
+                    if cache is None:
+                        result.stats = download_data(
+                            job.url, job.output_path, resume=resume, timeout=timeout, session=pool.session
+                        )
+                    else:
+                        cached = cached_download(
+                            job.url, job.output_path, cache, resume=resume, timeout=timeout, session=pool.session
+                        )
+                        result.stats, result.changed = cached.stats, cached.changed
+                    return result
+                except requests.RequestException as e:
+                    error = e
+                except OSError as e:
+                    # Local failures such as ENOSPC or EACCES do not go away by retrying.
+                    result.error = str(e)
+                    return result
+            delay = retry_delay(error, result.attempts, backoff)
+            if delay is None or result.attempts > retries:
+                result.error = str(error)
+                return result
+            logger.warning("Retrying %s in %.1fs (attempt %d): %s", job.url, delay, result.attempts, error)
+            time.sleep(delay)
+
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(fetch, jobs))
+    finally:
+        for pool in pools.values():
+            pool.session.close()
+
+    elapsed = time.monotonic() - started
+    received = sum(r.stats.bytes for r in results if r.stats is not None)
+    logger.info(
+        "✅ Downloaded %d/%d files, %.1f MB in %.1fs (%.1f MB/s)",
+        sum(r.ok for r in results),
+        len(results),
+        received / 1024**2,
+        elapsed,
+        received / 1024**2 / elapsed if elapsed else 0.0,
+    )
+    return results
+
+
+def load_download_manifest(
+    manifest_path: Union[str, Path], output_dir: Optional[Union[str, Path]] = None
+) -> Tuple[List[DownloadJob], Dict[str, HostLimits], HostLimits]:
+    """
+    Read a YAML download manifest.
+
+    Example::
+
+        output_dir: ./raw
+        defaults: {max_connections: 4}
+        hosts:
+          apis.data.go.kr: {max_connections: 2, requests_per_second: 1}
+        files:
+          - https://example.org/bike_2023_01.csv
+          - url: https://example.org/bike_2023_02.csv
+            output: 2023/02.csv
+
+    Outputs are relative to ``output_dir`` (argument, manifest key, or the manifest's
+    directory, in that order) and default to the last segment of the URL path.
+
+    Returns:
+        Tuple: Jobs, per-host limits and the default limits.
+
+    Raises:
+        ValueError: If the manifest is malformed.
+    """
+    path = Path(manifest_path)
+    raw: Dict[str, Any] = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict) or not isinstance(raw.get("files"), list):
+        raise ValueError(f"Download manifest {path} must contain a 'files' list")
+
+    base = Path(output_dir or raw.get("output_dir") or path.parent)
+    if not base.is_absolute() and output_dir is None and raw.get("output_dir"):
+        base = path.parent / base
+
+    jobs = parse_download_entries(raw["files"], base)
+    try:
+        defaults = HostLimits(**(raw.get("defaults") or {}))
+        hosts = {host: HostLimits(**limits) for host, limits in (raw.get("hosts") or {}).items()}
+    except TypeError as e:
+        raise ValueError(f"Invalid host limits in {path}: {e}") from e
+    return jobs, hosts, defaults
+
+
+def parse_download_entries(entries: List[Any], base: Union[str, Path]) -> List[DownloadJob]:
+    """
+    Turn manifest ``files`` entries (URL strings or ``{url, output}`` mappings) into jobs.
+
+    Outputs are relative to ``base`` and default to the last segment of the URL path.
+
+    Raises:
+        ValueError: If an entry has no URL or no file name can be derived from it.
+    """
+    jobs: List[DownloadJob] = []
+    for item in entries:
+        entry = {"url": item} if isinstance(item, str) else item
+        if not isinstance(entry, dict) or "url" not in entry:
+            raise ValueError(f"Invalid download manifest entry: {item!r}")
+        name = entry.get("output") or unquote(Path(urlparse(entry["url"]).path).name)
+        if not name:
+            raise ValueError(f"Cannot derive a file name from {entry['url']}; set 'output'")
+        jobs.append(DownloadJob(url=entry["url"], output_path=Path(base) / name))
+    return jobs
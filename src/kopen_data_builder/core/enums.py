@@ -53,3 +53,17 @@ class SizeCategory(str, Enum):
     n_100k_to_1m = "100K<n<1M"
     n_1m_to_10m = "1M<n<10M"
     n_gt_10m = "n>10M"
+
+    @classmethod
+    def from_count(cls, rows: int) -> "SizeCategory":
+        """Pick the Hugging Face size category for a row count."""
+        for limit, category in (
+            (1_000, cls.n_lt_1k),
+            (10_000, cls.n_1k_to_10k),
+            (100_000, cls.n_10k_to_100k),
+            (1_000_000, cls.n_100k_to_1m),
+            (10_000_000, cls.n_1m_to_10m),
+        ):
+            if rows < limit:
+                return category
+        return cls.n_gt_10m
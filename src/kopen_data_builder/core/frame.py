@@ -0,0 +1,291 @@
+# src/kopen_data_builder/core/frame.py
+
+"""
+Frame module: Fluent, lazy SDK for building datasets programmatically.
+Each method returns a new frame describing one more step; nothing is read until a
+terminal method (``collect``, ``to_csv``, ``to_dir``, ``to_hf_repo``) runs the
+optimized plan on the chunked engine. ``explain`` shows the plan that would run.
+With ``max_memory`` chunks are sized to a memory budget, and dedup and split spill to
+temporary files instead of holding the whole table.
+
+Example::
+
+    import kopen_data_builder as kopen
+
+    (
+        kopen.scan("raw.csv")
+        .preprocess()
+        .filter("시도명", "==", "서울특별시")
+        .dedup()
+        .split(train=0.8, test=0.2)
+        .to_hf_repo("seoul-permits", "./hf_repo")
+    )
+"""
+
+import logging
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from kopen_data_builder.core.io import CSV_CHUNK_ROWS, write_csv, write_csv_chunks
+from kopen_data_builder.core.memory import parse_memory_size
+from kopen_data_builder.core.partitioning import DEFAULT_MAX_OPEN_FILES
+from kopen_data_builder.core.plan import (
+    Dedup,
+    Filter,
+    Limit,
+    LogicalPlan,
+    MapChunks,
+    Op,
+    Predicate,
+    Preprocess,
+    Sample,
+    Scan,
+    Select,
+    execute,
+    optimize,
+)
+from kopen_data_builder.core.sampling import DEFAULT_SEED, SampleReport, check_sample_options
+from kopen_data_builder.core.splitter import split_chunks, split_dataset, write_splits
+
+if TYPE_CHECKING:
+    from kopen_data_builder.core.models import DatasetMeta
+
+logger = logging.getLogger(__name__)
+
+
+def scan(
+    source: str,
+    encoding: Optional[str] = None,
+    sheet_name: Optional[str] = None,
+    chunk_rows: Optional[int] = CSV_CHUNK_ROWS,
+    cache: bool = False,
+    max_memory: Optional[Union[int, str]] = None,
+) -> "LazyFrame":
+    """
+    Start a lazy plan reading ``source``.
+
+    Args:
+        source (str): CSV path or http(s) URL, Excel workbook, Parquet file or
+            (Hive-partitioned) directory, or Arrow dataset directory.
+        encoding (str, optional): CSV encoding; detected when omitted.
+        sheet_name (str, optional): Excel sheet to read.
+        chunk_rows (int, optional): Rows per chunk; ``None`` reads the whole table at once.
+        cache (bool): Keep a copy of URL sources in the download cache.
+        max_memory (int or str, optional): Memory budget in bytes or as a size like ``4GB``.
+            Chunks are then sized from a sample of the source instead of ``chunk_rows``.
+
+    Returns:
+        LazyFrame: A frame that has not read anything yet.
+    """
+    budget = parse_memory_size(max_memory) if max_memory is not None else None
+    return LazyFrame(
+        LogicalPlan(
+            Scan(
+                source,
+                encoding=encoding,
+                sheet_name=sheet_name,
+                chunk_rows=chunk_rows,
+                cache=cache,
+                max_memory=budget,
+            )
+        )
+    )
+
+
+@dataclass(frozen=True)
+class LazyFrame:
+    """An unevaluated table: a scan and the operations to apply to it."""
+
+    plan: LogicalPlan
+
+    def _then(self, op: Op) -> "LazyFrame":
+        return LazyFrame(self.plan.then(op))
+
+    def preprocess(self, date_columns: Optional[Sequence[str]] = None) -> "LazyFrame":
+        """Normalize column names, strip strings and convert date columns (see ``preprocess_data``)."""
+        return self._then(Preprocess(tuple(date_columns) if date_columns is not None else None))
+
+    def filter(self, column: str, op: str, value: Any) -> "LazyFrame":
+        """Keep rows where ``column <op> value``; ``op`` is a comparison, ``in`` or ``not in``."""
+        return self._then(Filter((Predicate(column, op, value),)))
+
+    def select(self, *columns: str) -> "LazyFrame":
+        """Keep only ``columns``, in that order."""
+        if not columns:
+            raise ValueError("select() needs at least one column")
+        return self._then(Select(tuple(columns)))
+
+    def dedup(self, subset: Optional[Sequence[str]] = None) -> "LazyFrame":
+        """Drop duplicate rows, comparing ``subset`` columns (all by default) and keeping the first."""
+        return self._then(Dedup(tuple(subset) if subset else None))
+
+    def limit(self, rows: int) -> "LazyFrame":
+        """Keep the first ``rows`` rows."""
+        if rows < 0:
+            raise ValueError(f"limit must not be negative, got {rows}")
+        return self._then(Limit(rows))
+
+    def sample(self, n: Optional[int] = None, frac: Optional[float] = None, seed: int = DEFAULT_SEED) -> "LazyFrame":
+        """
+        Keep ``n`` random rows (reservoir sampling) or each row with probability ``frac``.
+
+        The input is still streamed once; filters and limits given later are not moved before the sample.
+        """
+        if n is None and frac is None:
+            raise ValueError("sample() needs n or frac")
+        check_sample_options(n, frac)
+        method = "reservoir" if n is not None else "bernoulli"
+        return self._then(Sample(SampleReport(method=method, size=n, fraction=frac, seed=seed)))
+
+    @property
+    def sample_report(self) -> Optional[SampleReport]:
+        """The report of the last ``sample`` step, filled in once the frame has run; None without one."""
+        reports = [op.report for op in self.plan.ops if isinstance(op, Sample)]
+        return reports[-1] if reports else None
+
+    def map_chunks(self, fn: Callable[[pd.DataFrame], pd.DataFrame], name: Optional[str] = None) -> "LazyFrame":
+        """Apply ``fn`` to every chunk; it must not depend on how rows are chunked."""
+        return self._then(MapChunks(fn, name or getattr(fn, "__name__", "fn")))
+
+    def split(self, rules: Optional[Dict[str, float]] = None, **ratios: float) -> "SplitFrame":
+        """Split into named parts by ratio, e.g. ``split(train=0.8, test=0.2)``."""
+        rules = {**(rules or {}), **ratios}
+        if not rules:
+            raise ValueError("split() needs ratios, e.g. split(train=0.8, test=0.2)")
+        return SplitFrame(self, rules)
+
+    def explain(self, optimized: bool = True) -> str:
+        """The plan as text, after optimization unless ``optimized=False``."""
+        plan: LogicalPlan = optimize(self.plan) if optimized else self.plan
+        text: str = plan.explain()
+        return text
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Run the plan, yielding result chunks as they are produced."""
+        logger.debug("Running plan:\n%s", self.explain())
+        chunks: Iterator[pd.DataFrame] = execute(self.plan)
+        return chunks
+
+    def collect(self) -> pd.DataFrame:
+        """Run the plan into one DataFrame with a fresh ``RangeIndex``."""
+        chunks = list(self.iter_chunks())
+        if len(chunks) == 1:
+            return chunks[0].reset_index(drop=True)
+        return pd.concat(chunks, ignore_index=True)
+
+    def to_csv(self, path: str, encoding: str = "utf-8", engine: Optional[str] = None) -> int:
+        """
+        Run the plan into a CSV.
+
+        Without ``engine`` chunks are appended as they are produced; with one (see
+        ``write_csv``) the result is collected first.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if engine is None:
+            rows: int = write_csv_chunks(self.iter_chunks(), path, encoding=encoding)
+            return rows
+        df = self.collect()
+        write_csv(df, path, encoding=encoding, engine=engine)
+        return len(df)
+
+
+@dataclass(frozen=True)
+class SplitFrame:
+    """
+    A lazy frame to be split by ratio.
+
+    Splitting needs every row, so the frame is collected, unless it was scanned with
+    ``max_memory``: then rows are shuffled through spill files (see ``split_chunks``).
+    """
+
+    frame: LazyFrame
+    rules: Dict[str, float]
+
+    def explain(self, optimized: bool = True) -> str:
+        ratios = ", ".join(f"{name}={ratio}" for name, ratio in self.rules.items())
+        lines = self.frame.explain(optimized).splitlines()
+        return "\n".join([f"split({ratios})", *("  " + line for line in lines)])
+
+    def collect(self) -> Dict[str, pd.DataFrame]:
+        """Run the plan and split the result."""
+        splits: Dict[str, pd.DataFrame] = split_dataset(self.frame.collect(), self.rules)
+        return splits
+
+    def to_dir(
+        self,
+        output_dir: str,
+        output_format: str = "csv",
+        partition_by: Optional[Sequence[str]] = None,
+        encoding: str = "utf-8",
+        csv_engine: str = "pandas",
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    ) -> Dict[str, Path]:
+        """Write the splits like ``kopen split split`` (see ``write_splits``)."""
+        max_memory = self.frame.plan.scan.max_memory
+        if max_memory is not None:
+            streamed: Dict[str, Path] = split_chunks(
+                self.frame.iter_chunks(),
+                self.rules,
+                output_dir,
+                max_memory,
+                output_format=output_format,
+                partition_by=partition_by,
+                encoding=encoding,
+                max_open_files=max_open_files,
+            )
+            return streamed
+        outputs: Dict[str, Path] = write_splits(
+            self.collect(),
+            output_dir,
+            output_format=output_format,
+            partition_by=partition_by,
+            encoding=encoding,
+            csv_engine=csv_engine,
+            max_open_files=max_open_files,
+        )
+        return outputs
+
+    def to_hf_repo(
+        self,
+        dataset_name: str,
+        output_dir: str,
+        metadata: Optional["DatasetMeta"] = None,
+        output_format: str = "csv",
+        partition_by: Optional[List[str]] = None,
+        csv_engine: str = "pandas",
+    ) -> Path:
+        """Write the splits as a Hugging Face dataset repository (see ``prepare_hf_repository``)."""
+        from kopen_data_builder.core.builder import build_repository, prepare_hf_repository
+
+        max_memory = self.frame.plan.scan.max_memory
+        if max_memory is not None:
+            # Stage the splits on disk, then stream them into the repository.
+            with tempfile.TemporaryDirectory(prefix="kopen-splits-") as staging:
+                splits = self.to_dir(staging, output_format="parquet")
+                build_repository(
+                    {name: str(path) for name, path in splits.items()},
+                    dataset_name,
+                    output_dir,
+                    metadata=metadata,
+                    output_format=output_format,
+                    partition_by=partition_by,
+                    max_memory=max_memory,
+                )
+            return Path(output_dir)
+
+        prepare_hf_repository(
+            dataset_name,
+            self.collect(),
+            output_dir,
+            metadata=metadata,
+            output_format=output_format,
+            partition_by=partition_by,
+            csv_engine=csv_engine,
+        )
+        return Path(output_dir)
@@ -1,16 +1,91 @@
+import codecs
+import csv
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from kopen_data_builder.core.enums import SizeCategory
+from kopen_data_builder.core.metrics import timed
+
+if TYPE_CHECKING:
+    from datasets import Dataset, DatasetDict
+
+logger = logging.getLogger(__name__)
+
+ARROW_DATASET_MARKERS = ("dataset_dict.json", "dataset_info.json", "state.json")
+CSV_ENGINES = ("pandas", "chunked", "arrow")
+CSV_CHUNK_ROWS = 100_000
+SNIFF_BYTES = 64 * 1024
+SNIFF_LINES = 50
+SCAN_BLOCK_BYTES = 16 * 1024 * 1024
+SAMPLE_WINDOWS = 8
+MIN_WINDOW_BYTES = 4096
+CANDIDATE_ENCODINGS = ("utf-8", "cp949")
+CANDIDATE_DELIMITERS = ",\t;|"
+RECORD_SUFFIXES = {".xml": "xml", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+TRANSCODE_BLOCK_BYTES = 4 * 1024 * 1024
+TRANSCODE_ERRORS = ("strict", "replace", "ignore", "backslashreplace")
+
+
+@dataclass
+class TableStats:
+    """Row count, size and dialect of a delimited text file, gathered without parsing it."""
+
+    path: str
+    size_bytes: int
+    rows: int
+    exact: bool
+    encoding: str
+    delimiter: str
+    header: List[str] = field(default_factory=list)
+
+    @property
+    def size_category(self) -> SizeCategory:
+        return SizeCategory.from_count(self.rows)
+
+
+def record_format(name: str) -> Optional[str]:
+    """``xml``, ``json`` or ``jsonl`` if ``name`` (a path or URL path, maybe ending in ``.gz``) is a record file."""
+    path = Path(name.lower())
+    if path.suffix == ".gz":
+        path = path.with_suffix("")
+    return RECORD_SUFFIXES.get(path.suffix)
+
 
 def read_table(path: str, encoding: Optional[str] = None, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    with timed("read", path=str(path)) as sample:
+        df = _read_table(path, encoding, sheet_name)
+        sample.rows = len(df)
+    return df
+
+
+def _read_table(path: str, encoding: Optional[str], sheet_name: Optional[str]) -> pd.DataFrame:
     file_path = Path(path)
     suffix = file_path.suffix.lower()
 
+    if is_arrow_dataset(file_path):
+        return read_arrow_dataset(file_path).to_pandas()
+
     if suffix in {".xls", ".xlsx", ".xlsm"}:
         return pd.read_excel(file_path, sheet_name=sheet_name)
 
+    if record_format(str(path)) is not None:
+        from kopen_data_builder.core.records import read_records
+
+        return read_records(file_path, encoding=encoding)
+
     if encoding is not None:
         return pd.read_csv(file_path, encoding=encoding)
 
@@ -25,7 +100,510 @@ def read_table(path: str, encoding: Optional[str] = None, sheet_name: Optional[s
     raise ValueError(f"Failed to read file with supported encodings: {last_error}")
 
 
-def write_csv(df: pd.DataFrame, path: str) -> None:
+def write_csv(
+    df: pd.DataFrame,
+    path: str,
+    encoding: str = "utf-8",
+    engine: str = "pandas",
+    float_format: Optional[str] = None,
+    date_format: Optional[str] = None,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Write a DataFrame to CSV without the index.
+
+    Engines:
+        - ``pandas`` (default): a single ``DataFrame.to_csv`` call.
+        - ``chunked``: row chunks are formatted on background threads while the calling
+          thread writes finished chunks, overlapping formatting with disk I/O. Output is
+          byte-identical to ``pandas``.
+        - ``arrow``: ``pyarrow.csv`` multithreaded writer. Several times faster, but values are
+          formatted the Arrow way (e.g. ``1.0`` becomes ``1``); utf-8/utf-8-sig only and no
+          ``float_format``.
+
+    Args:
+        df (pd.DataFrame): Data to write.
+        path (str): Output file path; parent directories are created.
+        encoding (str): Output encoding, e.g. ``utf-8``, ``utf-8-sig`` or ``cp949``.
+        engine (str): One of ``CSV_ENGINES``.
+        float_format (str, optional): printf-style float format, e.g. ``%.2f``.
+        date_format (str, optional): strftime format for datetime columns.
+        chunk_rows (int): Rows formatted per chunk by the ``chunked`` engine.
+        max_workers (int, optional): Formatting threads for the ``chunked`` engine (default 2).
+
+    Raises:
+        ValueError: If the engine is unknown or cannot honour the requested options.
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unsupported CSV engine '{engine}'. Choose one of: {', '.join(CSV_ENGINES)}")
+
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+
+    with timed("write", engine=engine) as sample:
+        if engine == "arrow":
+            _write_csv_arrow(df, output_path, encoding, float_format, date_format)
+        elif engine == "chunked":
+            _write_csv_chunked(df, output_path, encoding, float_format, date_format, chunk_rows, max_workers)
+        else:
+            df.to_csv(output_path, index=False, encoding=encoding, float_format=float_format, date_format=date_format)
+        sample.rows, sample.bytes = len(df), output_path.stat().st_size
+
+
+def write_csv_chunks(chunks: Iterable[pd.DataFrame], path: Union[str, Path], encoding: str = "utf-8") -> int:
+    """
+    Write a stream of DataFrame chunks to one CSV as they arrive.
+
+    The file is written through a single handle so the header and any BOM appear once.
+    Chunks are aligned to the first chunk's columns; columns that only appear later are dropped.
+
+    Returns:
+        int: Number of rows written.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    columns: Optional[List[str]] = None
+    with open(target, "w", encoding=encoding, newline="") as f:
+        for chunk in chunks:
+            header = columns is None
+            if columns is None:
+                columns = list(chunk.columns)
+            elif list(chunk.columns) != columns:
+                extra = [c for c in chunk.columns if c not in columns]
+                if extra:
+                    logger.warning("Dropping columns not present in the first chunk: %s", extra)
+                chunk = chunk.reindex(columns=columns)
+            chunk.to_csv(f, header=header, index=False)
+            rows += len(chunk)
+    return rows
+
+
+def _chunk_codec(encoding: str) -> Optional[Tuple[str, bytes]]:
+    """Per-chunk codec and file prefix, or None if chunks cannot be encoded independently."""
+    name = codecs.lookup(encoding).name
+    if name == "utf-8-sig":
+        return "utf-8", codecs.BOM_UTF8
+    if name.startswith(("utf-16", "utf-32")):
+        return None
+    return name, b""
+
+
+def _write_csv_chunked(
+    df: pd.DataFrame,
+    output_path: Path,
+    encoding: str,
+    float_format: Optional[str],
+    date_format: Optional[str],
+    chunk_rows: int,
+    max_workers: Optional[int],
+) -> None:
+    codec = _chunk_codec(encoding)
+    if codec is None:
+        raise ValueError(f"The chunked CSV engine cannot write stateful encoding '{encoding}'; use engine='pandas'.")
+    chunk_encoding, prefix = codec
+
+    def format_chunk(start: int) -> bytes:
+        text: str = df.iloc[start : start + chunk_rows].to_csv(
+            index=False, header=start == 0, float_format=float_format, date_format=date_format
+        )
+        return text.encode(chunk_encoding)
+
+    workers = max_workers or 2
+    pending: Deque["Future[bytes]"] = deque()
+    starts = iter(range(0, max(len(df), 1), chunk_rows))
+    with ThreadPoolExecutor(max_workers=workers) as pool, open(output_path, "wb") as f:
+        f.write(prefix)
+        # Keep a bounded number of formatted chunks in flight so memory stays flat.
+        for start in starts:
+            pending.append(pool.submit(format_chunk, start))
+            if len(pending) >= workers * 2:
+                f.write(pending.popleft().result())
+        while pending:
+            f.write(pending.popleft().result())
+
+
+def _write_csv_arrow(
+    df: pd.DataFrame,
+    output_path: Path,
+    encoding: str,
+    float_format: Optional[str],
+    date_format: Optional[str],
+) -> None:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+
+    codec = codecs.lookup(encoding).name
+    if codec not in ("utf-8", "utf-8-sig"):
+        raise ValueError(f"The arrow CSV engine only writes utf-8 or utf-8-sig, not '{encoding}'.")
+    if float_format is not None:
+        raise ValueError("The arrow CSV engine does not support float_format; use engine='chunked'.")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if date_format is not None:
+        for i, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type):
+                table = table.set_column(i, field.name, pc.strftime(table.column(i), format=date_format))
+
+    with open(output_path, "wb") as f:
+        if codec == "utf-8-sig":
+            f.write(codecs.BOM_UTF8)
+        pa_csv.write_csv(table, f, pa_csv.WriteOptions(quoting_style="needed"))
+
+
+@dataclass
+class TranscodeStats:
+    """Outcome of ``transcode_file``."""
+
+    path: str
+    output: str
+    source_encoding: str
+    target_encoding: str
+    bytes_read: int = 0
+    bytes_written: int = 0
+    invalid_sequences: int = 0
+
+
+_TRANSCODE_STATE = threading.local()
+
+
+def _counting_handler(error: UnicodeError) -> Tuple[Union[str, bytes], int]:
+    # Counts invalid sequences, then handles them as the requested ``errors`` policy does.
+    _TRANSCODE_STATE.count += 1
+    result: Tuple[Union[str, bytes], int] = codecs.lookup_error(_TRANSCODE_STATE.errors)(error)
+    return result
+
+
+codecs.register_error("kopen-transcode", _counting_handler)
+
+
+def transcode_file(
+    path: Union[str, Path],
+    output: Union[str, Path],
+    to_encoding: str = "utf-8",
+    from_encoding: Optional[str] = None,
+    errors: str = "strict",
+    block_bytes: int = TRANSCODE_BLOCK_BYTES,
+) -> TranscodeStats:
+    """
+    Re-encode a text file block by block, without parsing it.
+
+    Incremental codecs carry multi-byte characters split across blocks, so memory stays
+    at about two blocks whatever the file size, and bytes such as line endings, quoting
+    and number formatting pass through unchanged. A ``utf-8-sig`` target gets one BOM and
+    a BOM in the source is dropped. A file whose ``from_encoding`` is given and matches
+    the target is copied as is; a detected one is decoded anyway, since the guess only
+    covers the first bytes.
+
+    Args:
+        path (str | Path): Source file.
+        output (str | Path): Destination file; parent directories are created.
+        to_encoding (str): Target encoding, e.g. ``utf-8`` or ``utf-8-sig`` (for Excel).
+        from_encoding (str, optional): Source encoding; detected from the first bytes when
+            omitted (a UTF-8 guess that fails later in the file is retried as cp949; with a
+            lenient ``errors`` policy the candidate with the fewest invalid sequences wins).
+        errors (str): Invalid byte sequences: ``strict`` raises, ``replace`` writes U+FFFD
+            (or ``?``), ``ignore`` drops them and ``backslashreplace`` writes ``\\xNN`` escapes.
+        block_bytes (int): Bytes read per block.
+
+    Returns:
+        TranscodeStats: Encodings, byte counts and the number of invalid sequences handled.
+
+    Raises:
+        ValueError: If ``errors`` is unknown, the source encoding cannot be detected, or
+            (with ``strict``) the source holds an invalid sequence; the byte offset is reported.
+    """
+    if errors not in TRANSCODE_ERRORS:
+        raise ValueError(f"Unsupported errors policy '{errors}'. Choose one of: {', '.join(TRANSCODE_ERRORS)}")
+    source, target = Path(path), Path(output)
+    if source.resolve() == target.resolve():
+        raise ValueError(f"Cannot transcode {source} onto itself; choose another output path")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if from_encoding is None:
+        with open(source, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+        try:
+            detected = detect_encoding(head)
+        except ValueError:
+            if errors == "strict":
+                raise
+            # Damaged input: take the candidate with the fewest invalid sequences in the head.
+            detected = min(CANDIDATE_ENCODINGS, key=lambda c: head.decode(c, errors="replace").count("\ufffd"))
+            logger.warning("%s: encoding unclear, transcoding as %s with errors='%s'", source, detected, errors)
+        try:
+            stats = _transcode(source, target, detected, to_encoding, errors, block_bytes)
+        except ValueError as e:
+            if detected != "utf-8" or not isinstance(e.__cause__, UnicodeDecodeError):
+                raise
+            logger.info("%s is not valid UTF-8 past its first bytes; retrying as cp949", source)
+            return _transcode(source, target, "cp949", to_encoding, errors, block_bytes)
+        if detected != "utf-8" or not stats.invalid_sequences:
+            return stats
+        # Lenient policies never fail, so a cp949 file with a long ASCII head comes out mangled.
+        logger.info("%s has invalid UTF-8 past its first bytes; comparing with cp949", source)
+        retry = target.with_name(target.name + ".cp949")
+        try:
+            candidate = _transcode(source, retry, "cp949", to_encoding, errors, block_bytes)
+            if candidate.invalid_sequences >= stats.invalid_sequences:
+                return stats
+            os.replace(retry, target)
+            candidate.output = str(target)
+            return candidate
+        finally:
+            retry.unlink(missing_ok=True)
+    return _transcode(source, target, from_encoding, to_encoding, errors, block_bytes, copy_same=True)
+
+
+def _transcode(
+    source: Path,
+    target: Path,
+    from_encoding: str,
+    to_encoding: str,
+    errors: str,
+    block_bytes: int,
+    copy_same: bool = False,
+) -> TranscodeStats:
+    stats = TranscodeStats(str(source), str(target), from_encoding, to_encoding)
+    with timed("transcode", path=str(source)) as sample:
+        if copy_same and codecs.lookup(from_encoding).name == codecs.lookup(to_encoding).name:
+            shutil.copyfile(source, target)
+            stats.bytes_read = stats.bytes_written = target.stat().st_size
+        else:
+            _TRANSCODE_STATE.count, _TRANSCODE_STATE.errors = 0, errors
+            handler = "strict" if errors == "strict" else "kopen-transcode"
+            decoder = codecs.getincrementaldecoder(from_encoding)(handler)
+            encoder = codecs.getincrementalencoder(to_encoding)(handler)
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                while True:
+                    block = src.read(block_bytes)
+                    final = not block
+                    pending = len(decoder.getstate()[0])
+                    try:
+                        data = encoder.encode(decoder.decode(block, final=final), final=final)
+                    except UnicodeDecodeError as e:
+                        offset = stats.bytes_read - pending + e.start
+                        raise ValueError(
+                            f"{source}: invalid {from_encoding} sequence at byte {offset}; "
+                            "use errors='replace' or 'ignore', or give the source encoding"
+                        ) from e
+                    except UnicodeEncodeError as e:
+                        raise ValueError(
+                            f"{source}: {e.object[e.start:e.end]!r} cannot be encoded as {to_encoding}"
+                        ) from e
+                    stats.bytes_read += len(block)
+                    dst.write(data)
+                    stats.bytes_written += len(data)
+                    if final:
+                        break
+            stats.invalid_sequences = _TRANSCODE_STATE.count
+            if stats.invalid_sequences:
+                logger.warning("%s: handled %d invalid sequences with '%s'", source, stats.invalid_sequences, errors)
+        sample.bytes = stats.bytes_read
+    return stats
+
+
+def transcode_files(
+    jobs: Sequence[Tuple[Union[str, Path], Union[str, Path]]],
+    to_encoding: str = "utf-8",
+    from_encoding: Optional[str] = None,
+    errors: str = "strict",
+    max_workers: Optional[int] = None,
+) -> List[TranscodeStats]:
+    """
+    Transcode many ``(path, output)`` pairs in parallel worker processes.
+
+    Decoding is CPU-bound and holds the GIL, so files are spread over processes
+    (``max_workers``, default: CPU count); a single file is transcoded in-process.
+
+    Returns:
+        List[TranscodeStats]: One entry per job, in input order.
+    """
+    options: Dict[str, Any] = {"to_encoding": to_encoding, "from_encoding": from_encoding, "errors": errors}
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [transcode_file(path, output, **options) for path, output in jobs]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(transcode_file, path, output, **options) for path, output in jobs]
+        return [future.result() for future in futures]
+
+
+def is_arrow_dataset(path: Union[str, Path]) -> bool:
+    """Return True if ``path`` is a directory written by ``Dataset(Dict).save_to_disk``."""
+    dir_path = Path(path)
+    return dir_path.is_dir() and any((dir_path / marker).exists() for marker in ARROW_DATASET_MARKERS)
+
+
+def read_arrow_dataset(path: Union[str, Path], split: Optional[str] = None) -> "Dataset":
+    """
+    Memory-map an Arrow dataset saved with ``save_to_disk`` without re-parsing it.
+
+    Args:
+        path (str | Path): Directory of a saved ``Dataset`` or ``DatasetDict``.
+        split (str, optional): Split to select when the directory holds a ``DatasetDict``.
+            May be omitted if the dict contains a single split.
+
+    Returns:
+        Dataset: The memory-mapped dataset.
+
+    Raises:
+        ValueError: If the directory holds several splits and none matches ``split``.
+    """
+    from datasets import DatasetDict, load_from_disk
+
+    loaded: Union["Dataset", "DatasetDict"] = load_from_disk(str(path))
+    if not isinstance(loaded, DatasetDict):
+        return loaded
+
+    if split is not None and split in loaded:
+        return loaded[split]
+    if len(loaded) == 1:
+        return next(iter(loaded.values()))
+    raise ValueError(f"Arrow dataset at {path} has splits {list(loaded)}; cannot select split '{split}'.")
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Guess the encoding of a byte sample: a UTF-8 BOM, then UTF-8, then cp949.
+
+    The sample may end in the middle of a multi-byte character.
+
+    Raises:
+        ValueError: If no supported encoding decodes the sample.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for candidate in CANDIDATE_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(candidate)().decode(sample, final=False)
+            return candidate
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Could not detect encoding; tried: {', '.join(CANDIDATE_ENCODINGS)}")
+
+
+def sniff_csv(path: str, sample_bytes: int = SNIFF_BYTES) -> Tuple[str, str, List[str]]:
+    """
+    Detect the encoding, delimiter and header of a CSV file from its first bytes.
+
+    Returns:
+        Tuple[str, str, List[str]]: ``(encoding, delimiter, header)``.
+    """
+    with open(path, "rb") as f:
+        return sniff_sample(f.read(sample_bytes))
+
+
+def sniff_sample(sample: bytes) -> Tuple[str, str, List[str]]:
+    """
+    Detect the encoding, delimiter and header from the first bytes of a CSV stream.
+
+    Returns:
+        Tuple[str, str, List[str]]: ``(encoding, delimiter, header)``.
+    """
+    encoding = detect_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+    # Only sniff complete lines so a truncated last row does not confuse the dialect guess;
+    # the first lines are enough and keep csv.Sniffer's regexes cheap.
+    complete = text[: text.rfind("\n") + 1] or text
+    try:
+        head = "".join(complete.splitlines(keepends=True)[:SNIFF_LINES])
+        delimiter = csv.Sniffer().sniff(head, delimiters=CANDIDATE_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ","
+    header = next(csv.reader(io.StringIO(complete), delimiter=delimiter), [])
+    return encoding, delimiter, header
+
+
+def count_records(path: str, sample_bytes: Optional[int] = None) -> Tuple[int, bool]:
+    """
+    Count CSV records (lines not inside a quoted field), header included.
+
+    The file is memory-mapped and scanned block by block with numpy: a newline ends a
+    record only when an even number of quote characters precedes it. Both UTF-8 and
+    cp949 keep ``"`` and ``\\n`` out of multi-byte sequences, so the byte scan is safe.
+
+    Args:
+        path (str): File to scan.
+        sample_bytes (int, optional): Scan only this many bytes, taken from windows spread
+            evenly over the file, and extrapolate the total from the average record length.
+
+    Returns:
+        Tuple[int, bool]: The record count and whether it is exact.
+    """
+    size = Path(path).stat().st_size
+    if size == 0:
+        return 0, True
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if sample_bytes is None or sample_bytes >= size:
+            records, in_quotes, last_end = 0, 0, 0
+            for start in range(0, size, SCAN_BLOCK_BYTES):
+                ends, quotes = _record_ends(mm, start, min(SCAN_BLOCK_BYTES, size - start), in_quotes)
+                records += len(ends)
+                if len(ends):
+                    last_end = start + int(ends[-1]) + 1
+                in_quotes = (in_quotes + quotes) & 1
+            # A final record without a trailing newline still counts.
+            return records + (1 if last_end < size else 0), True
+
+        # Sample windows across the file: record lengths often drift (ids grow, later
+        # years have more columns filled), so the head alone is a biased estimate.
+        windows = min(SAMPLE_WINDOWS, max(1, sample_bytes // MIN_WINDOW_BYTES))
+        width = sample_bytes // windows
+        sampled_records, sampled_bytes = 0, 0
+        for i in range(windows):
+            start = (size - width) * i // max(windows - 1, 1)
+            ends, _ = _record_ends(mm, start, width, 0)
+            # Mid-file windows start inside an unknown record; measure from the first boundary.
+            if start > 0:
+                ends = ends[1:] - ends[0] if len(ends) > 1 else ends[:0]
+                span = int(ends[-1]) if len(ends) else 0
+            else:
+                span = int(ends[-1]) + 1 if len(ends) else 0
+            sampled_records += len(ends)
+            sampled_bytes += span
+
+    if sampled_records == 0:
+        return 1, False
+    return max(1, round(sampled_records * size / sampled_bytes)), False
+
+
+def _record_ends(mm: mmap.mmap, start: int, length: int, in_quotes: int) -> Tuple["np.ndarray", int]:
+    """Offsets (relative to ``start``) of record-ending newlines and the number of quotes in the block."""
+    block = np.frombuffer(mm, dtype=np.uint8, count=length, offset=start)
+    newlines = np.flatnonzero(block == 0x0A)
+    quotes = np.flatnonzero(block == 0x22)
+    del block  # release the buffer export before the mmap is closed
+    if len(quotes) == 0:
+        return (newlines if in_quotes == 0 else newlines[:0]), 0
+    parity = (np.searchsorted(quotes, newlines) + in_quotes) & 1
+    return newlines[parity == 0], len(quotes)
+
+
+def inspect_table(path: str, sample_bytes: Optional[int] = None) -> TableStats:
+    """
+    Gather row count, byte size, encoding, delimiter and header of a CSV file
+    without loading it into pandas.
+
+    Args:
+        path (str): CSV file to inspect.
+        sample_bytes (int, optional): Estimate the row count from this many bytes, sampled
+            in windows spread over the whole file (see ``count_records``), instead of
+            scanning all of it.
+
+    Returns:
+        TableStats: Statistics about the file. ``rows`` excludes the header.
+    """
+    encoding, delimiter, header = sniff_csv(path)
+    records, exact = count_records(path, sample_bytes=sample_bytes)
+    return TableStats(
+        path=str(path),
+        size_bytes=Path(path).stat().st_size,
+        rows=max(records - 1, 0),
+        exact=exact,
+        encoding=encoding,
+        delimiter=delimiter,
+        header=header,
+    )
@@ -0,0 +1,138 @@
+# src/kopen_data_builder/core/manifest.py
+
+"""
+Manifest module: Tracks content hashes of the files in a local dataset repository.
+The manifest records size, mtime, sha256 and git blob id per file so that uploads
+and verification only hash files that changed since the last run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = ".kopen"  # local bookkeeping, never uploaded
+MANIFEST_FILENAME = f"{STATE_DIR}/manifest.json"
+IGNORED_DIRS = {STATE_DIR, ".git", ".cache", "__pycache__"}
+HASH_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+@dataclass
+class FileEntry:
+    """Content fingerprint of one file, keyed by its POSIX path relative to the repository root."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    git_sha1: str
+
+
+Manifest = Dict[str, FileEntry]
+
+
+def hash_file(path: Union[str, Path]) -> Tuple[str, str]:
+    """
+    Compute the sha256 and git blob sha1 of a file in a single read.
+
+    The sha256 matches the LFS oid on the Hub, the git sha1 matches the blob id
+    reported for regular (non-LFS) files.
+
+    Returns:
+        Tuple[str, str]: ``(sha256, git_sha1)`` hex digests.
+    """
+    size = os.path.getsize(path)
+    sha256 = hashlib.sha256()
+    git_sha1 = hashlib.sha1(f"blob {size}\0".encode(), usedforsecurity=False)
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_BYTES):
+            sha256.update(block)
+            git_sha1.update(block)
+    return sha256.hexdigest(), git_sha1.hexdigest()
+
+
+def list_repo_files(repo_dir: Union[str, Path]) -> List[str]:
+    """List repository files as sorted relative POSIX paths, skipping local state and VCS/cache dirs."""
+    root = Path(repo_dir)
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+        for name in filenames:
+            files.append((Path(dirpath) / name).relative_to(root).as_posix())
+    return sorted(files)
+
+
+def load_manifest(repo_dir: Union[str, Path]) -> Manifest:
+    """Load the manifest stored in ``repo_dir``; returns an empty manifest if none exists or it is unreadable."""
+    path = Path(repo_dir) / MANIFEST_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return {rel: FileEntry(**entry) for rel, entry in raw.get("files", {}).items()}
+    except (ValueError, TypeError) as e:
+        logger.warning("Ignoring unreadable manifest %s: %s", path, e)
+        return {}
+
+
+def save_manifest(repo_dir: Union[str, Path], manifest: Manifest) -> None:
+    """Write the manifest to ``repo_dir``."""
+    path = Path(repo_dir) / MANIFEST_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": 1, "files": {rel: asdict(entry) for rel, entry in sorted(manifest.items())}}
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def build_manifest(
+    repo_dir: Union[str, Path],
+    previous: Optional[Manifest] = None,
+    max_workers: Optional[int] = None,
+) -> Manifest:
+    """
+    Fingerprint every file in ``repo_dir``.
+
+    Entries from ``previous`` are reused when size and mtime are unchanged; all other
+    files are hashed concurrently in a thread pool (hashlib releases the GIL).
+
+    Args:
+        repo_dir (str | Path): Local repository directory.
+        previous (Manifest, optional): Manifest from an earlier run.
+        max_workers (int, optional): Hashing threads. Defaults to the executor default.
+
+    Returns:
+        Manifest: Mapping of relative path to ``FileEntry``.
+    """
+    root = Path(repo_dir)
+    previous = previous or {}
+    manifest: Manifest = {}
+    to_hash: List[Tuple[str, os.stat_result]] = []
+
+    for rel in list_repo_files(root):
+        stat = (root / rel).stat()
+        cached = previous.get(rel)
+        if cached is not None and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+            manifest[rel] = cached
+        else:
+            to_hash.append((rel, stat))
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            digests = pool.map(lambda item: hash_file(root / item[0]), to_hash)
+            for (rel, stat), (sha256, git_sha1) in zip(to_hash, digests):
+                manifest[rel] = FileEntry(rel, stat.st_size, stat.st_mtime_ns, sha256, git_sha1)
+
+    logger.debug("Manifest for %s: %d files, %d hashed", root, len(manifest), len(to_hash))
+    return manifest
+
+
+def update_manifest(repo_dir: Union[str, Path], max_workers: Optional[int] = None) -> Manifest:
+    """Refresh the manifest stored in ``repo_dir``, hashing only changed files, and save it."""
+    manifest = build_manifest(repo_dir, previous=load_manifest(repo_dir), max_workers=max_workers)
+    save_manifest(repo_dir, manifest)
+    return manifest
@@ -0,0 +1,104 @@
+# src/kopen_data_builder/core/memory.py
+
+"""
+Memory module: A memory budget (``kopen --max-memory 4GB``) and the sizes derived from it.
+
+Chunks are sized from the bytes per row measured on a sample of the input, and
+operations that keep state across chunks (dedup hash sets, the shuffle behind splits)
+spill to temporary files once their share of the budget is used (see ``core.spill``).
+The CLI imports this module at startup, so it must not import pandas.
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Share of the budget for one chunk; preprocessing and writing hold a few copies of it.
+CHUNK_SHARE = 0.1
+# Share of the budget for state kept across chunks before it spills to disk.
+STATE_SHARE = 0.25
+MIN_CHUNK_ROWS = 1_000
+MAX_CHUNK_ROWS = 1_000_000
+SAMPLE_ROWS = 1_000
+
+_UNITS = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(b|[kmgt](?:i?b)?)?\s*$", re.IGNORECASE)
+
+
+def parse_memory_size(value: Union[str, int]) -> int:
+    """
+    Parse a memory size such as ``4GB``, ``512MiB``, ``1.5g`` or ``800`` into bytes.
+
+    Units are binary (``1GB`` is 1024**3 bytes) and a bare number is taken as MB.
+
+    Raises:
+        ValueError: If the value cannot be parsed or is not positive.
+    """
+    if isinstance(value, int):
+        size = value
+    else:
+        match = _SIZE.match(value)
+        if match is None:
+            raise ValueError(f"Invalid memory size '{value}'; use e.g. 4GB, 512MB or 800 (MB)")
+        number, unit = match.groups()
+        size = int(float(number) * _UNITS[(unit or "m")[0].lower()])
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive, got {value}")
+    return size
+
+
+def format_memory_size(size: int) -> str:
+    """Human-readable size, e.g. ``4.0 GB``."""
+    for unit in ("TB", "GB", "MB", "KB"):
+        scale = _UNITS[unit[0].lower()]
+        if size >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size} B"
+
+
+@dataclass
+class MemoryBudget:
+    """
+    Upper bound on the memory a command should use; ``limit_bytes=None`` means unbounded.
+
+    Attributes:
+        limit_bytes (int, optional): The budget in bytes.
+    """
+
+    limit_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit_bytes is not None
+
+    @property
+    def state_bytes(self) -> Optional[int]:
+        """Bytes that cross-chunk state may hold in memory before spilling."""
+        return int(self.limit_bytes * STATE_SHARE) if self.limit_bytes is not None else None
+
+    def chunk_rows(self, row_bytes: float) -> Optional[int]:
+        """
+        Rows per chunk so one chunk of ``row_bytes``-sized rows fits its share of the budget.
+
+        Returns:
+            int, optional: Rows per chunk, or None when the budget is unbounded.
+        """
+        if self.limit_bytes is None:
+            return None
+        rows = math.floor(self.limit_bytes * CHUNK_SHARE / max(row_bytes, 1.0))
+        chunk_rows = min(max(rows, MIN_CHUNK_ROWS), MAX_CHUNK_ROWS)
+        logger.info(
+            "Memory budget %s: ~%.0f bytes/row, reading %d rows per chunk",
+            format_memory_size(self.limit_bytes),
+            row_bytes,
+            chunk_rows,
+        )
+        return chunk_rows
+
+
+# Budget of the running CLI command, set by ``kopen --max-memory``.
+MEMORY_BUDGET = MemoryBudget()
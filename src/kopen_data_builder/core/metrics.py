@@ -0,0 +1,228 @@
+# src/kopen_data_builder/core/metrics.py
+
+"""
+Metrics module: Structured timings, counters and peak memory for pipeline stages.
+Core functions wrap their work in ``timed``, which records wall time, rows and bytes
+per call into a process-wide registry; ``count`` tracks events such as cache hits.
+The registry can stream every sample as a JSON line while a command runs and render
+an aggregated table at the end. ``Profiler`` wraps a whole command in cProfile and
+tracemalloc.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where it cannot be read."""
+    try:
+        # Unlike ru_maxrss, VmHWM is not inherited from the parent across fork and exec.
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return float(peak / 1024**2 if sys.platform == "darwin" else peak / 1024)
+
+
+@dataclass
+class StageSample:
+    """One timed call of a stage. Set ``rows`` / ``bytes`` inside the ``timed`` block."""
+
+    stage: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    peak_rss_mb: Optional[float] = None
+    labels: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StageSummary:
+    """Totals of all samples of one stage."""
+
+    stage: str
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        return self.rows / self.seconds if self.rows and self.seconds else None
+
+    @property
+    def mb_per_second(self) -> Optional[float]:
+        return self.bytes / 1024**2 / self.seconds if self.bytes and self.seconds else None
+
+
+class MetricsRegistry:
+    """Thread-safe collection of stage samples and counters, optionally streamed to a JSON lines sink."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: List[StageSample] = []
+        self.counters: Dict[str, int] = {}
+        self.sink: Optional[IO[str]] = None
+
+    def record(self, sample: StageSample) -> None:
+        with self._lock:
+            self.samples.append(sample)
+            if self.sink is not None:
+                self._emit({"type": "stage", **asdict(sample)})
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+            self.counters.clear()
+
+    def summary(self) -> List[StageSummary]:
+        """Per-stage totals, in order of first appearance."""
+        totals: Dict[str, StageSummary] = {}
+        with self._lock:
+            for sample in self.samples:
+                total = totals.setdefault(sample.stage, StageSummary(sample.stage))
+                total.calls += 1
+                total.seconds += sample.seconds
+                total.rows += sample.rows or 0
+                total.bytes += sample.bytes or 0
+        return list(totals.values())
+
+    def finish(self) -> None:
+        """Emit counters and peak RSS to the sink, if any."""
+        with self._lock:
+            if self.sink is not None:
+                self._emit({"type": "summary", "counters": dict(self.counters), "peak_rss_mb": peak_rss_mb()})
+
+    def format_table(self) -> str:
+        """Render the per-stage summary, counters and peak RSS as a fixed-width table."""
+        rows = [["stage", "calls", "seconds", "rows", "rows/s", "MB", "MB/s"]]
+        for total in self.summary():
+            rows.append(
+                [
+                    total.stage,
+                    str(total.calls),
+                    f"{total.seconds:.2f}",
+                    str(total.rows) if total.rows else "-",
+                    f"{total.rows_per_second:,.0f}" if total.rows_per_second else "-",
+                    f"{total.bytes / 1024**2:.1f}" if total.bytes else "-",
+                    f"{total.mb_per_second:.1f}" if total.mb_per_second else "-",
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+        lines.extend(f"{name}: {value}" for name, value in sorted(self.counters.items()))
+        peak = peak_rss_mb()
+        if peak is not None:
+            lines.append(f"peak RSS: {peak:.0f} MB")
+        return "\n".join(lines)
+
+    def _emit(self, payload: Dict[str, Any]) -> None:
+        assert self.sink is not None
+        self.sink.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+        self.sink.flush()
+
+
+METRICS = MetricsRegistry()
+
+
+@contextmanager
+def timed(stage: str, **labels: Any) -> Iterator[StageSample]:
+    """
+    Time a block as one sample of ``stage``.
+
+    Example::
+
+        with timed("read", path=path) as sample:
+            df = pd.read_csv(path)
+            sample.rows = len(df)
+
+    The sample is recorded even if the block raises, with ``labels["error"]`` set.
+    """
+    sample = StageSample(stage, labels=labels)
+    started = time.perf_counter()
+    try:
+        yield sample
+    except BaseException as e:
+        sample.labels["error"] = type(e).__name__
+        raise
+    finally:
+        sample.seconds = time.perf_counter() - started
+        sample.peak_rss_mb = peak_rss_mb()
+        METRICS.record(sample)
+        logger.debug("%s took %.3fs (rows=%s, bytes=%s)", stage, sample.seconds, sample.rows, sample.bytes)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment the counter ``name`` (e.g. ``download_cache_hits``)."""
+    METRICS.count(name, n)
+
+
+class Profiler:
+    """
+    cProfile and (optionally) tracemalloc around a whole command.
+
+    ``stop`` writes ``<prefix>.prof`` (open with ``python -m pstats`` or snakeviz) and,
+    with memory tracing, ``<prefix>.memory.txt``, and returns a short text report.
+    tracemalloc makes allocation-heavy code several times slower.
+    """
+
+    def __init__(self, prefix: str = "kopen-profile", memory: bool = True, top: int = 20):
+        self.prefix = prefix
+        self.memory = memory
+        self.top = top
+        self._profile: Any = None
+
+    def start(self) -> None:
+        import cProfile
+        import tracemalloc
+
+        if self.memory:
+            tracemalloc.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> str:
+        import io
+        import pstats
+        import tracemalloc
+
+        self._profile.disable()
+        self._profile.dump_stats(f"{self.prefix}.prof")
+        report = io.StringIO()
+        pstats.Stats(self._profile, stream=report).sort_stats("cumulative").print_stats(self.top)
+        lines = [f"cProfile written to {self.prefix}.prof", report.getvalue().strip()]
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats = snapshot.statistics("lineno")
+            with open(f"{self.prefix}.memory.txt", "w", encoding="utf-8") as f:
+                f.write(f"peak traced memory: {peak / 1024**2:.1f} MB\n")
+                f.writelines(f"{stat}\n" for stat in stats[:100])
+            lines.append(f"tracemalloc written to {self.prefix}.memory.txt (peak {peak / 1024**2:.1f} MB)")
+            lines.extend(str(stat) for stat in stats[:10])
+        return "\n".join(lines)
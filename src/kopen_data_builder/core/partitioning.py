@@ -0,0 +1,256 @@
+# src/kopen_data_builder/core/partitioning.py
+
+"""
+Partitioning module: Writes splits as partitioned datasets.
+Rows are grouped by one or more columns into directories such as
+``data/train/2024/03/part-0.parquet`` so incremental builds only rewrite (and
+uploads only send) the partitions they touch. The partition columns stay inside
+the files: readers that only see the files, such as ``datasets.load_dataset``,
+get every column.
+"""
+
+import logging
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FORMATS = ("parquet", "csv")
+DATE_PARTS = {"year": "{:04d}", "month": "{:02d}", "day": "{:02d}"}
+DEFAULT_MAX_OPEN_FILES = 256
+# Directory name of missing (and empty) partition values; encoded values never contain "(".
+NULL_PARTITION = "(null)"
+
+
+@dataclass
+class PartitionLayout:
+    """Describes how split files are laid out on disk, for the dataset card."""
+
+    columns: List[str]
+    file_format: str = "parquet"
+    splits: List[str] = field(default_factory=list)
+    root: str = "data"
+
+    def data_files(self, split: str) -> str:
+        """Glob matching every file of ``split`` relative to the repository root."""
+        return f"{self.root}/{split}/**/*.{self.file_format}"
+
+
+def parse_partition_by(value: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated ``--partition-by`` value.
+
+    Each entry is either a column name (e.g. ``gu``) or ``<date column>:<part>``
+    where part is one of year, month or day (e.g. ``reg_date:year,reg_date:month``).
+    """
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def partition_segment(value: Optional[str]) -> str:
+    """
+    Directory name of one partition value: URI-encoded, so ``/`` and the like are safe.
+
+    A leading ``.`` or ``_`` is encoded too: pyarrow and ``datasets`` skip such paths.
+    """
+    if value is None or pd.isna(value) or value == "":
+        return NULL_PARTITION
+    segment = quote(str(value), safe="")
+    return f"%{ord(segment[0]):02X}{segment[1:]}" if segment[0] in "._" else segment
+
+
+def partition_path(values: Sequence[Optional[str]]) -> str:
+    """Directory of one partition relative to its split, one level per partition column."""
+    return "/".join(partition_segment(value) for value in values)
+
+
+def remove_partitions(base_dir: str, partitions: Sequence[Dict[str, Optional[str]]]) -> List[str]:
+    """
+    Delete whole partitions, e.g. those a ``kopen diff`` report found emptied.
+
+    Parent directories left empty are removed as well, up to ``base_dir``.
+
+    Args:
+        base_dir (str): Directory holding the partition tree of one split.
+        partitions (Sequence[dict]): Partition values keyed by column, in directory order.
+
+    Returns:
+        List[str]: The deleted partition directories, relative to ``base_dir``.
+    """
+    base = Path(base_dir)
+    removed = []
+    for values in partitions:
+        relative = partition_path(list(values.values()))
+        target = base / relative
+        if not target.is_dir():
+            continue
+        shutil.rmtree(target)
+        removed.append(relative)
+        parent = target.parent
+        while parent != base and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    if removed:
+        logger.info("Removed %d emptied partitions from %s", len(removed), base)
+    return removed
+
+
+def add_partition_columns(df: pd.DataFrame, partition_by: Sequence[str]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Resolve partition specs against a DataFrame, deriving date parts where requested.
+
+    Args:
+        df (pd.DataFrame): Data to partition.
+        partition_by (Sequence[str]): Partition specs, see ``parse_partition_by``.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: The frame with derived columns added and the
+        ordered list of partition column names.
+
+    Raises:
+        ValueError: If a column is missing, a date part is unknown, or a derived column
+            would overwrite an existing one.
+    """
+    df = df.copy()
+    columns: List[str] = []
+    for spec in partition_by:
+        source, _, part = spec.partition(":")
+        if source not in df.columns:
+            raise ValueError(f"Partition column '{source}' not found in data")
+        if not part:
+            df[source] = df[source].astype("string")
+            columns.append(source)
+            continue
+        if part not in DATE_PARTS:
+            raise ValueError(f"Unknown date part '{part}' in '{spec}'. Allowed: {', '.join(DATE_PARTS)}")
+        if part in df.columns:
+            raise ValueError(f"Cannot derive '{part}' from '{source}': column '{part}' already exists")
+        values = getattr(pd.to_datetime(df[source], errors="coerce").dt, part)
+        df[part] = values.map(lambda v, fmt=DATE_PARTS[part]: None if pd.isna(v) else fmt.format(int(v)))
+        df[part] = df[part].astype("string")
+        columns.append(part)
+    return df, columns
+
+
+def write_partitioned(
+    df: pd.DataFrame,
+    base_dir: str,
+    partition_by: Sequence[str],
+    file_format: str = "parquet",
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    incremental: bool = False,
+    append: bool = False,
+    basename: str = "part",
+) -> List[str]:
+    """
+    Write one DataFrame as a partitioned dataset.
+
+    Each partition is a directory of URI-encoded values, one level per partition column
+    (see ``partition_path``). The partition columns, derived date parts included, are
+    also written into the files. They are deliberately not Hive ``key=value`` directories:
+    Hive readers would then find each column twice and refuse to merge the two types.
+
+    Args:
+        df (pd.DataFrame): Data to write.
+        base_dir (str): Directory that receives the partition tree.
+        partition_by (Sequence[str]): Partition specs, see ``parse_partition_by``.
+        file_format (str): ``parquet`` or ``csv``.
+        max_open_files (int): Upper bound on files held open by the writer at once.
+        incremental (bool): Only replace partitions present in ``df`` and keep all others.
+            When False, ``base_dir`` is cleared first.
+        append (bool): Add files next to the existing ones without clearing or replacing
+            anything; ``basename`` must then differ between calls.
+        basename (str): File name prefix, files are named ``<basename>-<n>.<format>``.
+
+    Returns:
+        List[str]: The partition column names, in directory order.
+
+    Raises:
+        ValueError: If the format or partition specs are invalid.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if file_format not in PARTITION_FORMATS:
+        raise ValueError(f"Unsupported partition format '{file_format}'. Choose one of: {', '.join(PARTITION_FORMATS)}")
+    if not partition_by:
+        raise ValueError("At least one partition column is required.")
+
+    frame, columns = add_partition_columns(df, partition_by)
+    # Directory names come from copies of the partition columns, which the writer drops
+    # from the files; the columns themselves are kept.
+    keys = [f"__partition_{i}" for i in range(len(columns))]
+    for key, column in zip(keys, columns):
+        values = frame[column].fillna("")
+        frame[key] = values.map({value: partition_segment(value) for value in values.unique()}).astype(str)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    target = Path(base_dir)
+    if not incremental and not append and target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True, exist_ok=True)
+
+    ds.write_dataset(
+        table,
+        str(target),
+        format=file_format,
+        partitioning=ds.DirectoryPartitioning(
+            pa.schema([table.schema.field(k) for k in keys]), segment_encoding="none"
+        ),
+        basename_template=f"{basename}-{{i}}.{file_format}",
+        existing_data_behavior="delete_matching" if incremental and not append else "overwrite_or_ignore",
+        max_open_files=max_open_files,
+        use_threads=True,
+    )
+    logger.debug("Wrote %d rows partitioned by %s to %s", len(df), columns, target)
+    return columns
+
+
+def write_partitioned_splits(
+    splits: Dict[str, pd.DataFrame],
+    base_dir: str,
+    partition_by: Sequence[str],
+    file_format: str = "parquet",
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    max_workers: Optional[int] = None,
+    incremental: bool = False,
+) -> PartitionLayout:
+    """
+    Write every split under ``base_dir/<split>/`` in parallel.
+
+    The open-file budget is shared between the concurrent split writers so the total
+    number of open handles never exceeds ``max_open_files``.
+
+    Returns:
+        PartitionLayout: Layout of the written files, relative to the parent of ``base_dir``.
+    """
+    if not splits:
+        raise ValueError("No splits provided to partition.")
+
+    workers = max(1, min(max_workers or len(splits), len(splits)))
+    per_writer = max(1, max_open_files // workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(
+                write_partitioned,
+                df,
+                str(Path(base_dir) / name),
+                partition_by,
+                file_format,
+                per_writer,
+                incremental,
+            )
+            for name, df in splits.items()
+        }
+        columns = [future.result() for future in futures.values()][0]
+
+    logger.info("✅ Partitioned %d splits by %s under %s", len(splits), columns, base_dir)
+    return PartitionLayout(columns=columns, file_format=file_format, splits=list(splits), root=Path(base_dir).name)
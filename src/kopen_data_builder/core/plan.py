@@ -0,0 +1,587 @@
+# src/kopen_data_builder/core/plan.py
+
+"""
+Plan module: Logical query plans over a table source, their optimizer and chunked executor.
+A plan is a scan followed by a chain of row-wise operations. Before running, the
+optimizer pushes filters and row limits down into the scan (into pyarrow for Parquet,
+so row groups and partitions are skipped), prunes the columns the scan reads to those
+later operations use, and fuses the chain into one function applied to each chunk as
+it is read, so no intermediate table is materialized. With a memory budget, chunks
+are sized from a sample of the source and dedup state spills to disk.
+"""
+
+import logging
+import operator
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from kopen_data_builder.core.io import CSV_CHUNK_ROWS, read_table, record_format, sniff_csv
+from kopen_data_builder.core.memory import SAMPLE_ROWS, MemoryBudget, format_memory_size
+from kopen_data_builder.core.preprocessing import normalize_column_name, preprocess_data
+from kopen_data_builder.core.sampling import SampleReport, StreamSampler
+from kopen_data_builder.core.spill import SpillingHashSet
+
+logger = logging.getLogger(__name__)
+
+COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+MEMBERSHIP = ("in", "not in")
+EXCEL_SUFFIXES = (".xls", ".xlsx", ".xlsm")
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """``column <op> value``; ``op`` is a comparison or ``in`` / ``not in`` with a collection."""
+
+    column: str
+    op: str
+    value: Any
+
+    def __post_init__(self) -> None:
+        if self.op in MEMBERSHIP:
+            if isinstance(self.value, (str, bytes)) or not hasattr(self.value, "__iter__"):
+                raise ValueError(f"'{self.op}' needs a collection of values, got {self.value!r}")
+            object.__setattr__(self, "value", tuple(self.value))
+        elif self.op not in COMPARISONS:
+            raise ValueError(f"Unsupported operator '{self.op}'; expected one of {[*COMPARISONS, *MEMBERSHIP]}")
+
+    def mask(self, df: pd.DataFrame) -> "pd.Series[bool]":
+        series = df[self.column]
+        if self.op in MEMBERSHIP:
+            found = series.isin(self.value)
+            return ~found if self.op == "not in" else found
+        result: "pd.Series[bool]" = COMPARISONS[self.op](series, self.value).fillna(False).astype(bool)
+        return result
+
+    def to_arrow(self) -> Any:
+        """The predicate as a ``pyarrow.dataset`` expression."""
+        import pyarrow.dataset as ds
+
+        field = ds.field(self.column)
+        if self.op in MEMBERSHIP:
+            found = field.isin(list(self.value))
+            return ~found if self.op == "not in" else found
+        return COMPARISONS[self.op](field, self.value)
+
+    def __str__(self) -> str:
+        return f"{self.column} {self.op} {self.value!r}"
+
+
+@dataclass(frozen=True)
+class Scan:
+    """
+    Read a CSV (local or http(s)), Excel, Parquet file or directory, or Arrow dataset.
+
+    ``chunk_rows=None`` reads the whole table as one chunk; ``cache`` keeps a copy of
+    URL sources in the download cache. ``max_memory`` (bytes) replaces ``chunk_rows``
+    with a size measured on a sample, and bounds the state of later operations.
+    ``columns``, ``filters`` and ``limit`` are normally set by the optimizer.
+    """
+
+    source: str
+    encoding: Optional[str] = None
+    sheet_name: Optional[str] = None
+    chunk_rows: Optional[int] = CSV_CHUNK_ROWS
+    cache: bool = False
+    max_memory: Optional[int] = None
+    columns: Optional[Tuple[str, ...]] = None
+    filters: Tuple[Predicate, ...] = ()
+    limit: Optional[int] = None
+
+    @property
+    def kind(self) -> str:
+        """``url``, ``excel``, ``parquet``, ``arrow``, ``xml``, ``json``, ``jsonl`` or ``csv``."""
+        if self.source.startswith(("http://", "https://")):
+            return "url"
+        path = Path(self.source)
+        if path.suffix.lower() in EXCEL_SUFFIXES:
+            return "excel"
+        records: Optional[str] = record_format(self.source)
+        if records is not None:
+            return records
+        if path.suffix.lower() == ".parquet" or (path.is_dir() and any(path.rglob("*.parquet"))):
+            return "parquet"
+        if path.is_dir():
+            return "arrow"
+        return "csv"
+
+
+@dataclass(frozen=True)
+class Preprocess:
+    """``preprocess_data`` per chunk; date columns are detected on the first chunk unless given."""
+
+    date_columns: Optional[Tuple[str, ...]] = None
+
+
+@dataclass(frozen=True)
+class Filter:
+    """Keep rows matching all predicates."""
+
+    predicates: Tuple[Predicate, ...]
+
+
+@dataclass(frozen=True)
+class Select:
+    """Keep these columns, in this order."""
+
+    columns: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Dedup:
+    """Drop rows already seen, comparing ``subset`` columns (all columns by default)."""
+
+    subset: Optional[Tuple[str, ...]] = None
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Stop after ``rows`` rows."""
+
+    rows: int
+
+
+@dataclass(frozen=True)
+class Sample:
+    """
+    Keep a random sample of the rows (see ``core.sampling``); filters and limits are not moved past it.
+
+    ``report`` is filled in while the plan runs.
+    """
+
+    report: SampleReport = field(compare=False)
+
+
+@dataclass(frozen=True)
+class MapChunks:
+    """An arbitrary chunk transform; the optimizer cannot see through it."""
+
+    fn: Callable[[pd.DataFrame], pd.DataFrame]
+    name: str
+
+
+Op = Union[Preprocess, Filter, Select, Dedup, Limit, Sample, MapChunks]
+
+
+@dataclass(frozen=True)
+class Fused:
+    """Operations applied to each chunk in a single pass."""
+
+    ops: Tuple[Op, ...]
+
+
+@dataclass(frozen=True)
+class LogicalPlan:
+    """A scan followed by row-wise operations."""
+
+    scan: Scan
+    ops: Tuple[Union[Op, Fused], ...] = ()
+
+    def then(self, op: Op) -> "LogicalPlan":
+        return replace(self, ops=(*self.ops, op))
+
+    def explain(self) -> str:
+        """One line per operation, the scan last."""
+        lines = [_describe(op) for op in reversed(self.ops)] + [_describe(self.scan)]
+        return "\n".join("  " * depth + line for depth, line in enumerate(lines))
+
+
+def _describe(node: Union[Scan, Op, Fused]) -> str:
+    if isinstance(node, Scan):
+        details = [node.kind, repr(node.source)]
+        if node.max_memory is not None:
+            details.append(f"max_memory={format_memory_size(node.max_memory)}")
+        else:
+            details.append(f"chunk_rows={node.chunk_rows}" if node.chunk_rows else "whole table")
+        if node.columns is not None:
+            details.append(f"columns=[{', '.join(node.columns)}]")
+        if node.filters:
+            details.append(f"filters=[{' AND '.join(map(str, node.filters))}]")
+        if node.limit is not None:
+            details.append(f"limit={node.limit}")
+        return "Scan " + " ".join(details)
+    if isinstance(node, Fused):
+        return "Fused per chunk: " + " -> ".join(_describe(op) for op in node.ops)
+    if isinstance(node, Preprocess):
+        return "preprocess" + (f"(dates={list(node.date_columns)})" if node.date_columns is not None else "")
+    if isinstance(node, Filter):
+        return f"filter({' AND '.join(map(str, node.predicates))})"
+    if isinstance(node, Select):
+        return f"select({', '.join(node.columns)})"
+    if isinstance(node, Dedup):
+        return f"dedup({', '.join(node.subset) if node.subset else 'all columns'})"
+    if isinstance(node, Limit):
+        return f"limit({node.rows})"
+    if isinstance(node, Sample):
+        report = node.report
+        amount = f"n={report.size}" if report.fraction is None else f"frac={report.fraction}"
+        return f"sample({report.method}, {amount}, seed={report.seed})"
+    return f"map({node.name})"
+
+
+# ---------------------------------------------------------------------------
+# Optimizer
+# ---------------------------------------------------------------------------
+
+
+def optimize(plan: LogicalPlan) -> LogicalPlan:
+    """
+    Rewrite ``plan`` for execution: push filters and limits down, prune scanned
+    columns, merge adjacent filters and fuse the remaining operations.
+    """
+    ops = [inner for op in plan.ops for inner in (op.ops if isinstance(op, Fused) else (op,))]
+    scan, ops = _push_down(plan.scan, ops)
+    scan = _prune_columns(scan, ops)
+    ops = _merge_filters(ops)
+    return LogicalPlan(scan, (Fused(tuple(ops)),) if ops else ())
+
+
+def _commutes_with_filter(predicates: Tuple[Predicate, ...], op: Op) -> bool:
+    """Whether a filter may run before ``op`` without changing the result."""
+    columns = {p.column for p in predicates}
+    if isinstance(op, Filter):
+        return True
+    if isinstance(op, Select):
+        return columns <= set(op.columns)
+    if isinstance(op, Dedup):
+        # Rows dropped as duplicates share the filtered values only if those are compared.
+        return op.subset is None or columns <= set(op.subset)
+    return False
+
+
+def _push_down(scan: Scan, ops: Sequence[Op]) -> Tuple[Scan, List[Op]]:
+    out: List[Op] = []
+    for op in ops:
+        if isinstance(op, Filter):
+            i = len(out)
+            while i > 0 and _commutes_with_filter(op.predicates, out[i - 1]):
+                i -= 1
+            # Scan filters run before the scan's limit, so only filters from before a limit may join them.
+            if i == 0 and scan.limit is None:
+                scan = replace(scan, filters=(*scan.filters, *op.predicates))
+            else:
+                out.insert(i, op)
+        elif isinstance(op, Limit):
+            # Preprocessing and projection keep every row, so a limit can run before them.
+            i = len(out)
+            while i > 0 and isinstance(out[i - 1], (Preprocess, Select)):
+                i -= 1
+            if i == 0:
+                scan = replace(scan, limit=op.rows if scan.limit is None else min(scan.limit, op.rows))
+            else:
+                out.insert(i, op)
+        else:
+            out.append(op)
+    return scan, out
+
+
+def source_columns(scan: Scan) -> Optional[List[str]]:
+    """Column names of a local CSV or Parquet source, read from its header or schema; None otherwise."""
+    try:
+        if scan.kind == "csv":
+            header: List[str] = sniff_csv(scan.source)[2]
+            return header
+        if scan.kind == "parquet":
+            import pyarrow.dataset as ds
+
+            return list(ds.dataset(scan.source, format="parquet", partitioning="hive").schema.names)
+    except (OSError, ValueError) as e:
+        logger.debug("Cannot read the columns of %s: %s", scan.source, e)
+    return None
+
+
+def _prune_columns(scan: Scan, ops: Sequence[Op]) -> Scan:
+    """Restrict the scan to the columns the operations use, walking back from the output."""
+    needed: Optional[Set[str]] = None  # None: every column
+    header: Optional[List[str]] = None
+    for op in reversed(ops):
+        if isinstance(op, Select):
+            needed = set(op.columns)
+        elif isinstance(op, MapChunks) or (isinstance(op, Dedup) and op.subset is None):
+            needed = None
+        elif needed is None:
+            continue
+        elif isinstance(op, Filter):
+            needed |= {p.column for p in op.predicates}
+        elif isinstance(op, Dedup):
+            needed |= set(op.subset or ())
+        elif isinstance(op, Preprocess):
+            header = header if header is not None else source_columns(scan)
+            if header is None:
+                return scan
+            needed = {raw for raw in header if normalize_column_name(raw) in needed}
+    if needed is None:
+        return scan
+    header = header if header is not None else source_columns(scan)
+    if header is None:
+        return scan
+    needed |= {p.column for p in scan.filters}
+    columns = tuple(c for c in header if c in needed)
+    return replace(scan, columns=columns) if len(columns) < len(header) else scan
+
+
+def _merge_filters(ops: Sequence[Op]) -> List[Op]:
+    merged: List[Op] = []
+    for op in ops:
+        if isinstance(op, Filter) and merged and isinstance(merged[-1], Filter):
+            merged[-1] = Filter((*merged[-1].predicates, *op.predicates))
+        else:
+            merged.append(op)
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+
+class _Deduplicator:
+    """
+    Streaming ``drop_duplicates``: exact within a chunk, by 64-bit row hash across chunks.
+
+    The hashes of kept rows are held as a sorted array (8 bytes per distinct row) that
+    spills to disk beyond ``max_bytes``.
+    """
+
+    def __init__(self, subset: Optional[Tuple[str, ...]], max_bytes: Optional[int] = None):
+        self.subset = list(subset) if subset else None
+        self.seen = SpillingHashSet(max_bytes)
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = chunk.drop_duplicates(subset=self.subset)
+        if chunk.empty:
+            return chunk
+        keys = chunk[self.subset] if self.subset else chunk
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+        return chunk[self.seen.add(hashes)]
+
+
+class ChunkPipeline:
+    """
+    Applies fused operations to one chunk at a time, keeping per-operation state between chunks.
+
+    ``state_bytes`` bounds the in-memory state of each stateful operation (see ``_Deduplicator``).
+    """
+
+    def __init__(self, ops: Sequence[Op], state_bytes: Optional[int] = None):
+        self.exhausted = False
+        self.state_bytes = state_bytes
+        self._steps = [self._compile(op) for op in ops]
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        for step in self._steps:
+            chunk = step(chunk)
+        return chunk
+
+    def flush(self) -> Optional[pd.DataFrame]:
+        """Rows held back by steps such as reservoir sampling, run through the steps after them."""
+        carried: Optional[pd.DataFrame] = None
+        for step in self._steps:
+            if carried is not None:
+                carried = step(carried)
+            released = step.flush() if isinstance(step, StreamSampler) else None
+            if released is not None:
+                carried = released if carried is None else pd.concat([carried, released], ignore_index=True)
+        return carried
+
+    def _compile(self, op: Op) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        if isinstance(op, Preprocess):
+            return self._preprocess(op.date_columns)
+        if isinstance(op, Filter):
+            predicates = op.predicates
+            return lambda chunk: chunk[_mask(chunk, predicates)]
+        if isinstance(op, Select):
+            columns = list(op.columns)
+            return lambda chunk: chunk[columns]
+        if isinstance(op, Dedup):
+            return _Deduplicator(op.subset, self.state_bytes)
+        if isinstance(op, Limit):
+            return self._limit(op.rows)
+        if isinstance(op, Sample):
+            sampler: Callable[[pd.DataFrame], pd.DataFrame] = StreamSampler(op.report)
+            return sampler
+        return op.fn
+
+    def _preprocess(self, date_columns: Optional[Tuple[str, ...]]) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        detected = list(date_columns) if date_columns is not None else None
+
+        def step(chunk: pd.DataFrame) -> pd.DataFrame:
+            nonlocal detected
+            cleaned = preprocess_data(chunk, date_columns=detected)
+            if detected is None and len(chunk):
+                detected = [c for c in cleaned.columns if pd.api.types.is_datetime64_any_dtype(cleaned[c])]
+            return cleaned
+
+        return step
+
+    def _limit(self, rows: int) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        remaining = rows
+
+        def step(chunk: pd.DataFrame) -> pd.DataFrame:
+            nonlocal remaining
+            chunk = chunk.iloc[: max(remaining, 0)]
+            remaining -= len(chunk)
+            if remaining <= 0:
+                self.exhausted = True
+            return chunk
+
+        return step
+
+
+def _mask(chunk: pd.DataFrame, predicates: Sequence[Predicate]) -> "np.ndarray":
+    masks = [predicate.mask(chunk).to_numpy(dtype=bool) for predicate in predicates]
+    return np.logical_and.reduce(masks) if masks else np.ones(len(chunk), dtype=bool)
+
+
+def read_chunks(scan: Scan) -> Iterator[pd.DataFrame]:
+    """Read the chunks of ``scan``, applying its filters and limit."""
+    if scan.max_memory is not None:
+        if scan.kind == "excel":
+            logger.warning("Excel sheets are read whole; the memory budget cannot bound %s", scan.source)
+        scan = replace(scan, chunk_rows=MemoryBudget(scan.max_memory).chunk_rows(estimate_row_bytes(scan)))
+    if scan.kind == "parquet":
+        yield from _read_parquet(scan)
+        return
+
+    remaining = scan.limit
+    # Without filters the reader itself can stop after the limit.
+    nrows = scan.limit if not scan.filters else None
+    for chunk in _read_source(scan, nrows):
+        if scan.filters:
+            chunk = chunk[_mask(chunk, scan.filters)]
+        if remaining is not None:
+            chunk = chunk.iloc[:remaining]
+            remaining -= len(chunk)
+        yield chunk
+        if remaining is not None and remaining <= 0:
+            return
+
+
+def estimate_row_bytes(scan: Scan, sample_rows: int = SAMPLE_ROWS) -> float:
+    """
+    In-memory bytes per row of ``scan``'s source, measured on its first ``sample_rows`` rows.
+
+    Only the columns the scan reads are counted, so pruned columns do not inflate the estimate.
+    """
+    sample_scan = replace(scan, chunk_rows=sample_rows, max_memory=None, filters=(), limit=sample_rows)
+    reader = _read_parquet(sample_scan) if scan.kind == "parquet" else _read_source(sample_scan, sample_rows)
+    sample = next(iter(reader), pd.DataFrame())
+    if hasattr(reader, "close"):
+        reader.close()
+    row_bytes: float = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+    return row_bytes
+
+
+def _read_source(scan: Scan, nrows: Optional[int]) -> Iterator[pd.DataFrame]:
+    columns = list(scan.columns) if scan.columns is not None else None
+    kind = scan.kind
+    if kind == "url":
+        from kopen_data_builder.core.downloader import DownloadCache
+        from kopen_data_builder.core.url_source import iter_url_frames
+
+        frames = iter_url_frames(
+            scan.source,
+            chunk_rows=scan.chunk_rows or CSV_CHUNK_ROWS,
+            encoding=scan.encoding,
+            cache=DownloadCache() if scan.cache else None,
+            usecols=columns,
+            nrows=nrows,
+        )
+        if scan.chunk_rows:
+            yield from frames
+        else:
+            yield pd.concat(list(frames), ignore_index=True)
+        return
+
+    if kind in ("xml", "json", "jsonl"):
+        from kopen_data_builder.core.records import iter_record_frames
+
+        yield from iter_record_frames(
+            scan.source, kind, chunk_rows=scan.chunk_rows, encoding=scan.encoding, usecols=columns, nrows=nrows
+        )
+        return
+    if columns is None and nrows is None and (kind != "csv" or not scan.chunk_rows):
+        yield read_table(scan.source, encoding=scan.encoding, sheet_name=scan.sheet_name)
+        return
+    if kind == "excel":
+        yield pd.read_excel(scan.source, sheet_name=scan.sheet_name or 0, usecols=columns, nrows=nrows)
+        return
+    if kind == "arrow":
+        df = read_table(scan.source)
+        yield (df[columns] if columns is not None else df).head(nrows) if nrows is not None else df
+        return
+
+    encoding, sep, _ = sniff_csv(scan.source)
+    options: Dict[str, Any] = {"encoding": scan.encoding or encoding, "sep": sep, "usecols": columns, "nrows": nrows}
+    if not scan.chunk_rows:
+        yield pd.read_csv(scan.source, **options)
+        return
+    with pd.read_csv(scan.source, chunksize=scan.chunk_rows, **options) as reader:
+        yield from reader
+
+
+def _read_parquet(scan: Scan) -> Iterator[pd.DataFrame]:
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(scan.source, format="parquet", partitioning="hive")
+    expression = None
+    for predicate in scan.filters:
+        expression = predicate.to_arrow() if expression is None else expression & predicate.to_arrow()
+    columns = list(scan.columns) if scan.columns is not None else None
+    if not scan.chunk_rows:
+        table = dataset.to_table(columns=columns, filter=expression)
+        yield (table.slice(0, scan.limit) if scan.limit is not None else table).to_pandas()
+        return
+    remaining = scan.limit
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=scan.chunk_rows):
+        if remaining is not None:
+            batch = batch.slice(0, remaining)
+            remaining -= batch.num_rows
+        yield batch.to_pandas()
+        if remaining is not None and remaining <= 0:
+            return
+
+
+def execute(plan: LogicalPlan) -> Iterator[pd.DataFrame]:
+    """
+    Optimize and run ``plan``, yielding result chunks.
+
+    Chunks left empty by filters are skipped, but at least one (possibly empty) chunk is
+    yielded so consumers always see the result's columns.
+    """
+    optimized = optimize(plan)
+    ops: Tuple[Op, ...] = ()
+    if optimized.ops:
+        fused = optimized.ops[0]
+        ops = fused.ops if isinstance(fused, Fused) else (fused,)
+    pipeline = ChunkPipeline(ops, MemoryBudget(optimized.scan.max_memory).state_bytes)
+    empty: Optional[pd.DataFrame] = None
+    produced = False
+    for chunk in read_chunks(optimized.scan):
+        result = pipeline(chunk)
+        if len(result):
+            produced = True
+            yield result
+        else:
+            empty = result
+        if pipeline.exhausted:
+            break
+    result = pipeline.flush()
+    if result is not None:
+        if len(result):
+            produced = True
+            yield result
+        else:
+            empty = result
+    if not produced:
+        yield empty if empty is not None else pd.DataFrame()
@@ -3,16 +3,19 @@
 """
 Preprocessing module: Contains functions for standardizing and cleaning data in pandas DataFrames.
 This module provides utilities to normalize column names, convert
-data types, and prepare data for further processing.
+data types, and prepare data for further processing, either on a whole
+DataFrame or on a stream of chunks.
 """
 
 import logging
 import re
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
 import pandas as pd
 from pandas import DataFrame, Series
 
+from kopen_data_builder.core.metrics import timed
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,7 +51,7 @@ def is_probably_date_column(series: Series) -> bool:
     return bool(success_ratio >= 0.8)
 
 
-def preprocess_data(df: DataFrame) -> DataFrame:
+def preprocess_data(df: DataFrame, date_columns: Optional[List[str]] = None) -> DataFrame:
     """
     Perform standard preprocessing on a pandas DataFrame:
     1. Normalize column names to lowercase, underscore style
@@ -57,31 +60,57 @@ def preprocess_data(df: DataFrame) -> DataFrame:
 
     Args:
         df (pd.DataFrame): The input raw DataFrame
+        date_columns (List[str], optional): Normalized names of the columns to convert
+            to datetime, skipping detection. Used to keep chunks of one stream consistent.
 
     Returns:
         pd.DataFrame: The cleaned and normalized DataFrame
     """
-    df = df.copy()
-
-    original_columns: List[str] = list(df.columns)
-    df.columns = [normalize_column_name(col) for col in original_columns]
-    logger.debug("Normalized columns from %s to %s", original_columns, list(df.columns))
-
-    # Strip whitespace from string columns
-    for col in df.select_dtypes(include=["object", "string"]).columns:
-        try:
-            df[col] = df[col].astype(str).str.strip()
-        except Exception as e:
-            logger.warning("Could not process string column '%s': %s", col, e)
-
-    # Convert date-like columns
-    for col in df.columns:
-        if not pd.api.types.is_datetime64_any_dtype(df[col]):
-            if is_probably_date_column(df[col]):
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                    logger.debug("Converted column '%s' to datetime.", col)
-                except Exception as e:
-                    logger.warning("Failed to convert column '%s' to datetime: %s", col, e)
-
-    return df
+    with timed("preprocess") as sample:
+        df = df.copy()
+
+        original_columns: List[str] = list(df.columns)
+        df.columns = [normalize_column_name(col) for col in original_columns]
+        logger.debug("Normalized columns from %s to %s", original_columns, list(df.columns))
+
+        # Strip whitespace from string columns
+        for col in df.select_dtypes(include=["object", "string"]).columns:
+            try:
+                df[col] = df[col].astype(str).str.strip()
+            except Exception as e:
+                logger.warning("Could not process string column '%s': %s", col, e)
+
+        # Convert date-like columns
+        for col in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                is_date = col in date_columns if date_columns is not None else is_probably_date_column(df[col])
+                if is_date:
+                    try:
+                        df[col] = pd.to_datetime(df[col], errors="coerce")
+                        logger.debug("Converted column '%s' to datetime.", col)
+                    except Exception as e:
+                        logger.warning("Failed to convert column '%s' to datetime: %s", col, e)
+
+        sample.rows = len(df)
+        return df
+
+
+def preprocess_chunks(chunks: Iterable[DataFrame]) -> Iterator[DataFrame]:
+    """
+    Preprocess a stream of DataFrame chunks (e.g. pages of an API) one at a time.
+
+    Date columns are detected on the first chunk and the same columns are converted
+    in every later chunk, so all chunks share one schema.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Raw chunks with the same columns.
+
+    Yields:
+        pd.DataFrame: Cleaned chunks.
+    """
+    date_columns: Optional[List[str]] = None
+    for chunk in chunks:
+        cleaned = preprocess_data(chunk, date_columns=date_columns)
+        if date_columns is None:
+            date_columns = [col for col in cleaned.columns if pd.api.types.is_datetime64_any_dtype(cleaned[col])]
+        yield cleaned
@@ -0,0 +1,406 @@
+# src/kopen_data_builder/core/records.py
+
+"""
+Records module: Streams XML, JSON and JSON Lines files as DataFrame chunks.
+XML is read with a pull parser and JSON with an incremental decoder over a sliding
+text buffer, so neither document is ever held in memory whole. Records are flattened
+(nested fields become ``parent.child`` columns). Chunked reads take a first pass over
+the field names, so every chunk has the columns of the whole document, the same as a
+single-frame read, and downstream chunked steps and writers see a stable schema.
+"""
+
+import codecs
+import gzip
+import io
+import json
+import logging
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Union, cast
+
+import pandas as pd
+
+from kopen_data_builder.core.api_source import RECORD_TAGS
+from kopen_data_builder.core.io import CSV_CHUNK_ROWS, SNIFF_BYTES, detect_encoding, record_format
+
+logger = logging.getLogger(__name__)
+
+TEXT_BLOCK_CHARS = 1024 * 1024
+# Korean XML usually declares EUC-KR but uses characters only its superset cp949 has.
+DECLARED_ENCODINGS = {"euc-kr": "cp949", "euckr": "cp949", "ks_c_5601-1987": "cp949"}
+
+_XML_DECLARATION = re.compile(rb"^\s*<\?xml[^>]*encoding\s*=\s*[\"']([A-Za-z0-9._-]+)[\"']")
+_WHITESPACE = re.compile(r"\s*")
+_END = object()
+
+Record = Dict[str, Any]
+
+
+def detect_record_encoding(head: bytes, file_format: str) -> str:
+    """
+    Encoding of an XML or JSON stream from its first bytes: a BOM, then the XML
+    declaration, then the same UTF-8 / cp949 detection as for CSV.
+    """
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if file_format == "xml":
+        match = _XML_DECLARATION.match(head)
+        if match is not None:
+            declared: str = match.group(1).decode("ascii").lower()
+            return DECLARED_ENCODINGS.get(declared, declared)
+    detected: str = detect_encoding(head)
+    return detected
+
+
+def _flatten(record: Any, prefix: str = "", out: Optional[Record] = None) -> Record:
+    if not isinstance(record, dict):
+        raise ValueError(f"Expected records to be objects, got {type(record).__name__}: {str(record)[:80]}")
+    out = {} if out is None else out
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _flatten(value, f"{name}.", out)
+        elif isinstance(value, list):
+            # Lists stay in one cell as JSON so CSV and Parquet columns keep a scalar type.
+            out[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            out[name] = value
+    return out
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _xml_record(elem: ET.Element, prefix: str = "", out: Optional[Record] = None) -> Record:
+    out = {} if out is None else out
+    for key, value in elem.attrib.items():
+        out[f"{prefix}{_local_name(key)}"] = value
+    for child in elem:
+        name = f"{prefix}{_local_name(child.tag)}"
+        if len(child) or child.attrib:
+            _xml_record(child, f"{name}.", out)
+        else:
+            out[name] = child.text
+    return out
+
+
+def _is_leaf_parent(elem: ET.Element) -> bool:
+    return len(elem) > 0 and not any(len(child) for child in elem)
+
+
+def iter_xml_records(text: IO[str], record_tag: Optional[str] = None) -> Iterator[Record]:
+    """
+    Yield the records of an XML document, one per ``record_tag`` element.
+
+    Without ``record_tag`` the record element is detected: an ``<item>`` or ``<row>``
+    (as in data.go.kr and Seoul Open Data dumps), or else the first element holding
+    only leaf children that occurs twice. Consumed records are removed from the tree,
+    so memory does not grow with the document; candidates seen before the record
+    element is known stay intact until then, as they may be nested in the first record.
+    """
+    parser: Any = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    tag = record_tag
+    candidates: Dict[str, ET.Element] = {}
+
+    def drop(elem: ET.Element) -> None:
+        elem.clear()
+        if stack and len(stack[-1]) and stack[-1][-1] is elem:
+            del stack[-1][-1]
+
+    def records() -> Iterator[Record]:
+        nonlocal tag
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            name = _local_name(elem.tag)
+            if tag is None:
+                if not (name in RECORD_TAGS and len(elem)) and not _is_leaf_parent(elem):
+                    continue
+                if name not in RECORD_TAGS and name not in candidates:
+                    candidates[name] = elem
+                    continue
+                tag = name
+                logger.debug("Detected XML record element <%s>", tag)
+                if name in candidates:
+                    yield _xml_record(candidates[name])
+                yield _xml_record(elem)
+                drop(elem)
+                for candidate in candidates.values():
+                    drop(candidate)
+                candidates.clear()
+                continue
+            if name == tag:
+                yield _xml_record(elem)
+                drop(elem)
+
+    for block in iter(partial(text.read, TEXT_BLOCK_CHARS), ""):
+        parser.feed(block)
+        yield from records()
+    parser.close()
+    yield from records()
+    if tag is None and len(candidates) == 1:
+        # A document holding a single record.
+        yield from map(_xml_record, candidates.values())
+
+
+class _JsonCursor:
+    """Cursor over a JSON text that decodes values from a buffer refilled block by block."""
+
+    def __init__(self, text: IO[str]):
+        self.text = text
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.found = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        block = self.text.read(TEXT_BLOCK_CHARS)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or ``""`` at the end of the text."""
+        while True:
+            match = _WHITESPACE.match(self.buffer, self.pos)
+            self.pos = match.end() if match else self.pos
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(f"Invalid JSON: expected one of {expected!r}, got {char or 'end of input'!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Most likely the value continues in the next block.
+                if not self._fill():
+                    raise ValueError(f"Invalid JSON: {e}") from e
+                continue
+            # A number ending the buffer may have more digits in the next block.
+            if end == len(self.buffer) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def keys(self) -> Iterator[str]:
+        """Keys of the object at the cursor; the caller consumes each value before the next key."""
+        self.take("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.take(":")
+            yield key
+            if self.take(",}") == "}":
+                return
+
+    def items(self) -> Iterator[Any]:
+        """Elements of the array at the cursor."""
+        self.take("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.take(",]") == "]":
+                return
+
+
+def _json_records(cursor: _JsonCursor, path: Optional[List[str]], top: bool = False) -> Iterator[Any]:
+    """Records at ``path`` below the cursor, or in the first array of objects when ``path`` is None."""
+    char = cursor.peek()
+    if path == [] and char == "{":
+        cursor.found = True
+        yield cursor.value()
+    elif char == "[" and not path:
+        items = cursor.items()
+        first = next(items, _END)
+        if top or path == [] or isinstance(first, dict):
+            cursor.found = True
+            if first is not _END:
+                yield first
+            yield from items
+        else:
+            for _ in items:
+                pass
+    elif char == "{":
+        for key in cursor.keys():
+            if path is None or path[0] == key:
+                yield from _json_records(cursor, None if path is None else path[1:])
+                if cursor.found:
+                    return
+            else:
+                cursor.value()
+    else:
+        cursor.value()
+
+
+def iter_json_records(text: IO[str], record_path: Optional[str] = None) -> Iterator[Record]:
+    """
+    Yield the records of a JSON document without loading it whole.
+
+    Records are the elements of the top-level array, of the array (or single object)
+    at the dotted ``record_path`` such as ``response.body.items.item``, or by default
+    of the first array of objects found in document order.
+
+    Raises:
+        ValueError: If the JSON is invalid or ``record_path`` does not exist.
+    """
+    cursor = _JsonCursor(text)
+    yield from _json_records(cursor, record_path.split(".") if record_path else None, top=True)
+    if record_path and not cursor.found:
+        raise ValueError(f"No records found at '{record_path}'")
+
+
+def iter_jsonl_records(text: IO[str]) -> Iterator[Record]:
+    """Yield one record per non-blank line of a JSON Lines document."""
+    for number, line in enumerate(text, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+
+
+def _field_names(records: Iterable[Record]) -> List[str]:
+    """Union of the fields of ``records``, in order of first appearance."""
+    names: Dict[str, None] = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    return list(names)
+
+
+def _flat_records(
+    stream: IO[bytes], file_format: str, encoding: Optional[str], record_path: Optional[str]
+) -> Generator[Record, None, None]:
+    """Flattened records of ``stream``; the stream is left open (and rewindable) once closed."""
+    head: bytes = stream.peek(SNIFF_BYTES) if hasattr(stream, "peek") else b""
+    resolved = encoding or detect_record_encoding(head, file_format)
+    text = io.TextIOWrapper(stream, encoding=resolved, newline="" if file_format == "xml" else None)
+    try:
+        if file_format == "xml":
+            records = iter_xml_records(text, record_path)
+        elif file_format == "json":
+            records = iter_json_records(text, record_path)
+        else:
+            records = iter_jsonl_records(text)
+        yield from map(_flatten, records)
+    finally:
+        text.detach()
+
+
+def _open_source(source: Union[str, IO[bytes]]) -> IO[bytes]:
+    if not isinstance(source, str):
+        return source
+    if source.lower().endswith(".gz"):
+        return cast(IO[bytes], gzip.open(source, "rb"))
+    stream: IO[bytes] = open(source, "rb", buffering=SNIFF_BYTES)
+    return stream
+
+
+def iter_record_frames(
+    source: Union[str, IO[bytes]],
+    file_format: Optional[str] = None,
+    chunk_rows: Optional[int] = CSV_CHUNK_ROWS,
+    encoding: Optional[str] = None,
+    record_path: Optional[str] = None,
+    usecols: Optional[Sequence[str]] = None,
+    nrows: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an XML, JSON or JSON Lines file (optionally gzip-compressed) as DataFrame chunks.
+
+    Args:
+        source (str | IO[bytes]): File path, or a buffered binary stream.
+        file_format (str, optional): ``xml``, ``json`` or ``jsonl``; taken from the
+            file suffix when omitted.
+        chunk_rows (int, optional): Records per chunk; None yields a single DataFrame.
+        encoding (str, optional): Text encoding; detected when omitted.
+        record_path (str, optional): Dotted path to the records of a JSON document, or
+            the record element of an XML document; detected when omitted.
+        usecols (Sequence[str], optional): Columns to keep, after flattening.
+        nrows (int, optional): Stop after this many records.
+
+    Chunked reads parse the document twice: a first pass collects the field names so
+    every chunk gets the same columns as a single-frame read. Streams that cannot seek
+    are spooled to a temporary file for that.
+
+    Yields:
+        pd.DataFrame: Chunks with the columns of the whole document; at least one, possibly empty.
+
+    Raises:
+        ValueError: If the format is unknown or the document is malformed.
+    """
+    file_format = file_format or (record_format(source) if isinstance(source, str) else None)
+    if file_format not in ("xml", "json", "jsonl"):
+        raise ValueError(f"Unsupported record format '{file_format}'; expected xml, json or jsonl")
+
+    stream = _open_source(source)
+    spool: Optional[IO[bytes]] = None
+    try:
+        columns = list(usecols) if usecols is not None else None
+        if chunk_rows and columns is None:
+            if not stream.seekable():
+                spool = tempfile.TemporaryFile()
+                shutil.copyfileobj(stream, spool)
+                spool.seek(0)
+                stream = spool
+            start = stream.tell()
+            first_pass = _flat_records(stream, file_format, encoding, record_path)
+            try:
+                columns = _field_names(islice(first_pass, nrows))
+            finally:
+                first_pass.close()
+            stream.seek(start)
+        flat = islice(_flat_records(stream, file_format, encoding, record_path), nrows)
+
+        produced = False
+        while True:
+            batch = list(islice(flat, chunk_rows)) if chunk_rows else list(flat)
+            if not batch and produced:
+                return
+            produced = True
+            yield pd.DataFrame.from_records(batch, columns=columns if columns is not None else _field_names(batch))
+            if not chunk_rows:
+                return
+    finally:
+        if spool is not None:
+            spool.close()
+        if isinstance(source, str):
+            stream.close()
+
+
+def read_records(
+    path: Union[str, Path], encoding: Optional[str] = None, record_path: Optional[str] = None
+) -> pd.DataFrame:
+    """Read a whole XML, JSON or JSON Lines file; columns are the union over all records."""
+    return next(iter_record_frames(str(path), chunk_rows=None, encoding=encoding, record_path=record_path))
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable
+from pathlib import Path
+from typing import Any, Iterable
 
 from kopen_data_builder.core.models import DatasetMeta, LocalizedText
+from kopen_data_builder.core.partitioning import PartitionLayout
 
 
-def render_dataset_card(metadata: DatasetMeta, dataset_name: str) -> str:
+def render_dataset_card(metadata: DatasetMeta, dataset_name: str, partitioning: PartitionLayout | None = None) -> str:
     title = _select_localized(metadata.pretty_name) or dataset_name
     description = _select_localized(metadata.description) or ""
 
@@ -21,6 +23,7 @@ def render_dataset_card(metadata: DatasetMeta, dataset_name: str) -> str:
         *_format_list(metadata.tags),
         "size_categories:",
         *_format_list(metadata.size_categories),
+        *(render_partition_front_matter(partitioning) if partitioning else []),
         "---",
         "",
     ]
@@ -47,9 +50,50 @@ def render_dataset_card(metadata: DatasetMeta, dataset_name: str) -> str:
         for split_name, ratio in metadata.splits.items():
             body.append(f"- {split_name}: {ratio}")
 
+    if partitioning:
+        body.extend(["", *render_partition_section(partitioning)])
+
     return "\n".join(front_matter + body).strip() + "\n"
 
 
+def render_partition_front_matter(layout: PartitionLayout) -> list[str]:
+    """YAML ``configs`` entries pointing each split at its partitioned files."""
+    lines = ["configs:", "- config_name: default", "  data_files:"]
+    for split in layout.splits:
+        lines.extend([f"  - split: {split}", f"    path: {layout.data_files(split)}"])
+    return lines
+
+
+def render_partition_section(layout: PartitionLayout) -> list[str]:
+    """Markdown section documenting the partition layout."""
+    keys = "/".join(f"<{column}>" for column in layout.columns)
+    return [
+        "## Partitioning",
+        f"- Columns: {', '.join(layout.columns)}",
+        f"- Layout: `{layout.root}/<split>/{keys}/part-<n>.{layout.file_format}`",
+        "- Every file keeps its partition columns; directory names hold the URI-encoded values.",
+    ]
+
+
+def render_changelog_section(entries: list[dict[str, Any]]) -> list[str]:
+    """Markdown changelog, newest release first, from ``DiffReport.changelog_entry`` summaries."""
+    lines = ["## Changelog"]
+    for entry in reversed(entries):
+        lines.extend(
+            [
+                "",
+                f"### {entry['date']}: {Path(str(entry['new'])).name}",
+                f"- Rows: {entry['old_rows']:,} → {entry['new_rows']:,}",
+                f"- Added {entry['added']:,}, removed {entry['removed']:,}, modified {entry['modified']:,} rows",
+            ]
+        )
+        if entry.get("columns_added"):
+            lines.append(f"- New columns: {', '.join(entry['columns_added'])}")
+        if entry.get("columns_removed"):
+            lines.append(f"- Dropped columns: {', '.join(entry['columns_removed'])}")
+    return lines
+
+
 def _select_localized(value: str | LocalizedText) -> str:
     if isinstance(value, LocalizedText):
         return value.ko or value.en or ""
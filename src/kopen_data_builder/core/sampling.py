@@ -0,0 +1,155 @@
+# src/kopen_data_builder/core/sampling.py
+
+"""
+Sampling module: Representative previews of large inputs in a single streaming pass.
+``--sample N`` keeps a uniform random sample of exactly N rows (reservoir sampling,
+kept in source order); ``--sample-frac F`` keeps each row with probability F (Bernoulli
+sampling, which needs no reservoir and is the cheaper of the two). Both are
+reproducible for a given seed. Outputs built from a sample carry a ``sample.json``
+marker so they are never mistaken for the full dataset.
+"""
+
+import json
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 42
+MARKER_NAME = "sample.json"
+
+
+@dataclass
+class SampleReport:
+    """
+    What a sampling step kept; filled in while the plan runs.
+
+    Attributes:
+        method (str): ``reservoir`` or ``bernoulli``.
+        size (int, optional): Requested rows for reservoir sampling.
+        fraction (float, optional): Keep probability for Bernoulli sampling.
+        seed (int): Random seed.
+        rows_seen (int): Rows streamed through the sampler.
+        rows_kept (int): Rows in the sample.
+    """
+
+    method: str = "reservoir"
+    size: Optional[int] = None
+    fraction: Optional[float] = None
+    seed: int = DEFAULT_SEED
+    rows_seen: int = 0
+    rows_kept: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def describe(self) -> str:
+        how = f"{self.size} rows" if self.method == "reservoir" else f"fraction {self.fraction}"
+        return f"{self.method} sample ({how}, seed {self.seed}): {self.rows_kept} of {self.rows_seen} rows"
+
+
+def check_sample_options(size: Optional[int], fraction: Optional[float]) -> None:
+    """
+    Validate ``--sample`` / ``--sample-frac``.
+
+    Raises:
+        ValueError: If both are given, or either is out of range.
+    """
+    if size is not None and fraction is not None:
+        raise ValueError("Use either a sample size or a sample fraction, not both")
+    if size is not None and size < 1:
+        raise ValueError(f"Sample size must be at least 1, got {size}")
+    if fraction is not None and not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+
+
+class StreamSampler:
+    """
+    Chunk step that samples rows; reservoir samples are released by ``flush``.
+
+    The reservoir keeps the rows with the ``size`` smallest random keys (bottom-k
+    sampling, equivalent to a uniform sample without replacement). Once it is full,
+    only rows whose key beats the current largest one are considered, so later
+    chunks cost little more than drawing their keys.
+    """
+
+    def __init__(self, report: SampleReport):
+        self.report = report
+        # A frame may run more than once; each run reports afresh.
+        report.rows_seen = report.rows_kept = 0
+        self.rng = np.random.default_rng(report.seed)
+        self._pool: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0)
+        self._positions = np.empty(0, dtype=np.int64)
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        start = self.report.rows_seen
+        self.report.rows_seen += len(chunk)
+        keys = self.rng.random(len(chunk))
+        if self.report.fraction is not None:
+            kept = chunk[keys < self.report.fraction]
+            self.report.rows_kept += len(kept)
+            return kept
+
+        size = self.report.size or 0
+        positions = np.arange(start, start + len(chunk))
+        if len(self._keys) >= size:
+            candidates = keys < self._keys.max()
+            chunk, keys, positions = chunk[candidates], keys[candidates], positions[candidates]
+        pool = chunk if self._pool is None else pd.concat([self._pool, chunk], ignore_index=True)
+        keys = np.concatenate([self._keys, keys])
+        positions = np.concatenate([self._positions, positions])
+        if len(keys) > size:
+            keep = np.argpartition(keys, size - 1)[:size]
+            pool, keys, positions = pool.iloc[keep], keys[keep], positions[keep]
+        self._pool, self._keys, self._positions = pool.reset_index(drop=True), keys, positions
+        return chunk.iloc[:0]
+
+    def flush(self) -> Optional[pd.DataFrame]:
+        """The reservoir in source order (None for Bernoulli sampling, which emits as it goes)."""
+        if self.report.fraction is not None or self._pool is None:
+            return None
+        sample = self._pool.iloc[np.argsort(self._positions, kind="stable")].reset_index(drop=True)
+        self.report.rows_kept = len(sample)
+        self._pool = None
+        return sample
+
+
+def sample_marker_path(output: Path) -> Path:
+    """``<dir>/sample.json`` for a directory output, ``<file>.sample.json`` for a file."""
+    return output / MARKER_NAME if output.is_dir() else output.with_name(f"{output.name}.{MARKER_NAME}")
+
+
+def write_sample_marker(output: Path, report: Dict[str, Any], source: str) -> Path:
+    """
+    Mark ``output`` as built from a sample of ``source``.
+
+    Returns:
+        Path: The marker file.
+    """
+    marker = sample_marker_path(output)
+    marker.write_text(json.dumps({"sample": True, "source": source, **report}, ensure_ascii=False, indent=2), "utf-8")
+    logger.warning("⚠️ %s is a SAMPLE of %s, not the full dataset (see %s)", output, source, marker)
+    return marker
+
+
+def clear_sample_marker(output: Path) -> None:
+    """Remove a marker left by an earlier sampled run, now that ``output`` holds full data."""
+    marker = sample_marker_path(output)
+    if marker.is_file():
+        marker.unlink()
+        logger.info("Removed stale sample marker %s", marker)
+
+
+def read_sample_marker(path: Path) -> Optional[Dict[str, Any]]:
+    """The marker of ``path`` or of the directory holding it, if either was built from a sample."""
+    for marker in (sample_marker_path(path), path.parent / MARKER_NAME):
+        if marker.is_file():
+            loaded: Dict[str, Any] = json.loads(marker.read_text(encoding="utf-8"))
+            return loaded
+    return None
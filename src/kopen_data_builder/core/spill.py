@@ -0,0 +1,295 @@
+# src/kopen_data_builder/core/spill.py
+
+"""
+Spill module: Out-of-core building blocks for runs under a memory budget.
+Cross-chunk state that outgrows its share of the budget moves to temporary files:
+dedup hash sets become sorted runs probed through memory maps, and the shuffle behind
+splits scatters rows into random on-disk buckets that are shuffled one at a time.
+``ChunkWriter`` appends the resulting chunks to CSV, Parquet or partitioned outputs.
+"""
+
+import logging
+import math
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from kopen_data_builder.core.partitioning import DEFAULT_MAX_OPEN_FILES, write_partitioned
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+SHUFFLE_BUCKETS = 16
+SPILL_PREFIX = "kopen-spill-"
+
+
+class SpillingHashSet:
+    """
+    Set of 64-bit row hashes that spills to sorted runs on disk beyond ``max_bytes``.
+
+    Hashes added since the last spill are kept as a sorted array in memory; every spill
+    writes them to a ``.npy`` run that later lookups binary-search through a memory map,
+    so resident memory stays bounded while the page cache does the rest.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.memory = np.empty(0, dtype=np.uint64)
+        self.runs: List[np.ndarray] = []
+        self._dir: Optional[tempfile.TemporaryDirectory[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.memory) + sum(len(run) for run in self.runs)
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add unique ``hashes`` and return the mask of those not seen before.
+        """
+        new = ~np.isin(hashes, self.memory, assume_unique=True)
+        for run in self.runs:
+            candidates = np.flatnonzero(new)
+            positions = np.searchsorted(run, hashes[candidates]).clip(max=len(run) - 1)
+            new[candidates[run[positions] == hashes[candidates]]] = False
+        self.memory = np.union1d(self.memory, hashes[new])
+        if self.max_bytes is not None and self.memory.nbytes > self.max_bytes:
+            self._spill()
+        return new
+
+    def _spill(self) -> None:
+        if self._dir is None:
+            self._dir = tempfile.TemporaryDirectory(prefix=SPILL_PREFIX)
+        path = Path(self._dir.name) / f"run-{len(self.runs)}.npy"
+        np.save(path, self.memory)
+        self.runs.append(np.load(path, mmap_mode="r"))
+        logger.debug("Spilled %d row hashes to %s", len(self.memory), path)
+        self.memory = np.empty(0, dtype=np.uint64)
+
+
+class ShuffleSpill:
+    """
+    Uniformly random permutation of a stream of chunks that does not fit in memory.
+
+    Rows are scattered into random buckets on disk as they arrive; iterating loads one
+    bucket at a time and permutes it. A bucket larger than ``max_bytes`` is scattered
+    again into smaller buckets first, so no bucket held in memory exceeds the budget.
+    """
+
+    def __init__(self, max_bytes: int, buckets: int = SHUFFLE_BUCKETS, seed: int = 42, spill_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self._dir = Path(spill_dir) if spill_dir else Path(tempfile.mkdtemp(prefix=SPILL_PREFIX))
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._paths = [self._dir / f"bucket-{i}.pkl" for i in range(buckets)]
+        self._bytes = [0.0] * buckets
+        self._files: List[BinaryIO] = [open(path, "wb") for path in self._paths]
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Scatter the rows of ``chunk`` over the buckets."""
+        if chunk.empty:
+            return
+        row_bytes = chunk.memory_usage(deep=True, index=False).sum() / len(chunk)
+        assignment = self.rng.integers(len(self._paths), size=len(chunk))
+        for bucket in np.unique(assignment):
+            piece = chunk.iloc[np.flatnonzero(assignment == bucket)]
+            pickle.dump(piece, self._files[bucket], protocol=pickle.HIGHEST_PROTOCOL)
+            self._bytes[bucket] += len(piece) * row_bytes
+        self.rows += len(chunk)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        """Yield the permuted rows, one bucket per chunk; the spill files are removed as they are read."""
+        self._close_files()
+        try:
+            for path, size in zip(self._paths, self._bytes):
+                if size > self.max_bytes:
+                    buckets = math.ceil(size / self.max_bytes) + 1
+                    logger.debug("Bucket %s holds ~%.0f bytes; scattering it over %d buckets", path, size, buckets)
+                    child = ShuffleSpill(self.max_bytes, buckets, int(self.rng.integers(2**32)), str(path) + ".d")
+                    for piece in _load_pieces(path):
+                        child.add(piece)
+                    path.unlink()
+                    yield from child
+                    continue
+                pieces = list(_load_pieces(path))
+                path.unlink()
+                if pieces:
+                    bucket = pd.concat(pieces, ignore_index=True)
+                    yield bucket.take(self.rng.permutation(len(bucket))).reset_index(drop=True)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Remove the spill files."""
+        self._close_files()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _close_files(self) -> None:
+        for f in self._files:
+            f.close()
+
+
+def _load_pieces(path: Path) -> Iterator[pd.DataFrame]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _widen_schema(current: "pa.Schema", incoming: "pa.Schema") -> "pa.Schema":
+    """
+    Schema able to hold the rows of both ``current`` and ``incoming`` (columns aligned by position).
+
+    Chunks are typed independently, so a column can be all-null in the first chunk and
+    hold text later, or turn from int to float. Arrow's permissive promotion handles
+    null and numeric widening; any other conflict widens to string.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field, other in zip(current, incoming):
+        try:
+            merged = pa.unify_schemas([pa.schema([field]), pa.schema([other])], promote_options="permissive")
+            fields.append(merged.field(0))
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            large = pa.types.is_large_string(field.type) or pa.types.is_large_string(other.type)
+            fields.append(pa.field(field.name, pa.large_string() if large else pa.string()))
+    # The pandas metadata of the first chunk would describe the old column types.
+    return pa.schema(fields)
+
+
+class ChunkWriter:
+    """
+    Appends DataFrame chunks to one CSV or Parquet file, or to a partitioned directory.
+
+    Partitioned output gets one file per chunk and partition. With ``incremental`` the
+    chunks are staged next to ``path`` and, on close, replace only the partitions they
+    contain; otherwise ``path`` is cleared first.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file_format: str = "csv",
+        encoding: str = "utf-8",
+        partition_by: Optional[Sequence[str]] = None,
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+        incremental: bool = False,
+    ):
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported format '{file_format}'; expected 'csv' or 'parquet'")
+        self.path = Path(path)
+        self.file_format = file_format
+        self.encoding = encoding
+        self.partition_by = list(partition_by or [])
+        self.max_open_files = max_open_files
+        self.incremental = incremental
+        self.rows = 0
+        self.partition_columns: List[str] = []
+        self._columns: Optional[List[str]] = None
+        self._pieces = 0
+        self._handle: Any = None
+
+        if self.partition_by:
+            self._target = self.path.parent / f".{self.path.name}.staging" if incremental else self.path
+            if self._target.exists():
+                shutil.rmtree(self._target)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """
+        Append ``chunk``; its columns are aligned to those of the first chunk.
+
+        A single Parquet file keeps one schema, so when a chunk does not fit the types
+        seen so far (see ``_widen_schema``) the rows already written are rewritten once
+        with the widened schema.
+        """
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+        elif list(chunk.columns) != self._columns:
+            chunk = chunk.reindex(columns=self._columns)
+
+        if self.partition_by:
+            if not chunk.empty:
+                self.partition_columns = write_partitioned(
+                    chunk,
+                    str(self._target),
+                    self.partition_by,
+                    self.file_format,
+                    self.max_open_files,
+                    append=True,
+                    basename=f"part-{self._pieces}",
+                )
+                self._pieces += 1
+        elif self.file_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._handle is None:
+                self._handle = pq.ParquetWriter(str(self.path), table.schema)
+            elif not table.schema.equals(self._handle.schema):
+                schema = _widen_schema(self._handle.schema, table.schema)
+                if not schema.equals(self._handle.schema):
+                    self._rewrite_parquet(schema)
+                table = table.cast(schema, safe=False)
+            self._handle.write_table(table)
+        else:
+            if self._handle is None:
+                self._handle = open(self.path, "w", encoding=self.encoding, newline="")
+                chunk.to_csv(self._handle, index=False)
+            else:
+                chunk.to_csv(self._handle, header=False, index=False)
+        self.rows += len(chunk)
+
+    def close(self) -> None:
+        """Finish the output; writes the header or schema if no chunk arrived."""
+        if self.partition_by:
+            if self.incremental:
+                self._replace_partitions()
+            return
+        if self._handle is None and self._columns is not None:
+            self.write(pd.DataFrame(columns=self._columns))
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _rewrite_parquet(self, schema: "pa.Schema") -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._handle.close()
+        narrow = self.path.with_name(f".{self.path.name}.narrow")
+        self.path.replace(narrow)
+        logger.debug("Widening %s to %s; rewriting %d rows", self.path, schema, self.rows)
+        self._handle = pq.ParquetWriter(str(self.path), schema)
+        with pq.ParquetFile(narrow) as source:
+            for batch in source.iter_batches():
+                self._handle.write_table(pa.Table.from_batches([batch]).cast(schema, safe=False))
+        narrow.unlink()
+
+    def _replace_partitions(self) -> None:
+        if not self._target.exists():
+            return
+        leaves = {f.parent.relative_to(self._target) for f in self._target.rglob(f"*.{self.file_format}")}
+        for leaf in sorted(leaves):
+            destination = self.path / leaf
+            if destination.exists():
+                shutil.rmtree(destination)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(self._target / leaf), str(destination))
+        shutil.rmtree(self._target)
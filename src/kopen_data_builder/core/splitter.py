@@ -3,14 +3,22 @@
 """
 Splitter module: Contains functions for splitting and merging datasets.
 This module provides utilities to split a dataset into training and test sets
-and to merge multiple datasets into one.
+and to merge multiple datasets into one. ``split_chunks`` splits a stream of chunks
+larger than memory by shuffling it through spill files on disk.
 """
 
 import logging
-from typing import Dict, List
+import math
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import pandas as pd
-from sklearn.model_selection import train_test_split
+
+from kopen_data_builder.core.io import write_csv
+from kopen_data_builder.core.memory import MemoryBudget
+from kopen_data_builder.core.metrics import timed
+from kopen_data_builder.core.partitioning import DEFAULT_MAX_OPEN_FILES, write_partitioned_splits
+from kopen_data_builder.core.spill import ChunkWriter, ShuffleSpill
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +37,19 @@ def split_dataset(df: pd.DataFrame, rules: Dict[str, float]) -> Dict[str, pd.Dat
     Raises:
         ValueError: If rules are invalid or unsupported.
     """
+    with timed("split") as sample:
+        _validate_rules(rules)
+        logger.debug("Splitting dataset with rules: %s", rules)
+
+        # scikit-learn takes ~1s to import; only pay for it when actually splitting.
+        from sklearn.model_selection import train_test_split
+
+        df_train, df_test = train_test_split(df, test_size=rules["test"], random_state=42)
+        sample.rows = len(df)
+        return {"train": df_train, "test": df_test}
+
+
+def _validate_rules(rules: Dict[str, float]) -> None:
     if not rules or not isinstance(rules, dict):
         raise ValueError("Rules must be a non-empty dictionary.")
 
@@ -36,13 +57,135 @@ def split_dataset(df: pd.DataFrame, rules: Dict[str, float]) -> Dict[str, pd.Dat
     if not abs(total_ratio - 1.0) < 1e-6:
         raise ValueError(f"Split ratios must sum to 1.0, got {total_ratio:.3f}")
 
-    logger.debug("Splitting dataset with rules: %s", rules)
+    if set(rules.keys()) != {"train", "test"}:
+        raise NotImplementedError("Only 'train/test' split is currently supported.")
 
-    if set(rules.keys()) == {"train", "test"}:
-        df_train, df_test = train_test_split(df, test_size=rules["test"], random_state=42)
-        return {"train": df_train, "test": df_test}
 
-    raise NotImplementedError("Only 'train/test' split is currently supported.")
+def split_chunks(
+    chunks: Iterable[pd.DataFrame],
+    rules: Dict[str, float],
+    output_dir: str,
+    max_memory: int,
+    output_format: str = "csv",
+    partition_by: Optional[Sequence[str]] = None,
+    encoding: str = "utf-8",
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+) -> Dict[str, Path]:
+    """
+    Split a stream of chunks that may not fit in memory and write it like ``write_splits``.
+
+    Rows are shuffled out of core (see ``ShuffleSpill``); the first shuffled rows form
+    ``train`` and the rest ``test``. Split sizes match ``split_dataset`` (``test`` gets
+    ``ceil(test * rows)`` rows), but which rows land in which split differs.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): The rows to split.
+        rules (dict): e.g., {"train": 0.8, "test": 0.2}
+        output_dir (str): Directory to write into.
+        max_memory (int): Memory budget in bytes; shuffle buckets spill beyond its state share.
+        output_format (str): ``csv`` or ``parquet``.
+        partition_by (Sequence[str], optional): Partition specs (e.g. ``["reg_date:year", "gu"]``).
+        encoding (str): Encoding of CSV outputs.
+        max_open_files (int): Maximum files held open by partition writers.
+
+    Returns:
+        Dict[str, Path]: Split name to the written file or partition directory.
+    """
+    _validate_rules(rules)
+    if output_format not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported split format '{output_format}'; expected 'csv' or 'parquet'")
+
+    with timed("split") as sample:
+        spill = ShuffleSpill(MemoryBudget(max_memory).state_bytes or max_memory)
+        columns: Optional[List[str]] = None
+        try:
+            for chunk in chunks:
+                columns = list(chunk.columns) if columns is None else columns
+                spill.add(chunk)
+            n_test = math.ceil(spill.rows * rules["test"])
+            sizes = {"train": spill.rows - n_test, "test": n_test}
+            logger.info("Shuffled %d rows on disk; writing splits of %s rows", spill.rows, sizes)
+
+            outputs = {name: Path(output_dir) / (name if partition_by else f"{name}.{output_format}") for name in sizes}
+            writers = {
+                name: ChunkWriter(str(path), output_format, encoding, partition_by, max_open_files)
+                for name, path in outputs.items()
+            }
+            try:
+                for name, piece in _assign_splits(spill, sizes):
+                    writers[name].write(piece)
+                for writer in writers.values():
+                    if writer.rows == 0 and columns is not None:
+                        writer.write(pd.DataFrame(columns=columns))
+            finally:
+                for writer in writers.values():
+                    writer.close()
+        finally:
+            spill.close()
+        sample.rows = spill.rows
+    return outputs
+
+
+def _assign_splits(chunks: Iterable[pd.DataFrame], sizes: Dict[str, int]) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Cut consecutive runs of ``sizes[name]`` rows out of ``chunks``, in split order."""
+    remaining = iter(sizes.items())
+    name, left = next(remaining)
+    for chunk in chunks:
+        while len(chunk):
+            while left == 0:
+                name, left = next(remaining)
+            piece, chunk = chunk.iloc[:left], chunk.iloc[left:]
+            left -= len(piece)
+            yield name, piece
+
+
+def write_splits(
+    splits: Dict[str, pd.DataFrame],
+    output_dir: str,
+    output_format: str = "csv",
+    partition_by: Optional[Sequence[str]] = None,
+    encoding: str = "utf-8",
+    csv_engine: str = "pandas",
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+) -> Dict[str, Path]:
+    """
+    Write each split to ``output_dir/<split>.<format>``, or to ``output_dir/<split>/`` partitioned.
+
+    Args:
+        splits (dict): Split name to DataFrame.
+        output_dir (str): Directory to write into.
+        output_format (str): ``csv`` or ``parquet``.
+        partition_by (Sequence[str], optional): Partition specs (e.g. ``["reg_date:year", "gu"]``).
+        encoding (str): Encoding of CSV outputs.
+        csv_engine (str): CSV writer engine, see ``write_csv``.
+        max_open_files (int): Maximum files held open by partition writers.
+
+    Returns:
+        Dict[str, Path]: Split name to the written file or partition directory.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if output_format not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported split format '{output_format}'; expected 'csv' or 'parquet'")
+
+    if partition_by:
+        layout = write_partitioned_splits(
+            splits, output_dir, partition_by, file_format=output_format, max_open_files=max_open_files
+        )
+        return {name: Path(output_dir) / name for name in layout.splits}
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    outputs = {}
+    for name, part in splits.items():
+        output_path = Path(output_dir) / f"{name}.{output_format}"
+        if output_format == "parquet":
+            part.to_parquet(output_path, index=False)
+        else:
+            write_csv(part, str(output_path), encoding=encoding, engine=csv_engine)
+        logger.info("Saved %s split to %s", name, output_path)
+        outputs[name] = output_path
+    return outputs
 
 
 def merge_datasets(dfs: List[pd.DataFrame]) -> pd.DataFrame:
@@ -0,0 +1,283 @@
+# src/kopen_data_builder/core/stage_cache.py
+
+"""
+Stage cache module: Skips pipeline stages whose inputs, options and tool version are unchanged.
+A stage run is keyed by the content hashes of its input files, its options and the
+package version. The key and the size/mtime of the outputs are recorded in a small
+SQLite state database; a later run with the same key whose outputs are still intact
+is skipped and the existing outputs are reused. Every decision stores its reasons so
+``kopen stages explain`` can tell why a stage reran.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from kopen_data_builder import __version__
+from kopen_data_builder.core.manifest import hash_file, list_repo_files
+from kopen_data_builder.core.metrics import count
+
+logger = logging.getLogger(__name__)
+
+MISSING = "missing"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    stage TEXT NOT NULL,
+    target TEXT NOT NULL,
+    key TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    options TEXT NOT NULL,
+    version TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    reasons TEXT NOT NULL,
+    ran_at REAL NOT NULL,
+    checked_at REAL NOT NULL,
+    last_action TEXT NOT NULL,
+    PRIMARY KEY (stage, target)
+);
+"""
+
+PathLike = Union[str, Path]
+
+
+def default_state_db() -> Path:
+    """``$KOPEN_STATE_DB``, or ``state.db`` in ``$KOPEN_CACHE_DIR`` (default ``~/.cache/kopen-data-builder``)."""
+    if os.environ.get("KOPEN_STATE_DB"):
+        return Path(os.environ["KOPEN_STATE_DB"])
+    return Path(os.environ.get("KOPEN_CACHE_DIR", Path.home() / ".cache" / "kopen-data-builder")) / "state.db"
+
+
+@dataclass
+class StageDecision:
+    """Whether a stage must run, with the key to record once it has."""
+
+    stage: str
+    target: str
+    key: str
+    inputs: Dict[str, str]
+    options: Dict[str, Any]
+    version: str
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def fresh(self) -> bool:
+        """True if the recorded outputs can be reused."""
+        return not self.reasons
+
+
+@dataclass
+class StageRecord:
+    """The last recorded run of one stage, as shown by ``explain``."""
+
+    stage: str
+    target: str
+    version: str
+    reasons: List[str]
+    ran_at: float
+    checked_at: float
+    last_action: str
+    outputs: Dict[str, List[int]]
+
+
+class StageCache:
+    """
+    SQLite-backed record of stage runs.
+
+    Connections are opened per call, so one cache can be shared by threads and
+    worker processes may open their own on the same file.
+    """
+
+    def __init__(self, path: Optional[PathLike] = None):
+        self.path = Path(path) if path is not None else default_state_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def hash_input(self, path: PathLike) -> str:
+        """
+        sha256 of a file, or of the sorted file hashes of a directory.
+
+        Hashes are remembered by path, size and mtime, so unchanged inputs are not reread.
+        """
+        path = Path(path)
+        if path.is_dir():
+            digest = hashlib.sha256()
+            for rel in list_repo_files(path):
+                digest.update(f"{rel}\0{self.hash_input(path / rel)}\n".encode())
+            return digest.hexdigest()
+        if not path.is_file():
+            return MISSING
+
+        stat = path.stat()
+        resolved = str(path.resolve())
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT sha256 FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (resolved, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+            if row is not None:
+                return str(row[0])
+            sha256: str = hash_file(path)[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                (resolved, stat.st_size, stat.st_mtime_ns, sha256),
+            )
+        return sha256
+
+    def check(
+        self,
+        stage: str,
+        target: PathLike,
+        inputs: Sequence[PathLike],
+        options: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+    ) -> StageDecision:
+        """
+        Decide whether ``stage`` writing to ``target`` must run.
+
+        A fresh decision is recorded as a skip; otherwise run the stage and call
+        ``record`` with the returned decision.
+
+        Args:
+            stage (str): Stage name, e.g. ``split`` or ``build``.
+            target (str | Path): Output location identifying this stage instance.
+            inputs (Sequence[str | Path]): Files or directories the stage reads.
+            options (dict, optional): Options that affect the outputs; must be JSON-serializable.
+            force (bool): Run even if nothing changed.
+
+        Returns:
+            StageDecision: ``fresh`` if the recorded outputs can be reused.
+        """
+        hashed = {str(Path(p).resolve()): self.hash_input(p) for p in inputs}
+        normalized = json.loads(json.dumps(options or {}, sort_keys=True, default=str))
+        key = hashlib.sha256(json.dumps([stage, hashed, normalized, __version__], sort_keys=True).encode()).hexdigest()
+        decision = StageDecision(stage, str(Path(target).resolve()), key, hashed, normalized, __version__)
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT key, inputs, options, version, outputs FROM stages WHERE stage = ? AND target = ?",
+                (stage, decision.target),
+            ).fetchone()
+            if row is None:
+                decision.reasons.append("no previous run recorded")
+            elif row[0] != key:
+                decision.reasons.extend(_diff(json.loads(row[1]), json.loads(row[2]), row[3], decision))
+            else:
+                decision.reasons.extend(_check_outputs(json.loads(row[4])))
+            if force:
+                decision.reasons.insert(0, "forced with --force")
+            if decision.fresh:
+                conn.execute(
+                    "UPDATE stages SET checked_at = ?, last_action = 'skipped' WHERE stage = ? AND target = ?",
+                    (time.time(), stage, decision.target),
+                )
+                count("stage_cache_hits")
+                logger.info("Stage %s for %s is up to date; reusing its outputs", stage, decision.target)
+            else:
+                logger.info("Running stage %s for %s: %s", stage, decision.target, "; ".join(decision.reasons))
+        return decision
+
+    def record(self, decision: StageDecision, outputs: Sequence[PathLike]) -> None:
+        """Store the key, reasons and output fingerprints after ``decision``'s stage ran successfully."""
+        snapshot = {path: [size, mtime_ns] for path, size, mtime_ns in _snapshot(outputs)}
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO stages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'ran')",
+                (
+                    decision.stage,
+                    decision.target,
+                    decision.key,
+                    json.dumps(decision.inputs),
+                    json.dumps(decision.options),
+                    decision.version,
+                    json.dumps(snapshot),
+                    json.dumps(decision.reasons),
+                    now,
+                    now,
+                ),
+            )
+
+    def explain(self, stage: Optional[str] = None, target: Optional[PathLike] = None) -> List[StageRecord]:
+        """Recorded stage runs, optionally filtered by stage name and target, newest first."""
+        query = "SELECT stage, target, version, reasons, ran_at, checked_at, last_action, outputs FROM stages"
+        clauses, params = _filters(stage, target)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"{query}{clauses} ORDER BY checked_at DESC", params).fetchall()
+        return [StageRecord(r[0], r[1], r[2], json.loads(r[3]), r[4], r[5], r[6], json.loads(r[7])) for r in rows]
+
+    def forget(self, stage: Optional[str] = None, target: Optional[PathLike] = None) -> int:
+        """Drop recorded runs so the matching stages run again; returns the number removed."""
+        clauses, params = _filters(stage, target)
+        with closing(self._connect()) as conn, conn:
+            return int(conn.execute(f"DELETE FROM stages{clauses}", params).rowcount)
+
+
+def _filters(stage: Optional[str], target: Optional[PathLike]) -> Tuple[str, List[str]]:
+    conditions, params = [], []
+    if stage:
+        conditions.append("stage = ?")
+        params.append(stage)
+    if target:
+        conditions.append("target = ?")
+        params.append(str(Path(target).resolve()))
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+def _diff(inputs: Dict[str, str], options: Dict[str, Any], version: str, decision: StageDecision) -> List[str]:
+    reasons = []
+    for path in sorted(set(inputs) | set(decision.inputs)):
+        if path not in inputs:
+            reasons.append(f"new input {path}")
+        elif path not in decision.inputs:
+            reasons.append(f"input {path} no longer used")
+        elif decision.inputs[path] == MISSING:
+            reasons.append(f"input {path} is missing")
+        elif inputs[path] != decision.inputs[path]:
+            reasons.append(f"input {path} changed")
+    for name in sorted(set(options) | set(decision.options)):
+        if options.get(name) != decision.options.get(name):
+            reasons.append(f"option {name} changed: {options.get(name)!r} → {decision.options.get(name)!r}")
+    if version != decision.version:
+        reasons.append(f"tool version changed: {version} → {decision.version}")
+    return reasons or ["stage key changed"]
+
+
+def _snapshot(outputs: Sequence[PathLike]) -> Iterator[Tuple[str, int, int]]:
+    for output in outputs:
+        path = Path(output).resolve()
+        files = [path / rel for rel in list_repo_files(path)] if path.is_dir() else [path]
+        for file in files:
+            if file.is_file():
+                stat = file.stat()
+                yield str(file), stat.st_size, stat.st_mtime_ns
+
+
+def _check_outputs(outputs: Dict[str, List[int]]) -> List[str]:
+    reasons = []
+    for path, (size, mtime_ns) in sorted(outputs.items()):
+        if not os.path.isfile(path):
+            reasons.append(f"output {path} is missing")
+            continue
+        stat = os.stat(path)
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            reasons.append(f"output {path} was modified")
+    if not outputs:
+        reasons.append("no outputs recorded")
+    return reasons
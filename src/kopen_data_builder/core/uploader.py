@@ -4,51 +4,629 @@
 Uploader module: Uploads prepared dataset repositories to Hugging Face Hub.
 This module provides functionality to upload a prepared dataset repository
 to the Hugging Face Hub using the CLI.
+By default only files that differ from the remote repository are committed,
+based on a local hash manifest and a single remote tree listing. Very large
+repositories can be uploaded in resumable, size-bounded commit batches.
+All Hub calls go through a ``HubSession`` that reuses one client and caches
+repository existence and file listings, so create, upload and verify share
+round trips and many datasets can be published in one run.
 """
 
+import json
+import logging
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set
 
-from huggingface_hub import HfApi
-from huggingface_hub.utils import HfHubHTTPError
+from huggingface_hub import CommitOperationAdd, CommitOperationDelete, HfApi
+from huggingface_hub.errors import HfHubHTTPError, RepositoryNotFoundError
 
+from kopen_data_builder.core.manifest import STATE_DIR, FileEntry, Manifest, update_manifest
+from kopen_data_builder.core.metrics import timed
 
-def upload_to_hf(repo_dir: str, repo_id: str, token: Optional[str] = None, private: Optional[bool] = None) -> str:
+logger = logging.getLogger(__name__)
+
+PROGRESS_FILENAME = f"{STATE_DIR}/upload-progress.json"
+DEFAULT_BATCH_BYTES = 2 * 1024**3
+DEFAULT_BATCH_FILES = 500
+DEFAULT_UPLOAD_WORKERS = 4
+
+# Files the Hub manages itself; never delete them just because they are absent locally.
+PROTECTED_REMOTE_FILES = {".gitattributes"}
+
+
+@dataclass
+class RemoteFile:
+    """Size and content ids of a file in the remote repository."""
+
+    path: str
+    size: int
+    blob_id: str
+    lfs_sha256: Optional[str] = None
+
+    def matches(self, entry: FileEntry) -> bool:
+        """True if the local file has the same content as this remote file."""
+        if self.size != entry.size:
+            return False
+        if self.lfs_sha256 is not None:
+            return bool(self.lfs_sha256 == entry.sha256)
+        return bool(self.blob_id == entry.git_sha1)
+
+
+@dataclass
+class UploadPlan:
+    """Files to add, update and delete to make the remote repository match the local one."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    kept: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.deleted)
+
+
+def list_remote_files(api: Any, repo_id: str, token: Optional[str] = None) -> Dict[str, RemoteFile]:
+    """
+    Fetch every file of a dataset repository with its size, blob id and LFS sha256
+    in a single ``repo_info(files_metadata=True)`` request.
+
+    Returns:
+        Dict[str, RemoteFile]: Remote files keyed by path. Empty if the repository has no files.
+
+    Raises:
+        HfHubHTTPError: If the repository does not exist or cannot be read.
+    """
+    info = api.repo_info(repo_id, repo_type="dataset", token=token, files_metadata=True)
+    remote: Dict[str, RemoteFile] = {}
+    for sibling in info.siblings or []:
+        sha256 = sibling.lfs.sha256 if sibling.lfs is not None else None
+        remote[sibling.rfilename] = RemoteFile(
+            path=sibling.rfilename, size=sibling.size or 0, blob_id=sibling.blob_id or "", lfs_sha256=sha256
+        )
+    return remote
+
+
+def plan_delta_upload(manifest: Manifest, remote: Dict[str, RemoteFile], delete_missing: bool = False) -> UploadPlan:
+    """
+    Compare the local manifest with the remote file list.
+
+    Args:
+        manifest (Manifest): Local files and hashes.
+        remote (dict): Remote files from ``list_remote_files``.
+        delete_missing (bool): Schedule remote files that no longer exist locally for deletion;
+            otherwise they are listed in ``kept`` and left alone.
+
+    Returns:
+        UploadPlan: The files to add, change and delete.
+    """
+    plan = UploadPlan()
+    for rel, entry in sorted(manifest.items()):
+        remote_file = remote.get(rel)
+        if remote_file is None:
+            plan.added.append(rel)
+        elif remote_file.matches(entry):
+            plan.unchanged.append(rel)
+        else:
+            plan.changed.append(rel)
+    extra = sorted(p for p in remote if p not in manifest and p not in PROTECTED_REMOTE_FILES)
+    if delete_missing:
+        plan.deleted = extra
+    else:
+        plan.kept = extra
+    return plan
+
+
+def _log_kept(repo_id: str, plan: UploadPlan) -> None:
+    if plan.kept:
+        logger.warning(
+            "%d remote files of %s are not in the local repository and were kept "
+            "(upload with --delete-remote to remove them): %s",
+            len(plan.kept),
+            repo_id,
+            ", ".join(plan.kept),
+        )
+
+
+@dataclass
+class VerificationReport:
+    """Result of comparing a local repository with its remote copy."""
+
+    repo_id: str
+    verified: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.mismatched)
+
+
+@dataclass
+class UploadStats:
+    """Throughput of an upload run."""
+
+    files: int = 0
+    bytes: int = 0
+    commits: int = 0
+    seconds: float = 0.0
+    skipped: int = 0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1024**2 / self.seconds if self.seconds else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class PublishResult:
+    """Outcome of publishing one repository with ``publish_many``."""
+
+    repo_id: str
+    repo_dir: str
+    url: Optional[str] = None
+    verified: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.verified
+
+
+class HubSession:
+    """
+    One Hugging Face Hub client shared by create, upload and verify.
+
+    ``HfApi`` sends every request through huggingface_hub's shared HTTP client, so
+    keeping a single instance reuses pooled keep-alive connections. On top of that the
+    session caches, per repository, whether it exists and its remote file listing:
+    the listing fetched while checking existence is reused by the delta planner, and
+    it is only refetched after this session commits to the repository.
+    """
+
+    def __init__(self, token: Optional[str] = None, api: Optional[Any] = None, endpoint: Optional[str] = None):
+        """
+        Args:
+            token (str, optional): Hugging Face access token used for every request.
+            api (HfApi, optional): Client to use; a new ``HfApi`` by default.
+            endpoint (str, optional): Hub endpoint, e.g. a mirror. Defaults to huggingface.co.
+        """
+        self.token = token
+        self.api = api or HfApi(token=token, endpoint=endpoint)
+        self._existing: Set[str] = set()
+        self._remote_files: Dict[str, Dict[str, RemoteFile]] = {}
+
+    def repo_exists(self, repo_id: str) -> bool:
+        """True if the dataset repository exists; fetches and caches its listing on first use."""
+        if repo_id in self._existing:
+            return True
+        try:
+            self.remote_files(repo_id)
+        except RepositoryNotFoundError:
+            return False
+        return True
+
+    def ensure_repo(self, repo_id: str, private: Optional[bool] = None) -> None:
+        """
+        Create the dataset repository unless it is known to exist.
+
+        Existing repositories cost one ``repo_info`` request whose listing is kept for
+        the upload. Creation falls back to the account default visibility if the
+        requested one is rejected.
+        """
+        if self.repo_exists(repo_id):
+            return
+        try:
+            self.api.create_repo(repo_id, repo_type="dataset", token=self.token, exist_ok=True, private=private)
+        except HfHubHTTPError:
+            self.api.create_repo(repo_id, repo_type="dataset", token=self.token, exist_ok=True)
+        self._existing.add(repo_id)
+        self._remote_files.pop(repo_id, None)
+        logger.info("Created dataset repository %s", repo_id)
+
+    def remote_files(self, repo_id: str, refresh: bool = False) -> Dict[str, RemoteFile]:
+        """
+        Remote files of ``repo_id`` (see ``list_remote_files``), cached for the session.
+
+        Raises:
+            HfHubHTTPError: If the repository does not exist or cannot be read.
+        """
+        if refresh or repo_id not in self._remote_files:
+            self._remote_files[repo_id] = list_remote_files(self.api, repo_id, token=self.token)
+            self._existing.add(repo_id)
+        return self._remote_files[repo_id]
+
+    def invalidate(self, repo_id: str) -> None:
+        """Forget the cached listing of ``repo_id`` after it changed remotely."""
+        self._remote_files.pop(repo_id, None)
+
+    def commit(self, repo_id: str, operations: List[Any], message: str) -> None:
+        """Create one commit on the dataset repository and invalidate its cached listing."""
+        try:
+            self.api.create_commit(repo_id, operations, commit_message=message, repo_type="dataset", token=self.token)
+        finally:
+            self.invalidate(repo_id)
+
+    def preupload(self, repo_id: str, operations: List[Any], num_threads: int = DEFAULT_UPLOAD_WORKERS) -> None:
+        """Upload the LFS content of ``operations`` ahead of the commit that references it."""
+        self.api.preupload_lfs_files(
+            repo_id, additions=operations, repo_type="dataset", token=self.token, num_threads=num_threads
+        )
+
+    def upload_folder(self, repo_id: str, folder_path: str) -> None:
+        """Send a whole folder in one commit, skipping local bookkeeping files."""
+        try:
+            self.api.upload_folder(
+                repo_id=repo_id,
+                repo_type="dataset",
+                folder_path=folder_path,
+                token=self.token,
+                ignore_patterns=[f"{STATE_DIR}/*"],
+            )
+        finally:
+            self.invalidate(repo_id)
+
+
+def plan_batches(
+    paths: List[str],
+    manifest: Manifest,
+    max_batch_bytes: int = DEFAULT_BATCH_BYTES,
+    max_batch_files: int = DEFAULT_BATCH_FILES,
+) -> List[List[str]]:
+    """
+    Group files into commit batches bounded by total size and file count.
+
+    A single file larger than ``max_batch_bytes`` gets a batch of its own.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_bytes = 0
+    for rel in paths:
+        size = manifest[rel].size
+        if current and (current_bytes + size > max_batch_bytes or len(current) >= max_batch_files):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(rel)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _load_progress(repo_path: Path, repo_id: str) -> Dict[str, Dict[str, str]]:
+    path = repo_path / PROGRESS_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return raw.get("files", {}) if raw.get("repo_id") == repo_id else {}
+
+
+def _save_progress(repo_path: Path, repo_id: str, progress: Dict[str, Dict[str, str]]) -> None:
+    path = repo_path / PROGRESS_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"repo_id": repo_id, "files": progress}, indent=2), encoding="utf-8")
+
+
+def upload_in_batches(
+    repo_dir: str,
+    repo_id: str,
+    token: Optional[str] = None,
+    private: Optional[bool] = None,
+    num_workers: int = DEFAULT_UPLOAD_WORKERS,
+    max_batch_bytes: int = DEFAULT_BATCH_BYTES,
+    max_batch_files: int = DEFAULT_BATCH_FILES,
+    session: Optional[HubSession] = None,
+    delete_remote: bool = False,
+) -> UploadStats:
+    """
+    Upload a large repository as a series of bounded commits that can be resumed.
+
+    Changed files are grouped into batches (see ``plan_batches``). For each batch the LFS
+    files are pre-uploaded concurrently with ``num_workers`` threads and then committed.
+    Per-file progress is persisted in ``.kopen/upload-progress.json`` after every step,
+    so a rerun after a failure skips files already committed with the same content.
+
+    Args:
+        repo_dir (str): Path to the local HF dataset repository directory.
+        repo_id (str): Target Hugging Face repo ID.
+        token (str, optional): Hugging Face access token.
+        private (bool, optional): Create the repository as private.
+        num_workers (int): Concurrent LFS uploads and hashing threads.
+        max_batch_bytes (int): Upper bound on the bytes sent per commit.
+        max_batch_files (int): Upper bound on the files per commit.
+        session (HubSession, optional): Shared Hub session; a new one using ``token`` by default.
+        delete_remote (bool): Also delete remote files that are absent locally (in a final commit).
+
+    Returns:
+        UploadStats: Files, bytes, commits and elapsed time of this run.
+    """
+    with timed("upload", repo_id=repo_id) as sample:
+        stats = _upload_in_batches(
+            repo_dir, repo_id, token, private, num_workers, max_batch_bytes, max_batch_files, session, delete_remote
+        )
+        sample.bytes = stats.bytes
+    return stats
+
+
+def _upload_in_batches(
+    repo_dir: str,
+    repo_id: str,
+    token: Optional[str],
+    private: Optional[bool],
+    num_workers: int,
+    max_batch_bytes: int,
+    max_batch_files: int,
+    session: Optional[HubSession],
+    delete_remote: bool,
+) -> UploadStats:
+    repo_path = Path(repo_dir).resolve()
+    if not repo_path.exists():
+        raise FileNotFoundError(f"Repository directory does not exist: {repo_dir}")
+
+    session = session or HubSession(token=token)
+    session.ensure_repo(repo_id, private)
+
+    manifest = update_manifest(repo_path, max_workers=num_workers)
+    plan = plan_delta_upload(manifest, session.remote_files(repo_id), delete_missing=delete_remote)
+    _log_kept(repo_id, plan)
+    progress = _load_progress(repo_path, repo_id)
+
+    pending = []
+    stats = UploadStats(skipped=len(plan.unchanged))
+    for rel in plan.added + plan.changed:
+        if progress.get(rel, {}).get("committed") == manifest[rel].sha256:
+            stats.skipped += 1
+        else:
+            pending.append(rel)
+
+    batches = plan_batches(pending, manifest, max_batch_bytes, max_batch_files)
+    started = time.monotonic()
+    for index, batch in enumerate(batches, start=1):
+        operations = [CommitOperationAdd(path_in_repo=rel, path_or_fileobj=str(repo_path / rel)) for rel in batch]
+        session.preupload(repo_id, operations, num_threads=num_workers)
+        session.commit(repo_id, operations, f"Upload batch {index}/{len(batches)} ({len(batch)} files)")
+        for rel in batch:
+            progress[rel] = {"committed": manifest[rel].sha256}
+        _save_progress(repo_path, repo_id, progress)
+
+        stats.files += len(batch)
+        stats.bytes += sum(manifest[rel].size for rel in batch)
+        stats.commits += 1
+        stats.seconds = time.monotonic() - started
+        logger.info(
+            "Committed batch %d/%d: %d files, %.1f MB/s, %.1f files/s",
+            index,
+            len(batches),
+            stats.files,
+            stats.mb_per_second,
+            stats.files_per_second,
+        )
+
+    if plan.deleted:
+        session.commit(
+            repo_id,
+            [CommitOperationDelete(path_in_repo=rel) for rel in plan.deleted],
+            f"Delete {len(plan.deleted)} files",
+        )
+        stats.commits += 1
+
+    # Everything is committed: the next run starts from the remote state again.
+    (repo_path / PROGRESS_FILENAME).unlink(missing_ok=True)
+    stats.seconds = time.monotonic() - started
+    return stats
+
+
+def upload_to_hf(
+    repo_dir: str,
+    repo_id: str,
+    token: Optional[str] = None,
+    private: Optional[bool] = None,
+    delta: bool = True,
+    max_workers: Optional[int] = None,
+    session: Optional[HubSession] = None,
+    delete_remote: bool = False,
+) -> str:
     """
     Upload prepared dataset repository to Hugging Face using CLI.
 
     Args:
         repo_dir (str): Path to the local HF dataset repository directory.
         repo_id (str): Target Hugging Face repo ID (e.g., username/dataset-name).
+        token (str, optional): Hugging Face access token.
+        private (bool, optional): Create the repository as private.
+        delta (bool): Commit only added or changed files. When False the whole
+            folder is sent with ``upload_folder``.
+        max_workers (int, optional): Threads used to hash local files.
+        session (HubSession, optional): Shared Hub session; a new one using ``token`` by default.
+        delete_remote (bool): With ``delta``, also delete remote files that are absent locally.
+            Off by default: files added on the Hub by hand are kept and only logged.
     """
+    with timed("upload", repo_id=repo_id):
+        return _upload_to_hf(repo_dir, repo_id, token, private, delta, max_workers, session, delete_remote)
+
+
+def _upload_to_hf(
+    repo_dir: str,
+    repo_id: str,
+    token: Optional[str],
+    private: Optional[bool],
+    delta: bool,
+    max_workers: Optional[int],
+    session: Optional[HubSession],
+    delete_remote: bool,
+) -> str:
     repo_path = Path(repo_dir).resolve()
     if not repo_path.exists():
         raise FileNotFoundError(f"Repository directory does not exist: {repo_dir}")
 
-    api = HfApi()
-    try:
-        api.create_repo(repo_id, repo_type="dataset", token=token, exist_ok=True, private=private)
-    except HfHubHTTPError:
-        api.create_repo(repo_id, repo_type="dataset", token=token, exist_ok=True)
+    session = session or HubSession(token=token)
+    session.ensure_repo(repo_id, private)
+
+    url = f"https://huggingface.co/datasets/{repo_id}"
+    if not delta:
+        session.upload_folder(repo_id, str(repo_path))
+        return url
 
-    api.upload_folder(repo_id=repo_id, repo_type="dataset", folder_path=str(repo_path), token=token)
+    manifest = update_manifest(repo_path, max_workers=max_workers)
+    plan = plan_delta_upload(manifest, session.remote_files(repo_id), delete_missing=delete_remote)
+    _log_kept(repo_id, plan)
+    if plan.is_empty:
+        logger.info("Remote repository %s is up to date; nothing to upload.", repo_id)
+        return url
 
-    return f"https://huggingface.co/datasets/{repo_id}"
+    operations: List[Any] = [
+        CommitOperationAdd(path_in_repo=rel, path_or_fileobj=str(repo_path / rel)) for rel in plan.added + plan.changed
+    ]
+    operations.extend(CommitOperationDelete(path_in_repo=rel) for rel in plan.deleted)
+    session.commit(
+        repo_id,
+        operations,
+        f"Update dataset ({len(plan.added)} added, {len(plan.changed)} changed, {len(plan.deleted)} deleted)",
+    )
+    logger.info(
+        "Uploaded %d added, %d changed, %d deleted files to %s (%d unchanged skipped)",
+        len(plan.added),
+        len(plan.changed),
+        len(plan.deleted),
+        repo_id,
+        len(plan.unchanged),
+    )
+    return url
 
 
-def verify_upload(repo_id: str, token: Optional[str] = None) -> bool:
+def verify_repository(
+    repo_dir: str,
+    repo_id: str,
+    token: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    session: Optional[HubSession] = None,
+) -> VerificationReport:
+    """
+    Check that every local file exists remotely with the same size and content hash.
+
+    Remote sizes, blob ids and LFS sha256 come from one ``repo_info`` request. Local
+    hashes come from the manifest, so files already hashed by the uploader are not
+    read again; only files changed since then are hashed, in parallel.
+
+    Args:
+        repo_dir (str): Path to the local HF dataset repository directory.
+        repo_id (str): Hugging Face repo ID to verify against.
+        token (str, optional): Hugging Face access token.
+        max_workers (int, optional): Threads used to hash changed local files.
+        session (HubSession, optional): Shared Hub session; a new one using ``token`` by default.
+
+    Returns:
+        VerificationReport: Verified, missing, mismatched and extra (remote-only) files.
+    """
+    session = session or HubSession(token=token)
+    manifest = update_manifest(Path(repo_dir).resolve(), max_workers=max_workers)
+    remote = session.remote_files(repo_id)
+
+    report = VerificationReport(repo_id=repo_id)
+    for rel, entry in sorted(manifest.items()):
+        remote_file = remote.get(rel)
+        if remote_file is None:
+            report.missing.append(rel)
+        elif remote_file.matches(entry):
+            report.verified.append(rel)
+        else:
+            report.mismatched.append(rel)
+    report.extra = sorted(p for p in remote if p not in manifest and p not in PROTECTED_REMOTE_FILES)
+    return report
+
+
+def verify_upload(
+    repo_id: str,
+    token: Optional[str] = None,
+    repo_dir: Optional[str] = None,
+    session: Optional[HubSession] = None,
+) -> bool:
     """
     Check if the dataset repository exists on Hugging Face.
 
+    When ``repo_dir`` is given, also check that every local file was uploaded intact
+    (see ``verify_repository``) and log any missing or mismatched files.
+
     Args:
         repo_id (str): Target Hugging Face repo ID.
+        repo_dir (str, optional): Local repository to compare file by file.
+        session (HubSession, optional): Shared Hub session; a new one using ``token`` by default.
 
     Returns:
-        bool: True if repo exists, False otherwise.
+        bool: True if repo exists (and matches ``repo_dir``), False otherwise.
     """
-    api = HfApi()
+    session = session or HubSession(token=token)
     try:
-        api.repo_info(repo_id, repo_type="dataset", token=token)
-        return True
+        if repo_dir is None:
+            return session.repo_exists(repo_id)
+        report = verify_repository(repo_dir, repo_id, session=session)
     except HfHubHTTPError:
         return False
+
+    for rel in report.missing:
+        logger.error("Missing on %s: %s", repo_id, rel)
+    for rel in report.mismatched:
+        logger.error("Size or hash mismatch on %s: %s", repo_id, rel)
+    return report.ok
+
+
+def publish_many(
+    jobs: Dict[str, str],
+    token: Optional[str] = None,
+    private: Optional[bool] = None,
+    delta: bool = True,
+    verify: bool = True,
+    max_workers: Optional[int] = None,
+    session: Optional[HubSession] = None,
+    delete_remote: bool = False,
+) -> List[PublishResult]:
+    """
+    Upload and verify many dataset repositories through one shared ``HubSession``.
+
+    A failure in one repository is recorded in its result and does not stop the others.
+
+    Args:
+        jobs (dict): Mapping of Hugging Face repo ID to local repository directory.
+        token (str, optional): Hugging Face access token.
+        private (bool, optional): Create missing repositories as private.
+        delta (bool): Commit only files that differ from the remote repository.
+        verify (bool): Verify every repository file by file after uploading it.
+        max_workers (int, optional): Threads used to hash local files.
+        session (HubSession, optional): Shared Hub session; a new one using ``token`` by default.
+        delete_remote (bool): Delete remote files that are absent locally.
+
+    Returns:
+        List[PublishResult]: One result per job, in input order.
+    """
+    session = session or HubSession(token=token)
+    results: List[PublishResult] = []
+    for repo_id, repo_dir in jobs.items():
+        result = PublishResult(repo_id=repo_id, repo_dir=repo_dir)
+        try:
+            result.url = upload_to_hf(
+                repo_dir,
+                repo_id,
+                private=private,
+                delta=delta,
+                max_workers=max_workers,
+                session=session,
+                delete_remote=delete_remote,
+            )
+            result.verified = verify_upload(repo_id, repo_dir=repo_dir, session=session) if verify else True
+            if not result.verified:
+                result.error = "verification failed"
+        except (HfHubHTTPError, OSError, ValueError) as e:
+            result.error = str(e)
+            logger.error("Publishing %s from %s failed: %s", repo_id, repo_dir, e)
+        results.append(result)
+    return results
@@ -0,0 +1,346 @@
+# src/kopen_data_builder/core/url_source.py
+
+"""
+URL source module: Streams a remote CSV, XML, JSON or JSON Lines file straight into
+DataFrame chunks. The response body is read by a background thread into a bounded
+queue, so the network keeps transferring while earlier chunks are parsed and
+preprocessed. Blocks flow through gzip or zip decompression and encoding detection
+(e.g. cp949) into pandas' incremental CSV parser or the record readers of
+``core.records``; nothing is written to disk unless a copy is teed into the download cache.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import queue
+import struct
+import tempfile
+import threading
+import zlib
+from functools import partial
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+
+from kopen_data_builder.core.downloader import DEFAULT_TIMEOUT, DownloadCache, DownloadStats
+from kopen_data_builder.core.io import CSV_CHUNK_ROWS, SNIFF_BYTES, record_format, sniff_sample
+from kopen_data_builder.core.metrics import count
+
+logger = logging.getLogger(__name__)
+
+STREAM_BLOCK_BYTES = 1024 * 1024
+PREFETCH_BLOCKS = 16  # blocks buffered ahead of the parser
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_LOCAL_HEADER = b"PK\x03\x04"
+_ZIP_HEADER = struct.Struct("<4s5H3I2H")
+
+_DONE = object()
+
+
+class _BlockStream(io.RawIOBase):
+    """Readable binary stream over an iterator of byte blocks."""
+
+    def __init__(self, blocks: Iterable[bytes]):
+        self._blocks = iter(blocks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            self._buffer = next(self._blocks, b"")
+            if not self._buffer:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class _Prefetcher:
+    """
+    Reads response blocks on a background thread into a bounded queue.
+
+    Each block is optionally appended to ``tee`` (and hashed) on the same thread, so
+    caching costs the parser nothing. ``on_complete`` runs only after the whole body
+    was received.
+    """
+
+    def __init__(
+        self,
+        response: requests.Response,
+        depth: int,
+        tee: Optional[IO[bytes]] = None,
+        on_complete: Optional[Callable[["_Prefetcher"], None]] = None,
+    ):
+        self._response = response
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._tee = tee
+        self._on_complete = on_complete
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+        self._thread = threading.Thread(target=self._run, name="kopen-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            for block in self._response.iter_content(chunk_size=STREAM_BLOCK_BYTES):
+                if self._tee is not None:
+                    self._tee.write(block)
+                    self.sha256.update(block)
+                self.bytes += len(block)
+                if not self._put(block):
+                    return
+            if self._on_complete is not None:
+                self._on_complete(self)
+            self._put(_DONE)
+        except BaseException as e:  # handed to the consumer thread
+            self._put(e)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        self._stop.set()
+        # Closing the response first unblocks a producer waiting on the socket.
+        self._response.close()
+        self._thread.join()
+
+
+def _gunzip(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """Decompress a gzip stream, including concatenated members."""
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    for block in blocks:
+        while block:
+            yield decompressor.decompress(block)
+            block = decompressor.unused_data if decompressor.eof else b""
+            if decompressor.eof:
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    yield decompressor.flush()
+
+
+def _unzip_first(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Decompress the first file of a zip archive from its local header, without seeking.
+
+    Only deflate entries and stored entries with known sizes can be streamed this way;
+    later entries of the archive are ignored.
+
+    Raises:
+        ValueError: If the entry uses another compression method or cannot be streamed.
+    """
+    blocks = iter(blocks)
+    buffer = b""
+    while True:
+        while len(buffer) < _ZIP_HEADER.size:
+            block = next(blocks, b"")
+            if not block:
+                raise ValueError("Truncated zip archive")
+            buffer += block
+        signature, _, flags, method, _, _, _, csize, _, name_len, extra_len = _ZIP_HEADER.unpack_from(buffer)
+        if signature != ZIP_LOCAL_HEADER:
+            raise ValueError("Zip archive contains no streamable file")
+        header_len = _ZIP_HEADER.size + name_len + extra_len
+        while len(buffer) < header_len:
+            buffer += next(blocks, b"")
+        name = buffer[_ZIP_HEADER.size : _ZIP_HEADER.size + name_len].decode("utf-8", "replace")
+        buffer = buffer[header_len:]
+        if name.endswith("/") and not flags & 0x08:
+            buffer = buffer[csize:]  # directory entry
+            continue
+        break
+
+    logger.debug("Streaming zip entry %s", name)
+    if method == 8:
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        for block in _chain([buffer], blocks):
+            yield decompressor.decompress(block)
+            if decompressor.eof:
+                break
+        yield decompressor.flush()
+    elif method == 0 and not flags & 0x08 and csize != 0xFFFFFFFF:
+        remaining = csize
+        for block in _chain([buffer], blocks):
+            yield block[:remaining]
+            remaining -= min(len(block), remaining)
+            if remaining <= 0:
+                break
+    else:
+        raise ValueError(f"Cannot stream zip entry {name} (method {method}); download it first")
+
+
+def _decompress(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """Detect gzip or zip from the magic bytes and decompress on the fly; pass anything else through."""
+    blocks = iter(blocks)
+    head = b""
+    for block in blocks:
+        head += block
+        if len(head) >= len(ZIP_LOCAL_HEADER):
+            break
+    stream = _chain([head], blocks)
+    if head.startswith(GZIP_MAGIC):
+        return _gunzip(stream)
+    if head.startswith(ZIP_LOCAL_HEADER):
+        return _unzip_first(stream)
+    return stream
+
+
+def _chain(first: List[bytes], rest: Iterator[bytes]) -> Iterator[bytes]:
+    yield from (b for b in first if b)
+    yield from rest
+
+
+def _store_in_cache(
+    cache: DownloadCache, url: str, tee: IO[bytes], response: requests.Response
+) -> Callable[["_Prefetcher"], None]:
+    """Callback registering the fully received body, teed into ``tee``, in the download cache."""
+    stats = DownloadStats(
+        path=Path(tee.name),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+    def on_complete(prefetcher: _Prefetcher) -> None:
+        tee.close()
+        cache.store(url, Path(tee.name), prefetcher.sha256.hexdigest(), stats)
+
+    return on_complete
+
+
+def iter_url_frames(
+    url: str,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    encoding: Optional[str] = None,
+    sep: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    cache: Optional[DownloadCache] = None,
+    prefetch_blocks: int = PREFETCH_BLOCKS,
+    file_format: Optional[str] = None,
+    **read_csv_kwargs: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a remote CSV, XML, JSON or JSON Lines file (optionally gzip- or zip-compressed)
+    as DataFrame chunks.
+
+    HTTP ``Content-Encoding`` is undone by the client; gzip and zip payloads are
+    recognised by their magic bytes. The encoding (UTF-8 with or without BOM, or cp949)
+    and delimiter are sniffed from the first decompressed bytes unless given.
+
+    With a ``cache``, a cached copy is revalidated with a conditional request and read
+    from disk on ``304``; otherwise the received bytes are teed into the cache and
+    registered once the body is complete.
+
+    Args:
+        url (str): URL of the CSV file.
+        chunk_rows (int): Rows per yielded DataFrame.
+        encoding (str, optional): Text encoding; detected when omitted.
+        sep (str, optional): Delimiter; detected when omitted.
+        session (requests.Session, optional): Session to reuse pooled connections from.
+        cache (DownloadCache, optional): Download cache to revalidate against and fill.
+        prefetch_blocks (int): 1 MiB blocks buffered ahead of the parser.
+        file_format (str, optional): ``csv``, ``xml``, ``json`` or ``jsonl``; taken from the
+            URL's suffix when omitted.
+        **read_csv_kwargs: Extra ``pd.read_csv`` arguments (e.g. ``dtype``, ``usecols``); record
+            formats honour only ``usecols`` and ``nrows``.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of at most ``chunk_rows`` rows.
+
+    Raises:
+        HTTPError: If the HTTP request returns an unsuccessful status code.
+        ValueError: If the encoding cannot be detected or the archive cannot be streamed.
+    """
+    http = session or requests.Session()
+    entry = cache.lookup(url) if cache is not None else None
+    headers = cache.conditional_headers(entry) if cache is not None and entry is not None else {}
+    response = http.get(url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT)
+    prefetcher: Optional[_Prefetcher] = None
+    cached: Optional[IO[bytes]] = None
+    tee: Optional[IO[bytes]] = None
+    try:
+        response.raise_for_status()
+        if response.status_code == 304 and cache is not None and entry is not None:
+            logger.info("Not modified, reading %s from the download cache", url)
+            response.close()
+            cache.touch(url)
+            count("download_cache_hits")
+            cached = open(cache.blob_path(entry.sha256), "rb")
+            blocks: Iterator[bytes] = iter(partial(cached.read, STREAM_BLOCK_BYTES), b"")
+        else:
+            on_complete = None
+            if cache is not None:
+                cache.root.mkdir(parents=True, exist_ok=True)
+                tee = tempfile.NamedTemporaryFile(dir=cache.root, suffix=".stream", delete=False)
+                on_complete = _store_in_cache(cache, url, tee, response)
+            prefetcher = _Prefetcher(response, prefetch_blocks, tee=tee, on_complete=on_complete)
+            blocks = iter(prefetcher)
+
+        data = _decompress(blocks)
+        head = b""
+        for block in data:
+            head += block
+            if len(head) >= SNIFF_BYTES:
+                break
+        if not head:
+            return
+        file_format = file_format or record_format(urlparse(url).path) or "csv"
+        if file_format != "csv":
+            from kopen_data_builder.core.records import iter_record_frames
+
+            stream = io.BufferedReader(_BlockStream(_chain([head], data)), buffer_size=STREAM_BLOCK_BYTES)
+            yield from iter_record_frames(
+                stream,
+                file_format,
+                chunk_rows=chunk_rows,
+                encoding=encoding,
+                usecols=read_csv_kwargs.get("usecols"),
+                nrows=read_csv_kwargs.get("nrows"),
+            )
+            return
+        try:
+            detected_encoding, detected_sep, _ = sniff_sample(head)
+        except ValueError:
+            if encoding is None:
+                raise
+            detected_encoding, detected_sep = encoding, ","
+        text = io.TextIOWrapper(
+            io.BufferedReader(_BlockStream(_chain([head], data)), buffer_size=STREAM_BLOCK_BYTES),
+            encoding=encoding or detected_encoding,
+            newline="",
+        )
+        with pd.read_csv(text, sep=sep or detected_sep, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+            yield from reader
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+        else:
+            response.close()
+        if cached is not None:
+            cached.close()
+        if tee is not None:
+            tee.close()
+            if os.path.exists(tee.name):
+                os.unlink(tee.name)
+        if session is None:
+            http.close()
@@ -0,0 +1,407 @@
+# src/kopen_data_builder/registry.py
+
+"""
+Registry module: Indexes dataset metadata files in the local SQLite state database.
+Each ``metadata.yaml`` is parsed and validated once; later lookups reuse the stored
+model while the file's size and mtime (or, failing that, its sha256) are unchanged.
+Agency, license, update frequency and tags are stored as indexed columns, together
+with the last build and upload of each dataset, so questions such as "all monthly
+datasets from 서울열림데이터광장 due for refresh" are answered without reading any
+YAML. The database is the one used by the stage cache (``$KOPEN_STATE_DB``).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from kopen_data_builder.core.manifest import hash_file, load_manifest
+from kopen_data_builder.core.metadata import load_metadata
+from kopen_data_builder.core.models import DatasetMeta
+from kopen_data_builder.core.stage_cache import default_state_db
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILENAMES = ("metadata.yaml", "metadata.yml")
+DAY_SECONDS = 24 * 60 * 60
+# Refresh interval in days per normalized update frequency; Korean portal labels included.
+FREQUENCY_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "monthly": 31,
+    "quarterly": 92,
+    "semiannual": 183,
+    "annual": 366,
+}
+FREQUENCY_ALIASES = {
+    "day": "daily",
+    "일간": "daily",
+    "매일": "daily",
+    "week": "weekly",
+    "주간": "weekly",
+    "매주": "weekly",
+    "month": "monthly",
+    "월간": "monthly",
+    "매월": "monthly",
+    "quarter": "quarterly",
+    "분기": "quarterly",
+    "semi-annual": "semiannual",
+    "semiannually": "semiannual",
+    "biannual": "semiannual",
+    "반기": "semiannual",
+    "yearly": "annual",
+    "annually": "annual",
+    "year": "annual",
+    "연간": "annual",
+    "매년": "annual",
+}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    error TEXT,
+    meta TEXT,
+    pretty_name TEXT,
+    agency_en TEXT,
+    agency_ko TEXT,
+    license TEXT,
+    update_frequency TEXT,
+    frequency TEXT,
+    indexed_at REAL NOT NULL,
+    repo_dir TEXT,
+    build_hash TEXT,
+    built_at REAL,
+    repo_id TEXT,
+    upload_hash TEXT,
+    uploaded_at REAL
+);
+CREATE TABLE IF NOT EXISTS dataset_tags (
+    tag TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (tag, path)
+);
+CREATE INDEX IF NOT EXISTS datasets_frequency ON datasets (frequency);
+CREATE INDEX IF NOT EXISTS datasets_agency_en ON datasets (agency_en);
+CREATE INDEX IF NOT EXISTS datasets_agency_ko ON datasets (agency_ko);
+CREATE INDEX IF NOT EXISTS datasets_license ON datasets (license);
+CREATE INDEX IF NOT EXISTS datasets_repo_dir ON datasets (repo_dir);
+"""
+COLUMNS = (
+    "path, error, pretty_name, agency_en, agency_ko, license, update_frequency, frequency, "
+    "repo_dir, build_hash, built_at, repo_id, upload_hash, uploaded_at"
+)
+
+PathLike = Union[str, Path]
+
+
+def normalize_frequency(value: Optional[str]) -> Optional[str]:
+    """Map an update frequency such as ``Monthly`` or ``월간`` to a key of ``FREQUENCY_DAYS`` (None if unknown)."""
+    if not value:
+        return None
+    key = value.strip().lower()
+    key = FREQUENCY_ALIASES.get(key, key)
+    return key if key in FREQUENCY_DAYS else None
+
+
+@dataclass
+class RegistryEntry:
+    """One indexed metadata file with its last build and upload."""
+
+    path: str
+    error: Optional[str]
+    pretty_name: Optional[str]
+    agency_en: Optional[str]
+    agency_ko: Optional[str]
+    license: Optional[str]
+    update_frequency: Optional[str]
+    frequency: Optional[str]
+    repo_dir: Optional[str]
+    build_hash: Optional[str]
+    built_at: Optional[float]
+    repo_id: Optional[str]
+    upload_hash: Optional[str]
+    uploaded_at: Optional[float]
+    tags: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    def next_refresh(self) -> Optional[float]:
+        """When the dataset should be rebuilt (epoch seconds): last build plus its update interval."""
+        if self.frequency is None or self.built_at is None:
+            return None
+        return self.built_at + FREQUENCY_DAYS[self.frequency] * DAY_SECONDS
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """True for valid datasets never built, or whose update interval has passed since the last build."""
+        if not self.valid:
+            return False
+        if self.built_at is None:
+            return True
+        next_refresh = self.next_refresh()
+        return next_refresh is not None and next_refresh <= (time.time() if now is None else now)
+
+    @property
+    def upload_pending(self) -> bool:
+        """True if the dataset was rebuilt after its last upload."""
+        return self.built_at is not None and (self.uploaded_at is None or self.uploaded_at < self.built_at)
+
+
+@dataclass
+class IndexStats:
+    """What ``DatasetRegistry.index`` did."""
+
+    unchanged: int = 0
+    revalidated: int = 0
+    invalid: List[str] = field(default_factory=list)
+    removed: int = 0
+
+
+class DatasetRegistry:
+    """
+    SQLite index of dataset metadata files.
+
+    Connections are opened per call, as in ``StageCache``, so build and upload stages
+    running in worker processes can record themselves in the same database.
+    """
+
+    def __init__(self, path: Optional[PathLike] = None):
+        self.path = Path(path) if path is not None else default_state_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def index(self, paths: Iterable[PathLike], prune: bool = False) -> IndexStats:
+        """
+        Index metadata files, revalidating only those whose contents changed.
+
+        Args:
+            paths (Iterable[str | Path]): Metadata files, or directories searched
+                recursively for ``metadata.yaml``/``metadata.yml``.
+            prune (bool): Drop entries whose metadata file no longer exists.
+
+        Returns:
+            IndexStats: Unchanged and revalidated counts, invalid files and removed entries.
+
+        Raises:
+            FileNotFoundError: If a given path does not exist.
+        """
+        stats = IndexStats()
+        with closing(self._connect()) as conn, conn:
+            for path in _metadata_files(paths):
+                revalidated, error = self._refresh(conn, path)
+                if revalidated:
+                    stats.revalidated += 1
+                else:
+                    stats.unchanged += 1
+                if error is not None:
+                    stats.invalid.append(str(path))
+            if prune:
+                for (path,) in conn.execute("SELECT path FROM datasets").fetchall():
+                    if not Path(path).is_file():
+                        _delete(conn, path)
+                        stats.removed += 1
+        logger.info(
+            "Indexed metadata: %d unchanged, %d revalidated, %d invalid, %d removed",
+            stats.unchanged,
+            stats.revalidated,
+            len(stats.invalid),
+            stats.removed,
+        )
+        return stats
+
+    def load(self, path: PathLike) -> DatasetMeta:
+        """
+        Drop-in for ``load_metadata`` that skips YAML parsing for unchanged files.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is malformed or fails schema validation.
+        """
+        resolved = Path(path).resolve()
+        if not resolved.is_file():
+            raise FileNotFoundError(f"Metadata file not found at: {resolved}")
+        with closing(self._connect()) as conn, conn:
+            self._refresh(conn, resolved)
+            error, meta = conn.execute("SELECT error, meta FROM datasets WHERE path = ?", (str(resolved),)).fetchone()
+        if error is not None:
+            raise ValueError(error)
+        metadata: DatasetMeta = DatasetMeta.model_validate_json(meta)
+        return metadata
+
+    def _refresh(self, conn: sqlite3.Connection, path: Path) -> Tuple[bool, Optional[str]]:
+        # Returns (revalidated, validation error) for the metadata file at the resolved ``path``.
+        stat = path.stat()
+        row = conn.execute("SELECT size, mtime_ns, sha256, error FROM datasets WHERE path = ?", (str(path),)).fetchone()
+        if row is not None and (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns):
+            return False, row[3]
+        sha256: str = hash_file(path)[0]
+        if row is not None and row[2] == sha256:
+            conn.execute(
+                "UPDATE datasets SET size = ?, mtime_ns = ? WHERE path = ?", (stat.st_size, stat.st_mtime_ns, str(path))
+            )
+            return False, row[3]
+
+        values: Dict[str, object] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+        tags: List[str] = []
+        error: Optional[str] = None
+        try:
+            metadata = load_metadata(str(path))
+        except ValueError as e:
+            logger.warning("Invalid metadata %s: %s", path, e)
+            error = str(e)
+            values.update(error=error, meta=None, pretty_name=None, agency_en=None, agency_ko=None)
+            values.update(license=None, update_frequency=None, frequency=None)
+        else:
+            tags = list(dict.fromkeys(metadata.tags))
+            values.update(
+                error=None,
+                meta=metadata.model_dump_json(),
+                pretty_name=_text(metadata.pretty_name),
+                agency_en=metadata.source_agency.en,
+                agency_ko=metadata.source_agency.ko,
+                license=str(getattr(metadata.license, "value", metadata.license)),
+                update_frequency=metadata.update_frequency,
+                frequency=normalize_frequency(metadata.update_frequency),
+            )
+        values["indexed_at"] = time.time()
+
+        if row is None:
+            conn.execute(
+                f"INSERT INTO datasets (path, {', '.join(values)}) VALUES (?{', ?' * len(values)})",
+                (str(path), *values.values()),
+            )
+        else:
+            assignments = ", ".join(f"{name} = ?" for name in values)
+            conn.execute(f"UPDATE datasets SET {assignments} WHERE path = ?", (*values.values(), str(path)))
+        conn.execute("DELETE FROM dataset_tags WHERE path = ?", (str(path),))
+        conn.executemany("INSERT INTO dataset_tags VALUES (?, ?)", [(tag, str(path)) for tag in tags])
+        return True, error
+
+    def find(
+        self,
+        frequency: Optional[str] = None,
+        agency: Optional[str] = None,
+        tags: Sequence[str] = (),
+        license: Optional[str] = None,
+        due: bool = False,
+        include_invalid: bool = False,
+        now: Optional[float] = None,
+    ) -> List[RegistryEntry]:
+        """
+        Query indexed datasets; filters are combined with AND.
+
+        Args:
+            frequency (str, optional): Update frequency, e.g. ``Monthly`` or ``월간``.
+            agency (str, optional): Source agency, in English or Korean.
+            tags (Sequence[str]): Tags every result must carry.
+            license (str, optional): License identifier, e.g. ``cc-by-4.0``.
+            due (bool): Only datasets due for refresh (see ``RegistryEntry.is_due``).
+            include_invalid (bool): Also return files that failed validation.
+            now (float, optional): Reference time for ``due``; defaults to the current time.
+
+        Returns:
+            List[RegistryEntry]: Matching entries, ordered by path.
+
+        Raises:
+            ValueError: If ``frequency`` is not a known update frequency.
+        """
+        conditions: List[str] = []
+        params: List[object] = []
+        if frequency:
+            normalized = normalize_frequency(frequency)
+            if normalized is None:
+                raise ValueError(f"Unknown update frequency '{frequency}'. Use one of: {', '.join(FREQUENCY_DAYS)}")
+            conditions.append("frequency = ?")
+            params.append(normalized)
+        if agency:
+            conditions.append("(agency_en = ? OR agency_ko = ?)")
+            params.extend([agency, agency])
+        if license:
+            conditions.append("license = ?")
+            params.append(license)
+        for tag in tags:
+            conditions.append("path IN (SELECT path FROM dataset_tags WHERE tag = ?)")
+            params.append(tag)
+        if not include_invalid:
+            conditions.append("error IS NULL")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT {COLUMNS} FROM datasets{where} ORDER BY path", params).fetchall()
+            entries = [RegistryEntry(*row) for row in rows]
+            for entry in entries:
+                entry.tags = [r[0] for r in conn.execute("SELECT tag FROM dataset_tags WHERE path = ?", (entry.path,))]
+        if due:
+            entries = [entry for entry in entries if entry.is_due(now)]
+        return entries
+
+    def record_build(self, metadata_path: PathLike, repo_dir: PathLike, build_hash: str) -> None:
+        """
+        Remember that the dataset described by ``metadata_path`` was built into ``repo_dir``.
+
+        ``build_hash`` is the stage-cache key of the build (inputs, options and tool version).
+        """
+        path = Path(metadata_path).resolve()
+        with closing(self._connect()) as conn, conn:
+            self._refresh(conn, path)
+            conn.execute(
+                "UPDATE datasets SET repo_dir = ?, build_hash = ?, built_at = ? WHERE path = ?",
+                (str(Path(repo_dir).resolve()), build_hash, time.time(), str(path)),
+            )
+
+    def record_upload(self, repo_dir: PathLike, repo_id: str) -> int:
+        """
+        Remember that ``repo_dir`` was published as ``repo_id``.
+
+        The upload hash is a digest of the repository manifest the upload just refreshed,
+        so equal hashes mean identical published contents. Returns the number of datasets
+        built into ``repo_dir``; repositories built without metadata are not tracked.
+        """
+        manifest = load_manifest(repo_dir)
+        contents = json.dumps({rel: entry.sha256 for rel, entry in sorted(manifest.items())})
+        digest = hashlib.sha256(contents.encode()).hexdigest()
+        with closing(self._connect()) as conn, conn:
+            return int(
+                conn.execute(
+                    "UPDATE datasets SET repo_id = ?, upload_hash = ?, uploaded_at = ? WHERE repo_dir = ?",
+                    (repo_id, digest, time.time(), str(Path(repo_dir).resolve())),
+                ).rowcount
+            )
+
+
+def _metadata_files(paths: Iterable[PathLike]) -> List[Path]:
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(p for name in METADATA_FILENAMES for p in sorted(path.rglob(name)) if p.is_file())
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Metadata file or directory not found: {path}")
+    return list(dict.fromkeys(p.resolve() for p in files))
+
+
+def _delete(conn: sqlite3.Connection, path: str) -> None:
+    conn.execute("DELETE FROM datasets WHERE path = ?", (path,))
+    conn.execute("DELETE FROM dataset_tags WHERE path = ?", (path,))
+
+
+def _text(value: object) -> Optional[str]:
+    # pretty_name is either a plain string or a LocalizedText with en/ko.
+    if isinstance(value, str):
+        return value
+    en, ko = getattr(value, "en", None), getattr(value, "ko", None)
+    return str(en or ko) if en or ko else None
@@ -0,0 +1,242 @@
+# tests/conftest.py
+
+"""Shared fixtures, including an in-memory stand-in for the Hugging Face Hub API."""
+
+import gzip
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, get_type_hints
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests
+from huggingface_hub import CommitOperationAdd, CommitOperationDelete
+from huggingface_hub.errors import HfHubHTTPError, RepositoryNotFoundError
+from huggingface_hub.hf_api import DatasetInfo
+
+
+def hub_response(status_code: int, url: str) -> Any:
+    """
+    A real HTTP response for Hub errors.
+
+    huggingface_hub errors take a ``requests.Response`` before 1.0 and an httpx-style
+    response after, so the type is taken from the installed version.
+    """
+    response_type = get_type_hints(HfHubHTTPError.__init__)["response"]
+    if response_type is requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url
+        response.request = requests.Request("GET", url).prepare()
+        return response
+    return response_type(status_code, request=sys.modules[response_type.__module__].Request("GET", url))
+
+
+class FakeHubApi:
+    """Implements the subset of ``HfApi`` used by the uploader against an in-memory repository."""
+
+    lfs_suffixes = (".csv", ".parquet", ".arrow")
+
+    def __init__(self) -> None:
+        self.repos: Dict[str, Dict[str, bytes]] = {}
+        self.calls: List[Tuple[str, Any]] = []
+        self.fail_on_commit: Optional[int] = None  # 1-based index of a create_commit call that should fail
+
+    def create_repo(self, repo_id: str, **kwargs: Any) -> str:
+        self.calls.append(("create_repo", repo_id))
+        self.repos.setdefault(repo_id, {".gitattributes": b"*.parquet filter=lfs\n"})
+        return f"https://huggingface.co/datasets/{repo_id}"
+
+    def repo_info(self, repo_id: str, files_metadata: bool = False, **kwargs: Any) -> DatasetInfo:
+        self.calls.append(("repo_info", repo_id))
+        if repo_id not in self.repos:
+            url = f"https://huggingface.co/api/datasets/{repo_id}"
+            raise RepositoryNotFoundError(f"{repo_id} not found", response=hub_response(404, url))
+        files = self.repos[repo_id]
+        siblings = [
+            self._sibling(path, content) if files_metadata else {"rfilename": path} for path, content in files.items()
+        ]
+        # DatasetInfo.__init__ takes **kwargs and is not annotated.
+        return DatasetInfo(id=repo_id, siblings=siblings)  # type: ignore[no-untyped-call]
+
+    def preupload_lfs_files(self, repo_id: str, additions: Iterable[Any], **kwargs: Any) -> None:
+        self.calls.append(("preupload_lfs_files", [op.path_in_repo for op in additions]))
+
+    def create_commit(self, repo_id: str, operations: Iterable[Any], **kwargs: Any) -> None:
+        operations = list(operations)
+        if self.fail_on_commit is not None and len(self.commits()) + 1 == self.fail_on_commit:
+            self.fail_on_commit = None
+            raise ConnectionError("simulated network failure")
+        self.calls.append(("create_commit", [getattr(op, "path_in_repo", None) for op in operations]))
+        files = self.repos[repo_id]
+        for op in operations:
+            if isinstance(op, CommitOperationAdd):
+                files[op.path_in_repo] = self._read(op.path_or_fileobj)
+            elif isinstance(op, CommitOperationDelete):
+                files.pop(op.path_in_repo, None)
+
+    def calls_named(self, name: str) -> List[Any]:
+        return [args for call, args in self.calls if call == name]
+
+    def commits(self) -> List[Any]:
+        return self.calls_named("create_commit")
+
+    def _sibling(self, path: str, content: bytes) -> Dict[str, Any]:
+        blob_id = hashlib.sha1(f"blob {len(content)}\0".encode() + content).hexdigest()
+        entry: Dict[str, Any] = {"rfilename": path, "size": len(content), "blobId": blob_id}
+        if path.endswith(self.lfs_suffixes):
+            entry["lfs"] = {"size": len(content), "sha256": hashlib.sha256(content).hexdigest(), "pointerSize": 134}
+        return entry
+
+    @staticmethod
+    def _read(source: Union[str, Path, bytes, Any]) -> bytes:
+        if isinstance(source, bytes):
+            return source
+        if isinstance(source, (str, Path)):
+            return Path(source).read_bytes()
+        data: bytes = source.read()
+        return data
+
+
+@pytest.fixture(autouse=True)
+def isolated_state_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the stage cache of every test (and the CLI subprocesses it starts) in its own temp dir."""
+    path = tmp_path / "state.db"
+    monkeypatch.setenv("KOPEN_STATE_DB", str(path))
+    return path
+
+
+@pytest.fixture
+def fake_hub() -> FakeHubApi:
+    return FakeHubApi()
+
+
+class LocalHttpServer:
+    """Serves in-memory files over HTTP on localhost, with Range/ETag support and fault injection."""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, bytes] = {}
+        # path -> handler(query, path) returning (body, content type), for API-style endpoints
+        self.routes: Dict[str, Callable[[Dict[str, str], str], Tuple[bytes, str]]] = {}
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.support_ranges = True
+        self.cut_after: Optional[int] = None  # bytes of the body sent before the connection drops (once)
+        self.fail_first: Dict[str, int] = {}  # path -> number of 503 responses before succeeding
+        self.delay = 0.0  # seconds each response is held, to observe concurrency
+        # "negotiated": gzip file bodies when Accept-Encoding allows it; "always": even for identity
+        self.gzip: Optional[str] = None
+        self.active = 0
+        self.max_active = 0
+        self.connections: Set[Tuple[str, int]] = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}{path}"
+
+    def etag(self, path: str) -> str:
+        return '"' + hashlib.sha256(self.files[path]).hexdigest()[:16] + '"'
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                with server._lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.connections.add(self.client_address)
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    time.sleep(server.delay)
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _respond(self) -> None:
+                if server.fail_first.get(self.path, 0) > 0:
+                    server.fail_first[self.path] -= 1
+                    self.send_response(503)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                route = next((r for prefix, r in server.routes.items() if self.path.startswith(prefix)), None)
+                if route is not None:
+                    parts = urlsplit(self.path)
+                    payload, content_type = route(dict(parse_qsl(parts.query)), parts.path)
+                    self.send_response(200)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                body = server.files.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = server.etag(self.path)
+                accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+                encoded = server.gzip == "always" or (server.gzip == "negotiated" and accepts_gzip)
+                if encoded:
+                    body = gzip.compress(body, mtime=0)
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                start = 0
+                range_header = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if range_header and server.support_ranges and if_range in (None, etag):
+                    start = int(range_header.split("=", 1)[1].split("-", 1)[0])
+                    if start >= len(body):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(body)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                else:
+                    self.send_response(200)
+                self.send_header("ETag", etag)
+                if encoded:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                payload = body[start:]
+                if server.cut_after is not None:
+                    payload, server.cut_after = payload[: server.cut_after], None
+                    self.close_connection = True
+                self.wfile.write(payload)
+
+        return Handler
+
+
+@pytest.fixture
+def http_server() -> Iterator[LocalHttpServer]:
+    server = LocalHttpServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,125 @@
+# tests/test_api_source.py
+
+import io
+import json
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.api_source import ApiSource, iter_api_frames, parse_json_page, parse_xml_page
+from kopen_data_builder.core.downloader import HostLimits
+from kopen_data_builder.core.preprocessing import preprocess_chunks
+from tests.conftest import LocalHttpServer
+
+ROWS = [
+    {"stationName": f"측정소{i} ", "dataTime": f"2024-03-{i % 28 + 1:02d} 10:00", "pm10": str(i)} for i in range(23)
+]
+
+
+def data_go_kr_json(query: Dict[str, str], path: str) -> Tuple[bytes, str]:
+    page, size = int(query["pageNo"]), int(query["numOfRows"])
+    items = ROWS[(page - 1) * size : page * size]
+    body = {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_CODE"},
+            "body": {"items": {"item": items}, "numOfRows": size, "pageNo": page, "totalCount": len(ROWS)},
+        }
+    }
+    return json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json;charset=UTF-8"
+
+
+def seoul_xml(query: Dict[str, str], path: str) -> Tuple[bytes, str]:
+    start, end = (int(p) for p in path.rstrip("/").split("/")[-2:])
+    rows = "".join(
+        "<row>" + "".join(f"<{k}>{v}</{k}>" for k, v in row.items()) + "</row>" for row in ROWS[start - 1 : end]
+    )
+    xml = (
+        f"<?xml version='1.0' encoding='UTF-8'?><bikeList><list_total_count>{len(ROWS)}</list_total_count>"
+        f"<RESULT><CODE>INFO-000</CODE><MESSAGE>정상 처리되었습니다</MESSAGE></RESULT>{rows}</bikeList>"
+    )
+    return xml.encode("utf-8"), "application/xml;charset=UTF-8"
+
+
+def test_iter_api_frames_data_go_kr_json(http_server: LocalHttpServer) -> None:
+    """All pages are fetched concurrently and yielded in order."""
+    http_server.routes["/getData"] = data_go_kr_json
+    source = ApiSource(http_server.url("/getData"), params={"serviceKey": "k"}, page_size=5)
+
+    frames = list(iter_api_frames(source))
+
+    assert len(frames) == 5
+    assert pd.concat(frames)["pm10"].tolist() == [str(i) for i in range(23)]
+    assert http_server.requests[0][0].startswith("/getData?serviceKey=k&pageNo=1&numOfRows=5")
+
+
+def test_iter_api_frames_seoul_xml(http_server: LocalHttpServer) -> None:
+    """Seoul-style START/END paths are generated and XML rows are parsed."""
+    http_server.routes["/KEY/xml/bikeList/"] = seoul_xml
+    source = ApiSource(http_server.url("/KEY/xml/bikeList"), style="seoul", page_size=10, limits=HostLimits(2, 100.0))
+
+    frames = list(iter_api_frames(source))
+
+    assert [len(f) for f in frames] == [10, 10, 3]
+    assert sorted(p for p, _ in http_server.requests) == [
+        "/KEY/xml/bikeList/1/10/",
+        "/KEY/xml/bikeList/11/20/",
+        "/KEY/xml/bikeList/21/30/",
+    ]
+
+
+def test_parse_json_page_raises_api_errors() -> None:
+    """A data.go.kr error header becomes a ValueError carrying the message."""
+    payload = {"response": {"header": {"resultCode": "30", "resultMsg": "SERVICE_KEY_IS_NOT_REGISTERED_ERROR"}}}
+    with pytest.raises(ValueError, match="SERVICE_KEY"):
+        parse_json_page(payload)
+
+
+def test_parse_json_page_accepts_seoul_empty_result() -> None:
+    """Seoul's bare RESULT with INFO-200 (no data) is an empty page, not an error."""
+    payload = {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+    assert parse_json_page(payload) == ([], 0)
+    with pytest.raises(ValueError, match="INFO-100"):
+        parse_json_page({"RESULT": {"CODE": "INFO-100", "MESSAGE": "인증키가 유효하지 않습니다."}})
+
+
+def test_parse_pages_accept_data_go_kr_no_data() -> None:
+    """data.go.kr's NODATA_ERROR (03) is an empty page in both JSON and XML."""
+    payload = {"response": {"header": {"resultCode": "03", "resultMsg": "NODATA_ERROR"}}}
+    assert parse_json_page(payload) == ([], 0)
+    xml = b"<response><header><resultCode>03</resultCode><resultMsg>NODATA_ERROR</resultMsg></header></response>"
+    assert parse_xml_page(io.BytesIO(xml)) == ([], 0)
+
+
+def test_preprocess_chunks_keeps_schema_consistent() -> None:
+    """Date columns found in the first chunk are converted in every chunk."""
+    chunks = [pd.DataFrame(ROWS[:5]), pd.DataFrame([{"stationName": "x", "dataTime": "24", "pm10": "1"}])]
+    cleaned = list(preprocess_chunks(chunks))
+    assert list(cleaned[0].columns) == ["stationname", "datatime", "pm10"]
+    assert cleaned[0]["stationname"].iloc[0] == "측정소0"
+    assert all(pd.api.types.is_datetime64_any_dtype(c["datatime"]) for c in cleaned)
+
+
+def test_fetch_run_writes_csv(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """The CLI streams every page into one CSV with a single header."""
+    http_server.routes["/getData"] = data_go_kr_json
+    output = tmp_path / "air.csv"
+    result = CliRunner().invoke(
+        app,
+        ["fetch", "run", "--url", http_server.url("/getData"), "--param", "serviceKey=k", "--page-size", "7"]
+        + ["--output-csv", str(output)],
+    )
+    assert result.exit_code == 0, result.output
+    df = pd.read_csv(output)
+    assert len(df) == 23 and list(df.columns) == ["stationname", "datatime", "pm10"]
+
+
+def test_fetch_run_reports_http_errors(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """A failing API ends the command with exit code 1 and a message instead of a traceback."""
+    result = CliRunner().invoke(
+        app, ["fetch", "run", "--url", http_server.url("/missing"), "--output-csv", str(tmp_path / "out.csv")]
+    )
+    assert result.exit_code == 1 and "404" in result.output
@@ -0,0 +1,168 @@
+# tests/test_batch.py
+
+import logging
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.batch import (
+    DatasetResult,
+    PipelineSpec,
+    estimate_memory_mb,
+    format_summary,
+    load_pipeline,
+    run_batch,
+)
+from kopen_data_builder.core.uploader import HubSession
+from tests.conftest import FakeHubApi, LocalHttpServer
+
+CSV = "지역,인구\n" + "".join(f"구{i},{i * 100}\n" for i in range(50))
+
+
+def _write_pipeline(directory: Path, name: str, body: str) -> Path:
+    path = directory / f"{name}.yaml"
+    path.write_text(f"name: {name}\n{body}", encoding="utf-8")
+    return path
+
+
+def test_load_pipeline_resolves_paths_and_defaults(tmp_path: Path) -> None:
+    path = _write_pipeline(
+        tmp_path,
+        "bike",
+        "download:\n  - https://example.org/files/bike_2024.csv\n"
+        "build:\n  format: parquet\n  partition_by: reg_date:year, gu\n"
+        "upload:\n  repo_id: org/bike\n",
+    )
+
+    spec = load_pipeline(path)
+
+    assert spec.workdir == tmp_path / "bike"
+    assert spec.input == tmp_path / "bike" / "bike_2024.csv"
+    assert spec.downloads[0].output_path == spec.input
+    assert (spec.output_format, spec.partition_by) == ("parquet", ["reg_date:year", "gu"])
+    assert (spec.split, spec.repo_id, spec.repo_dir) == ({"train": 0.8, "test": 0.2}, "org/bike", spec.workdir / "repo")
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [("input: a.csv\nspilt: {train: 1.0}\n", "Unknown keys"), ("preprocess: false\n", "needs an 'input'")],
+)
+def test_load_pipeline_rejects_malformed_definitions(tmp_path: Path, body: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        load_pipeline(_write_pipeline(tmp_path, "bad", body))
+
+
+def test_estimate_memory_prefers_explicit_budget(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_bytes(b"x" * 20 * 1024**2)
+
+    assert estimate_memory_mb(PipelineSpec("a", tmp_path, data)) == 120
+    assert estimate_memory_mb(PipelineSpec("a", tmp_path, data, memory_mb=500)) == 500
+    assert estimate_memory_mb(PipelineSpec("a", tmp_path, tmp_path / "missing.csv")) == 64
+
+
+def test_run_batch_overlaps_stages_and_isolates_failures(
+    http_server: LocalHttpServer, fake_hub: FakeHubApi, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A download, a local input, an upload and a broken input all run in one batch; only the broken one fails."""
+    http_server.files["/bike.csv"] = CSV.encode("cp949")
+    (tmp_path / "local").mkdir()
+    (tmp_path / "local" / "local.csv").write_text(CSV, encoding="utf-8")
+    specs = [
+        load_pipeline(_write_pipeline(tmp_path, "remote", f"download:\n  - {http_server.url('/bike.csv')}\n")),
+        load_pipeline(
+            _write_pipeline(
+                tmp_path, "local", "input: local.csv\nbuild: {format: parquet}\nupload: {repo_id: org/local}\n"
+            )
+        ),
+        load_pipeline(_write_pipeline(tmp_path, "broken", "input: missing.csv\n")),
+    ]
+
+    with caplog.at_level(logging.DEBUG, logger="kopen_data_builder.core.batch"):
+        results = run_batch(specs, workers=2, memory_budget_mb=100, session=HubSession(api=fake_hub))
+
+    remote, local, broken = results
+    assert (remote.status, local.status, broken.status) == ("ok", "ok", "failed")
+    assert remote.rows == local.rows == 50
+    assert (tmp_path / "remote" / "repo" / "train.csv").exists()
+    assert set(fake_hub.repos["org/local"]) >= {"README.md", "train.parquet", "test.parquet"}
+    assert local.url and {"download", "process", "upload", "total"} - set(remote.timings) == {"upload"}
+    assert broken.error is not None and broken.error.startswith("process:")
+    assert "waits for memory" in caplog.text
+
+
+def test_run_batch_retries_datasets_when_a_worker_dies(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Killing one of two busy workers breaks the pool; the datasets in flight are resubmitted and succeed."""
+    specs = []
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+        # Large enough that both datasets are still being processed when the worker is killed.
+        (tmp_path / name / "data.csv").write_text(CSV + CSV.split("\n", 1)[1] * 2000, encoding="utf-8")
+        specs.append(load_pipeline(_write_pipeline(tmp_path, name, "input: data.csv\n")))
+    results: List[DatasetResult] = []
+    batch = threading.Thread(target=lambda: results.extend(run_batch(specs, workers=2)))
+
+    with caplog.at_level(logging.WARNING, logger="kopen_data_builder.core.batch"):
+        batch.start()
+        deadline = time.monotonic() + 30
+        while len(multiprocessing.active_children()) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        workers = multiprocessing.active_children()
+        assert len(workers) == 2
+        workers[0].kill()
+        batch.join()
+
+    assert [r.status for r in results] == ["ok", "ok"]
+    assert all(r.rows == 50 * 2001 for r in results)
+    # The pool may notice the death only after the other dataset finished, so one or both are retried.
+    assert "lost its worker process; retrying alone" in caplog.text
+
+
+def test_run_batch_rejects_duplicate_names(tmp_path: Path) -> None:
+    spec = PipelineSpec("same", tmp_path, tmp_path / "a.csv")
+    with pytest.raises(ValueError, match="unique"):
+        run_batch([spec, spec])
+
+
+def test_format_summary_aligns_columns() -> None:
+    table = format_summary(
+        [
+            DatasetResult("seoul-bike", "ok", {"download": 1.25, "process": 3.0, "total": 4.3}, rows=1200),
+            DatasetResult("air", "failed", {"process": 0.5}, error="process: boom"),
+        ]
+    )
+
+    header, first, second = table.splitlines()
+    assert header.split() == ["dataset", "status", "rows", "download", "process", "upload", "total", "error"]
+    assert first.split() == ["seoul-bike", "ok", "1200", "1.2s", "3.0s", "-", "4.3s"]
+    assert second.endswith("process: boom") and first.index("ok") == second.index("failed")
+
+
+def test_cli_batch_run_expands_globs_and_reports_failures(tmp_path: Path) -> None:
+    (tmp_path / "good").mkdir()
+    (tmp_path / "good" / "data.csv").write_text(CSV, encoding="utf-8")
+    _write_pipeline(tmp_path, "good", "input: data.csv\n")
+    _write_pipeline(tmp_path, "bad", "input: missing.csv\n")
+
+    result = CliRunner().invoke(app, ["batch", "run", str(tmp_path / "*.yaml"), "--workers", "1", "--no-cache"])
+
+    assert result.exit_code == 1
+    assert "good" in result.output and "1/2 datasets completed" in result.output
+    assert (tmp_path / "good" / "repo" / "test.csv").exists()
+
+
+def test_run_batch_reuses_unchanged_builds(tmp_path: Path) -> None:
+    (tmp_path / "ds").mkdir()
+    (tmp_path / "ds" / "data.csv").write_text(CSV, encoding="utf-8")
+    spec = load_pipeline(_write_pipeline(tmp_path, "ds", "input: data.csv\n"))
+
+    first, second, forced = (run_batch([spec], workers=1, force=force)[0] for force in (False, False, True))
+
+    assert (first.ok, first.cached, second.ok, second.cached, forced.cached) == (True, False, True, True, False)
+    assert second.rows is None and "cached" in format_summary([second])
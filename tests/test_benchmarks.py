@@ -0,0 +1,61 @@
+# tests/test_benchmarks.py
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+import pytest
+
+from benchmarks.datagen import generate_table, write_csv, write_workbook
+from benchmarks.suite import compare_reports, format_report, run_suite, select_cases
+
+
+def test_generate_table_is_reproducible_korean_data(tmp_path: Path) -> None:
+    df = generate_table(500, columns=30, seed=7)
+
+    assert df.shape == (500, 30)
+    assert df.equals(generate_table(500, columns=30, seed=7))
+    assert df["인허가일자"].str.match(r"^\d{4}년 \d{2}월 \d{2}일$").all()
+    assert df["측정값"].isna().any()
+
+    path = write_csv(df, tmp_path / "data.csv", encoding="cp949")
+    assert pd.read_csv(path, encoding="cp949")["시도명"].tolist() == df["시도명"].tolist()
+    write_workbook(df, tmp_path / "data.xlsx", sheets=3)
+    assert list(pd.read_excel(tmp_path / "data.xlsx", sheet_name=None)) == ["sheet_1", "sheet_2", "sheet_3"]
+    with pytest.raises(ValueError):
+        generate_table(10, columns=5)
+
+
+def test_compare_reports_flags_slower_and_bigger_cases() -> None:
+    def report(seconds: float, traced: float) -> Dict[str, Any]:
+        result = {"rows": 10, "seconds": seconds, "min_seconds": seconds, "peak_traced_mb": traced, "peak_rss_mb": 100}
+        return {"results": [{"case": "read/csv-utf8", **result}, {"case": "split/tall", **result}]}
+
+    baseline = report(1.0, 10.0)
+    current = report(1.0, 10.0)
+    current["results"][0].update(min_seconds=1.5)
+    current["results"][1].update(peak_traced_mb=20.0)
+    current["results"].append({**current["results"][0], "case": "build/csv"})
+
+    comparisons = compare_reports(baseline, current)
+
+    assert [(c.case, c.regressed) for c in comparisons] == [
+        ("read/csv-utf8", True),
+        ("split/tall", True),
+        ("build/csv", False),
+    ]
+    assert comparisons[0].status == "slower +50%" and comparisons[1].status == "more memory +100%"
+    assert comparisons[2].status == "new"
+
+
+def test_run_suite_smoke_case(tmp_path: Path) -> None:
+    assert select_cases(["read/csv"]) == ["read/csv-utf8", "read/csv-cp949", "read/csv-wide"]
+    with pytest.raises(ValueError):
+        select_cases(["nope"])
+
+    report = run_suite("smoke", ["read/csv-cp949"], data_dir=tmp_path)
+
+    (result,) = report["results"]
+    assert result["case"] == "read/csv-cp949" and result["rows"] == 1000
+    assert result["seconds"] > 0 and result["peak_traced_mb"] > 0
+    assert "read/csv-cp949" in format_report(report)
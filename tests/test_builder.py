@@ -4,8 +4,10 @@ import os
 import tempfile
 
 import pandas as pd
+import pytest
 
 from kopen_data_builder.core.builder import build_repository
+from kopen_data_builder.core.metrics import METRICS
 
 
 def test_build_repository() -> None:
@@ -28,3 +30,70 @@ def test_build_repository() -> None:
         assert os.path.exists(os.path.join(out_dir, "test.csv"))
         assert os.path.exists(os.path.join(out_dir, "README.md"))
         assert os.path.exists(os.path.join(out_dir, "dataset_infos.json"))
+
+
+def test_build_repository_arrow_output_and_input() -> None:
+    from datasets import load_from_disk
+
+    df_train = pd.DataFrame({"text": ["A", "B", None], "label": [0, 1, 2]})
+    df_test = pd.DataFrame({"text": ["C"], "label": [1]})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        train_path = os.path.join(tmpdir, "train.csv")
+        test_path = os.path.join(tmpdir, "test.csv")
+        df_train.to_csv(train_path, index=False)
+        df_test.to_csv(test_path, index=False)
+
+        arrow_dir = os.path.join(tmpdir, "arrow")
+        METRICS.reset()
+        build_repository({"train": train_path, "test": test_path}, "my-dataset", arrow_dir, output_format="arrow")
+        assert [(s.stage, s.rows) for s in METRICS.samples if s.stage == "build"] == [("build", 4)]
+
+        dataset = load_from_disk(arrow_dir)
+        assert set(dataset) == {"train", "test"}
+        assert dataset["train"]["text"] == ["A", "B", None]
+        assert dataset["train"].features["label"].dtype == "int64"
+        assert os.path.exists(os.path.join(arrow_dir, "README.md"))
+
+        # An existing Arrow dataset can be used as the input of another build.
+        csv_dir = os.path.join(tmpdir, "csv")
+        build_repository({"train": arrow_dir, "test": test_path}, "my-dataset", csv_dir)
+        assert len(pd.read_csv(os.path.join(csv_dir, "train.csv"))) == 3
+
+
+def test_build_repository_arrow_widens_types_of_later_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    from datasets import load_from_disk
+
+    from kopen_data_builder.core import builder
+
+    monkeypatch.setattr(builder, "ARROW_CHUNK_SIZE", 2)
+    df = pd.DataFrame(
+        {
+            "memo": [None, None, "비고", None],  # empty in the first chunk
+            "amount": ["1", "2", "3", "4.5"],  # int, then float
+            "code": ["1", "2", "007", "x"],  # int, then text that keeps its zeros
+            "count": [1, 2, 3, 4],
+        }
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        train_path = os.path.join(tmpdir, "train.csv")
+        df.to_csv(train_path, index=False)
+        arrow_dir = os.path.join(tmpdir, "arrow")
+        build_repository({"train": train_path}, "my-dataset", arrow_dir, output_format="arrow")
+
+        train = load_from_disk(arrow_dir)["train"]
+        assert {name: feature.dtype for name, feature in train.features.items()} == {
+            "memo": "string",
+            "amount": "float64",
+            "code": "string",
+            "count": "int64",
+        }
+        assert train["memo"] == [None, None, "비고", None] and train["amount"] == [1.0, 2.0, 3.0, 4.5]
+        assert train["code"] == ["1", "2", "007", "x"]
+
+
+def test_build_repository_rejects_unknown_format() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            build_repository({}, "my-dataset", tmpdir, output_format="xml")
@@ -1,4 +1,6 @@
 # tests/test_cli.py
+from pathlib import Path
+
 from typer.testing import CliRunner
 
 from kopen_data_builder.cli.main import app
@@ -27,3 +29,13 @@ def test_metadata_help() -> None:
     """Test that the metadata command help works."""
     result = runner.invoke(app, ["metadata", "--help"])
     assert result.exit_code == 0
+
+
+def test_inspect_run(tmp_path: Path) -> None:
+    """Test that the inspect command reports rows and header."""
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n3,4\n", encoding="utf-8")
+    result = runner.invoke(app, ["inspect", "run", str(path), "--json"])
+    assert result.exit_code == 0
+    assert '"rows": 2' in result.output
+    assert '"header": ["a", "b"]' in result.output
@@ -0,0 +1,64 @@
+# tests/test_cli_startup.py
+
+import importlib
+import subprocess
+import sys
+from typing import Set
+
+from kopen_data_builder.cli.main import SUBCOMMANDS
+
+# Loading every subcommand eagerly (pandas, scikit-learn, huggingface_hub, ...) made
+# startup take well over a second. Wall-clock startup is tracked by the cli/help benchmark.
+HEAVY_MODULES = ("pandas", "numpy", "sklearn", "huggingface_hub", "datasets", "requests", "pyarrow", "pydantic")
+# Cumulative import time of the CLI entry module; typer and click take about 40 ms of it,
+# pandas alone well over 200 ms. Generous, so only a regression to eager imports trips it.
+IMPORT_BUDGET_US = 500_000
+
+
+def _importtime(*args: str) -> str:
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True)
+    return result.stderr
+
+
+def _imported(stderr: str) -> Set[str]:
+    return {line.rsplit("|", 1)[-1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+
+
+def test_cli_import_does_not_import_heavy_modules() -> None:
+    """Importing the CLI entry module loads none of the subcommands' dependencies."""
+    imported = _imported(_importtime("-c", "import kopen_data_builder.cli.main"))
+    assert "kopen_data_builder.cli.main" in imported
+    assert not imported & set(HEAVY_MODULES)
+
+
+def _cumulative_us(stderr: str, module: str) -> int:
+    """Cumulative microseconds of ``module`` and its parent packages in ``-X importtime`` output."""
+    times = [
+        int(line.split("|")[1])
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1].strip() == module
+    ]
+    assert times, f"{module} not imported"
+    return max(times)
+
+
+def test_cli_import_time_within_budget() -> None:
+    """Importing the CLI entry module stays within an absolute budget (best of three runs)."""
+    module = "kopen_data_builder.cli.main"
+    best = min(_cumulative_us(_importtime("-c", f"import {module}"), module) for _ in range(3))
+    assert best < IMPORT_BUDGET_US, f"{module} took {best / 1000:.0f} ms to import"
+
+
+def test_root_help_does_not_import_heavy_modules() -> None:
+    """--help lists every subcommand without importing their dependencies."""
+    code = "from kopen_data_builder.cli.main import app; app(['--help'])"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0
+    assert all(name in result.stdout for name in SUBCOMMANDS)
+    assert not _imported(result.stderr) & set(HEAVY_MODULES)
+
+
+def test_subcommand_help_matches_module() -> None:
+    """The static help in the root listing matches each subcommand module's own help."""
+    for name, (module, help_text) in SUBCOMMANDS.items():
+        assert importlib.import_module(module).app.info.help == help_text, name
@@ -0,0 +1,118 @@
+# tests/test_diff.py
+
+import json
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.builder import build_repository
+from kopen_data_builder.core.diff import diff_tables, load_diff_report
+
+
+@pytest.fixture
+def releases(tmp_path: Path) -> Tuple[str, str]:
+    old = pd.DataFrame(
+        {
+            "id": range(3_000),
+            "gu": ["강남구", "서초구", "마포구"] * 1_000,
+            "reg_date": pd.date_range("2023-01-01", periods=3_000, freq="D").strftime("%Y-%m-%d"),
+            "count": np.arange(3_000, dtype=float),
+            "memo": "x",
+        }
+    )
+    old.loc[7, "count"] = np.nan  # float column in some chunks, int in others
+    new = old.drop(columns="memo").assign(status="open")
+    new = new[new["id"] != 10]
+    new.loc[new["id"] == 20, "gu"] = "종로구"
+    new = pd.concat([new, new.tail(1).assign(id=9_999)]).sample(frac=1, random_state=0)
+    old.to_csv(tmp_path / "old.csv", index=False)
+    new.to_csv(tmp_path / "new.csv", index=False, encoding="cp949")
+    return str(tmp_path / "old.csv"), str(tmp_path / "new.csv")
+
+
+@pytest.mark.parametrize("max_memory", [None, 1024**2], ids=["memory", "spilled"])
+def test_diff_counts_samples_and_change_files(releases: Tuple[str, str], tmp_path: Path, max_memory: object) -> None:
+    old, new = releases
+
+    report = diff_tables(old, new, ["id"], output_dir=str(tmp_path / "diff"), max_memory=max_memory)
+
+    assert (report.added, report.removed, report.modified, report.unchanged) == (1, 1, 1, 2_998)
+    assert report.columns_added == ["status"] and report.columns_removed == ["memo"]
+    assert report.samples["modified"] == [{"key": {"id": 20}, "changes": {"gu": ["마포구", "종로구"]}}]
+    assert pd.read_csv(tmp_path / "diff" / "removed.csv")["id"].tolist() == [10]
+    assert pd.read_csv(tmp_path / "diff" / "added.csv")["id"].tolist() == [9_999]
+    assert load_diff_report(tmp_path / "diff").as_dict() == report.as_dict()
+
+
+def test_diff_delta_drives_incremental_build_and_changelog(releases: Tuple[str, str], tmp_path: Path) -> None:
+    old, new = releases
+    build_repository({"train": old}, "demo", str(tmp_path / "repo"), partition_by=["reg_date:year"])
+
+    report = diff_tables(old, new, ["id"], output_dir=str(tmp_path / "diff"), partition_by=["reg_date:year"])
+
+    assert report.changed_partitions == [{"year": "2023"}, {"year": "2031"}]
+    delta = pd.read_csv(report.files["delta"])
+    assert set(pd.to_datetime(delta["reg_date"]).dt.year) == {2023, 2031}
+    build_repository(
+        {"train": report.files["delta"]},
+        "demo",
+        str(tmp_path / "repo"),
+        partition_by=["reg_date:year"],
+        incremental=True,
+        changelog=report.changelog_entry(),
+    )
+    parts = sorted((tmp_path / "repo" / "data" / "train").rglob("*.csv"))
+    rebuilt = pd.concat(pd.read_csv(part) for part in parts)
+    assert sorted(rebuilt["id"]) == sorted(pd.read_csv(new, encoding="cp949")["id"])
+    readme = (tmp_path / "repo" / "README.md").read_text(encoding="utf-8")
+    assert "## Changelog" in readme and "Added 1, removed 1, modified 1 rows" in readme
+
+    # A full rebuild keeps the history; the same release is not listed twice.
+    build_repository({"train": old}, "demo", str(tmp_path / "repo"), changelog=report.changelog_entry())
+    readme = (tmp_path / "repo" / "README.md").read_text(encoding="utf-8")
+    assert readme.count("### ") == 1 and "New columns: status" in readme
+
+
+def test_incremental_build_deletes_emptied_partitions(tmp_path: Path) -> None:
+    old = pd.DataFrame({"id": [1, 2, 3], "reg_date": ["2023-05-01", "2024-05-01", "2024-06-01"], "v": [1, 2, 3]})
+    old.to_csv(tmp_path / "old.csv", index=False)
+    old[old["reg_date"] < "2024"].assign(v=9).to_csv(tmp_path / "new.csv", index=False)
+    runner = CliRunner()
+    options = ["--partition-by", "reg_date:year"]
+    (tmp_path / "old.json").write_text(json.dumps({"train": str(tmp_path / "old.csv")}), encoding="utf-8")
+    build = ["build", "run", "--dataset-name", "demo", "--output-dir", str(tmp_path / "repo"), *options]
+    assert runner.invoke(app, [*build, "--csv-json-path", str(tmp_path / "old.json")]).exit_code == 0
+
+    diff = ["diff", "run", str(tmp_path / "old.csv"), str(tmp_path / "new.csv"), "--key", "id", *options]
+    result = runner.invoke(app, [*diff, "--output-dir", str(tmp_path / "diff")])
+    assert result.exit_code == 0, result.output
+    report = load_diff_report(tmp_path / "diff")
+    assert report.emptied_partitions == [{"year": "2024"}]
+    (tmp_path / "delta.json").write_text(json.dumps({"train": report.files["delta"]}), encoding="utf-8")
+    build += ["--csv-json-path", str(tmp_path / "delta.json"), "--incremental", "--changelog", str(tmp_path / "diff")]
+    result = runner.invoke(app, build)
+
+    assert result.exit_code == 0, result.output
+    train = tmp_path / "repo" / "data" / "train"
+    assert sorted(p.name for p in train.iterdir()) == ["2023"]
+    assert pd.read_csv(next(train.rglob("*.csv")))["v"].tolist() == [9]
+
+
+def test_cli_diff(releases: Tuple[str, str], tmp_path: Path) -> None:
+    old, new = releases
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["diff", "run", old, new, "--key", "id", "--output-dir", str(tmp_path / "d")])
+    assert result.exit_code == 0, result.output
+    assert "1 added, 1 removed, 1 modified" in result.output
+
+    assert runner.invoke(app, ["diff", "run", old, old, "--key", "id", "--fail-on-change"]).exit_code == 0
+    assert runner.invoke(app, ["diff", "run", old, new, "--key", "id", "--fail-on-change"]).exit_code == 1
+    assert runner.invoke(app, ["diff", "run", old, new, "--key", "nope"]).exit_code == 2
+    report = json.loads(runner.invoke(app, ["diff", "run", old, new, "--key", "id,gu", "--json"]).output)
+    assert (report["added"], report["removed"], report["modified"]) == (2, 2, 0)
@@ -0,0 +1,260 @@
+# tests/test_downloader.py
+
+import os
+import stat
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from kopen_data_builder.core import downloader
+from kopen_data_builder.core.downloader import (
+    DownloadCache,
+    DownloadJob,
+    HostLimits,
+    cached_download,
+    download_data,
+    download_many,
+    load_download_manifest,
+)
+from tests.conftest import LocalHttpServer
+
+BODY = bytes(range(256)) * 400
+
+
+def test_download_streams_to_part_and_renames(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """The file is written in chunks and only appears under its final name when complete."""
+    http_server.files["/data.csv"] = BODY
+    seen = []
+
+    stats = download_data(
+        http_server.url("/data.csv"),
+        tmp_path / "out" / "data.csv",
+        chunk_size=4096,
+        progress=lambda done, total: seen.append((done, total)),
+    )
+
+    assert (tmp_path / "out" / "data.csv").read_bytes() == BODY
+    assert not (tmp_path / "out" / "data.csv.part").exists()
+    assert (stats.bytes, stats.total, stats.resumed_from) == (len(BODY), len(BODY), 0)
+    assert seen[-1] == (len(BODY), len(BODY)) and len(seen) > 1
+
+
+def test_download_resumes_with_range(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """A dropped connection leaves a .part file; the rerun requests only the remaining bytes."""
+    http_server.files["/big.bin"] = BODY
+    http_server.cut_after = 30_000
+    target = tmp_path / "big.bin"
+
+    with pytest.raises((IOError, requests.RequestException)):
+        download_data(http_server.url("/big.bin"), target, chunk_size=4096)
+    assert not target.exists()
+    partial = (tmp_path / "big.bin.part").stat().st_size
+    assert 0 < partial <= 30_000
+
+    stats = download_data(http_server.url("/big.bin"), target, chunk_size=4096)
+
+    assert target.read_bytes() == BODY
+    assert (stats.resumed_from, stats.bytes) == (partial, len(BODY) - partial)
+    headers = http_server.requests[-1][1]
+    assert headers["Range"] == f"bytes={partial}-"
+    assert headers["If-Range"] == http_server.etag("/big.bin")
+
+
+def test_download_handles_gzip_content_encoding(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """Identity is requested; a server that gzips anyway yields the decoded file, retried from scratch if cut."""
+    text = "구,값\n".encode("utf-8") + b"Gangnam,1\n" * 20_000
+    http_server.files["/data.csv"] = text
+    http_server.gzip = "negotiated"
+
+    stats = download_data(http_server.url("/data.csv"), tmp_path / "a.csv")
+
+    assert http_server.requests[-1][1]["Accept-Encoding"] == "identity"
+    assert (tmp_path / "a.csv").read_bytes() == text and stats.total == len(text)
+
+    http_server.gzip = "always"
+    http_server.cut_after = 100
+    with pytest.raises((IOError, requests.RequestException)):
+        download_data(http_server.url("/data.csv"), tmp_path / "b.csv", chunk_size=64)
+    assert not (tmp_path / "b.csv.part").exists()
+
+    stats = download_data(http_server.url("/data.csv"), tmp_path / "b.csv")
+
+    assert (tmp_path / "b.csv").read_bytes() == text
+    assert stats.resumed_from == 0 and stats.total is None and "Range" not in http_server.requests[-1][1]
+
+
+def test_download_restarts_when_file_changed(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """If the remote file changed since the partial download, the server sends it whole and we start over."""
+    http_server.files["/big.bin"] = BODY
+    http_server.cut_after = 10_000
+    target = tmp_path / "big.bin"
+    with pytest.raises((IOError, requests.RequestException)):
+        download_data(http_server.url("/big.bin"), target)
+
+    http_server.files["/big.bin"] = BODY[::-1]
+    stats = download_data(http_server.url("/big.bin"), target)
+
+    assert target.read_bytes() == BODY[::-1]
+    assert stats.resumed_from == 0
+
+
+def test_download_many_limits_hosts_and_reuses_connections(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """Many files from one host respect the connection limit and share keep-alive connections."""
+    for i in range(8):
+        http_server.files[f"/2023_{i:02d}.csv"] = f"month,{i}\n".encode()
+    http_server.delay = 0.05
+    host = http_server.url("/").split("/")[2]
+    jobs = [DownloadJob(http_server.url(path), tmp_path / path.lstrip("/")) for path in http_server.files]
+
+    results = download_many(jobs, max_workers=8, host_limits={host: HostLimits(max_connections=2)})
+
+    assert all(r.ok for r in results)
+    assert (tmp_path / "2023_07.csv").read_text() == "month,7\n"
+    assert http_server.max_active <= 2
+    assert len(http_server.connections) <= 2
+
+
+def test_download_many_retries_and_reports_failures(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """Transient 503s are retried; a 404 fails without retrying and does not stop the batch."""
+    http_server.files["/flaky.csv"] = b"a\n1\n"
+    http_server.fail_first["/flaky.csv"] = 2
+    jobs = [
+        DownloadJob(http_server.url("/flaky.csv"), tmp_path / "flaky.csv"),
+        DownloadJob(http_server.url("/missing.csv"), tmp_path / "missing.csv"),
+    ]
+
+    flaky, missing = download_many(jobs, retries=3, backoff=0.01)
+
+    assert flaky.ok and flaky.attempts == 3
+    assert not missing.ok and missing.attempts == 1
+    assert "404" in (missing.error or "")
+
+
+def test_download_many_frees_host_slot_while_backing_off(
+    http_server: LocalHttpServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Other files from the host are fetched while a failed one waits; local errors are not retried."""
+    http_server.files["/flaky.csv"] = b"a\n1\n"
+    http_server.files["/ok.csv"] = b"a\n2\n"
+    http_server.fail_first["/flaky.csv"] = 1
+    monkeypatch.setattr(downloader, "retry_delay", lambda error, attempt, backoff: 0.5)
+    (tmp_path / "blocked").write_text("not a directory")
+    jobs = [
+        DownloadJob(http_server.url("/flaky.csv"), tmp_path / "flaky.csv"),
+        DownloadJob(http_server.url("/ok.csv"), tmp_path / "ok.csv"),
+        DownloadJob(http_server.url("/ok.csv"), tmp_path / "blocked" / "ok.csv"),
+    ]
+
+    flaky, ok, blocked = download_many(jobs, max_workers=3, default_limits=HostLimits(max_connections=1))
+
+    paths = [path for path, _ in http_server.requests]
+    assert flaky.ok and flaky.attempts == 2 and ok.ok
+    assert paths.index("/ok.csv") < len(paths) - 1 - paths[::-1].index("/flaky.csv")
+    assert not blocked.ok and blocked.attempts == 1
+
+
+def test_load_download_manifest(tmp_path: Path) -> None:
+    """Manifest entries resolve to paths under output_dir with per-host limits."""
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        "output_dir: raw\n"
+        "hosts:\n  apis.data.go.kr: {max_connections: 2, requests_per_second: 1}\n"
+        "files:\n  - https://example.org/a/bike_01.csv\n"
+        "  - {url: 'https://apis.data.go.kr/x?page=2', output: x/02.json}\n",
+        encoding="utf-8",
+    )
+
+    jobs, hosts, defaults = load_download_manifest(manifest)
+
+    assert [j.output_path for j in jobs] == [tmp_path / "raw" / "bike_01.csv", tmp_path / "raw" / "x" / "02.json"]
+    assert hosts["apis.data.go.kr"] == HostLimits(max_connections=2, requests_per_second=1)
+    assert defaults == HostLimits()
+
+
+def test_download_many_paces_requests_per_host(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """requests_per_second spaces out requests to the same host."""
+    for i in range(5):
+        http_server.files[f"/{i}.csv"] = b"x\n"
+    jobs = [DownloadJob(http_server.url(path), tmp_path / path.lstrip("/")) for path in http_server.files]
+
+    started = time.monotonic()
+    results = download_many(jobs, default_limits=HostLimits(max_connections=5, requests_per_second=20))
+
+    assert all(r.ok for r in results)
+    assert time.monotonic() - started >= 4 / 20
+
+
+def test_cached_download_revalidates_with_etag(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """The second run sends If-None-Match, gets a 304 and restores the file from the cache."""
+    http_server.files["/daily.csv"] = b"a\n1\n"
+    cache = DownloadCache(tmp_path / "cache")
+    target = tmp_path / "out" / "daily.csv"
+
+    first = cached_download(http_server.url("/daily.csv"), target, cache)
+    target.unlink()
+    second = cached_download(http_server.url("/daily.csv"), target, cache)
+
+    assert first.changed and not first.from_cache
+    assert not second.changed and second.from_cache and second.sha256 == first.sha256
+    assert target.read_bytes() == b"a\n1\n"
+    assert http_server.requests[-1][1]["If-None-Match"] == http_server.etag("/daily.csv")
+
+
+def test_cached_download_copies_by_default(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """The output keeps its mode and never shares an inode with the read-only cache blob."""
+    http_server.files["/daily.csv"] = b"a\n1\n"
+    cache = DownloadCache(tmp_path / "cache")
+    target = tmp_path / "daily.csv"
+
+    first = cached_download(http_server.url("/daily.csv"), target, cache)
+    mode = stat.S_IMODE(target.stat().st_mode)
+    blob = cache.blob_path(first.sha256)
+    assert mode & stat.S_IWUSR
+    assert not os.path.samefile(target, blob)
+
+    cached_download(http_server.url("/daily.csv"), target, cache)
+    assert stat.S_IMODE(target.stat().st_mode) == mode
+    target.write_bytes(b"edited")
+    assert blob.read_bytes() == b"a\n1\n"
+
+
+def test_cached_download_refetches_when_caller_headers_match_but_nothing_is_cached(
+    http_server: LocalHttpServer, tmp_path: Path
+) -> None:
+    """A 304 for the caller's own If-None-Match with an empty cache falls back to a plain GET."""
+    http_server.files["/daily.csv"] = b"a\n1\n"
+    target = tmp_path / "daily.csv"
+
+    result = cached_download(
+        http_server.url("/daily.csv"),
+        target,
+        DownloadCache(tmp_path / "cache"),
+        headers={"If-None-Match": http_server.etag("/daily.csv")},
+    )
+
+    assert result.changed and not result.from_cache
+    assert target.read_bytes() == b"a\n1\n"
+    assert "If-None-Match" not in http_server.requests[-1][1]
+
+    http_server.files["/daily.csv"] = b"a\n2\n"
+    third = cached_download(http_server.url("/daily.csv"), target, DownloadCache(tmp_path / "cache"))
+    assert third.changed and target.read_bytes() == b"a\n2\n"
+
+
+def test_download_cache_evicts_least_recently_used(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """Past the size cap the least recently used URL is dropped along with its content."""
+    for name in ("a", "b", "c"):
+        http_server.files[f"/{name}.bin"] = name.encode() * 100
+    cache = DownloadCache(tmp_path / "cache", max_bytes=250)
+
+    for name in ("a", "b"):
+        cached_download(http_server.url(f"/{name}.bin"), tmp_path / f"{name}.bin", cache, link=False)
+    cached_download(http_server.url("/a.bin"), tmp_path / "a.bin", cache, link=False)
+    cached_download(http_server.url("/c.bin"), tmp_path / "c.bin", cache, link=False)
+
+    assert cache.lookup(http_server.url("/b.bin")) is None
+    assert cache.lookup(http_server.url("/a.bin")) is not None
+    assert cache.lookup(http_server.url("/c.bin")) is not None
+    assert len(list((tmp_path / "cache" / "objects").iterdir())) == 2
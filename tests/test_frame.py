@@ -0,0 +1,71 @@
+# tests/test_frame.py
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import kopen_data_builder as kopen
+from kopen_data_builder.core.preprocessing import preprocess_data
+
+
+@pytest.fixture
+def raw_csv(tmp_path: Path) -> Path:
+    df = pd.DataFrame(
+        {
+            "Gu Name": [" 강남구 ", "서초구", "강남구", "마포구", "강남구", "서초구"] * 50,
+            "Reg Date": ["2024-01-05", "2024-02-10", "2024-01-05", "2024-03-01", "2024-04-02", "2024-02-10"] * 50,
+            "Count": [1, 2, 1, 3, 4, 2] * 50,
+            "Memo": ["a", "b", "a", "c", "d", "b"] * 50,
+        }
+    )
+    path = tmp_path / "raw.csv"
+    df.to_csv(path, index=False, encoding="cp949")
+    return path
+
+
+def test_optimizer_pushes_filters_and_limits_and_prunes_columns(raw_csv: Path) -> None:
+    frame = kopen.scan(str(raw_csv)).filter("Count", ">", 1).select("Gu Name", "Count").limit(5)
+
+    plan = frame.explain()
+
+    assert plan.splitlines()[0] == "Fused per chunk: select(Gu Name, Count)"
+    assert "columns=[Gu Name, Count]" in plan and "filters=[Count > 1]" in plan and "limit=5" in plan
+    assert "filter" in frame.explain(optimized=False).splitlines()[2]
+    result = frame.collect()
+    assert list(result.columns) == ["Gu Name", "Count"] and len(result) == 5 and (result["Count"] > 1).all()
+
+
+def test_chunked_execution_matches_whole_table(raw_csv: Path) -> None:
+    def build(chunk_rows: int) -> pd.DataFrame:
+        return kopen.scan(str(raw_csv), chunk_rows=chunk_rows).preprocess().dedup(["gu_name", "count"]).collect()
+
+    chunked, whole = build(7), build(1000)
+
+    expected = preprocess_data(pd.read_csv(raw_csv, encoding="cp949")).drop_duplicates(["gu_name", "count"])
+    pd.testing.assert_frame_equal(chunked, whole)
+    pd.testing.assert_frame_equal(whole, expected.reset_index(drop=True))
+    assert "columns=[Gu Name]" in kopen.scan(str(raw_csv)).preprocess().select("gu_name").explain()
+
+
+def test_parquet_filters_are_pushed_into_the_dataset_reader(tmp_path: Path) -> None:
+    df = pd.DataFrame({"gu": ["강남구", "서초구"] * 100, "value": range(200)})
+    df.to_parquet(tmp_path / "data.parquet", index=False)
+
+    frame = kopen.scan(str(tmp_path / "data.parquet"), chunk_rows=16).filter("gu", "in", ["서초구"]).select("value")
+
+    assert "parquet" in frame.explain() and "filters=[gu in ('서초구',)]" in frame.explain()
+    assert frame.collect()["value"].tolist() == list(range(1, 200, 2))
+    with pytest.raises(ValueError):
+        kopen.scan(str(tmp_path / "data.parquet")).filter("gu", "~", "x")
+
+
+def test_split_to_dir_and_streaming_csv(raw_csv: Path, tmp_path: Path) -> None:
+    frame = kopen.scan(str(raw_csv), chunk_rows=50).preprocess().dedup()
+
+    outputs = frame.split(train=0.5, test=0.5).to_dir(str(tmp_path / "splits"), output_format="parquet")
+    rows = frame.to_csv(str(tmp_path / "clean.csv"))
+
+    assert set(outputs) == {"train", "test"} and all(path.suffix == ".parquet" for path in outputs.values())
+    assert sum(len(pd.read_parquet(path)) for path in outputs.values()) == rows == 4
+    assert frame.split(train=0.5, test=0.5).explain().startswith("split(train=0.5, test=0.5)")
@@ -0,0 +1,153 @@
+# tests/test_io.py
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.enums import SizeCategory
+from kopen_data_builder.core.io import count_records, inspect_table, transcode_file, write_csv
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "이름": ["홍길동", "이순신", None, "강감찬", "유관순"],
+            "점수": [1.5, 2.0, None, 3.25, 4.0],
+            "가입일": pd.to_datetime(
+                ["2024-01-01 00:00:00", "2024-02-01 00:00:00", None, "2024-03-01 12:30:00", "2024-04-01 00:00:00"]
+            ),
+        }
+    )
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "cp949"])
+def test_write_csv_chunked_matches_pandas(encoding: str) -> None:
+    df = _frame()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        expected = Path(tmpdir) / "pandas.csv"
+        actual = Path(tmpdir) / "chunked.csv"
+        options = {"encoding": encoding, "float_format": "%.2f", "date_format": "%Y%m%d"}
+
+        write_csv(df, str(expected), engine="pandas", **options)
+        write_csv(df, str(actual), engine="chunked", chunk_rows=2, **options)
+
+        assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_write_csv_arrow_engine_round_trips() -> None:
+    df = _frame()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "nested" / "arrow.csv"
+        write_csv(df, str(path), encoding="utf-8-sig", engine="arrow")
+
+        assert path.read_bytes().startswith(b"\xef\xbb\xbf")
+        loaded = pd.read_csv(path, encoding="utf-8-sig")
+        assert list(loaded["이름"].fillna("")) == ["홍길동", "이순신", "", "강감찬", "유관순"]
+
+
+def test_write_csv_rejects_unsupported_options() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError, match="Unsupported CSV engine"):
+            write_csv(_frame(), f"{tmpdir}/out.csv", engine="fast")
+        with pytest.raises(ValueError, match="only writes utf-8"):
+            write_csv(_frame(), f"{tmpdir}/out.csv", engine="arrow", encoding="cp949")
+
+
+def test_inspect_table_counts_quoted_multiline_records() -> None:
+    df = pd.DataFrame({"구": ["강남구", "마포구", "종로구"], "비고": ['여러\n줄 "메모"', "", "끝"]})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "data.csv"
+        df.to_csv(path, index=False, encoding="cp949", sep=";")
+
+        stats = inspect_table(str(path))
+
+        assert stats.rows == 3
+        assert stats.exact
+        assert stats.encoding == "cp949"
+        assert stats.delimiter == ";"
+        assert stats.header == ["구", "비고"]
+        assert stats.size_category == SizeCategory.n_lt_1k
+
+
+def test_count_records_estimates_from_sample() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "data.csv"
+        pd.DataFrame({"value": range(100_000)}).to_csv(path, index=False)
+
+        records, exact = count_records(str(path), sample_bytes=64 * 1024)
+
+        assert not exact
+        assert abs(records - 100_001) < 10_000
+
+
+def test_transcode_file_streams_across_blocks(tmp_path: Path) -> None:
+    text = "이름,값\r\n" + "".join(f'"강남구 {i}",{i}\r\n' for i in range(500))
+    source = tmp_path / "raw.csv"
+    source.write_bytes(text.encode("cp949"))
+
+    stats = transcode_file(source, tmp_path / "utf8.csv", block_bytes=7)
+    excel = transcode_file(tmp_path / "utf8.csv", tmp_path / "excel.csv", to_encoding="utf-8-sig", block_bytes=5)
+
+    assert stats.source_encoding == "cp949" and (tmp_path / "utf8.csv").read_bytes() == text.encode("utf-8")
+    assert excel.bytes_written == stats.bytes_written + 3 and (tmp_path / "excel.csv").read_bytes()[3:] == text.encode()
+
+
+def test_transcode_file_reports_or_handles_invalid_bytes(tmp_path: Path) -> None:
+    source = tmp_path / "damaged.csv"
+    source.write_bytes("가,나\n".encode("cp949") * 10 + b"\xff\xfe,x\n")
+
+    with pytest.raises(ValueError, match="at byte 60"):
+        transcode_file(source, tmp_path / "out.csv", from_encoding="cp949", block_bytes=8)
+    stats = transcode_file(source, tmp_path / "out.csv", errors="replace", block_bytes=8)
+
+    assert stats.invalid_sequences == 2
+    assert (tmp_path / "out.csv").read_text(encoding="utf-8").endswith("\ufffd\ufffd,x\n")
+
+
+def test_transcode_file_validates_detected_source_and_target(tmp_path: Path) -> None:
+    """An ASCII head detected as UTF-8 is not copied blindly, and unencodable characters raise ValueError."""
+    text = "id,name\n" + "".join(f"{i},seoul\n" for i in range(10_000)) + "10000,서울특별시\n"
+    source = tmp_path / "late.csv"
+    source.write_bytes(text.encode("cp949"))
+
+    stats = transcode_file(source, tmp_path / "utf8.csv", to_encoding="utf-8")
+
+    assert len(text) > 80_000 and stats.source_encoding == "cp949"
+    assert (tmp_path / "utf8.csv").read_text(encoding="utf-8") == text
+    (tmp_path / "emoji.csv").write_text("name\n서울 🚲\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="cannot be encoded as cp949"):
+        transcode_file(tmp_path / "emoji.csv", tmp_path / "out.csv", to_encoding="cp949")
+
+
+def test_transcode_file_retries_cp949_under_lenient_errors(tmp_path: Path) -> None:
+    """A detected UTF-8 pass that needed replacements is redone as cp949 when that decodes cleanly."""
+    text = "a,b\n" + "1,2\n" * 40_000 + "서울,부산\n"
+    source = tmp_path / "late.csv"
+    source.write_bytes(text.encode("cp949"))
+
+    stats = transcode_file(source, tmp_path / "utf8.csv", errors="replace")
+
+    assert stats.source_encoding == "cp949" and stats.invalid_sequences == 0
+    assert stats.output == str(tmp_path / "utf8.csv")
+    assert (tmp_path / "utf8.csv").read_text(encoding="utf-8") == text
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["late.csv", "utf8.csv"]
+
+
+def test_cli_convert_encoding(tmp_path: Path) -> None:
+    for name in ("a.csv", "b.csv"):
+        (tmp_path / name).write_bytes("구,값\n마포구,1\n".encode("cp949"))
+    runner = CliRunner()
+
+    single = runner.invoke(app, ["convert", "encoding", str(tmp_path / "a.csv"), str(tmp_path / "a8.csv")])
+    batch = runner.invoke(
+        app,
+        ["convert", "encoding", str(tmp_path / "a.csv"), str(tmp_path / "b.csv"), "--output-dir", str(tmp_path / "u")],
+    )
+
+    assert single.exit_code == 0 and batch.exit_code == 0, batch.output
+    assert [(tmp_path / "u" / n).read_text(encoding="utf-8") for n in ("a.csv", "b.csv")] == ["구,값\n마포구,1\n"] * 2
+    assert runner.invoke(app, ["convert", "encoding", str(tmp_path / "a.csv")]).exit_code != 0
@@ -0,0 +1,40 @@
+# tests/test_manifest.py
+
+import hashlib
+import os
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from kopen_data_builder.core import manifest as manifest_module
+from kopen_data_builder.core.manifest import MANIFEST_FILENAME, hash_file, load_manifest, update_manifest
+
+
+def test_hash_file_matches_git_blob_id(tmp_path: Path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+
+    sha256, git_sha1 = hash_file(path)
+
+    assert sha256 == hashlib.sha256(b"a,b\n1,2\n").hexdigest()
+    assert git_sha1 == hashlib.sha1(b"blob 8\0a,b\n1,2\n").hexdigest()
+
+
+def test_update_manifest_only_rehashes_changed_files(tmp_path: Path, mocker: MockerFixture) -> None:
+    (tmp_path / "train.csv").write_text("a\n1\n", encoding="utf-8")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "test.csv").write_text("a\n2\n", encoding="utf-8")
+
+    first = update_manifest(tmp_path)
+    assert set(first) == {"train.csv", "data/test.csv"}
+    assert (tmp_path / MANIFEST_FILENAME).exists()
+
+    spy = mocker.spy(manifest_module, "hash_file")
+    (tmp_path / "train.csv").write_text("a\n10\n", encoding="utf-8")
+    os.utime(tmp_path / "train.csv", ns=(1, 1))
+    second = update_manifest(tmp_path)
+
+    assert spy.call_count == 1
+    assert second["data/test.csv"] == first["data/test.csv"]
+    assert second["train.csv"].sha256 != first["train.csv"].sha256
+    assert load_manifest(tmp_path) == second
@@ -0,0 +1,146 @@
+# tests/test_memory.py
+
+import json
+from pathlib import Path
+from typing import Set
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+import kopen_data_builder as kopen
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.builder import build_repository
+from kopen_data_builder.core.memory import MAX_CHUNK_ROWS, MIN_CHUNK_ROWS, MemoryBudget, parse_memory_size
+from kopen_data_builder.core.spill import ChunkWriter, ShuffleSpill, SpillingHashSet
+
+
+def test_parse_memory_size_and_chunk_rows() -> None:
+    assert parse_memory_size("4GB") == parse_memory_size("4 gib") == 4 * 1024**3
+    assert parse_memory_size("512M") == parse_memory_size("512") == 512 * 1024**2
+    assert parse_memory_size("100b") == 100
+    for bad in ("", "4XB", "-1", "0"):
+        with pytest.raises(ValueError):
+            parse_memory_size(bad)
+
+    budget = MemoryBudget(parse_memory_size("1GB"))
+    assert budget.chunk_rows(1024) == 104857
+    assert budget.chunk_rows(10**9) == MIN_CHUNK_ROWS and budget.chunk_rows(1) == MAX_CHUNK_ROWS
+    assert MemoryBudget().chunk_rows(1024) is None and MemoryBudget().state_bytes is None
+
+
+def test_spilling_hash_set_matches_in_memory_set() -> None:
+    rng = np.random.default_rng(0)
+    seen = SpillingHashSet(max_bytes=800)
+    expected: Set[int] = set()
+
+    for _ in range(20):
+        hashes = np.unique(rng.integers(0, 5000, size=300).astype(np.uint64))
+        new = seen.add(hashes)
+        assert new.tolist() == [int(h) not in expected for h in hashes]
+        expected.update(int(h) for h in hashes)
+
+    assert len(seen.runs) > 1 and len(seen) == len(expected)
+
+
+def test_shuffle_spill_is_a_permutation_within_bounded_buckets() -> None:
+    spill = ShuffleSpill(max_bytes=20_000, buckets=2, seed=1)
+    for start in range(0, 10_000, 1_000):
+        spill.add(pd.DataFrame({"id": range(start, start + 1_000), "name": "행"}))
+
+    chunks = list(spill)
+
+    ids = pd.concat(chunks)["id"]
+    assert spill.rows == 10_000 and sorted(ids) == list(range(10_000))
+    assert ids.tolist() != list(range(10_000))
+    # Oversized buckets were scattered again, so no chunk held more than the budget.
+    assert len(chunks) > 2 and max(c.memory_usage(deep=True, index=False).sum() for c in chunks) < 2 * 20_000
+
+
+def test_chunk_writer_incremental_replaces_only_written_partitions(tmp_path: Path) -> None:
+    target = tmp_path / "data" / "train"
+    with ChunkWriter(str(target), "parquet", partition_by=["gu"]) as writer:
+        writer.write(pd.DataFrame({"gu": ["강남구", "서초구"], "v": [1, 2]}))
+        writer.write(pd.DataFrame({"gu": ["강남구"], "v": [3]}))
+    assert writer.partition_columns == ["gu"]
+
+    with ChunkWriter(str(target), "parquet", partition_by=["gu"], incremental=True) as writer:
+        writer.write(pd.DataFrame({"gu": ["강남구"], "v": [9]}))
+
+    result = pd.read_parquet(target).sort_values("v")
+    assert result["v"].tolist() == [2, 9] and not (tmp_path / "data" / ".train.staging").exists()
+
+
+def test_cli_max_memory_streams_dedup_and_split(tmp_path: Path) -> None:
+    df = pd.DataFrame({"id": np.arange(30_000) % 20_000, "name": "서울특별시 강남구"})
+    df.to_csv(tmp_path / "data.csv", index=False)
+    (tmp_path / "rules.json").write_text(json.dumps({"train": 0.75, "test": 0.25}), encoding="utf-8")
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "--max-memory",
+            "2MB",
+            "split",
+            "split",
+            "--input-csv",
+            str(tmp_path / "data.csv"),
+            "--split-json",
+            str(tmp_path / "rules.json"),
+            "--output-dir",
+            str(tmp_path / "out"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    train, test = (pd.read_csv(tmp_path / "out" / f"{name}.csv") for name in ("train", "test"))
+    assert (len(train), len(test)) == (22_500, 7_500)
+    assert sorted(pd.concat([train, test])["id"]) == sorted(df["id"])
+
+    deduped = kopen.scan(str(tmp_path / "data.csv"), max_memory="1MB").dedup().collect()
+    assert "max_memory=1.0 MB" in kopen.scan(str(tmp_path / "data.csv"), max_memory="1MB").explain()
+    assert len(deduped) == 20_000 and deduped["id"].tolist() == list(range(20_000))
+    assert CliRunner().invoke(app, ["--max-memory", "lots", "split", "split"]).exit_code == 2
+
+
+def test_build_repository_streams_splits_under_a_budget(tmp_path: Path) -> None:
+    paths = {}
+    for name, rows in (("train", 3_000), ("test", 1_000)):
+        paths[name] = str(tmp_path / f"{name}.csv")
+        pd.DataFrame({"gu": ["강남구", "서초구"] * (rows // 2), "v": range(rows)}).to_csv(paths[name], index=False)
+
+    build_repository(paths, "demo", str(tmp_path / "repo"), max_memory=parse_memory_size("1MB"))
+    build_repository(
+        paths, "demo", str(tmp_path / "parts"), output_format="parquet", partition_by=["gu"], max_memory=1024**2
+    )
+
+    assert pd.read_csv(tmp_path / "repo" / "train.csv", encoding="utf-8-sig")["v"].tolist() == list(range(3_000))
+    assert len(pd.read_parquet(tmp_path / "parts" / "data" / "test")) == 1_000
+    assert "data/train/**/*.parquet" in (tmp_path / "parts" / "README.md").read_text(encoding="utf-8")
+
+
+def test_cli_max_memory_parquet_build_widens_late_columns(tmp_path: Path) -> None:
+    """A column empty in the first chunks that later holds text, and ints that turn float, still build."""
+    rows = 30_000
+    df = pd.DataFrame(
+        {
+            "id": range(rows),
+            "note": [None] * (rows - 100) + ["공사중"] * 100,
+            "count": [*range(rows - 1), None],
+        }
+    )
+    df.to_csv(tmp_path / "train.csv", index=False)
+    (tmp_path / "splits.json").write_text(json.dumps({"train": str(tmp_path / "train.csv")}), encoding="utf-8")
+
+    result = CliRunner().invoke(
+        app,
+        ["--max-memory", "2MB", "build", "run", "--format", "parquet", "--dataset-name", "demo"]
+        + ["--csv-json-path", str(tmp_path / "splits.json"), "--output-dir", str(tmp_path / "repo")],
+    )
+
+    assert result.exit_code == 0, result.output
+    train = pd.read_parquet(tmp_path / "repo" / "train.parquet")
+    assert len(train) == rows and train["note"].tail(100).eq("공사중").all() and train["note"].head(1).isna().all()
+    assert train["count"].iloc[:-1].tolist() == list(range(rows - 1)) and pd.isna(train["count"].iloc[-1])
+    assert [p.name for p in (tmp_path / "repo").iterdir() if p.name.startswith(".")] == []
@@ -0,0 +1,78 @@
+# tests/test_metrics.py
+
+import json
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.metrics import METRICS, count, timed
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics() -> Iterator[None]:
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+def test_timed_records_samples_and_counters() -> None:
+    for _ in range(2):
+        with timed("read") as sample:
+            sample.rows, sample.bytes = 3, 30
+    with pytest.raises(RuntimeError):
+        with timed("write", path="x.csv") as sample:
+            sample.rows = 1
+            raise RuntimeError("disk full")
+    count("download_cache_hits", 2)
+
+    read_total, write_total = METRICS.summary()
+    assert (read_total.stage, read_total.calls, read_total.rows, read_total.bytes) == ("read", 2, 6, 60)
+    assert METRICS.samples[-1].labels == {"path": "x.csv", "error": "RuntimeError"}
+    assert write_total.rows == 1 and METRICS.samples[0].peak_rss_mb
+    table = METRICS.format_table()
+    assert table.splitlines()[0].split() == ["stage", "calls", "seconds", "rows", "rows/s", "MB", "MB/s"]
+    assert "download_cache_hits: 2" in table and "peak RSS" in table
+
+
+def _split_args(tmp_path: Path) -> List[str]:
+    (tmp_path / "data.csv").write_text("a,b\n" + "".join(f"{i},{i}\n" for i in range(100)), encoding="utf-8")
+    (tmp_path / "rules.json").write_text(json.dumps({"train": 0.8, "test": 0.2}), encoding="utf-8")
+    return [
+        "split",
+        "split",
+        "--input-csv",
+        str(tmp_path / "data.csv"),
+        "--split-json",
+        str(tmp_path / "rules.json"),
+        "--output-dir",
+        str(tmp_path / "out"),
+    ]
+
+
+def test_cli_metrics_file_streams_json_lines(tmp_path: Path) -> None:
+    metrics_file = tmp_path / "metrics.jsonl"
+
+    result = CliRunner().invoke(app, ["--metrics-file", str(metrics_file), *_split_args(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line) for line in metrics_file.read_text(encoding="utf-8").splitlines()]
+    stages = [e for e in events if e["type"] == "stage"]
+    assert [e["stage"] for e in stages] == ["read", "split", "write", "write"]
+    assert stages[0]["rows"] == stages[1]["rows"] == 100 and sum(e["rows"] for e in stages[2:]) == 100
+    assert events[-1]["type"] == "summary" and events[-1]["peak_rss_mb"] > 0
+
+
+def test_cli_profile_writes_cprofile_and_tracemalloc_output(tmp_path: Path) -> None:
+    prefix = tmp_path / "prof"
+
+    result = CliRunner().invoke(
+        app, ["--metrics", "table", "--profile", "--profile-output", str(prefix), *_split_args(tmp_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert prefix.with_suffix(".prof").stat().st_size > 0
+    assert "peak traced memory" in Path(f"{prefix}.memory.txt").read_text(encoding="utf-8")
+    assert "function calls" in result.output and "rows/s" in result.output
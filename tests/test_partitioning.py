@@ -0,0 +1,68 @@
+# tests/test_partitioning.py
+
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+from datasets import load_dataset
+
+from kopen_data_builder.core.builder import prepare_hf_repository
+from kopen_data_builder.core.partitioning import add_partition_columns, parse_partition_by, write_partitioned
+
+
+def _sample() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "reg_date": ["2024-03-01", "2024-03-15", "2024-04-02"],
+            "gu": ["강남구", "마포구", "강남구"],
+            "count": [1, 2, 3],
+        }
+    )
+
+
+def test_add_partition_columns_derives_date_parts() -> None:
+    df, columns = add_partition_columns(_sample(), parse_partition_by("reg_date:year, reg_date:month"))
+    assert columns == ["year", "month"]
+    assert list(df["month"]) == ["03", "03", "04"]
+
+
+def test_add_partition_columns_rejects_unknown_column() -> None:
+    with pytest.raises(ValueError, match="not found"):
+        add_partition_columns(_sample(), ["district"])
+
+
+def test_write_partitioned_incremental_keeps_other_partitions() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_partitioned(_sample(), tmpdir, ["reg_date:year", "reg_date:month"])
+        assert os.path.exists(os.path.join(tmpdir, "2024", "03", "part-0.parquet"))
+
+        april = pd.DataFrame({"reg_date": ["2024-04-20"], "gu": ["종로구"], "count": [9]})
+        write_partitioned(april, tmpdir, ["reg_date:year", "reg_date:month"], incremental=True)
+
+        march = pd.read_parquet(os.path.join(tmpdir, "2024", "03"))
+        replaced = pd.read_parquet(os.path.join(tmpdir, "2024", "04"))
+        assert len(march) == 2
+        assert list(replaced["gu"]) == ["종로구"]
+
+
+def test_prepare_hf_repository_records_partition_layout() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        prepare_hf_repository("my-dataset", {"train": _sample()}, tmpdir, output_format="parquet", partition_by=["gu"])
+
+        # The partition column stays inside the files, so filters on it still work.
+        gangnam = pd.read_parquet(os.path.join(tmpdir, "data", "train"), filters=[("gu", "=", "강남구")])
+        assert list(gangnam["count"]) == [1, 3]
+        with open(os.path.join(tmpdir, "README.md"), encoding="utf-8") as f:
+            readme = f.read()
+        assert "path: data/train/**/*.parquet" in readme
+        assert "## Partitioning" in readme
+
+
+def test_partitioned_repository_loads_with_partition_columns() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        prepare_hf_repository("my-dataset", {"train": _sample()}, tmpdir, output_format="parquet", partition_by=["gu"])
+
+        train = load_dataset(tmpdir, split="train").to_pandas()
+        assert sorted(train.columns) == ["count", "gu", "reg_date"]
+        assert sorted(zip(train["gu"], train["count"])) == [("강남구", 1), ("강남구", 3), ("마포구", 2)]
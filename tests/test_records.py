@@ -0,0 +1,105 @@
+# tests/test_records.py
+
+import gzip
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+import kopen_data_builder as kopen
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core import records
+from kopen_data_builder.core.io import read_table
+from kopen_data_builder.core.records import iter_record_frames, read_records
+from kopen_data_builder.core.url_source import iter_url_frames
+from tests.conftest import LocalHttpServer
+
+XML = (
+    '<?xml version="1.0" encoding="EUC-KR"?><response><header><resultCode>00</resultCode>'
+    "<resultMsg>OK</resultMsg></header><body><items>"
+    + "".join(f"<item><gu>강남구</gu><count>{i}</count></item>" for i in range(25))
+    + "</items><totalCount>25</totalCount></body></response>"
+)
+PAGE = {
+    "response": {
+        "header": {"resultCode": "00", "codes": ["00"]},
+        "body": {"items": {"item": [{"gu": "서초구", "n": i, "geo": {"lat": 37.5}, "tags": [i]} for i in range(30)]}},
+    }
+}
+
+
+def test_xml_records_are_detected_decoded_and_chunked(tmp_path: Path) -> None:
+    path = tmp_path / "bikes.xml"
+    path.write_bytes(XML.encode("cp949"))
+    generic = tmp_path / "generic.xml"
+    generic.write_text('<root><meta><v>1</v></meta><rec id="1"><x>a</x></rec><rec id="2"><x>b</x></rec></root>')
+
+    chunks = list(iter_record_frames(str(path), chunk_rows=10))
+
+    assert [len(c) for c in chunks] == [10, 10, 5] and all(list(c.columns) == ["gu", "count"] for c in chunks)
+    assert read_table(str(path))["gu"].eq("강남구").all()
+    assert read_records(generic).to_dict("records") == [{"id": "1", "x": "a"}, {"id": "2", "x": "b"}]
+
+
+def test_xml_detection_keeps_nested_fields_of_the_first_record(tmp_path: Path) -> None:
+    path = tmp_path / "stations.xml"
+    items = "".join(f"<item><id>{i}</id><addr><road>r{i}</road><zip>{i}</zip></addr></item>" for i in range(3))
+    path.write_text(f"<response><body><items>{items}</items></body></response>", encoding="utf-8")
+
+    df = read_records(path)
+
+    assert list(df.columns) == ["id", "addr.road", "addr.zip"]
+    assert df.loc[0].tolist() == ["0", "r0", "0"]
+
+
+def test_json_records_stream_across_block_boundaries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "page.json"
+    path.write_text(json.dumps(PAGE, ensure_ascii=False), encoding="cp949")
+    monkeypatch.setattr(records, "TEXT_BLOCK_CHARS", 7)
+
+    chunks = list(iter_record_frames(str(path), chunk_rows=8))
+
+    df = pd.concat(chunks, ignore_index=True)
+    assert [len(c) for c in chunks] == [8, 8, 8, 6] and list(df.columns) == ["gu", "n", "geo.lat", "tags"]
+    assert df["n"].tolist() == list(range(30)) and df["tags"].iloc[3] == "[3]"
+    assert len(read_records(path, record_path="response.body.items.item")) == 30
+    with pytest.raises(ValueError):
+        read_records(path, record_path="response.body.rows")
+    (tmp_path / "broken.json").write_text('[{"a": 1}, {"a": 2}')
+    with pytest.raises(ValueError):
+        read_records(tmp_path / "broken.json")
+
+
+def test_jsonl_chunks_get_the_columns_of_the_whole_document(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(12):
+            f.write(json.dumps({"id": i, **({"late": 1} if i > 5 else {})}) + "\n\n")
+
+    chunks = list(iter_record_frames(str(path), chunk_rows=5))
+
+    assert [list(c.columns) for c in chunks] == [["id", "late"]] * 3 and sum(map(len, chunks)) == 12
+    assert pd.concat(chunks, ignore_index=True).equals(read_table(str(path)))
+    assert read_table(str(path))["late"].notna().sum() == 6
+    frame = kopen.scan(str(path), chunk_rows=4).filter("id", ">=", 9).select("id")
+    assert "jsonl" in frame.explain() and frame.collect()["id"].tolist() == [9, 10, 11]
+
+
+def test_url_and_cli_read_record_files(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    http_server.files["/bikes.xml.gz"] = gzip.compress(XML.encode("cp949"))
+
+    chunks = list(iter_url_frames(http_server.url("/bikes.xml.gz"), chunk_rows=20, usecols=["count"]))
+
+    assert [len(c) for c in chunks] == [20, 5] and list(chunks[0].columns) == ["count"]
+    # Without usecols the HTTP stream is spooled for the first pass over the field names.
+    chunks = list(iter_url_frames(http_server.url("/bikes.xml.gz"), chunk_rows=20))
+    assert [list(c.columns) for c in chunks] == [["gu", "count"]] * 2
+    (tmp_path / "page.json").write_text(json.dumps(PAGE, ensure_ascii=False), encoding="utf-8")
+    result = CliRunner().invoke(
+        app,
+        ["preprocess", "run", "--input-csv", str(tmp_path / "page.json"), "--output-csv", str(tmp_path / "out.csv")],
+    )
+    assert result.exit_code == 0, result.output
+    assert len(pd.read_csv(tmp_path / "out.csv")) == 30
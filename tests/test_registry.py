@@ -0,0 +1,91 @@
+# tests/test_registry.py
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder import registry as registry_module
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.manifest import update_manifest
+from kopen_data_builder.core.metadata import init_metadata, load_metadata
+from kopen_data_builder.registry import DatasetRegistry
+
+
+@pytest.fixture
+def datasets(tmp_path: Path) -> Path:
+    root = tmp_path / "datasets"
+    init_metadata(str(root / "bike" / "metadata.yaml"))
+    bike = root / "bike" / "metadata.yaml"
+    bike.write_text(bike.read_text(encoding="utf-8").replace("Semiannual", "Monthly"), encoding="utf-8")
+    init_metadata(str(root / "parking" / "metadata.yaml"))
+    parking = root / "parking" / "metadata.yaml"
+    text = parking.read_text(encoding="utf-8").replace("서울열림데이터광장", "공공데이터포털")
+    parking.write_text(text.replace("transportation", "parking").replace("Semiannual", "연간"), encoding="utf-8")
+    (root / "broken").mkdir()
+    (root / "broken" / "metadata.yaml").write_text("license: nope\n", encoding="utf-8")
+    return root
+
+
+def test_index_revalidates_only_changed_files(datasets: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = DatasetRegistry()
+    bike = datasets / "bike" / "metadata.yaml"
+
+    first = registry.index([datasets])
+    os.utime(bike, ns=(time.time_ns(), time.time_ns() + 10**9))  # touched, same contents
+    second = registry.index([datasets])
+
+    assert (first.revalidated, first.unchanged, len(first.invalid)) == (3, 0, 1)
+    assert (second.revalidated, second.unchanged) == (0, 3)
+    monkeypatch.setattr(registry_module, "load_metadata", lambda path: pytest.fail(f"re-read {path}"))
+    assert registry.load(bike) == load_metadata(str(bike))
+
+    monkeypatch.undo()
+    bike.write_text(bike.read_text(encoding="utf-8").replace("- tabular", "- bikes"), encoding="utf-8")
+    assert registry.index([datasets]).revalidated == 1
+    assert [e.tags for e in registry.find(tags=["bikes"])] == [["bikes", "transportation"]]
+    with pytest.raises(ValueError, match="schema"):
+        registry.load(datasets / "broken" / "metadata.yaml")
+
+
+def test_find_by_frequency_agency_and_refresh_due(datasets: Path, tmp_path: Path) -> None:
+    registry = DatasetRegistry()
+    registry.index([datasets])
+    bike = datasets / "bike" / "metadata.yaml"
+
+    monthly = registry.find(frequency="월간", agency="서울열림데이터광장")
+    assert [Path(e.path).parent.name for e in monthly] == ["bike"]
+    assert [Path(e.path).parent.name for e in registry.find(frequency="Annual", tags=["parking"])] == ["parking"]
+    assert len(registry.find(due=True)) == 2 and len(registry.find(include_invalid=True)) == 3
+
+    repo = tmp_path / "repo"
+    (repo / "data").mkdir(parents=True)
+    (repo / "data" / "train.csv").write_text("a\n1\n", encoding="utf-8")
+    registry.record_build(bike, repo, "build-key")
+    assert registry.find(frequency="monthly", due=True) == []
+    assert len(registry.find(frequency="monthly", due=True, now=time.time() + 32 * 86400)) == 1
+    (entry,) = registry.find(frequency="monthly")
+    assert entry.build_hash == "build-key" and entry.upload_pending
+
+    update_manifest(repo)
+    assert registry.record_upload(repo, "user/bike") == 1
+    (entry,) = registry.find(frequency="monthly")
+    assert entry.repo_id == "user/bike" and entry.upload_hash and not entry.upload_pending
+    with pytest.raises(ValueError):
+        registry.find(frequency="sometimes")
+
+
+def test_cli_registry_scan_and_list(datasets: Path) -> None:
+    runner = CliRunner()
+
+    scanned = runner.invoke(app, ["registry", "scan", str(datasets)])
+    listed = runner.invoke(app, ["registry", "list", "--agency", "서울열림데이터광장", "--due", "--json"])
+
+    assert scanned.exit_code == 0 and "1 invalid" in scanned.output
+    assert [e["pretty_name"] for e in json.loads(listed.output)] == ["Seoul Public Bike Usage (Monthly)"]
+    assert runner.invoke(app, ["registry", "list", "--frequency", "sometimes"]).exit_code != 0
+    (datasets / "parking" / "metadata.yaml").unlink()
+    assert "1 removed" in runner.invoke(app, ["registry", "scan", str(datasets), "--prune"]).output
@@ -0,0 +1,99 @@
+# tests/test_sampling.py
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+import kopen_data_builder as kopen
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.builder import build_repository
+from kopen_data_builder.core.sampling import SampleReport, StreamSampler, check_sample_options
+
+
+@pytest.fixture
+def big_csv(tmp_path: Path) -> Path:
+    path = tmp_path / "big.csv"
+    pd.DataFrame({"id": range(5_000), "gu": ["강남구", "서초구"] * 2_500}).to_csv(path, index=False)
+    return path
+
+
+def test_reservoir_sample_is_exact_reproducible_and_in_source_order(big_csv: Path) -> None:
+    def sample(chunk_rows: int, seed: int) -> pd.DataFrame:
+        return kopen.scan(str(big_csv), chunk_rows=chunk_rows).sample(n=100, seed=seed).collect()
+
+    first, again, other = sample(700, 1), sample(700, 1), sample(700, 2)
+
+    assert len(first) == 100 and first["id"].is_monotonic_increasing and first["id"].is_unique
+    pd.testing.assert_frame_equal(first, again)
+    assert first["id"].tolist() != other["id"].tolist()
+    assert len(kopen.scan(str(big_csv)).sample(n=10_000).collect()) == 5_000
+
+
+def test_bernoulli_sample_and_option_checks(big_csv: Path) -> None:
+    frame = kopen.scan(str(big_csv), chunk_rows=1_000).sample(frac=0.1, seed=7)
+
+    result = frame.collect()
+
+    report = frame.sample_report
+    assert report is not None and report.rows_seen == 5_000 and report.rows_kept == len(result)
+    assert 350 < len(result) < 650 and "sample(bernoulli, frac=0.1, seed=7)" in frame.explain()
+    for size, fraction in ((10, 0.1), (0, None), (None, 1.5)):
+        with pytest.raises(ValueError):
+            check_sample_options(size, fraction)
+    with pytest.raises(ValueError):
+        kopen.scan(str(big_csv)).sample()
+
+
+def test_sampler_skips_rows_that_cannot_enter_a_full_reservoir() -> None:
+    sampler = StreamSampler(SampleReport(size=5, seed=3))
+
+    for start in range(0, 1_000, 100):
+        assert sampler(pd.DataFrame({"id": range(start, start + 100)})).empty
+
+    sample = sampler.flush()
+    assert sample is not None and len(sample) == 5 and sampler.report.rows_seen == 1_000
+    assert sample["id"].is_monotonic_increasing
+
+
+def test_cli_sample_marks_preprocess_split_and_build_outputs(big_csv: Path, tmp_path: Path) -> None:
+    runner = CliRunner()
+    clean = tmp_path / "clean.csv"
+    (tmp_path / "rules.json").write_text(json.dumps({"train": 0.8, "test": 0.2}), encoding="utf-8")
+
+    result = runner.invoke(
+        app, ["preprocess", "run", "--input-csv", str(big_csv), "--output-csv", str(clean), "--sample", "300"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "SAMPLE" in result.output and len(pd.read_csv(clean)) == 300
+    assert json.loads((tmp_path / "clean.csv.sample.json").read_text(encoding="utf-8"))["rows_seen"] == 5_000
+
+    split_args = ["split", "split", "--input-csv", str(big_csv), "--split-json", str(tmp_path / "rules.json")]
+    result = runner.invoke(app, [*split_args, "--output-dir", str(tmp_path / "out"), "--sample-frac", "0.2"])
+    assert result.exit_code == 0, result.output
+    marker = json.loads((tmp_path / "out" / "sample.json").read_text(encoding="utf-8"))
+    assert marker["method"] == "bernoulli" and marker["rows_kept"] < 5_000
+
+    splits = {name: str(tmp_path / "out" / f"{name}.csv") for name in ("train", "test")}
+    build_repository(splits, "demo", str(tmp_path / "repo"))
+    readme = (tmp_path / "repo" / "README.md").read_text(encoding="utf-8")
+    assert readme.startswith("> ⚠️ **Sample preview.**")
+    repo_marker = json.loads((tmp_path / "repo" / "sample.json").read_text(encoding="utf-8"))
+    assert set(repo_marker["splits"]) == {"train", "test"}
+
+    # A full run into the same directory drops the stale marker.
+    result = runner.invoke(app, [*split_args, "--output-dir", str(tmp_path / "out")])
+    assert result.exit_code == 0, result.output
+    assert not (tmp_path / "out" / "sample.json").exists()
+    both = ["--sample", "1", "--sample-frac", "0.5"]
+    assert runner.invoke(app, [*split_args, "--output-dir", str(tmp_path / "x"), *both]).exit_code == 2
+
+
+def test_build_repository_samples_each_split(big_csv: Path, tmp_path: Path) -> None:
+    build_repository({"train": str(big_csv)}, "demo", str(tmp_path / "repo"), sample_size=50, sample_seed=5)
+
+    assert len(pd.read_csv(tmp_path / "repo" / "train.csv", encoding="utf-8-sig")) == 50
+    marker = json.loads((tmp_path / "repo" / "sample.json").read_text(encoding="utf-8"))
+    assert marker["splits"]["train"]["size"] == 50 and marker["splits"]["train"]["seed"] == 5
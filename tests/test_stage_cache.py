@@ -0,0 +1,87 @@
+# tests/test_stage_cache.py
+
+import json
+import os
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.stage_cache import StageCache
+
+
+def _inputs(tmp_path: Path) -> Path:
+    (tmp_path / "data.csv").write_text("a,b\n" + "".join(f"{i},{i % 3}\n" for i in range(20)), encoding="utf-8")
+    (tmp_path / "rules.json").write_text(json.dumps({"train": 0.8, "test": 0.2}), encoding="utf-8")
+    return tmp_path
+
+
+def _split(tmp_path: Path, *extra: str) -> str:
+    args = ["split", "split", "--input-csv", str(tmp_path / "data.csv"), "--split-json", str(tmp_path / "rules.json")]
+    result = CliRunner().invoke(app, [*args, "--output-dir", str(tmp_path / "splits"), *extra])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_stage_cache_keys_on_content_options_and_outputs(tmp_path: Path) -> None:
+    cache = StageCache(tmp_path / "state.db")
+    source = tmp_path / "in.csv"
+    source.write_text("x\n1\n", encoding="utf-8")
+    output = tmp_path / "out.csv"
+
+    first = cache.check("stage", output, [source], {"n": 1})
+    assert first.reasons == ["no previous run recorded"]
+    output.write_text("done", encoding="utf-8")
+    cache.record(first, [output])
+    assert cache.check("stage", output, [source], {"n": 1}).fresh
+
+    os.utime(source, ns=(1, 1))  # touched but identical content
+    assert cache.check("stage", output, [source], {"n": 1}).fresh
+    assert cache.check("stage", output, [source], {"n": 2}).reasons == ["option n changed: 1 → 2"]
+    assert cache.check("stage", output, [source], {"n": 1}, force=True).reasons == ["forced with --force"]
+
+    source.write_text("x\n2\n", encoding="utf-8")
+    assert cache.check("stage", output, [source], {"n": 1}).reasons == [f"input {source.resolve()} changed"]
+
+    output.unlink()
+    source.write_text("x\n1\n", encoding="utf-8")
+    assert cache.check("stage", output, [source], {"n": 1}).reasons == [f"output {output.resolve()} is missing"]
+
+
+def test_cli_split_skips_unchanged_input_and_explains_reruns(tmp_path: Path) -> None:
+    _inputs(tmp_path)
+    assert "train split saved" in _split(tmp_path)
+    assert "up to date" in _split(tmp_path)
+    assert "train split saved" in _split(tmp_path, "--force")
+
+    (tmp_path / "rules.json").write_text(json.dumps({"train": 0.5, "test": 0.5}), encoding="utf-8")
+    assert "train split saved" in _split(tmp_path)
+
+    explained = CliRunner().invoke(app, ["stages", "explain", str(tmp_path / "splits")])
+    assert f"input {(tmp_path / 'rules.json').resolve()} changed" in explained.output
+
+    _split(tmp_path)
+    explained = CliRunner().invoke(app, ["stages", "explain", "--stage", "split"])
+    assert "skipped" in explained.output
+
+    assert "Forgot 1" in CliRunner().invoke(app, ["stages", "clear"]).output
+    assert "train split saved" in _split(tmp_path)
+
+
+def test_cli_build_rebuilds_when_metadata_changes(tmp_path: Path) -> None:
+    _inputs(tmp_path)
+    _split(tmp_path)
+    (tmp_path / "splits.json").write_text(
+        json.dumps({"train": str(tmp_path / "splits" / "train.csv"), "test": str(tmp_path / "splits" / "test.csv")}),
+        encoding="utf-8",
+    )
+    metadata = tmp_path / "metadata.yaml"
+    assert CliRunner().invoke(app, ["metadata", "init", "--output", str(metadata)]).exit_code == 0
+    args = ["build", "run", "--dataset-name", "ds", "--csv-json-path", str(tmp_path / "splits.json")]
+    args += ["--output-dir", str(tmp_path / "repo"), "--metadata-path", str(metadata)]
+
+    assert "prepared" in CliRunner().invoke(app, args).output
+    assert "up to date" in CliRunner().invoke(app, args).output
+
+    metadata.write_text(metadata.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    assert "prepared" in CliRunner().invoke(app, args).output
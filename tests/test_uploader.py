@@ -1,8 +1,116 @@
 # tests/test_uploader.py
 
-from kopen_data_builder.core.uploader import verify_upload
+from pathlib import Path
+
+import pytest
+
+from kopen_data_builder.core.manifest import MANIFEST_FILENAME
+from kopen_data_builder.core.uploader import (
+    PROGRESS_FILENAME,
+    HubSession,
+    publish_many,
+    upload_in_batches,
+    upload_to_hf,
+    verify_repository,
+    verify_upload,
+)
+from tests.conftest import FakeHubApi
 
 
 def test_verify_upload_public_dataset() -> None:
     """This test checks a known public dataset."""
     verify_upload("glue/sst2")  # Assumes public dataset is always accessible
+
+
+def test_delta_upload_commits_only_changed_files(fake_hub: FakeHubApi, tmp_path: Path) -> None:
+    """Only added and modified files are committed; remote-only files are deleted only on request."""
+    (tmp_path / "README.md").write_text("# v1", encoding="utf-8")
+    (tmp_path / "train.csv").write_text("a\n1\n", encoding="utf-8")
+    (tmp_path / "test.csv").write_text("a\n2\n", encoding="utf-8")
+
+    upload_to_hf(str(tmp_path), "user/ds", session=HubSession(api=fake_hub))
+    assert sorted(fake_hub.commits()[-1]) == ["README.md", "test.csv", "train.csv"]
+    assert MANIFEST_FILENAME not in fake_hub.repos["user/ds"]
+
+    (tmp_path / "README.md").write_text("# v2", encoding="utf-8")
+    (tmp_path / "test.csv").unlink()
+    (tmp_path / "valid.csv").write_text("a\n3\n", encoding="utf-8")
+    upload_to_hf(str(tmp_path), "user/ds", session=HubSession(api=fake_hub))
+
+    assert sorted(fake_hub.commits()[-1]) == ["README.md", "valid.csv"]
+    assert "test.csv" in fake_hub.repos["user/ds"]  # may have been added on the Hub by hand
+
+    upload_to_hf(str(tmp_path), "user/ds", session=HubSession(api=fake_hub), delete_remote=True)
+    assert fake_hub.commits()[-1] == ["test.csv"]
+    assert set(fake_hub.repos["user/ds"]) == {".gitattributes", "README.md", "train.csv", "valid.csv"}
+
+    upload_to_hf(str(tmp_path), "user/ds", session=HubSession(api=fake_hub), delete_remote=True)
+    assert len(fake_hub.commits()) == 3
+
+
+def test_upload_in_batches_resumes_after_failure(fake_hub: FakeHubApi, tmp_path: Path) -> None:
+    """A failed batch leaves progress behind; the rerun only sends the files not yet committed."""
+    for i in range(5):
+        (tmp_path / f"part-{i}.parquet").write_bytes(bytes(100))
+
+    fake_hub.fail_on_commit = 2
+    with pytest.raises(ConnectionError):
+        upload_in_batches(str(tmp_path), "user/big", max_batch_bytes=250, session=HubSession(api=fake_hub))
+    assert (tmp_path / PROGRESS_FILENAME).exists()
+    assert fake_hub.commits() == [["part-0.parquet", "part-1.parquet"]]
+
+    stats = upload_in_batches(str(tmp_path), "user/big", max_batch_bytes=250, session=HubSession(api=fake_hub))
+
+    assert fake_hub.commits()[1:] == [["part-2.parquet", "part-3.parquet"], ["part-4.parquet"]]
+    assert (stats.files, stats.commits, stats.skipped) == (3, 2, 2)
+    assert not (tmp_path / PROGRESS_FILENAME).exists()
+
+
+def test_verify_repository_reports_missing_and_truncated_files(fake_hub: FakeHubApi, tmp_path: Path) -> None:
+    """A repo that exists but lost or truncated a shard fails verification."""
+    (tmp_path / "README.md").write_text("# card", encoding="utf-8")
+    (tmp_path / "train.parquet").write_bytes(bytes(64))
+    (tmp_path / "test.parquet").write_bytes(bytes(32))
+    upload_to_hf(str(tmp_path), "user/ds", session=HubSession(api=fake_hub))
+    assert verify_upload("user/ds", repo_dir=str(tmp_path), session=HubSession(api=fake_hub))
+
+    fake_hub.repos["user/ds"]["train.parquet"] = bytes(10)
+    del fake_hub.repos["user/ds"]["test.parquet"]
+    report = verify_repository(str(tmp_path), "user/ds", session=HubSession(api=fake_hub))
+
+    assert report.verified == ["README.md"]
+    assert report.mismatched == ["train.parquet"]
+    assert report.missing == ["test.parquet"]
+    assert not verify_upload("user/ds", repo_dir=str(tmp_path), session=HubSession(api=fake_hub))
+
+
+def test_session_reuses_listing_and_creates_repo_once(fake_hub: FakeHubApi, tmp_path: Path) -> None:
+    """Create, upload and verify share one session: one create, one listing before and one after the commit."""
+    (tmp_path / "train.parquet").write_bytes(bytes(16))
+    session = HubSession(api=fake_hub)
+
+    upload_to_hf(str(tmp_path), "user/new", session=session)
+    assert verify_upload("user/new", repo_dir=str(tmp_path), session=session)
+    assert verify_upload("user/new", session=session)
+
+    assert fake_hub.calls_named("create_repo") == ["user/new"]
+    assert fake_hub.calls_named("repo_info") == ["user/new", "user/new", "user/new"]
+
+    upload_to_hf(str(tmp_path), "user/new", session=session)
+    assert fake_hub.calls_named("create_repo") == ["user/new"]
+    assert len(fake_hub.commits()) == 1
+
+
+def test_publish_many_isolates_failures(fake_hub: FakeHubApi, tmp_path: Path) -> None:
+    """One missing directory does not stop the other repositories from being published."""
+    good = tmp_path / "good"
+    good.mkdir()
+    (good / "README.md").write_text("# card", encoding="utf-8")
+
+    results = publish_many(
+        {"user/good": str(good), "user/bad": str(tmp_path / "missing")}, session=HubSession(api=fake_hub)
+    )
+
+    assert [r.ok for r in results] == [True, False]
+    assert "does not exist" in (results[1].error or "")
+    assert "README.md" in fake_hub.repos["user/good"]
@@ -0,0 +1,81 @@
+# tests/test_url_source.py
+
+import gzip
+import io
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from kopen_data_builder.cli.main import app
+from kopen_data_builder.core.downloader import DownloadCache
+from kopen_data_builder.core.url_source import iter_url_frames
+from tests.conftest import LocalHttpServer
+
+CSV = "구,대여건수\n" + "".join(f"종로구,{i}\n" for i in range(500))
+
+
+def zipped(name: str, data: bytes, method: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=method) as zf:
+        zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        CSV.encode("cp949"),
+        CSV.encode("utf-8-sig"),
+        gzip.compress(CSV.encode("cp949")),
+        zipped("bike.csv", CSV.encode("cp949"), zipfile.ZIP_DEFLATED),
+        zipped("bike.csv", CSV.encode("utf-8"), zipfile.ZIP_STORED),
+    ],
+    ids=["cp949", "utf-8-sig", "gzip", "zip-deflate", "zip-stored"],
+)
+def test_iter_url_frames_decompresses_and_decodes(http_server: LocalHttpServer, payload: bytes) -> None:
+    """Compressed and cp949 payloads stream into chunks with decoded Korean text."""
+    http_server.files["/bike"] = payload
+
+    chunks = list(iter_url_frames(http_server.url("/bike"), chunk_rows=200))
+
+    assert [len(c) for c in chunks] == [200, 200, 100]
+    df = pd.concat(chunks)
+    assert list(df.columns) == ["구", "대여건수"]
+    assert df["구"].iloc[0] == "종로구" and df["대여건수"].iloc[-1] == 499
+
+
+def test_iter_url_frames_tees_into_cache(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """The first read fills the cache; the second is answered with 304 and read from disk."""
+    http_server.files["/bike.csv.gz"] = gzip.compress(CSV.encode("utf-8"))
+    cache = DownloadCache(tmp_path / "cache")
+
+    first = pd.concat(iter_url_frames(http_server.url("/bike.csv.gz"), cache=cache))
+    entry = cache.lookup(http_server.url("/bike.csv.gz"))
+    assert entry is not None and cache.blob_path(entry.sha256).read_bytes() == http_server.files["/bike.csv.gz"]
+
+    second = pd.concat(iter_url_frames(http_server.url("/bike.csv.gz"), cache=cache))
+    assert http_server.requests[-1][1]["If-None-Match"] == http_server.etag("/bike.csv.gz")
+    pd.testing.assert_frame_equal(first, second)
+    assert not list((tmp_path / "cache").glob("*.stream"))
+
+
+def test_iter_url_frames_stops_early(http_server: LocalHttpServer) -> None:
+    """Abandoning the generator stops the prefetch thread without error."""
+    http_server.files["/bike"] = CSV.encode("utf-8") * 20
+    frames = iter_url_frames(http_server.url("/bike"), chunk_rows=10, prefetch_blocks=1)
+    assert len(next(frames)) == 10
+    frames.close()
+
+
+def test_preprocess_run_streams_url(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    """preprocess run accepts a URL and writes the cleaned chunks."""
+    http_server.files["/raw.csv.gz"] = gzip.compress("이름 ,가입날짜\n홍길동 ,2024-01-01\n".encode("cp949"))
+    output = tmp_path / "clean.csv"
+    result = CliRunner().invoke(
+        app, ["preprocess", "run", "--input-csv", http_server.url("/raw.csv.gz"), "--output-csv", str(output)]
+    )
+    assert result.exit_code == 0, result.output
+    assert pd.read_csv(output).to_dict("records") == [{"이름": "홍길동", "가입날짜": "2024-01-01"}]